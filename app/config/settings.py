@@ -52,17 +52,54 @@ class Settings(BaseSettings):
     mock_coordinator_password: str = "coordinatorpass"
     mock_guest_password: str = "guestpass"
     
+    # Background task placement
+    run_background_tasks: bool = True  # Start message poller / ClinicalOps processor inside web workers. Set False when `python -m app.worker` runs them. Override: RUN_BACKGROUND_TASKS
+    worker_processes: int = 1  # Number of `python -m app.worker` processes to run. Override: WORKER_PROCESSES
+    worker_db_pool_size: Optional[int] = None  # DB pool size per worker process (defaults to db_pool_size). Override: WORKER_DB_POOL_SIZE
+
     # Message Poller Configuration
     message_poller_enabled: bool = True
     message_poller_interval_seconds: int = 180  # Poll every N seconds (default: 3 minutes, configurable via MESSAGE_POLLER_INTERVAL_SECONDS env var)
     message_poller_batch_size: int = 7  # Process up to 7 messages per poll (increased from 3 for faster processing)
-    
+    inbox_lease_seconds: int = 600  # Lease granted per claimed inbox row (requires migration 032). Override: INBOX_LEASE_SECONDS
+    inbox_lease_renew_interval_seconds: int = 120  # How often a worker renews leases for jobs it still holds. Override: INBOX_LEASE_RENEW_INTERVAL_SECONDS
+    inbox_priority_aging_factor: float = 1.0  # Starvation protection: hours of claim priority a job gains per hour waited (0 = strict earliest-due-first). Override: INBOX_PRIORITY_AGING_FACTOR
+    pipeline_max_workers: int = 4  # Max inbox jobs processed concurrently per poller (scaled down when DB pool is under pressure). Override: PIPELINE_MAX_WORKERS
+    pipeline_db_connections_per_job: int = 2  # DB connections budgeted per in-flight job when sizing the worker pool. Override: PIPELINE_DB_CONNECTIONS_PER_JOB
+    inbox_lane_weights: str = "utn:4,portal:3,fax:1,esmd:1"  # Weighted fair share of worker slots per lane (utn, portal, fax, esmd). Override: INBOX_LANE_WEIGHTS
+    inbox_lane_max_concurrency: str = "utn:4,portal:4,fax:2,esmd:2"  # Max concurrent jobs per lane per poller. Override: INBOX_LANE_MAX_CONCURRENCY
+    pipeline_stage_concurrency: str = "download:4,merge:2,upload:4,split:2,page_upload:4,ocr:4"  # Max packets active per processing stage (download, merge, upload, split, page_upload, ocr). Override: PIPELINE_STAGE_CONCURRENCY
+    pipeline_stage_queue_size: int = 8  # Max packets waiting for each stage; a full queue holds packets in the previous stage (backpressure). Override: PIPELINE_STAGE_QUEUE_SIZE
+    pipeline_in_memory_max_bytes: int = 25 * 1024 * 1024  # Packets whose source documents fit this budget are downloaded, merged, split and uploaded from memory; larger ones spill to temp files (0 = always use temp files). Override: PIPELINE_IN_MEMORY_MAX_BYTES
+    pipeline_streaming_page_threshold: int = 200  # Consolidated PDFs with more pages are split, uploaded and cleaned up in chunks instead of all at once (0 = never by page count). Override: PIPELINE_STREAMING_PAGE_THRESHOLD
+    pipeline_streaming_min_bytes: int = 200 * 1024 * 1024  # Consolidated PDFs larger than this are split in streaming chunks (0 = never by size). Override: PIPELINE_STREAMING_MIN_BYTES
+    pipeline_streaming_chunk_pages: int = 50  # Pages split and uploaded per chunk in streaming mode (also TIFF frames converted per batch). Override: PIPELINE_STREAMING_CHUNK_PAGES
+    cpu_pool_workers: int = 2  # Worker processes for CPU-bound PDF/image work (TIFF conversion, page flattening, text rendering); 0 = run in the calling thread. Override: CPU_POOL_WORKERS
+    cpu_pool_max_queue: int = 8  # CPU tasks allowed to wait for a worker; callers block while the queue is full. Override: CPU_POOL_MAX_QUEUE
+    http_client_max_connections: int = 100  # Connections the shared outbound HTTP client (OCR, LetterGen, JSON Generator) opens at once across all hosts. Override: HTTP_CLIENT_MAX_CONNECTIONS
+    http_client_max_connections_per_host: int = 20  # Requests to one host at once through the shared HTTP client (0 = only the total limit). Override: HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST
+    http_client_max_keepalive_connections: int = 20  # Idle connections kept open for reuse. Override: HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS
+    http_client_keepalive_expiry_seconds: float = 30.0  # Time an idle connection is kept before closing. Override: HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS
+    http_client_http2: bool = False  # Negotiate HTTP/2 with services that support it (requires the h2 package). Override: HTTP_CLIENT_HTTP2
+    http_client_connect_timeout_seconds: float = 10.0  # Connect timeout for OCR and LetterGen calls (read timeouts stay per service). Override: HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS
+
     # ClinicalOps Poller Configuration
     clinical_ops_poller_enabled: bool = True
     clinical_ops_poll_interval_seconds: int = 60  # Poll every 60s (1 min). Override: CLINICAL_OPS_POLL_INTERVAL_SECONDS
     clinical_ops_poll_batch_size: int = 25  # Process up to 25 messages per poll. Override: CLINICAL_OPS_POLL_BATCH_SIZE
     clinical_ops_processing_delay_seconds: float = 2.0  # Delay between messages (prevents pool exhaustion). Override: CLINICAL_OPS_PROCESSING_DELAY_SECONDS
-    
+
+    # Event-driven intake (Postgres LISTEN/NOTIFY, requires migration 031)
+    # When the listener is connected, pollers wake on NOTIFY and the timed poll becomes a slow safety sweep.
+    # If the listener is disconnected, pollers fall back to their normal poll intervals above.
+    db_notify_enabled: bool = True  # Override: DB_NOTIFY_ENABLED
+    db_notify_intake_channel: str = "serviceops_intake"  # Channel notified on INSERT into integration.send_serviceops
+    db_notify_clinical_ops_channel: str = "clinical_ops_decisions"  # Channel notified on decision writes to service_ops.send_serviceops
+    db_notify_debounce_seconds: float = 1.0  # Coalesce bursts of notifications into one poll cycle
+    db_notify_reconnect_seconds: float = 5.0  # Delay before reconnecting a dropped listener connection
+    message_poller_sweep_interval_seconds: int = 600  # Safety sweep interval while listening (10 min). Override: MESSAGE_POLLER_SWEEP_INTERVAL_SECONDS
+    clinical_ops_sweep_interval_seconds: int = 300  # Safety sweep interval while listening (5 min). Override: CLINICAL_OPS_SWEEP_INTERVAL_SECONDS
+
     # Azure Blob Storage Configuration
     storage_account_url: str = ""  # e.g., https://devwisersa.blob.core.windows.net
     azure_storage_connection_string: Optional[str] = None  # For dev/local (optional, uses DefaultAzureCredential if not set)
@@ -82,6 +119,14 @@ class Settings(BaseSettings):
     blob_temp_dir: str = "/tmp/service_ops_blobs"  # Base directory for temporary files
     blob_max_retries: int = 5  # Maximum retry attempts for transient failures
     blob_retry_base_seconds: float = 1.0  # Base delay in seconds for exponential backoff
+    blob_download_max_concurrency: int = 4  # Max concurrent source document downloads per packet (1 = sequential)
+    blob_upload_max_concurrency: int = 8  # Max concurrent split page uploads per packet (1 = sequential)
+    page_upload_checkpoint_interval: int = 10  # Record page upload progress in pages_metadata every N pages so a retry skips pages already uploaded. Override: PAGE_UPLOAD_CHECKPOINT_INTERVAL
+    
+    # PDF Split Configuration
+    pdf_split_flatten_mode: str = "selective"  # "selective": render only pages with form widgets/annotations, copy others as-is; "all": render every page. Override: PDF_SPLIT_FLATTEN_MODE
+    pdf_split_flatten_dpi: int = 144  # Resolution for rendering flattened pages (144 = previous 2x zoom). Override: PDF_SPLIT_FLATTEN_DPI
+    tiff_passthrough_enabled: bool = True  # Embed CCITT G4 / JPEG TIFF frames in PDFs without decoding (other frames are decoded as before). Override: TIFF_PASSTHROUGH_ENABLED
     
     # OCR Service Configuration
     ocr_base_url: str = ""  # Base URL for OCR service (e.g., http://localhost:5080)
@@ -89,11 +134,24 @@ class Settings(BaseSettings):
     ocr_max_retries: int = 5  # Maximum retry attempts for transient failures (5xx, timeouts) - increased from 3
     ocr_confidence_threshold: float = 0.5  # Minimum confidence threshold for field counting in coversheet detection (0.0-1.0)
     ocr_delay_between_requests: float = 0.5  # Delay in seconds between OCR requests to reduce load (default: 0.5s)
+    ocr_page_concurrency: int = 1  # Pages of one packet OCR'd at once; 1 = sequential with ocr_delay_between_requests, >1 = concurrent (paced by the shared rate limiter, no delay). Override: OCR_PAGE_CONCURRENCY
+    ocr_requests_per_second: float = 0.0  # Process-wide OCR request rate across all jobs, including retries (0 = no rate limit). Override: OCR_REQUESTS_PER_SECOND
+    ocr_max_in_flight: int = 4  # Process-wide OCR requests in flight across all jobs (0 = no limit). Override: OCR_MAX_IN_FLIGHT
+    ocr_adaptive_concurrency: bool = True  # Tune OCR concurrency between ocr_min_in_flight and ocr_max_in_flight with AIMD (halve on 5xx/429/timeouts/slow responses, grow by one per round of successes). Override: OCR_ADAPTIVE_CONCURRENCY
+    ocr_min_in_flight: int = 1  # Lowest OCR concurrency adaptive mode decreases to. Override: OCR_MIN_IN_FLIGHT
+    ocr_latency_target_seconds: float = 60.0  # OCR responses slower than this count as overload in adaptive mode (0 = ignore latency). Override: OCR_LATENCY_TARGET_SECONDS
+    ocr_circuit_failure_threshold: int = 5  # Consecutive failed OCR requests (after retries) that open the circuit; jobs are parked instead of failed while it is open (0 = never open). Override: OCR_CIRCUIT_FAILURE_THRESHOLD
+    ocr_circuit_reset_seconds: int = 60  # Time the OCR circuit stays open before a probe request is let through. Override: OCR_CIRCUIT_RESET_SECONDS
+    ocr_result_cache_enabled: bool = True  # Reuse OCR results of identical page bytes from service_ops.ocr_result_cache (migration 034) instead of calling the OCR service again. Override: OCR_RESULT_CACHE_ENABLED
+    ocr_result_cache_model_id: str = "coversheet-extraction"  # OCR model id assumed for cache lookups until a live OCR response reports the current model. Override: OCR_RESULT_CACHE_MODEL_ID
+    ocr_result_cache_ttl_days: int = 90  # Cached OCR results older than this are ignored (0 = never expire). Override: OCR_RESULT_CACHE_TTL_DAYS
     ocr_retry_failed_pages: bool = True  # Retry failed pages at end of processing (default: True)
     ocr_max_failed_page_retries: int = 3  # Maximum retries for failed pages at end (default: 3)
     ocr_stop_after_coversheet: bool = True  # Stop processing pages after finding strong coversheet candidate (default: True)
     ocr_coversheet_confidence_threshold: float = 0.7  # Minimum confidence to consider a page as strong coversheet candidate (default: 0.7)
     ocr_min_coversheet_fields: int = 20  # Minimum number of fields to consider a page as strong coversheet candidate (default: 20)
+    ocr_coversheet_prerank: bool = True  # Score pages locally (PDF text layer + layout) and OCR the most coversheet-like pages first. Override: OCR_COVERSHEET_PRERANK
+    ocr_prerank_max_pages: int = 30  # Pages scored by pre-ranking; the top OCR_MAX_PAGES of them are OCR'd in ranked order. Override: OCR_PRERANK_MAX_PAGES
     
     # Validation Services Configuration
     hets_base_url: str = ""  # Base URL for HETS service (DEV: https://dev-wiser-hets-api-b7bqh0gshnftc7f4.eastus-01.azurewebsites.net, PROD: https://prd-wiser-hets-app.azurewebsites.us)
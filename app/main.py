@@ -27,6 +27,8 @@ from app.utils.phi_masking import mask_error_message
 from app.services.message_poller import get_message_poller
 from app.services.clinical_ops_inbox_processor import ClinicalOpsInboxProcessor
 from app.services.db import test_connection, close_all_connections, get_pool_status
+from app.services.cpu_pool import shutdown_cpu_pool
+from app.services.http_client import close_http_client
 
 
 # Configure logging
@@ -92,9 +94,13 @@ async def lifespan(app: FastAPI):
     else:
         logger.error("Database connection test failed - application may not function correctly")
     
+    # Background tasks run here unless a dedicated worker process owns them (python -m app.worker)
+    if not settings.run_background_tasks:
+        logger.info("Background tasks disabled in web tier (RUN_BACKGROUND_TASKS=false) - expecting app.worker to run them")
+    
     # Start message poller
     message_poller = None
-    if settings.message_poller_enabled:
+    if settings.run_background_tasks and settings.message_poller_enabled:
         message_poller = get_message_poller()
         try:
             await message_poller.start()
@@ -111,7 +117,7 @@ async def lifespan(app: FastAPI):
     
     # Start ClinicalOps inbox processor
     clinical_ops_processor = None
-    if getattr(settings, 'clinical_ops_poller_enabled', True):
+    if settings.run_background_tasks and getattr(settings, 'clinical_ops_poller_enabled', True):
         clinical_ops_processor = ClinicalOpsInboxProcessor()
         try:
             await clinical_ops_processor.start()
@@ -153,6 +159,12 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error during graceful shutdown: {e}", exc_info=True)
     
+    # Stop CPU pool worker processes
+    shutdown_cpu_pool()
+    
+    # Close pooled outbound HTTP connections
+    close_http_client()
+    
     # Close all database connections
     close_all_connections()
     logger.info("Shutting down WISeR Packet Dashboard Backend")
@@ -7,6 +7,12 @@ from app.models.api import HealthResponse
 from app.config import settings
 from app.services.db import health_check as db_health_check, SessionLocal
 from app.services.message_poller import get_message_poller
+from app.services.pipeline_stages import get_document_pipeline
+from app.services.cpu_pool import get_cpu_pool
+from app.services.ocr_rate_limiter import get_ocr_rate_limiter
+from app.services.ocr_circuit_breaker import get_ocr_circuit_breaker
+from app.services.ocr_result_cache import get_ocr_result_cache
+from app.services.http_client import get_http_client
 from sqlalchemy import text
 from datetime import datetime
 
@@ -63,6 +69,34 @@ async def poller_health():
     }
 
 
+@router.get("/health/pipeline")
+async def pipeline_health():
+    """
+    Document pipeline stage status for this process.
+    Returns active/queued packet counts and limits per stage (download, merge,
+    upload, split, page_upload, ocr), the poller's in-flight job count, the
+    CPU pool's in-flight task count, the OCR rate limiter's in-flight requests and
+    current (adaptive) concurrency limit, the OCR circuit breaker state, OCR result
+    cache hits and misses, and the shared outbound HTTP client's in-flight requests
+    per host.
+    
+    NOTE: This endpoint is intentionally unauthenticated to allow monitoring tools
+    to watch queue depths. Only counts are returned.
+    """
+    poller = get_message_poller()
+    
+    return {
+        "stages": get_document_pipeline().get_status(),
+        "active_jobs": poller.active_job_count if poller else 0,
+        "lanes_in_flight": dict(poller.lane_in_flight) if poller else {},
+        "cpu_pool": get_cpu_pool().get_status(),
+        "ocr_rate_limiter": get_ocr_rate_limiter().get_status(),
+        "ocr_circuit_breaker": get_ocr_circuit_breaker().get_status(),
+        "ocr_result_cache": get_ocr_result_cache().get_status(),
+        "http_client": get_http_client().get_status()
+    }
+
+
 @router.get("/api/pending-actions")
 async def get_pending_actions():
     """
@@ -3,11 +3,14 @@ Azure Blob Storage Client
 Handles downloading source documents and uploading derived artifacts (split pages)
 Supports both connection string and Managed Identity authentication
 """
+import io
 import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Set
 from urllib.parse import urlparse
 
 from azure.storage.blob import BlobServiceClient, BlobClient, ContentSettings, generate_blob_sas, BlobSasPermissions
@@ -401,13 +404,12 @@ class BlobStorageClient:
         def _download():
             blob_client = self._get_blob_client(blob_path_or_url, container_name=container_name)
             
-            # Get blob properties first
-            properties = blob_client.get_blob_properties()
-            
             # Download with streaming to avoid memory issues
+            # (the download response carries the blob properties - no separate round trip)
             with open(local_path, 'wb') as f:
                 download_stream = blob_client.download_blob(timeout=timeout)
                 download_stream.readinto(f)
+            properties = download_stream.properties
             
             return {
                 'local_path': str(local_path),
@@ -453,6 +455,354 @@ class BlobStorageClient:
         Returns:
             Dict with metadata (same as download_to_file)
         """
+        local_path = self._unique_temp_path(blob_path_or_url, subdir)
+        return self.download_to_file(blob_path_or_url, str(local_path), container_name=container_name, timeout=timeout)
+    
+    def download_many_to_temp(
+        self,
+        blob_paths_or_urls: List[str],
+        subdir: Optional[str] = None,
+        container_name: Optional[str] = None,
+        timeout: int = 300,
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Download several blobs to temporary files concurrently.
+        
+        At most max_concurrency downloads are in flight. Each download keeps the
+        transient-failure retries of download_to_file; the first download that still
+        fails stops the batch: downloads not yet started are cancelled, files already
+        written by this call are removed and the error is raised.
+        
+        Args:
+            blob_paths_or_urls: Absolute URLs or relative blob paths
+            subdir: Optional subdirectory under temp_dir
+            container_name: Optional container name override (if None, uses instance container_name)
+            timeout: Per-download timeout in seconds (default: 300)
+            max_concurrency: Max downloads in flight (default: settings.blob_download_max_concurrency)
+            
+        Returns:
+            List of metadata dicts (same as download_to_file), in input order
+            
+        Raises:
+            BlobStorageError: On the first download that fails
+        """
+        if not blob_paths_or_urls:
+            return []
+        
+        max_concurrency = max(1, max_concurrency or settings.blob_download_max_concurrency)
+        
+        # Assign local paths up front so blobs with the same name never share a temp file
+        reserved: Set[Path] = set()
+        local_paths = []
+        for blob_path_or_url in blob_paths_or_urls:
+            local_path = self._unique_temp_path(blob_path_or_url, subdir, reserved)
+            reserved.add(local_path)
+            local_paths.append(local_path)
+        
+        calls = [
+            (lambda b=blob_path_or_url, p=local_path: self.download_to_file(
+                b, str(p), container_name=container_name, timeout=timeout
+            ))
+            for blob_path_or_url, local_path in zip(blob_paths_or_urls, local_paths)
+        ]
+        return self._run_bounded(
+            calls,
+            max_concurrency,
+            thread_name_prefix="blob-download",
+            on_abort=lambda completed: self._remove_files(r['local_path'] for r in completed)
+        )
+    
+    def download_many_to_buffers(
+        self,
+        blob_paths_or_urls: List[str],
+        subdir: Optional[str] = None,
+        container_name: Optional[str] = None,
+        timeout: int = 300,
+        max_concurrency: Optional[int] = None,
+        max_memory_bytes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Download several blobs concurrently, keeping them in memory while they fit.
+        
+        Blobs are read into memory until the combined size would exceed
+        max_memory_bytes; blobs that do not fit are streamed to temporary files
+        instead. Concurrency, retries and fail-fast behaviour match
+        download_many_to_temp.
+        
+        Args:
+            blob_paths_or_urls: Absolute URLs or relative blob paths
+            subdir: Optional subdirectory under temp_dir (for spilled blobs)
+            container_name: Optional container name override (if None, uses instance container_name)
+            timeout: Per-download timeout in seconds (default: 300)
+            max_concurrency: Max downloads in flight (default: settings.blob_download_max_concurrency)
+            max_memory_bytes: Combined in-memory budget (default: settings.pipeline_in_memory_max_bytes)
+        
+        Returns:
+            List of metadata dicts in input order. Each has either 'data' (bytes, with
+            local_path None) or 'local_path' (spilled to disk, with data None), plus
+            size_bytes, etag, content_type and blob_url.
+        
+        Raises:
+            BlobStorageError: On the first download that fails
+        """
+        if not blob_paths_or_urls:
+            return []
+        
+        max_concurrency = max(1, max_concurrency or settings.blob_download_max_concurrency)
+        if max_memory_bytes is None:
+            max_memory_bytes = settings.pipeline_in_memory_max_bytes
+        
+        budget_lock = threading.Lock()
+        budget = {'used': 0}
+        
+        def _reserve(size: int) -> bool:
+            with budget_lock:
+                if budget['used'] + size > max_memory_bytes:
+                    return False
+                budget['used'] += size
+                return True
+        
+        def _release(size: int) -> None:
+            with budget_lock:
+                budget['used'] -= size
+        
+        reserved: Set[Path] = set()
+        local_paths = []
+        for blob_path_or_url in blob_paths_or_urls:
+            local_path = self._unique_temp_path(blob_path_or_url, subdir, reserved)
+            reserved.add(local_path)
+            local_paths.append(local_path)
+        
+        def _fetch(blob_path_or_url: str, local_path: Path) -> Dict[str, Any]:
+            def _download():
+                blob_client = self._get_blob_client(blob_path_or_url, container_name=container_name)
+                download_stream = blob_client.download_blob(timeout=timeout)
+                properties = download_stream.properties
+                size = download_stream.size
+                result = {
+                    'data': None,
+                    'local_path': None,
+                    'size_bytes': size,
+                    'etag': properties.etag,
+                    'content_type': properties.content_settings.content_type if properties.content_settings else None,
+                    'blob_url': self.resolve_blob_url(blob_path_or_url, container_name=container_name),
+                }
+                
+                if _reserve(size):
+                    try:
+                        result['data'] = download_stream.readall()
+                    except BaseException:
+                        _release(size)
+                        raise
+                else:
+                    # Over the memory budget - stream this blob to a temp file
+                    local_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(local_path, 'wb') as f:
+                        download_stream.readinto(f)
+                    result['local_path'] = str(local_path)
+                return result
+            
+            try:
+                result = self._retry_on_transient_failure(_download)
+                logger.info(
+                    f"Downloaded blob '{blob_path_or_url}' ({result['size_bytes']} bytes) "
+                    f"{'to memory' if result['data'] is not None else 'to ' + result['local_path']}"
+                )
+                return result
+            except Exception as e:
+                logger.error(f"Failed to download blob '{blob_path_or_url}': {e}", exc_info=True)
+                self._remove_files([local_path])
+                raise BlobStorageError(f"Failed to download blob: {e}") from e
+        
+        calls = [
+            (lambda b=blob_path_or_url, p=local_path: _fetch(b, p))
+            for blob_path_or_url, local_path in zip(blob_paths_or_urls, local_paths)
+        ]
+        return self._run_bounded(
+            calls,
+            max_concurrency,
+            thread_name_prefix="blob-download",
+            on_abort=lambda completed: self._remove_files(
+                r['local_path'] for r in completed if r['local_path']
+            )
+        )
+    
+    def upload_pages(
+        self,
+        pages: List[Dict[str, Any]],
+        container_name: Optional[str] = None,
+        overwrite: bool = True,
+        timeout: int = 300,
+        max_concurrency: Optional[int] = None,
+        on_uploaded: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Upload split page files concurrently.
+        
+        At most max_concurrency uploads are in flight. Each upload keeps the
+        transient-failure retries of upload_file; the first upload that still fails
+        stops the batch (uploads not yet started are cancelled) and the error is raised.
+        
+        Args:
+            pages: Dicts with page_number, dest_blob_path, optional content_type, optional
+                sha256 (stored as blob metadata) and either local_path or data (bytes of a
+                page kept in memory)
+            container_name: Optional container name override (if None, uses instance container_name)
+            overwrite: Whether to overwrite existing blobs (default: True)
+            timeout: Per-upload timeout in seconds (default: 300)
+            max_concurrency: Max uploads in flight (default: settings.blob_upload_max_concurrency)
+            on_uploaded: Called with (page, upload metadata) as each page finishes
+                (from the upload thread), e.g. to checkpoint progress
+            
+        Returns:
+            Dict of page_number -> upload metadata (same as upload_file)
+            
+        Raises:
+            BlobStorageError: On the first upload that fails
+        """
+        if not pages:
+            return {}
+        
+        max_concurrency = max(1, max_concurrency or settings.blob_upload_max_concurrency)
+        
+        def _upload_page(page: Dict[str, Any]) -> Dict[str, Any]:
+            extra = {'metadata': {'sha256': page['sha256']}} if page.get('sha256') else {}
+            if page.get('data') is not None:
+                result = self.upload_bytes(
+                    data=page['data'],
+                    dest_blob_path=page['dest_blob_path'],
+                    container_name=container_name,
+                    overwrite=overwrite,
+                    content_type=page.get('content_type'),
+                    timeout=timeout,
+                    **extra
+                )
+            else:
+                result = self.upload_file(
+                    local_path=page['local_path'],
+                    dest_blob_path=page['dest_blob_path'],
+                    container_name=container_name,
+                    overwrite=overwrite,
+                    content_type=page.get('content_type'),
+                    timeout=timeout,
+                    **extra
+                )
+            if on_uploaded:
+                on_uploaded(page, result)
+            return result
+        
+        calls = [lambda page=page: _upload_page(page) for page in pages]
+        results = self._run_bounded(calls, max_concurrency, thread_name_prefix="blob-upload")
+        return {page['page_number']: result for page, result in zip(pages, results)}
+    
+    def find_unchanged_pages(
+        self,
+        pages: List[Dict[str, Any]],
+        container_name: Optional[str] = None,
+        max_concurrency: Optional[int] = None
+    ) -> Set[int]:
+        """
+        Find pages whose blob already exists with the same content hash.
+        
+        Compares each page's sha256 with the sha256 metadata written by upload_pages
+        (one properties request per page, at most max_concurrency in flight). Blobs that
+        are missing, carry no hash or cannot be checked count as changed.
+        
+        Args:
+            pages: Dicts with page_number, dest_blob_path and sha256
+            container_name: Optional container name override (if None, uses instance container_name)
+            max_concurrency: Max requests in flight (default: settings.blob_upload_max_concurrency)
+            
+        Returns:
+            Page numbers that do not need to be uploaded again
+        """
+        pages = [page for page in pages if page.get('sha256')]
+        if not pages:
+            return set()
+        
+        def _stored_sha256(page: Dict[str, Any]) -> Optional[str]:
+            try:
+                properties = self.get_properties(page['dest_blob_path'], container_name=container_name)
+            except BlobStorageError as e:
+                logger.debug(f"Page blob '{page['dest_blob_path']}' not reusable: {e}")
+                return None
+            return (properties.get('metadata') or {}).get('sha256')
+        
+        max_concurrency = max(1, max_concurrency or settings.blob_upload_max_concurrency)
+        stored = self._run_bounded(
+            [lambda page=page: _stored_sha256(page) for page in pages],
+            max_concurrency,
+            thread_name_prefix="blob-check"
+        )
+        return {
+            page['page_number'] for page, sha256 in zip(pages, stored)
+            if sha256 == page['sha256']
+        }
+    
+    @staticmethod
+    def _run_bounded(
+        calls: List[Callable[[], Any]],
+        max_concurrency: int,
+        thread_name_prefix: str = "blob-io",
+        on_abort: Optional[Callable[[List[Any]], None]] = None
+    ) -> List[Any]:
+        """
+        Run blob operations with at most max_concurrency in flight, failing fast.
+        
+        Args:
+            calls: Zero-argument callables (one per blob operation)
+            max_concurrency: Max operations in flight (1 = sequential in the calling thread)
+            thread_name_prefix: Worker thread name prefix
+            on_abort: Called with the results of operations that completed before a failure
+            
+        Returns:
+            Results in the order of calls
+        """
+        if max_concurrency == 1 or len(calls) == 1:
+            results = []
+            try:
+                for call in calls:
+                    results.append(call())
+            except Exception:
+                if on_abort:
+                    on_abort(results)
+                raise
+            return results
+        
+        executor = ThreadPoolExecutor(
+            max_workers=min(max_concurrency, len(calls)),
+            thread_name_prefix=thread_name_prefix
+        )
+        futures = [executor.submit(call) for call in calls]
+        try:
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = next((f for f in futures if f in done and f.exception() is not None), None)
+            if failed is not None:
+                # Fail fast: don't start queued operations, let running ones finish
+                executor.shutdown(wait=True, cancel_futures=True)
+                if on_abort:
+                    on_abort([
+                        f.result() for f in futures
+                        if f.done() and not f.cancelled() and f.exception() is None
+                    ])
+                raise failed.exception()
+            return [f.result() for f in futures]
+        finally:
+            executor.shutdown(wait=False)
+    
+    def _unique_temp_path(self, blob_path_or_url: str, subdir: Optional[str] = None, reserved: Optional[Set[Path]] = None) -> Path:
+        """
+        Build a temp file path for a blob that does not collide with existing or reserved paths.
+        
+        Args:
+            blob_path_or_url: Absolute URL or relative blob path
+            subdir: Optional subdirectory under temp_dir
+            reserved: Paths already assigned but not yet written
+            
+        Returns:
+            Unused local path
+        """
         # Create subdirectory if specified
         if subdir:
             temp_path = self.temp_dir / subdir
@@ -468,15 +818,23 @@ class BlobStorageClient:
             blob_name = hashlib.md5(blob_path_or_url.encode()).hexdigest() + '.tmp'
         
         # Ensure unique filename
+        reserved = reserved or set()
         local_path = temp_path / blob_name
         counter = 1
-        while local_path.exists():
-            stem = local_path.stem
-            suffix = local_path.suffix
-            local_path = temp_path / f"{stem}_{counter}{suffix}"
+        while local_path.exists() or local_path in reserved:
+            local_path = temp_path / f"{Path(blob_name).stem}_{counter}{Path(blob_name).suffix}"
             counter += 1
         
-        return self.download_to_file(blob_path_or_url, str(local_path), container_name=container_name, timeout=timeout)
+        return local_path
+    
+    @staticmethod
+    def _remove_files(paths) -> None:
+        """Best-effort removal of local files written by a failed batch"""
+        for path in paths:
+            try:
+                Path(path).unlink(missing_ok=True)
+            except Exception:
+                pass
     
     def upload_file(
         self,
@@ -485,7 +843,8 @@ class BlobStorageClient:
         container_name: Optional[str] = None,
         overwrite: bool = True,
         content_type: Optional[str] = None,
-        timeout: int = 300
+        timeout: int = 300,
+        metadata: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """
         Upload local file to blob storage.
@@ -497,6 +856,7 @@ class BlobStorageClient:
             overwrite: Whether to overwrite if blob exists (default: True)
             content_type: Content type for blob (auto-detected if not provided)
             timeout: Upload timeout in seconds (default: 300)
+            metadata: Optional blob metadata (e.g. {'sha256': ...})
             
         Returns:
             Dict with metadata:
@@ -514,6 +874,74 @@ class BlobStorageClient:
         if not local_path_obj.exists():
             raise BlobStorageError(f"Local file does not exist: {local_path}")
         
+        return self._upload(
+            open_data=lambda: open(local_path, 'rb'),
+            size_bytes=local_path_obj.stat().st_size,
+            source_label=f"file '{local_path}'",
+            name_hint=local_path,
+            dest_blob_path=dest_blob_path,
+            container_name=container_name,
+            overwrite=overwrite,
+            content_type=content_type,
+            timeout=timeout,
+            metadata=metadata
+        )
+    
+    def upload_bytes(
+        self,
+        data: bytes,
+        dest_blob_path: str,
+        container_name: Optional[str] = None,
+        overwrite: bool = True,
+        content_type: Optional[str] = None,
+        timeout: int = 300,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload an in-memory buffer to blob storage (no temp file).
+        
+        Args:
+            data: Bytes to upload
+            dest_blob_path: Destination blob path (relative to container)
+            container_name: Optional container name override (if None, uses instance container_name)
+            overwrite: Whether to overwrite if blob exists (default: True)
+            content_type: Content type for blob (auto-detected from dest_blob_path if not provided)
+            timeout: Upload timeout in seconds (default: 300)
+            metadata: Optional blob metadata (e.g. {'sha256': ...})
+            
+        Returns:
+            Dict with metadata (same as upload_file)
+            
+        Raises:
+            RuntimeError: If attempting to upload to SOURCE container
+        """
+        return self._upload(
+            open_data=lambda: io.BytesIO(data),
+            size_bytes=len(data),
+            source_label=f"buffer ({len(data)} bytes)",
+            name_hint=dest_blob_path,
+            dest_blob_path=dest_blob_path,
+            container_name=container_name,
+            overwrite=overwrite,
+            content_type=content_type,
+            timeout=timeout,
+            metadata=metadata
+        )
+    
+    def _upload(
+        self,
+        open_data: Callable[[], Any],
+        size_bytes: int,
+        source_label: str,
+        name_hint: str,
+        dest_blob_path: str,
+        container_name: Optional[str],
+        overwrite: bool,
+        content_type: Optional[str],
+        timeout: int,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Upload a file or buffer to the DEST container (shared by upload_file/upload_bytes)"""
         # Remove leading slash from dest_blob_path
         dest_blob_path = dest_blob_path.lstrip('/')
         
@@ -534,7 +962,7 @@ class BlobStorageClient:
             )
         
         logger.info(
-            f"Uploading file '{local_path}' to DEST container '{target_container}': blob '{dest_blob_path}'"
+            f"Uploading {source_label} to DEST container '{target_container}': blob '{dest_blob_path}'"
         )
         
         def _upload():
@@ -544,39 +972,37 @@ class BlobStorageClient:
             detected_content_type = content_type
             if not detected_content_type:
                 import mimetypes
-                detected_content_type, _ = mimetypes.guess_type(local_path)
+                detected_content_type, _ = mimetypes.guess_type(name_hint)
                 if not detected_content_type:
                     detected_content_type = 'application/octet-stream'
             
-            # Upload file
-            with open(local_path, 'rb') as f:
-                blob_client.upload_blob(
+            # Upload (the response carries the new ETag - no separate properties round trip)
+            with open_data() as f:
+                upload_response = blob_client.upload_blob(
                     data=f,
                     overwrite=overwrite,
                     content_settings=ContentSettings(content_type=detected_content_type),
+                    metadata=metadata,
                     timeout=timeout
                 )
             
-            # Get blob properties
-            properties = blob_client.get_blob_properties()
-            
             return {
                 'blob_url': self.resolve_blob_url(dest_blob_path, container_name=target_container),
                 'blob_path': dest_blob_path,
-                'etag': properties.etag,
-                'size_bytes': local_path_obj.stat().st_size,
+                'etag': upload_response.get('etag') if upload_response else None,
+                'size_bytes': size_bytes,
                 'content_type': detected_content_type,
             }
         
         try:
             result = self._retry_on_transient_failure(_upload)
             logger.info(
-                f"Successfully uploaded file '{local_path}' "
+                f"Successfully uploaded {source_label} "
                 f"({result['size_bytes']} bytes) to blob '{dest_blob_path}'"
             )
             return result
         except Exception as e:
-            logger.error(f"Failed to upload file '{local_path}': {e}", exc_info=True)
+            logger.error(f"Failed to upload {source_label}: {e}", exc_info=True)
             raise BlobStorageError(f"Failed to upload file: {e}") from e
     
     def exists(self, blob_path_or_url: str, container_name: Optional[str] = None) -> bool:
@@ -625,6 +1051,7 @@ class BlobStorageClient:
                 - size_bytes: File size in bytes
                 - content_type: Content type
                 - last_modified: Last modified timestamp
+                - metadata: User-defined blob metadata
         """
         logger.debug(f"Getting properties for blob: '{blob_path_or_url}'")
         
@@ -637,6 +1064,7 @@ class BlobStorageClient:
                 'size_bytes': properties.size,
                 'content_type': properties.content_settings.content_type if properties.content_settings else None,
                 'last_modified': properties.last_modified.isoformat() if properties.last_modified else None,
+                'metadata': dict(properties.metadata or {}),
             }
         
         try:
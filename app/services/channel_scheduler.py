@@ -0,0 +1,144 @@
+"""
+Channel Fair Scheduler
+Weighted fair scheduling of integration_inbox jobs across channel lanes.
+
+Channels have very different processing costs: Genzeon Portal skips OCR, while
+ESMD and Genzeon Fax run the full download/merge/split/OCR pipeline, and UTN
+events are small status updates. Each lane gets a share of the worker pool
+proportional to its weight and is capped at its own max concurrency, so a burst
+of expensive packets cannot block cheap work behind it.
+"""
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from app.models.channel_type import ChannelType
+
+logger = logging.getLogger(__name__)
+
+LANE_UTN = 'utn'
+LANE_PORTAL = 'portal'
+LANE_FAX = 'fax'
+LANE_ESMD = 'esmd'
+
+LANES = [LANE_UTN, LANE_PORTAL, LANE_FAX, LANE_ESMD]
+
+# SQL predicates selecting each lane's rows in service_ops.integration_inbox.
+# NULL message_type_id is intake (type 1); NULL or unknown channel_type_id is processed as ESMD.
+INBOX_LANE_FILTERS = {
+    LANE_UTN: "message_type_id IN (2, 3)",
+    LANE_PORTAL: "COALESCE(message_type_id, 1) NOT IN (2, 3) AND channel_type_id = 1",
+    LANE_FAX: "COALESCE(message_type_id, 1) NOT IN (2, 3) AND channel_type_id = 2",
+    LANE_ESMD: "COALESCE(message_type_id, 1) NOT IN (2, 3) AND COALESCE(channel_type_id, 3) NOT IN (1, 2)",
+}
+
+
+def lane_for_job(job: Dict[str, Any]) -> str:
+    """
+    Scheduling lane of a claimed inbox job (mirrors INBOX_LANE_FILTERS)
+
+    Args:
+        job: Job dict with channel_type_id and message_type_id
+
+    Returns:
+        Lane name
+    """
+    if job.get('message_type_id') in (2, 3):
+        return LANE_UTN
+    channel_type_id = job.get('channel_type_id')
+    if channel_type_id == ChannelType.GENZEON_PORTAL:
+        return LANE_PORTAL
+    if channel_type_id == ChannelType.GENZEON_FAX:
+        return LANE_FAX
+    return LANE_ESMD
+
+
+def parse_lane_values(value: Optional[str], default: float) -> Dict[str, float]:
+    """
+    Parse a "lane:value,lane:value" setting; lanes not listed get the default
+
+    Args:
+        value: Setting string, e.g. "utn:4,portal:3,fax:1,esmd:1"
+        default: Value for lanes that are not listed
+
+    Returns:
+        Dict of lane -> value for every known lane
+    """
+    parsed = {lane: default for lane in LANES}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        try:
+            lane, raw = item.split(":", 1)
+            lane = lane.strip().lower()
+            if lane not in parsed:
+                logger.warning(f"Ignoring unknown scheduling lane '{lane}' (known lanes: {LANES})")
+                continue
+            parsed[lane] = float(raw)
+        except ValueError:
+            logger.warning(f"Ignoring invalid scheduling lane setting '{item}' (expected lane:value)")
+    return parsed
+
+
+class ChannelFairScheduler:
+    """
+    Plans how many jobs each lane may claim when worker slots free up.
+
+    Every lane that has capacity and may still have backlog is offered up to
+    min(cap - in_flight, free_slots) rows. The claim query then fills free slots
+    in weighted fair order (lane finish tag = (in_flight + rank) / weight), so lanes
+    without backlog give their share to the others.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, caps: Optional[Dict[str, float]] = None):
+        """
+        Initialize scheduler
+
+        Args:
+            weights: Relative share per lane (default: all 1)
+            caps: Max concurrent jobs per lane (default: unbounded)
+        """
+        self.weights = {lane: max(0.001, float((weights or {}).get(lane, 1))) for lane in LANES}
+        self.caps = {lane: int((caps or {}).get(lane, 1_000_000)) for lane in LANES}
+
+    @classmethod
+    def from_settings(cls, settings) -> "ChannelFairScheduler":
+        """Build scheduler from INBOX_LANE_WEIGHTS / INBOX_LANE_MAX_CONCURRENCY"""
+        return cls(
+            weights=parse_lane_values(settings.inbox_lane_weights, 1.0),
+            caps=parse_lane_values(settings.inbox_lane_max_concurrency, 1_000_000)
+        )
+
+    def plan(
+        self,
+        free_slots: int,
+        in_flight_by_lane: Dict[str, int],
+        exhausted_lanes: Iterable[str] = ()
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Compute per-lane claim offers for the next claim
+
+        Args:
+            free_slots: Free worker slots in the pool
+            in_flight_by_lane: Jobs currently running per lane
+            exhausted_lanes: Lanes found empty in this drain since new jobs were last signalled
+
+        Returns:
+            Dict of lane -> {'quota', 'weight', 'in_flight'} for lanes that may claim
+        """
+        if free_slots <= 0:
+            return {}
+
+        exhausted = set(exhausted_lanes)
+        plan = {}
+        for lane in LANES:
+            if lane in exhausted:
+                continue
+            in_flight = in_flight_by_lane.get(lane, 0)
+            quota = min(self.caps[lane] - in_flight, free_slots)
+            if quota > 0:
+                plan[lane] = {
+                    'quota': quota,
+                    'weight': self.weights[lane],
+                    'in_flight': in_flight
+                }
+        return plan
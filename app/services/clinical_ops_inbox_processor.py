@@ -22,6 +22,8 @@ from app.services.db import SessionLocal
 from app.models.packet_db import PacketDB
 from app.models.document_db import PacketDocumentDB
 from app.models.packet_decision_db import PacketDecisionDB
+from app.services.db_notification_listener import get_notification_listener
+from app.services.http_client import RetryPolicy, get_http_client, http_timeout
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -37,12 +39,16 @@ class ClinicalOpsInboxProcessor:
     3. Processes Phase 2 results (json_sent_to_integration IS NOT NULL)
     
     All workers run the processor. Database-level locking prevents duplicate processing.
+    
+    When database notifications are enabled, the processor wakes on NOTIFY from
+    decision writes to service_ops.send_serviceops and the timed poll becomes a slow safety sweep.
     """
     
     def __init__(self):
         self.is_running = False
         self.poll_task: Optional[asyncio.Task] = None
         self.worker_id = f"clinical-ops-worker-{uuid.uuid4()}"
+        self.notify_event: Optional[asyncio.Event] = None
         self.poll_interval_seconds = getattr(settings, 'clinical_ops_poll_interval_seconds', 120)  # Default 120s (2 min)
         self.batch_size = getattr(settings, 'clinical_ops_poll_batch_size', 10)  # Default 10 (clinical ops is lighter load than integration inbox)
         self.processing_delay_seconds = getattr(settings, 'clinical_ops_processing_delay_seconds', 5.0)  # Delay between messages
@@ -62,6 +68,17 @@ class ClinicalOpsInboxProcessor:
             logger.warning("JSON_GENERATOR_BASE_URL not configured - Phase 2 triggering will fail")
         
         self.is_running = True
+        
+        # Subscribe to decision notifications before the first poll so nothing is missed
+        if getattr(settings, 'db_notify_enabled', False):
+            try:
+                listener = get_notification_listener()
+                self.notify_event = listener.subscribe(settings.db_notify_clinical_ops_channel)
+                await listener.start()
+            except Exception as e:
+                logger.warning(f"Failed to start ClinicalOps notification listener, using timed polling only: {e}")
+                self.notify_event = None
+        
         self.poll_task = asyncio.create_task(self._poll_loop())
         
         # Add exception handler to prevent unhandled exceptions from crashing the worker
@@ -102,14 +119,40 @@ class ClinicalOpsInboxProcessor:
             except asyncio.CancelledError:
                 pass
         
+        if self.notify_event is not None:
+            listener = get_notification_listener()
+            listener.unsubscribe(settings.db_notify_clinical_ops_channel, self.notify_event)
+            self.notify_event = None
+            if not listener.get_status()["channels"]:
+                await listener.stop()
+        
         logger.info("ClinicalOps inbox processor stopped")
     
+    async def _wait_for_next_cycle(self):
+        """
+        Wait until the next poll cycle.
+        
+        While the notification listener is connected, wake on NOTIFY (debounced to
+        coalesce bursts) or after the safety sweep interval. Otherwise fall back to
+        the regular poll interval.
+        """
+        listener = get_notification_listener()
+        if self.notify_event is not None and listener.is_connected:
+            woke = await listener.wait(self.notify_event, settings.clinical_ops_sweep_interval_seconds)
+            if woke:
+                logger.debug("ClinicalOps inbox processor woken by database notification")
+                await asyncio.sleep(settings.db_notify_debounce_seconds)
+                self.notify_event.clear()
+            return
+        
+        await asyncio.sleep(self.poll_interval_seconds)
+    
     async def _poll_loop(self):
         """Main polling loop"""
         while self.is_running:
             try:
                 await self._poll_and_process()
-                await asyncio.sleep(self.poll_interval_seconds)
+                await self._wait_for_next_cycle()
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -758,13 +801,9 @@ class ClinicalOpsInboxProcessor:
         max_retries = getattr(settings, 'json_generator_max_retries', 3)
         retry_base_seconds = getattr(settings, 'json_generator_retry_base_seconds', 2.0)
         
-        # Use httpx.Timeout with separate connect and read timeouts for better control
-        timeout = httpx.Timeout(
-            connect=connect_timeout_seconds,  # Time to establish connection
-            read=timeout_seconds,  # Time to read response
-            write=30.0,  # Time to write request
-            pool=30.0  # Time to get connection from pool
-        )
+        # Separate connect and read timeouts for better control
+        timeout = http_timeout(timeout_seconds, connect_seconds=connect_timeout_seconds)
+        retry_policy = RetryPolicy(max_attempts=max_retries, base_seconds=retry_base_seconds)
         
         last_exception = None
         
@@ -776,21 +815,21 @@ class ClinicalOpsInboxProcessor:
                     f"Attempt {attempt + 1}/{max_retries}"
                 )
                 
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    response = await client.post(
-                        endpoint,
-                        json={"decision_tracking_id": decision_tracking_id},
-                        headers={"Content-Type": "application/json"}
-                    )
-                    response.raise_for_status()
-                    
-                    result = response.json()
-                    logger.info(
-                        f"Successfully called JSON Generator Phase 2 for decision_tracking_id={decision_tracking_id} | "
-                        f"status={result.get('status')}"
-                    )
-                    return True
-                    
+                response = await get_http_client().post(
+                    endpoint,
+                    json={"decision_tracking_id": decision_tracking_id},
+                    headers={"Content-Type": "application/json"},
+                    timeout=timeout
+                )
+                response.raise_for_status()
+                
+                result = response.json()
+                logger.info(
+                    f"Successfully called JSON Generator Phase 2 for decision_tracking_id={decision_tracking_id} | "
+                    f"status={result.get('status')}"
+                )
+                return True
+            
             except httpx.ConnectTimeout as e:
                 last_exception = e
                 logger.warning(
@@ -817,14 +856,14 @@ class ClinicalOpsInboxProcessor:
                 )
             except httpx.HTTPStatusError as e:
                 # Check if it's a retryable error (5xx server errors)
-                if e.response.status_code >= 500:
+                if retry_policy.is_retryable_status(e.response.status_code):
                     last_exception = e
                     logger.warning(
                         f"JSON Generator Phase 2 server error ({e.response.status_code}) for decision_tracking_id={decision_tracking_id} | "
                         f"Attempt {attempt + 1}/{max_retries}: {e.response.text[:200]}"
                     )
                 else:
-                    # 4xx client errors - don't retry
+                    # 4xx client errors (and non-transient 5xx) - don't retry
                     logger.error(
                         f"JSON Generator Phase 2 returned client error for decision_tracking_id={decision_tracking_id}: "
                         f"status={e.response.status_code}, response={e.response.text[:200]}"
@@ -838,8 +877,8 @@ class ClinicalOpsInboxProcessor:
                 )
             
             # Exponential backoff before retry (except on last attempt)
-            if attempt < max_retries - 1:
-                delay = retry_base_seconds * (2 ** attempt)
+            if retry_policy.has_attempts_left(attempt + 1):
+                delay = retry_policy.delay_seconds(attempt + 1)
                 logger.info(
                     f"Retrying JSON Generator Phase 2 for decision_tracking_id={decision_tracking_id} "
                     f"after {delay}s (exponential backoff)..."
@@ -0,0 +1,165 @@
+"""
+Coversheet Ranker
+Cheap local pre-ranking of split pages by how likely each is to be the coversheet.
+
+OCR walks pages until one passes the coversheet thresholds, and only a few OCR attempts
+are made per packet. When the coversheet is not among the first pages, OCR is spent on
+cover letters and clinical notes and the coversheet may never be read. Before OCR,
+each candidate page is scored from its PDF text layer and layout with PyMuPDF
+(milliseconds per page, no OCR call):
+- coversheet labels (beneficiary, Medicare ID, NPI, HCPCS, ...) and titles
+  ("Prior Authorization Request", "Medicare Part A/B", ...)
+- form-like structure: AcroForm widgets, "Label:" lines, ruled boxes and lines
+- long running prose (letters, clinical notes) lowers the score
+
+Pages are then OCR'd in descending score order. Scanned pages without a text layer
+score 0, and ties keep page order, so packets without usable text are OCR'd in page
+order exactly as before.
+"""
+import logging
+import re
+from typing import List, Optional, Sequence
+
+from app.services.document_splitter import SplitPage
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+logger = logging.getLogger(__name__)
+
+# Phrases that title a coversheet
+COVERSHEET_TITLES = (
+    "prior authorization request",
+    "prior auth request",
+    "coversheet",
+    "cover sheet",
+    "medicare part a",
+    "medicare part b",
+)
+
+# Field labels printed on coversheets (matched case-insensitively, each counted once)
+COVERSHEET_LABELS = (
+    "beneficiary",
+    "medicare id",
+    "mbi",
+    "date of birth",
+    "npi",
+    "ptan",
+    "hcpcs",
+    "procedure code",
+    "diagnosis code",
+    "icd-10",
+    "attending physician",
+    "facility provider",
+    "rendering provider",
+    "requester",
+    "submission type",
+    "anticipated date of service",
+    "expedited",
+    "resubmission",
+    "unique tracking number",
+)
+
+TITLE_WEIGHT = 25.0
+LABEL_WEIGHT = 10.0
+WIDGET_WEIGHT = 2.0
+LABEL_LINE_WEIGHT = 1.5
+DRAWING_WEIGHT = 0.25
+# Caps keep one feature from dominating (a dense form still needs coversheet labels to rank first)
+MAX_WIDGETS = 30
+MAX_LABEL_LINES = 30
+MAX_DRAWINGS = 80
+# Words beyond this count as running prose
+PROSE_WORDS = 400
+PROSE_PENALTY_PER_100_WORDS = 5.0
+
+_LABEL_LINE = re.compile(r"^\s*[A-Za-z][A-Za-z0-9 /#&().'-]{1,40}:", re.MULTILINE)
+_LABEL_PATTERNS = tuple(re.compile(r"\b" + re.escape(label) + r"\b") for label in COVERSHEET_LABELS)
+
+
+def score_page_text(text: str) -> float:
+    """
+    Score a page's text for coversheet titles, labels, "Label:" lines and prose length
+
+    Args:
+        text: Page text (any case)
+
+    Returns:
+        Score (0 for an empty page; higher is more coversheet-like)
+    """
+    if not text or not text.strip():
+        return 0.0
+    lowered = text.lower()
+    score = TITLE_WEIGHT * sum(1 for title in COVERSHEET_TITLES if title in lowered)
+    score += LABEL_WEIGHT * sum(1 for pattern in _LABEL_PATTERNS if pattern.search(lowered))
+    score += LABEL_LINE_WEIGHT * min(len(_LABEL_LINE.findall(text)), MAX_LABEL_LINES)
+    words = len(lowered.split())
+    if words > PROSE_WORDS:
+        score -= PROSE_PENALTY_PER_100_WORDS * (words - PROSE_WORDS) / 100
+    return score
+
+
+class CoversheetRanker:
+    """
+    Orders split pages by local coversheet likelihood before OCR.
+    """
+
+    def score_page(self, page: SplitPage) -> Optional[float]:
+        """
+        Score one split page from its PDF text layer and layout
+
+        Args:
+            page: Split page (read from local_path, or from content for in-memory pages)
+
+        Returns:
+            Score, or None if the page cannot be read
+        """
+        if fitz is None:
+            return None
+        content = getattr(page, 'content', None)
+        try:
+            if content is not None:
+                doc = fitz.open(stream=content, filetype="pdf")
+            elif page.local_path:
+                doc = fitz.open(page.local_path)
+            else:
+                return None
+            with doc:
+                if len(doc) == 0:
+                    return 0.0
+                pdf_page = doc[0]
+                score = score_page_text(pdf_page.get_text("text"))
+                score += WIDGET_WEIGHT * min(sum(1 for _ in pdf_page.widgets()), MAX_WIDGETS)
+                score += DRAWING_WEIGHT * min(len(pdf_page.get_drawings()), MAX_DRAWINGS)
+                return score
+        except Exception as e:
+            logger.debug(f"Could not score page {page.page_number} for coversheet pre-ranking: {e}")
+            return None
+
+    def rank_pages(self, pages: Sequence[SplitPage]) -> List[SplitPage]:
+        """
+        Order pages by descending coversheet score (stable: ties keep page order)
+
+        Pages that cannot be read go last, in page order.
+
+        Args:
+            pages: Candidate pages in page order
+
+        Returns:
+            The same pages, most likely coversheet first
+        """
+        scored = []
+        for index, page in enumerate(pages):
+            score = self.score_page(page)
+            scored.append((score is None, -(score or 0.0), index, page))
+        scored.sort(key=lambda entry: entry[:3])
+        ranked = [entry[3] for entry in scored]
+        if [page.page_number for page in ranked] != [page.page_number for page in pages]:
+            logger.info(
+                "Coversheet pre-ranking: OCR order "
+                + ", ".join(f"{page.page_number} ({-neg:.0f})" for _, neg, _, page in scored[:5])
+                + (" ..." if len(scored) > 5 else "")
+            )
+        return ranked
@@ -0,0 +1,185 @@
+"""
+CPU Pool
+Process pool for CPU-bound PDF and image work.
+
+TIFF frame decoding, page rasterization (flattening) and text rendering hold the GIL
+when they run on executor threads, which stalls API requests and background tasks
+in the same worker process. These tasks are dispatched to a small pool of worker
+processes instead.
+
+The pool is bounded: at most workers + max_queue tasks are submitted at once and
+callers block while it is full (backpressure), so a burst of large faxes queues in
+the calling threads instead of piling up pickled page data in the pool.
+
+Tasks must be picklable module-level functions taking and returning plain data
+(bytes, ints, strings). With CPU_POOL_WORKERS=0 tasks run in the calling thread.
+"""
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CpuPool:
+    """
+    Bounded process pool shared by all document processors in this process.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int = 8):
+        """
+        Initialize pool (worker processes start on first use)
+
+        Args:
+            max_workers: Worker processes (0 = run tasks in the calling thread)
+            max_queue: Tasks allowed to wait for a free worker
+        """
+        self.max_workers = max(0, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.max_in_flight = self.max_workers + self.max_queue
+        self._slots = threading.BoundedSemaphore(max(1, self.max_in_flight))
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._completed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs DB/blob/HTTP threads is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"CPU pool started: workers={self.max_workers}, max_queue={self.max_queue}")
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken executor so the next task starts fresh workers"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, fn: Callable, *args: Any) -> Future:
+        """
+        Submit a task (blocks while the pool is full)
+
+        Args:
+            fn: Picklable module-level function
+            *args: Picklable arguments
+
+        Returns:
+            Future with the task result
+        """
+        if not self.enabled:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+
+        self._slots.acquire()
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM on a huge page) - restart the pool once
+                logger.warning("CPU pool is broken - restarting worker processes")
+                self._discard_executor(executor)
+                future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_flight += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._slots.release()
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            executor = self._executor
+            if executor is not None:
+                self._discard_executor(executor)
+
+    def run(self, fn: Callable, *args: Any) -> Any:
+        """Run one task and wait for its result"""
+        return self.submit(fn, *args).result()
+
+    def imap(self, fn: Callable, arg_tuples: Iterable[Tuple]) -> Iterator[Any]:
+        """
+        Run fn over arg_tuples, yielding results in input order.
+
+        Keeps at most max_in_flight of this caller's tasks submitted, so results
+        waiting to be consumed stay bounded. arg_tuples is consumed lazily.
+        """
+        window = max(1, self.max_in_flight)
+        pending = deque()
+        try:
+            for args in arg_tuples:
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+                pending.append(self.submit(fn, *args))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def get_status(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'in_flight': self._in_flight,
+                'completed': self._completed
+            }
+
+    def shutdown(self) -> None:
+        """Stop worker processes (running tasks finish, queued tasks are cancelled)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+            logger.info("CPU pool stopped")
+
+
+# Global pool instance (shared by all processors in this process)
+_cpu_pool: Optional[CpuPool] = None
+_cpu_pool_lock = threading.Lock()
+
+
+def get_cpu_pool() -> CpuPool:
+    """Get or create the global CPU pool"""
+    global _cpu_pool
+    if _cpu_pool is None:
+        with _cpu_pool_lock:
+            if _cpu_pool is None:
+                _cpu_pool = CpuPool(
+                    max_workers=settings.cpu_pool_workers,
+                    max_queue=settings.cpu_pool_max_queue
+                )
+    return _cpu_pool
+
+
+def shutdown_cpu_pool() -> None:
+    """Stop the global CPU pool's worker processes (application shutdown)"""
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown()
@@ -0,0 +1,256 @@
+"""
+Database Notification Listener
+Wakes background pollers on Postgres NOTIFY instead of waiting for the next timed poll.
+
+Uses one dedicated psycopg2 connection per process (outside the SQLAlchemy pool) in
+autocommit mode, registered with the asyncio event loop via add_reader, so waiting
+for notifications costs no queries and no executor threads.
+
+Notifications are treated as "wake up and poll" signals only. The watermark queries
+in IntegrationInboxService / ClinicalOpsInboxProcessor remain the source of truth, and
+the pollers keep a slow timed safety sweep for anything missed while disconnected.
+Triggers are created by deploy/migrations/031_add_send_serviceops_notify_triggers.sql.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any
+
+import psycopg2
+import psycopg2.extensions
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DbNotificationListener:
+    """
+    Process-wide LISTEN connection that fans notifications out to asyncio.Event subscribers.
+
+    On connect and on reconnect, every subscriber is woken once so a poll cycle runs
+    for anything that arrived while the listener was down.
+    """
+
+    def __init__(self, dsn: Optional[str] = None):
+        """
+        Initialize listener.
+
+        Args:
+            dsn: libpq connection string/URI (derived from the SQLAlchemy engine URL if None)
+        """
+        self._dsn = dsn
+        self._subscribers: Dict[str, List[asyncio.Event]] = {}
+        self._conn = None
+        self._task: Optional[asyncio.Task] = None
+        self._connection_lost: Optional[asyncio.Event] = None
+        self.is_running = False
+        self.is_connected = False
+        self.notifications_received = 0
+        self.last_notification_at: Optional[datetime] = None
+
+    def _get_dsn(self) -> str:
+        """Build a plain libpq URI from the SQLAlchemy engine URL"""
+        if self._dsn:
+            return self._dsn
+        from app.services.db import engine
+        return engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+    def subscribe(self, channel: str) -> asyncio.Event:
+        """
+        Subscribe to a notification channel.
+
+        Args:
+            channel: Postgres NOTIFY channel name
+
+        Returns:
+            asyncio.Event that is set whenever a notification arrives on the channel
+        """
+        event = asyncio.Event()
+        is_new_channel = channel not in self._subscribers
+        self._subscribers.setdefault(channel, []).append(event)
+
+        if is_new_channel and self.is_connected and self._conn is not None:
+            try:
+                self._listen(channel)
+            except Exception as e:
+                logger.warning(f"Failed to LISTEN on new channel '{channel}': {e}")
+
+        return event
+
+    def unsubscribe(self, channel: str, event: asyncio.Event) -> None:
+        """Remove a subscriber event from a channel"""
+        events = self._subscribers.get(channel, [])
+        if event in events:
+            events.remove(event)
+        if not events:
+            self._subscribers.pop(channel, None)
+
+    async def start(self) -> None:
+        """Start the listener task (idempotent)"""
+        if self.is_running:
+            return
+
+        if not settings.db_notify_enabled:
+            logger.info("Database notification listener is disabled in settings")
+            return
+
+        self.is_running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Database notification listener started (channels: {sorted(self._subscribers)})")
+
+    async def stop(self) -> None:
+        """Stop the listener task and close the LISTEN connection"""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        self._disconnect()
+        logger.info("Database notification listener stopped")
+
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        """
+        Wait for a notification or timeout, then clear the event.
+
+        Args:
+            event: Event returned by subscribe()
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if woken by a notification (or reconnect), False on timeout
+        """
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            woke = True
+        except asyncio.TimeoutError:
+            woke = False
+        event.clear()
+        return woke
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get listener status for monitoring"""
+        return {
+            "enabled": settings.db_notify_enabled,
+            "running": self.is_running,
+            "connected": self.is_connected,
+            "channels": sorted(self._subscribers),
+            "notifications_received": self.notifications_received,
+            "last_notification_at": self.last_notification_at.isoformat() if self.last_notification_at else None
+        }
+
+    async def _run(self) -> None:
+        """Connect, LISTEN and stay registered with the event loop; reconnect on failure"""
+        loop = asyncio.get_event_loop()
+
+        while self.is_running:
+            try:
+                await loop.run_in_executor(None, self._connect)
+                self._connection_lost = asyncio.Event()
+                loop.add_reader(self._conn.fileno(), self._on_readable)
+                self.is_connected = True
+                logger.info(f"✅ Listening for database notifications on {sorted(self._subscribers)}")
+
+                # Wake everyone once so anything that arrived while disconnected is polled
+                self._wake_all()
+
+                await self._connection_lost.wait()
+                logger.warning("Database notification connection lost - pollers fall back to timed polling")
+            except asyncio.CancelledError:
+                raise
+            except NotImplementedError:
+                # Event loops without add_reader support (e.g. Windows Proactor) - timed polling only
+                logger.warning("Event loop does not support add_reader - database notifications disabled")
+                self.is_running = False
+                break
+            except Exception as e:
+                logger.warning(f"Database notification listener error: {e}")
+            finally:
+                self._disconnect(loop)
+                # Wake subscribers so they re-evaluate their wait interval (timed fallback)
+                self._wake_all()
+
+            try:
+                await asyncio.sleep(settings.db_notify_reconnect_seconds)
+            except asyncio.CancelledError:
+                raise
+
+    def _connect(self) -> None:
+        """Open the dedicated LISTEN connection (blocking - run in executor)"""
+        conn = psycopg2.connect(
+            self._get_dsn(),
+            connect_timeout=settings.db_connect_args_connect_timeout,
+            keepalives=1,
+            keepalives_idle=30,
+            keepalives_interval=10,
+            keepalives_count=3
+        )
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        self._conn = conn
+        for channel in list(self._subscribers):
+            self._listen(channel)
+
+    def _listen(self, channel: str) -> None:
+        """Issue LISTEN for a channel on the current connection"""
+        with self._conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{channel}"')
+
+    def _disconnect(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Unregister from the event loop and close the connection"""
+        self.is_connected = False
+        conn = self._conn
+        self._conn = None
+        if conn is None:
+            return
+
+        try:
+            (loop or asyncio.get_event_loop()).remove_reader(conn.fileno())
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _on_readable(self) -> None:
+        """Event-loop callback: drain pending notifications and wake subscribers"""
+        try:
+            self._conn.poll()
+        except Exception as e:
+            logger.debug(f"Notification connection poll failed: {e}")
+            if self._connection_lost:
+                self._connection_lost.set()
+            return
+
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            self.notifications_received += 1
+            self.last_notification_at = datetime.now(timezone.utc)
+            logger.debug(f"Database notification: channel={notify.channel}, payload={notify.payload}")
+            for event in self._subscribers.get(notify.channel, []):
+                event.set()
+
+    def _wake_all(self) -> None:
+        """Set every subscriber event"""
+        for events in self._subscribers.values():
+            for event in events:
+                event.set()
+
+
+# Global instance
+_notification_listener: Optional[DbNotificationListener] = None
+
+
+def get_notification_listener() -> DbNotificationListener:
+    """Get or create the global database notification listener instance"""
+    global _notification_listener
+    if _notification_listener is None:
+        _notification_listener = DbNotificationListener()
+    return _notification_listener
@@ -10,8 +10,9 @@ Orchestrates the end-to-end document processing pipeline:
 import logging
 import uuid
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from datetime import datetime, timezone, timedelta, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
@@ -20,16 +21,24 @@ from sqlalchemy.exc import IntegrityError
 
 from app.services.db import get_db_session
 from app.services.payload_parser import PayloadParser
-from app.services.document_splitter import DocumentSplitter, DocumentSplitError, SplitResult
+from app.services.document_splitter import DocumentSplitter, DocumentSplitError, SplitPage, SplitResult
 from app.services.blob_storage import BlobStorageClient, BlobStorageError
-from app.services.ocr_service import OCRService, OCRServiceError
+from app.services.ocr_service import OCRService, OCRServiceError, OCRServiceUnavailableError
 from app.services.coversheet_detector import CoversheetDetector
+from app.services.coversheet_ranker import CoversheetRanker
 from app.services.part_classifier import PartClassifier
 from app.services.pdf_merger import PDFMerger, PDFMergeError
-from app.services.document_processor_resume import check_resume_state, ResumeState, get_page_blob_paths_from_metadata
+from app.services.document_processor_resume import (
+    check_resume_state, ResumeState, get_page_blob_paths_from_metadata, PageUploadCheckpoint
+)
 from app.services.channel_processing_strategy import get_channel_strategy, ChannelProcessingStrategy
+from app.services.pipeline_stages import (
+    get_document_pipeline, PipelineRun,
+    STAGE_DOWNLOAD, STAGE_MERGE, STAGE_UPLOAD, STAGE_SPLIT, STAGE_PAGE_UPLOAD, STAGE_OCR
+)
 from app.models.channel_type import ChannelType
 from app.utils.path_builder import build_consolidated_paths, build_page_blob_path
+from app.utils.sla import normalize_submission_type, calculate_due_date
 from app.models.integration_db import SendServiceOpsDB
 from app.models.packet_db import PacketDB
 from app.models.document_db import PacketDocumentDB
@@ -43,6 +52,18 @@ class DocumentProcessorError(Exception):
     pass
 
 
+class DocumentProcessorDeferredError(DocumentProcessorError):
+    """
+    Processing was parked because a dependency is temporarily unavailable (e.g. the OCR
+    circuit is open). The job should be retried after retry_after_seconds without counting
+    as a failed attempt; it resumes from its last checkpoint.
+    """
+    
+    def __init__(self, message: str, retry_after_seconds: float = 0.0):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
 class DocumentProcessor:
     """
     Orchestrates document processing pipeline from message to database.
@@ -63,18 +84,26 @@ class DocumentProcessor:
     5. Merge all documents into ONE consolidated PDF (in order)
     6. Upload consolidated PDF to DEST container (date-partitioned path)
     7. Split consolidated PDF into per-page PDFs
-    8. Upload each page to DEST container (overwrite=True for REPLACE policy)
+    8. Upload each changed page to DEST container (overwrite=True for REPLACE policy)
     9. Run OCR on all pages, detect coversheet, classify Part A/B
     10. Update packet_document with pages_metadata, ocr_metadata, extracted_fields
     11. Commit transaction, cleanup temp files
     
     REPLACE Policy (Idempotency):
     - If same decision_tracking_id is processed again, rebuild consolidated PDF from payload
-    - Always overwrite consolidated PDF blob and page blobs (overwrite=True)
+    - Always overwrite consolidated PDF blob and changed page blobs (overwrite=True);
+      page blobs whose stored sha256 matches the new page are left as they are
     - Always replace pages_metadata, ocr_metadata, extracted_fields with new results
     - Old page blobs not in new run are ignored (UI relies on pages_metadata)
+    
+    Large documents (above settings.pipeline_streaming_page_threshold pages or
+    settings.pipeline_streaming_min_bytes) are split, uploaded and cleaned up in chunks
+    of settings.pipeline_streaming_chunk_pages pages; only the pages OCR needs stay on disk.
     """
     
+    # OCR runs on the first pages only (fail fast to manual review if needed)
+    OCR_MAX_PAGES = 10
+    
     def __init__(
         self,
         blob_client: Optional[BlobStorageClient] = None,
@@ -93,8 +122,20 @@ class DocumentProcessor:
         """
         # Initialize blob client (container_name not required at init since we use per-call containers)
         self.blob_client = blob_client or BlobStorageClient()
-        self.splitter = splitter or DocumentSplitter(temp_dir=temp_dir or settings.blob_temp_dir)
-        self.pdf_merger = PDFMerger(temp_dir=temp_dir or settings.blob_temp_dir)
+        self.splitter = splitter or DocumentSplitter(
+            temp_dir=temp_dir or settings.blob_temp_dir,
+            flatten_mode=settings.pdf_split_flatten_mode,
+            flatten_dpi=settings.pdf_split_flatten_dpi,
+            tiff_passthrough=settings.tiff_passthrough_enabled,
+            chunk_pages=settings.pipeline_streaming_chunk_pages,
+            streaming_page_threshold=settings.pipeline_streaming_page_threshold,
+            streaming_min_bytes=settings.pipeline_streaming_min_bytes
+        )
+        self.pdf_merger = PDFMerger(
+            temp_dir=temp_dir or settings.blob_temp_dir,
+            tiff_passthrough=settings.tiff_passthrough_enabled,
+            tiff_chunk_frames=settings.pipeline_streaming_chunk_pages
+        )
         self.temp_dir = Path(temp_dir or settings.blob_temp_dir)
         
         # Initialize OCR service and helpers (only if OCR service is configured)
@@ -102,17 +143,20 @@ class DocumentProcessor:
             try:
                 self.ocr_service = OCRService()
                 self.coversheet_detector = CoversheetDetector()
+                self.coversheet_ranker = CoversheetRanker()
                 self.part_classifier = PartClassifier()
             except Exception as e:
                 # If OCR service initialization fails, disable OCR
                 logger.warning(f"OCR service initialization failed: {e}, OCR processing will be disabled")
                 self.ocr_service = None
                 self.coversheet_detector = None
+                self.coversheet_ranker = None
                 self.part_classifier = None
         else:
             # OCR not configured - disable OCR processing
             self.ocr_service = None
             self.coversheet_detector = None
+            self.coversheet_ranker = None
             self.part_classifier = None
         
         # Initialize channel strategy
@@ -318,14 +362,17 @@ class DocumentProcessor:
             )
             return
         
-        # Process with step commits and resume logic
-        self._process_with_step_commits(
-            message=message,
-            parsed=parsed,
-            inbox_id=inbox_id,
-            resume_state=resume_state,
-            temp_files_to_cleanup=temp_files_to_cleanup
-        )
+        # Process with step commits and resume logic (stage gates bound per-stage concurrency
+        # across all packets in this process - see app/services/pipeline_stages.py)
+        with get_document_pipeline().run() as stage_run:
+            self._process_with_step_commits(
+                message=message,
+                parsed=parsed,
+                inbox_id=inbox_id,
+                resume_state=resume_state,
+                temp_files_to_cleanup=temp_files_to_cleanup,
+                stage_run=stage_run
+            )
     
     def _process_with_step_commits(
         self,
@@ -333,7 +380,8 @@ class DocumentProcessor:
         parsed,
         inbox_id: Optional[int],
         resume_state: Optional[ResumeState],
-        temp_files_to_cleanup: list
+        temp_files_to_cleanup: list,
+        stage_run: Optional[PipelineRun] = None
     ) -> None:
         """
         Process message with step commits and resume logic.
@@ -349,9 +397,14 @@ class DocumentProcessor:
         
         Resume logic:
         - If resume_state.resume_from == 'ocr': Skip to OCR
-        - If resume_state.resume_from == 'split': Skip to split
+        - If resume_state.resume_from == 'split': Skip to split (pages checkpointed with a
+          matching hash by an earlier attempt are not uploaded again)
         - If resume_state.resume_from == 'merge': Skip to merge
         - Otherwise: Start from beginning
+        
+        Pipeline stages (when stage_run is given): the external work runs through the
+        download, merge, upload, split, page_upload and ocr stage gates; each transaction
+        commits inside the stage that produced its data, so the checkpoints are unchanged.
         """
         # Determine where to start based on resume state
         start_from = 'beginning'
@@ -476,6 +529,9 @@ class DocumentProcessor:
         consolidated_file_size = 0
         paths = None
         
+        # Set by the single-pass merge+split in Step 5, or by Step 8 / OCR resume
+        split_result = None
+        
         if start_from == 'beginning' or start_from == 'merge':
             # Step 4: Deduplicate documents by source_absolute_url before downloading
             # This prevents duplicate pages when payload lists the same blob URL multiple times
@@ -501,60 +557,126 @@ class DocumentProcessor:
                 )
             
             # Step 4: Download deduplicated documents from SOURCE container
+            self._enter_stage(stage_run, STAGE_DOWNLOAD)
             downloaded_docs = []
             source_container = settings.azure_storage_source_container or settings.container_name
             
-            logger.info(f"Downloading {len(docs_to_merge)} unique documents from SOURCE container for merging")
-            for doc_idx, doc in enumerate(docs_to_merge, 1):
-                logger.info(
-                    f"Downloading document {doc_idx}/{len(docs_to_merge)}: "
-                    f"{doc.file_name} (source: {doc.source_absolute_url})"
-                )
-                try:
-                    download_result = self.blob_client.download_to_temp(
-                        blob_path_or_url=doc.source_absolute_url,
+            # Small packets stay in memory end to end (download -> merge/split -> upload -> OCR);
+            # documents beyond the budget spill to temp files
+            in_memory_budget = settings.pipeline_in_memory_max_bytes
+            
+            logger.info(
+                f"Downloading {len(docs_to_merge)} unique documents from SOURCE container for merging "
+                f"(max_concurrency={settings.blob_download_max_concurrency}, in_memory_budget={in_memory_budget})"
+            )
+            try:
+                # Concurrent downloads; results come back in docs_to_merge order (merge order)
+                if in_memory_budget > 0:
+                    download_results = self.blob_client.download_many_to_buffers(
+                        blob_paths_or_urls=[doc.source_absolute_url for doc in docs_to_merge],
                         subdir=f"consolidated/{parsed.unique_id}",
                         container_name=source_container,
-                        timeout=300
+                        timeout=300,
+                        max_concurrency=settings.blob_download_max_concurrency,
+                        max_memory_bytes=in_memory_budget
                     )
-                    downloaded_docs.append({
-                        'local_path': download_result['local_path'],
-                        'mime_type': doc.mime_type,
-                        'file_name': doc.file_name,
-                        'file_size': download_result['size_bytes']
-                    })
-                    temp_files_to_cleanup.append(download_result['local_path'])
-                    logger.info(
-                        f"Downloaded: {doc.file_name} -> {download_result['local_path']} "
-                        f"({download_result['size_bytes']} bytes)"
+                else:
+                    download_results = self.blob_client.download_many_to_temp(
+                        blob_paths_or_urls=[doc.source_absolute_url for doc in docs_to_merge],
+                        subdir=f"consolidated/{parsed.unique_id}",
+                        container_name=source_container,
+                        timeout=300,
+                        max_concurrency=settings.blob_download_max_concurrency
                     )
-                except BlobStorageError as e:
-                    logger.error(f"Failed to download document {doc.file_name}: {e}", exc_info=True)
-                    raise DocumentProcessorError(f"Failed to download document {doc.file_name}: {e}") from e
+            except BlobStorageError as e:
+                logger.error(f"Failed to download documents: {e}", exc_info=True)
+                raise DocumentProcessorError(f"Failed to download documents: {e}") from e
+            
+            for doc, download_result in zip(docs_to_merge, download_results):
+                downloaded_docs.append({
+                    'local_path': download_result['local_path'],
+                    'data': download_result.get('data'),
+                    'mime_type': doc.mime_type,
+                    'file_name': doc.file_name,
+                    'file_size': download_result['size_bytes']
+                })
+                if download_result['local_path']:
+                    temp_files_to_cleanup.append(download_result['local_path'])
+                logger.info(
+                    f"Downloaded: {doc.file_name} -> {download_result['local_path'] or '(memory)'} "
+                    f"({download_result['size_bytes']} bytes)"
+                )
             
             if not downloaded_docs:
                 raise DocumentProcessorError("No documents downloaded for merging")
             
             # Step 5: Merge all documents into ONE consolidated PDF
+            self._enter_stage(stage_run, STAGE_MERGE)
             logger.info(f"Merging {len(downloaded_docs)} documents into consolidated PDF")
             consolidated_pdf_path = self.temp_dir / f"consolidated_{parsed.unique_id}_{packet.packet_id}.pdf"
             consolidated_pdf_path.parent.mkdir(parents=True, exist_ok=True)
             temp_files_to_cleanup.append(str(consolidated_pdf_path))
             
-            try:
-                total_pages_before_split = self.pdf_merger.merge_documents(
-                    input_paths=[d['local_path'] for d in downloaded_docs],
-                    mime_types=[d['mime_type'] for d in downloaded_docs],
-                    output_path=str(consolidated_pdf_path)
+            # Consolidated PDF bytes when the merged packet fits the in-memory budget
+            consolidated_data = None
+            
+            # Decide memory vs disk from the downloaded size before merging: packets over the
+            # budget go through the file-based merge, which saves the consolidated PDF to disk
+            packet_bytes = sum(d['file_size'] or 0 for d in downloaded_docs)
+            merge_in_memory = in_memory_budget > 0 and packet_bytes <= in_memory_budget
+            if in_memory_budget > 0 and not merge_in_memory:
+                logger.info(
+                    f"Packet is {packet_bytes} bytes (in-memory budget {in_memory_budget}); "
+                    f"merging and splitting on disk"
                 )
-                consolidated_file_size = consolidated_pdf_path.stat().st_size
+                self._spill_downloads_to_disk(downloaded_docs, parsed.unique_id, temp_files_to_cleanup)
+            
+            try:
+                # Single pass: the per-page PDFs (Step 8) are emitted from the in-memory merged
+                # document, so the consolidated PDF is written once and never re-parsed
+                if merge_in_memory:
+                    total_pages_before_split, consolidated_data, split_result = self.pdf_merger.merge_and_split_buffers(
+                        sources=[d['data'] if d['data'] is not None else d['local_path'] for d in downloaded_docs],
+                        mime_types=[d['mime_type'] for d in downloaded_docs],
+                        output_path=str(consolidated_pdf_path),
+                        splitter=self.splitter,
+                        unique_id=parsed.unique_id,
+                        document_unique_identifier="CONSOLIDATED",
+                        max_memory_bytes=in_memory_budget
+                    )
+                    # Source bytes are no longer needed once merged
+                    for d in downloaded_docs:
+                        d['data'] = None
+                else:
+                    total_pages_before_split, split_result = self.pdf_merger.merge_and_split(
+                        input_paths=[d['local_path'] for d in downloaded_docs],
+                        mime_types=[d['mime_type'] for d in downloaded_docs],
+                        output_path=str(consolidated_pdf_path),
+                        splitter=self.splitter,
+                        unique_id=parsed.unique_id,
+                        document_unique_identifier="CONSOLIDATED"
+                    )
+                if consolidated_data is not None:
+                    consolidated_file_size = len(consolidated_data)
+                else:
+                    consolidated_file_size = consolidated_pdf_path.stat().st_size
+                if split_result is not None:
+                    temp_files_to_cleanup.extend(split_result.local_paths)
+                    split_summary = f"split into {split_result.page_count} pages"
+                else:
+                    split_summary = "split deferred to streaming mode"
                 logger.info(
                     f"Merged {len(downloaded_docs)} documents into consolidated PDF: "
-                    f"{consolidated_pdf_path} ({consolidated_file_size} bytes, {total_pages_before_split} pages)"
+                    f"{'(memory)' if consolidated_data is not None else consolidated_pdf_path} "
+                    f"({consolidated_file_size} bytes, {total_pages_before_split} pages), "
+                    f"{split_summary}"
                 )
             except PDFMergeError as e:
                 logger.error(f"Failed to merge documents: {e}", exc_info=True)
                 raise DocumentProcessorError(f"Failed to merge documents: {e}") from e
+            except DocumentSplitError as e:
+                logger.error(f"Failed to split consolidated PDF: {e}", exc_info=True)
+                raise DocumentProcessorError(f"Failed to split consolidated PDF: {e}") from e
             
             # Step 6: Build blob paths
             dt_utc = message.created_at if hasattr(message, 'created_at') and message.created_at else datetime.now(timezone.utc)
@@ -570,18 +692,28 @@ class DocumentProcessor:
             )
             
             # Step 7: Upload consolidated PDF to DEST container
+            self._enter_stage(stage_run, STAGE_UPLOAD)
             dest_container = settings.azure_storage_dest_container
             logger.info(
                 f"Uploading consolidated PDF to DEST container '{dest_container}': {paths.consolidated_pdf_blob_path}"
             )
             try:
-                consolidated_upload_result = self.blob_client.upload_file(
-                    local_path=str(consolidated_pdf_path),
-                    dest_blob_path=paths.consolidated_pdf_blob_path,
-                    container_name=dest_container,
-                    content_type='application/pdf',
-                    overwrite=True  # REPLACE policy
-                )
+                if consolidated_data is not None:
+                    consolidated_upload_result = self.blob_client.upload_bytes(
+                        data=consolidated_data,
+                        dest_blob_path=paths.consolidated_pdf_blob_path,
+                        container_name=dest_container,
+                        content_type='application/pdf',
+                        overwrite=True  # REPLACE policy
+                    )
+                else:
+                    consolidated_upload_result = self.blob_client.upload_file(
+                        local_path=str(consolidated_pdf_path),
+                        dest_blob_path=paths.consolidated_pdf_blob_path,
+                        container_name=dest_container,
+                        content_type='application/pdf',
+                        overwrite=True  # REPLACE policy
+                    )
                 logger.info(
                     f"Uploaded consolidated PDF: {consolidated_upload_result['size_bytes']} bytes, "
                     f"blob_url={consolidated_upload_result['blob_url']}"
@@ -636,11 +768,11 @@ class DocumentProcessor:
                     raise DocumentProcessorError("Cannot resume: consolidated_blob_path not found")
                 
         # External Work: Split and upload pages (skip if resuming from OCR)
-        split_result = None
         
         if start_from == 'beginning' or start_from == 'merge' or start_from == 'split':
             # Download consolidated PDF if resuming from split
             if start_from == 'split':
+                self._enter_stage(stage_run, STAGE_DOWNLOAD)
                 # Reload packet_document to get consolidated_blob_path
                 with get_db_session() as db:
                     packet_document_db = db.query(PacketDocumentDB).filter(
@@ -668,58 +800,67 @@ class DocumentProcessor:
                         raise DocumentProcessorError("Cannot resume from split: consolidated_blob_path not found")
             
             # Step 8: Split consolidated PDF into per-page PDFs
-            logger.info(f"Splitting consolidated PDF into pages")
-            try:
-                split_result = self.splitter.split_document(
-                    input_path=str(consolidated_pdf_path),
-                    unique_id=parsed.unique_id,
-                    document_unique_identifier="CONSOLIDATED",
-                    original_file_name="consolidated.pdf",
-                    mime_type="application/pdf"
-                )
-                logger.info(f"Split complete: {split_result.page_count} pages")
-            except DocumentSplitError as e:
-                logger.error(f"Failed to split consolidated PDF: {e}", exc_info=True)
-                raise DocumentProcessorError(f"Failed to split consolidated PDF: {e}") from e
+            # (already done in Step 5 unless resuming from split or streaming)
+            streaming_split = False
+            if split_result is None:
+                self._enter_stage(stage_run, STAGE_SPLIT)
+                try:
+                    split_page_count = self.splitter.get_pdf_page_count(str(consolidated_pdf_path))
+                    streaming_split = self.splitter.should_stream(split_page_count, consolidated_file_size)
+                    if streaming_split:
+                        # Split, upload and cleanup run chunk by chunk in Step 9
+                        logger.info(
+                            f"Streaming mode: {split_page_count} pages ({consolidated_file_size} bytes) "
+                            f"will be split and uploaded in chunks of {self.splitter.chunk_pages} pages"
+                        )
+                    else:
+                        logger.info(f"Splitting consolidated PDF into pages")
+                        split_result = self.splitter.split_document(
+                            input_path=str(consolidated_pdf_path),
+                            unique_id=parsed.unique_id,
+                            document_unique_identifier="CONSOLIDATED",
+                            original_file_name="consolidated.pdf",
+                            mime_type="application/pdf"
+                        )
+                        temp_files_to_cleanup.extend(split_result.local_paths)
+                        logger.info(f"Split complete: {split_result.page_count} pages")
+                except DocumentSplitError as e:
+                    logger.error(f"Failed to split consolidated PDF: {e}", exc_info=True)
+                    raise DocumentProcessorError(f"Failed to split consolidated PDF: {e}") from e
             
             # Step 9: Upload each page to DEST container
+            self._enter_stage(stage_run, STAGE_PAGE_UPLOAD)
             dest_container = settings.azure_storage_dest_container
-            logger.info(f"Uploading {split_result.page_count} pages to DEST container")
-            page_metadata_list = []
-            for page in split_result.pages:
-                page_blob_path = build_page_blob_path(
-                    pages_folder_blob_prefix=paths.pages_folder_blob_prefix,
-                    packet_id=packet.packet_id,
-                    page_number=page.page_number
-                )
-                
-                logger.info(
-                    f"Uploading page {page.page_number} to DEST container '{dest_container}': {page_blob_path}"
-                )
-                try:
-                    upload_result = self.blob_client.upload_file(
-                        local_path=page.local_path,
-                        dest_blob_path=page_blob_path,
-                        container_name=dest_container,
-                        content_type=page.content_type,
-                        overwrite=True  # REPLACE policy
+            checkpoint = PageUploadCheckpoint(
+                packet_document_id=packet_document.packet_document_id,
+                flush_every=settings.page_upload_checkpoint_interval
+            )
+            try:
+                checkpointed = checkpoint.load()
+            except Exception as e:
+                logger.warning(f"Existing page hashes unavailable, uploading all pages: {e}")
+                checkpointed = {}
+            
+            upload_kwargs = dict(
+                packet_id=packet.packet_id,
+                pages_folder_blob_prefix=paths.pages_folder_blob_prefix,
+                dest_container=dest_container,
+                checkpoint=checkpoint,
+                checkpointed=checkpointed
+            )
+            try:
+                if streaming_split:
+                    split_result, page_metadata_list = self._split_and_upload_in_chunks(
+                        str(consolidated_pdf_path),
+                        unique_id=parsed.unique_id,
+                        temp_files_to_cleanup=temp_files_to_cleanup,
+                        upload_kwargs=upload_kwargs
                     )
-                    temp_files_to_cleanup.append(page.local_path)
-                    
-                    page_metadata_list.append({
-                        'page_number': page.page_number,
-                        'blob_path': page_blob_path,
-                        'relative_path': page_blob_path,
-                        'content_type': page.content_type,
-                        'file_size_bytes': page.file_size_bytes,
-                        'sha256': page.sha256,
-                        'is_coversheet': False,
-                    })
-                    
-                    logger.info(f"Uploaded page {page.page_number}: {upload_result['size_bytes']} bytes")
-                except BlobStorageError as e:
-                    logger.error(f"Failed to upload page {page.page_number}: {e}", exc_info=True)
-                    raise DocumentProcessorError(f"Failed to upload page {page.page_number}: {e}") from e
+                else:
+                    page_metadata_list = self._upload_split_pages(split_result.pages, **upload_kwargs)
+            finally:
+                # Persist the pages that made it, so a retry resumes after them
+                checkpoint.flush()
             
             # Transaction C: Update pages_metadata and split_status
             with get_db_session() as db:
@@ -752,6 +893,7 @@ class DocumentProcessor:
         else:
             # Resuming from OCR - download pages from blob storage
             logger.info("Resuming from OCR: downloading pages from blob storage")
+            self._enter_stage(stage_run, STAGE_DOWNLOAD)
             # Reload packet_document to get pages_metadata
             with get_db_session() as db:
                 packet_document_db = db.query(PacketDocumentDB).filter(
@@ -764,138 +906,122 @@ class DocumentProcessor:
             if not page_blob_paths:
                 raise DocumentProcessorError("Cannot resume from OCR: pages_metadata not found")
             
-            # Download pages from blob storage
-            dest_container = settings.azure_storage_dest_container
-            split_pages = []
-            for page_num, blob_path in sorted(page_blob_paths.items()):
-                local_page_path = self.temp_dir / f"resume_page_{packet.packet_id}_{page_num}.pdf"
-                local_page_path.parent.mkdir(parents=True, exist_ok=True)
-                temp_files_to_cleanup.append(str(local_page_path))
-                
-                try:
-                    self.blob_client.download_to_file(
-                        blob_path_or_url=blob_path,
-                        local_path=str(local_page_path),
-                        container_name=dest_container
-                    )
-                    
-                    # Create SplitPage-like object
-                    from app.services.document_splitter import SplitPage
-                    split_pages.append(SplitPage(
-                        page_number=page_num,
-                        local_path=str(local_page_path),
-                        dest_blob_path=blob_path,
-                        content_type="application/pdf",
-                        file_size_bytes=local_page_path.stat().st_size,
-                        sha256=None  # Not needed for resume
-                    ))
-                    logger.info(f"Downloaded page {page_num} from {blob_path}")
-                except BlobStorageError as e:
-                    logger.error(f"Failed to download page {page_num} from {blob_path}: {e}", exc_info=True)
-                    raise DocumentProcessorError(f"Failed to download page {page_num}: {e}") from e
+            # Fetch the pages OCR reads from blob storage; the rest keep their metadata only
+            page_sizes = {
+                p.get('page_number'): p.get('file_size_bytes') or 0
+                for p in (packet_document_db.pages_metadata or {}).get('pages', [])
+            }
+            split_pages = self._download_ocr_pages(page_blob_paths, page_sizes, temp_files_to_cleanup)
             
             # Create SplitResult from downloaded pages
             split_result = SplitResult(
                 processing_path=packet_document_db.processing_path or "",
                 page_count=len(split_pages),
                 pages=split_pages,
-                local_paths=[p.local_path for p in split_pages]
+                local_paths=[p.local_path for p in split_pages if p.local_path]
+            )
+            logger.info(
+                f"Resumed: downloaded {len(split_result.local_paths)} of {len(split_pages)} pages for OCR processing"
             )
-            logger.info(f"Resumed: downloaded {len(split_pages)} pages for OCR processing")
         
-        # External Work: Run OCR OR Extract from Payload (channel-dependent)
-        if start_from != 'ocr':
-            # Check if channel strategy requires OCR
-            if self.channel_strategy.should_run_ocr() and self.ocr_service:
-                # ESMD or Fax: Run OCR (existing flow)
-                try:
-                    # Use a fresh session for OCR processing
+        # External Work: Run OCR OR Extract from Payload (channel-dependent); also when resuming
+        # from OCR (the pages were downloaded above; fully processed documents returned earlier)
+        # Check if channel strategy requires OCR
+        if self.channel_strategy.should_run_ocr() and self.ocr_service:
+            # ESMD or Fax: Run OCR (existing flow)
+            self._enter_stage(stage_run, STAGE_OCR)
+            try:
+                # Use a fresh session for OCR processing
+                with get_db_session() as db:
+                    # Reload packet_document (use packet_document_id from resume_state or from Transaction A)
+                    packet_document_id = packet_document.packet_document_id if packet_document else None
+                    if not packet_document_id and resume_state:
+                        packet_document_id = resume_state.packet_document.packet_document_id
+                    if not packet_document_id:
+                        raise DocumentProcessorError("Cannot process OCR: packet_document_id not found")
+                    
+                    packet_document_db = db.query(PacketDocumentDB).filter(
+                        PacketDocumentDB.packet_document_id == packet_document_id
+                    ).first()
+                    if not packet_document_db:
+                        raise DocumentProcessorError("Cannot process OCR: packet_document not found")
+                    
+                    # Process OCR
+                    self._process_ocr(
+                        db=db,
+                        packet_document=packet_document_db,
+                        split_result=split_result,
+                        temp_files_to_cleanup=temp_files_to_cleanup
+                    )
+                    
+                    # Transaction D: OCR results are already committed in _process_ocr
+                    logger.info(f"✓ Transaction D committed: ocr_status=DONE")
+            except OCRServiceUnavailableError as e:
+                # Pages are uploaded and split_status=DONE, so the retry resumes from OCR
+                logger.warning(f"Parking OCR for message {message.message_id}: {e}")
+                raise DocumentProcessorDeferredError(
+                    f"OCR deferred: {e}", retry_after_seconds=e.retry_after_seconds
+                ) from e
+            except Exception as ocr_error:
+                logger.error(f"OCR processing failed: {ocr_error}", exc_info=True)
+                # Update status to FAILED
+                packet_document_id = packet_document.packet_document_id if packet_document else None
+                if not packet_document_id and resume_state:
+                    packet_document_id = resume_state.packet_document.packet_document_id
+                if packet_document_id:
                     with get_db_session() as db:
-                        # Reload packet_document (use packet_document_id from resume_state or from Transaction A)
-                        packet_document_id = packet_document.packet_document_id if packet_document else None
-                        if not packet_document_id and resume_state:
-                            packet_document_id = resume_state.packet_document.packet_document_id
-                        if not packet_document_id:
-                            raise DocumentProcessorError("Cannot process OCR: packet_document_id not found")
-                        
                         packet_document_db = db.query(PacketDocumentDB).filter(
                             PacketDocumentDB.packet_document_id == packet_document_id
                         ).first()
-                        if not packet_document_db:
-                            raise DocumentProcessorError("Cannot process OCR: packet_document not found")
-                        
-                        # Process OCR
-                        self._process_ocr(
-                            db=db,
-                            packet_document=packet_document_db,
-                            split_result=split_result,
-                            temp_files_to_cleanup=temp_files_to_cleanup
-                        )
-                        
-                        # Transaction D: OCR results are already committed in _process_ocr
-                        logger.info(f"✓ Transaction D committed: ocr_status=DONE")
-                except Exception as ocr_error:
-                    logger.error(f"OCR processing failed: {ocr_error}", exc_info=True)
-                    # Update status to FAILED
+                        if packet_document_db:
+                            packet_document_db.ocr_status = 'FAILED'
+                            db.commit()
+                raise DocumentProcessorError(f"OCR processing failed: {ocr_error}") from ocr_error
+        elif not self.channel_strategy.should_run_ocr():
+            # Portal: Extract from payload (NEW)
+            try:
+                # Use a fresh session for Portal processing
+                with get_db_session() as db:
+                    # Reload packet_document
                     packet_document_id = packet_document.packet_document_id if packet_document else None
                     if not packet_document_id and resume_state:
                         packet_document_id = resume_state.packet_document.packet_document_id
-                    if packet_document_id:
-                        with get_db_session() as db:
-                            packet_document_db = db.query(PacketDocumentDB).filter(
-                                PacketDocumentDB.packet_document_id == packet_document_id
-                            ).first()
-                            if packet_document_db:
-                                packet_document_db.ocr_status = 'FAILED'
-                                db.commit()
-                    raise DocumentProcessorError(f"OCR processing failed: {ocr_error}") from ocr_error
-            elif not self.channel_strategy.should_run_ocr():
-                # Portal: Extract from payload (NEW)
-                try:
-                    # Use a fresh session for Portal processing
+                    if not packet_document_id:
+                        raise DocumentProcessorError("Cannot process Portal fields: packet_document_id not found")
+                    
+                    packet_document_db = db.query(PacketDocumentDB).filter(
+                        PacketDocumentDB.packet_document_id == packet_document_id
+                    ).first()
+                    if not packet_document_db:
+                        raise DocumentProcessorError("Cannot process Portal fields: packet_document not found")
+                    
+                    # Process Portal fields from payload
+                    self._process_portal_fields_from_payload(
+                        db=db,
+                        packet_document=packet_document_db,
+                        split_result=split_result,
+                        payload=message.payload
+                    )
+                    
+                    # Transaction D: Portal results are already committed in _process_portal_fields_from_payload
+                    logger.info(f"✓ Transaction D committed: ocr_status=DONE (from payload)")
+            except Exception as portal_error:
+                logger.error(f"Portal field extraction failed: {portal_error}", exc_info=True)
+                # Update status to FAILED
+                packet_document_id = packet_document.packet_document_id if packet_document else None
+                if not packet_document_id and resume_state:
+                    packet_document_id = resume_state.packet_document.packet_document_id
+                if packet_document_id:
                     with get_db_session() as db:
-                        # Reload packet_document
-                        packet_document_id = packet_document.packet_document_id if packet_document else None
-                        if not packet_document_id and resume_state:
-                            packet_document_id = resume_state.packet_document.packet_document_id
-                        if not packet_document_id:
-                            raise DocumentProcessorError("Cannot process Portal fields: packet_document_id not found")
-                        
                         packet_document_db = db.query(PacketDocumentDB).filter(
                             PacketDocumentDB.packet_document_id == packet_document_id
                         ).first()
-                        if not packet_document_db:
-                            raise DocumentProcessorError("Cannot process Portal fields: packet_document not found")
-                        
-                        # Process Portal fields from payload
-                        self._process_portal_fields_from_payload(
-                            db=db,
-                            packet_document=packet_document_db,
-                            split_result=split_result,
-                            payload=message.payload
-                        )
-                        
-                        # Transaction D: Portal results are already committed in _process_portal_fields_from_payload
-                        logger.info(f"✓ Transaction D committed: ocr_status=DONE (from payload)")
-                except Exception as portal_error:
-                    logger.error(f"Portal field extraction failed: {portal_error}", exc_info=True)
-                    # Update status to FAILED
-                    packet_document_id = packet_document.packet_document_id if packet_document else None
-                    if not packet_document_id and resume_state:
-                        packet_document_id = resume_state.packet_document.packet_document_id
-                    if packet_document_id:
-                        with get_db_session() as db:
-                            packet_document_db = db.query(PacketDocumentDB).filter(
-                                PacketDocumentDB.packet_document_id == packet_document_id
-                            ).first()
-                            if packet_document_db:
-                                packet_document_db.ocr_status = 'FAILED'
-                                db.commit()
-                    raise DocumentProcessorError(f"Portal field extraction failed: {portal_error}") from portal_error
-            elif not self.ocr_service:
-                logger.warning("OCR service not configured, skipping OCR")
-        elif start_from == 'ocr':
-            logger.info("Skipping OCR/Portal extraction: already completed")
+                        if packet_document_db:
+                            packet_document_db.ocr_status = 'FAILED'
+                            db.commit()
+                raise DocumentProcessorError(f"Portal field extraction failed: {portal_error}") from portal_error
+        elif not self.ocr_service:
+            logger.warning("OCR service not configured, skipping OCR")
         
         # Clean up all temp files
         for temp_file in temp_files_to_cleanup:
@@ -910,6 +1036,282 @@ class DocumentProcessor:
             f"merged {len(parsed.documents)} documents into 1 consolidated document"
         )
     
+    def _run_page_ocr(self, page: SplitPage) -> Dict[str, Any]:
+        """Run OCR on one split page (from memory if the page was never written to disk; reused from the OCR result cache by page hash)"""
+        page_content = getattr(page, 'content', None)
+        page_sha256 = getattr(page, 'sha256', None)
+        if page_content is not None:
+            return self.ocr_service.run_ocr_on_bytes(
+                page_content, f"page_{page.page_number:04d}.pdf", content_sha256=page_sha256
+            )
+        return self.ocr_service.run_ocr_on_pdf(page.local_path, content_sha256=page_sha256)
+    
+    def _iter_page_ocr(
+        self,
+        pages: List[SplitPage],
+        *,
+        page_concurrency: int,
+        delay_between_requests: float
+    ) -> Iterator[Tuple[SplitPage, Optional[Dict[str, Any]], Optional[OCRServiceError]]]:
+        """
+        OCR pages and yield (page, result, error) in page order.
+        
+        With page_concurrency 1 pages are OCR'd one at a time with delay_between_requests
+        between them. Otherwise up to page_concurrency pages are in flight at once (the
+        shared OCR rate limiter paces the actual requests) and no delay is added. Closing
+        the iterator cancels requests not yet started; running ones finish in the background.
+        
+        Args:
+            pages: Pages to OCR, in order
+            page_concurrency: Pages of this packet OCR'd at once
+            delay_between_requests: Seconds between sequential requests
+            
+        Yields:
+            (page, OCR result or None, OCRServiceError or None)
+        """
+        if page_concurrency <= 1:
+            for page_idx, page in enumerate(pages):
+                # Add delay between requests to reduce load on OCR service
+                if page_idx and delay_between_requests > 0:
+                    time.sleep(delay_between_requests)
+                logger.info(f"Running OCR on page {page.page_number}: {page.local_path or '(memory)'}")
+                try:
+                    ocr_result, ocr_error = self._run_page_ocr(page), None
+                except OCRServiceError as e:
+                    ocr_result, ocr_error = None, e
+                yield page, ocr_result, ocr_error
+            return
+        
+        executor = ThreadPoolExecutor(
+            max_workers=min(page_concurrency, max(1, len(pages))),
+            thread_name_prefix="ocr-page"
+        )
+        try:
+            futures = []
+            for page in pages:
+                logger.info(f"Running OCR on page {page.page_number}: {page.local_path or '(memory)'}")
+                futures.append(executor.submit(self._run_page_ocr, page))
+            for page, future in zip(pages, futures):
+                try:
+                    ocr_result, ocr_error = future.result(), None
+                except OCRServiceError as e:
+                    ocr_result, ocr_error = None, e
+                yield page, ocr_result, ocr_error
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _enter_stage(stage_run: Optional[PipelineRun], stage: str) -> None:
+        """Move the packet to the next pipeline stage (no-op when not run through the pipeline)"""
+        if stage_run is not None:
+            stage_run.enter(stage)
+    
+    def _upload_split_pages(
+        self,
+        pages: List[SplitPage],
+        *,
+        packet_id: int,
+        pages_folder_blob_prefix: str,
+        dest_container: str,
+        checkpoint: PageUploadCheckpoint,
+        checkpointed: Dict[int, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Upload split pages to the DEST container and build their pages_metadata entries.
+        
+        Content-hash skip: pages recorded by the previous build (rebuild) or by an
+        interrupted attempt (resume) whose blob still carries the same sha256 are not
+        uploaded again; progress is recorded in the checkpoint as pages finish (the
+        caller flushes it).
+        
+        Args:
+            pages: Split pages to upload
+            packet_id: Packet ID (page blob path)
+            pages_folder_blob_prefix: Blob prefix of the packet's pages folder
+            dest_container: DEST container name
+            checkpoint: PageUploadCheckpoint recording uploaded pages
+            checkpointed: Known page hashes from PageUploadCheckpoint.load()
+            
+        Returns:
+            pages_metadata entries for the pages, in page order
+            
+        Raises:
+            DocumentProcessorError: If a page upload fails
+        """
+        page_uploads = [
+            {
+                'page_number': page.page_number,
+                'local_path': page.local_path,
+                'data': page.content,
+                'dest_blob_path': build_page_blob_path(
+                    pages_folder_blob_prefix=pages_folder_blob_prefix,
+                    packet_id=packet_id,
+                    page_number=page.page_number
+                ),
+                'content_type': page.content_type,
+                'sha256': page.sha256
+            }
+            for page in pages
+        ]
+        
+        skipped_pages = set()
+        candidates = [
+            p for p in page_uploads
+            if p['sha256']
+            and checkpointed.get(p['page_number'], {}).get('sha256') == p['sha256']
+            and checkpointed[p['page_number']].get('blob_path') == p['dest_blob_path']
+        ]
+        if candidates:
+            try:
+                skipped_pages = self.blob_client.find_unchanged_pages(
+                    pages=candidates,
+                    container_name=dest_container,
+                    max_concurrency=settings.blob_upload_max_concurrency
+                )
+            except Exception as e:
+                logger.warning(f"Existing page hashes unavailable, uploading all pages: {e}")
+        
+        pages_to_upload = [p for p in page_uploads if p['page_number'] not in skipped_pages]
+        logger.info(
+            f"Uploading {len(pages_to_upload)} of {len(page_uploads)} pages to DEST container "
+            f"'{dest_container}' ({len(skipped_pages)} unchanged, "
+            f"max_concurrency={settings.blob_upload_max_concurrency})"
+        )
+        try:
+            upload_results = self.blob_client.upload_pages(
+                pages=pages_to_upload,
+                container_name=dest_container,
+                overwrite=True,  # REPLACE policy
+                max_concurrency=settings.blob_upload_max_concurrency,
+                on_uploaded=checkpoint.record
+            )
+        except BlobStorageError as e:
+            logger.error(f"Failed to upload pages: {e}", exc_info=True)
+            raise DocumentProcessorError(f"Failed to upload pages: {e}") from e
+        
+        # Build metadata in page order from the results keyed by page number
+        page_blob_paths = {p['page_number']: p['dest_blob_path'] for p in page_uploads}
+        page_metadata_list = []
+        for page in sorted(pages, key=lambda p: p.page_number):
+            if page.page_number in upload_results:
+                logger.debug(f"Uploaded page {page.page_number}: {upload_results[page.page_number]['size_bytes']} bytes")
+            page_metadata_list.append({
+                'page_number': page.page_number,
+                'blob_path': page_blob_paths[page.page_number],
+                'relative_path': page_blob_paths[page.page_number],
+                'content_type': page.content_type,
+                'file_size_bytes': page.file_size_bytes,
+                'sha256': page.sha256,
+                'is_coversheet': False,
+            })
+        logger.info(
+            f"Uploaded {len(upload_results)} pages: "
+            f"{sum(r['size_bytes'] for r in upload_results.values())} bytes "
+            f"({len(skipped_pages)} unchanged pages skipped)"
+        )
+        return page_metadata_list
+    
+    def _spill_downloads_to_disk(
+        self,
+        downloaded_docs: List[Dict[str, Any]],
+        unique_id: str,
+        temp_files_to_cleanup: List[str]
+    ) -> None:
+        """
+        Write documents downloaded to memory to temp files (for the file-based merge)
+        
+        Args:
+            downloaded_docs: Downloaded documents ('data' is moved to 'local_path' in place)
+            unique_id: Unique identifier for the message/packet (temp file names)
+            temp_files_to_cleanup: Temp file list extended with the written files
+        """
+        for index, doc in enumerate(downloaded_docs):
+            if doc['data'] is None:
+                continue
+            local_path = self.temp_dir / f"source_{unique_id}_{index}{Path(doc['file_name'] or '').suffix}"
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_files_to_cleanup.append(str(local_path))
+            local_path.write_bytes(doc['data'])
+            doc['local_path'] = str(local_path)
+            doc['data'] = None
+    
+    def _split_and_upload_in_chunks(
+        self,
+        consolidated_pdf_path: str,
+        *,
+        unique_id: str,
+        temp_files_to_cleanup: List[str],
+        upload_kwargs: Dict[str, Any]
+    ) -> Tuple[SplitResult, List[Dict[str, Any]]]:
+        """
+        Split, upload and clean up a large consolidated PDF one chunk at a time (streaming mode).
+        
+        Each chunk of per-page PDFs is uploaded before the next one is split. Afterwards only
+        the files of the pages OCR will read (_select_ocr_pages over the candidate window) are
+        kept; every other page file is deleted and its SplitPage keeps metadata only, so scratch
+        disk stays at one chunk plus OCR_MAX_PAGES pages.
+        
+        Args:
+            consolidated_pdf_path: Local path of the consolidated PDF
+            unique_id: Unique identifier for the message/packet (split work directory)
+            temp_files_to_cleanup: Temp file list extended with the pages kept for OCR
+            upload_kwargs: Keyword arguments for _upload_split_pages
+            
+        Returns:
+            Tuple of (SplitResult for the whole document, pages_metadata entries in page order)
+            
+        Raises:
+            DocumentProcessorError: If splitting or a page upload fails
+        """
+        pages: List[SplitPage] = []
+        page_metadata_list: List[Dict[str, Any]] = []
+        processing_path = ""
+        ocr_candidate_pages = self._ocr_candidate_page_count()
+        ocr_pages: List[SplitPage] = []
+        chunks = self.splitter.iter_split_pdf(
+            input_path=consolidated_pdf_path,
+            unique_id=unique_id,
+            document_unique_identifier="CONSOLIDATED"
+        )
+        try:
+            for chunk in chunks:
+                processing_path = chunk.processing_path
+                try:
+                    page_metadata_list.extend(self._upload_split_pages(chunk.pages, **upload_kwargs))
+                finally:
+                    # Re-select the OCR pages with this chunk's candidates; only the metadata of
+                    # pages OCR will not read is needed from here on
+                    kept_pages = ocr_pages
+                    kept_paths = {page.local_path for page in kept_pages}
+                    ocr_pages = self._select_ocr_pages(
+                        kept_pages + [p for p in chunk.pages if p.page_number <= ocr_candidate_pages]
+                    )
+                    selected = {page.page_number for page in ocr_pages}
+                    for page in kept_pages + chunk.pages:
+                        if page.page_number in selected:
+                            if page.local_path not in kept_paths:
+                                temp_files_to_cleanup.append(page.local_path)
+                        elif page.local_path:
+                            if page.local_path in kept_paths:
+                                temp_files_to_cleanup.remove(page.local_path)
+                            Path(page.local_path).unlink(missing_ok=True)
+                            page.local_path = None
+                pages.extend(chunk.pages)
+                logger.info(f"Streaming split: {len(pages)} pages split and uploaded")
+        except DocumentSplitError as e:
+            logger.error(f"Failed to split consolidated PDF: {e}", exc_info=True)
+            raise DocumentProcessorError(f"Failed to split consolidated PDF: {e}") from e
+        finally:
+            chunks.close()
+        
+        split_result = SplitResult(
+            processing_path=processing_path,
+            page_count=len(pages),
+            pages=pages,
+            local_paths=[page.local_path for page in pages if page.local_path]
+        )
+        return split_result, page_metadata_list
+    
     def _extract_submission_date_from_payload(
         self,
         payload: Dict[str, Any],
@@ -1028,25 +1430,7 @@ class DocumentProcessor:
         Returns:
             'Expedited', 'Standard', or None (if unrecognized)
         """
-        if not submission_type:
-            return None
-        
-        value_lower = submission_type.strip().lower()
-        
-        # Expedited keywords - check if value starts with any of these
-        expedited_keywords = ['expedited', 'expedite', 'urgent', 'rush']
-        for keyword in expedited_keywords:
-            if value_lower.startswith(keyword):
-                return 'Expedited'
-        
-        # Standard keywords - check if value starts with any of these
-        standard_keywords = ['standard', 'normal', 'routine', 'regular']
-        for keyword in standard_keywords:
-            if value_lower.startswith(keyword):
-                return 'Standard'
-        
-        # Unrecognized - return None for manual review
-        return None
+        return normalize_submission_type(submission_type)
     
     def _calculate_due_date(self, received_date: datetime, submission_type: Optional[str] = None) -> datetime:
         """
@@ -1057,6 +1441,9 @@ class DocumentProcessor:
         - Expedited: 48 hours from received_date (normalized to midnight)
         - Standard: 72 hours from received_date (normalized to midnight, default)
         
+        Example: received_date = 2026-01-06 14:25:33, Standard (72h = 3 days)
+                 due_date = 2026-01-09 00:00:00 (3 days later at midnight)
+        
         Args:
             received_date: When the packet was received (raw timestamp - will be normalized to midnight)
             submission_type: "Expedited" or "Standard" (defaults to "Standard")
@@ -1064,49 +1451,7 @@ class DocumentProcessor:
         Returns:
             Due date timestamp (at midnight UTC)
         """
-        # Ensure timezone-aware
-        if received_date.tzinfo is None:
-            received_date = received_date.replace(tzinfo=timezone.utc)
-        
-        # Normalize received_date to midnight for SLA calculation (extract date only)
-        normalized_received_date = datetime(
-            year=received_date.year,
-            month=received_date.month,
-            day=received_date.day,
-            hour=0,
-            minute=0,
-            second=0,
-            microsecond=0,
-            tzinfo=timezone.utc
-        )
-        
-        # Determine SLA hours based on submission_type
-        # Use helper function to normalize, but for due_date calculation we need a default
-        normalized = self._normalize_submission_type(submission_type)
-        if normalized == 'Expedited':
-            sla_hours = 48  # Expedited: 48 hours
-        else:
-            sla_hours = 72  # Standard: 72 hours (default if None or Standard)
-        
-        # Calculate due date using normalized received_date
-        due_date = normalized_received_date + timedelta(hours=sla_hours)
-        
-        # Normalize due date to midnight (SLA is based on date, not time)
-        # Example: received_date = 2026-01-06 14:25:33, Standard (72h = 3 days)
-        #          normalized_received_date = 2026-01-06 00:00:00
-        #          due_date = 2026-01-09 00:00:00 (3 days later at midnight)
-        normalized_due_date = datetime(
-            year=due_date.year,
-            month=due_date.month,
-            day=due_date.day,
-            hour=0,
-            minute=0,
-            second=0,
-            microsecond=0,
-            tzinfo=timezone.utc
-        )
-        
-        return normalized_due_date
+        return calculate_due_date(received_date, submission_type)
     
     def _get_or_create_packet(
         self,
@@ -1515,6 +1860,108 @@ class DocumentProcessor:
         
         return packet_document
     
+    def _ocr_candidate_page_count(self) -> int:
+        """
+        Number of leading pages OCR may pick from
+        
+        Returns:
+            OCR_MAX_PAGES, or the wider pre-ranking window when coversheet pre-ranking is on
+        """
+        if self._prerank_enabled():
+            return max(self.OCR_MAX_PAGES, int(settings.ocr_prerank_max_pages))
+        return self.OCR_MAX_PAGES
+    
+    def _prerank_enabled(self) -> bool:
+        """Whether OCR candidates are ordered by local coversheet pre-ranking"""
+        return settings.ocr_coversheet_prerank and getattr(self, 'coversheet_ranker', None) is not None
+    
+    def _select_ocr_pages(self, candidates: List[SplitPage]) -> List[SplitPage]:
+        """
+        Pick the pages OCR reads from the candidate pages
+        
+        Args:
+            candidates: Readable candidate pages in page order
+            
+        Returns:
+            At most OCR_MAX_PAGES pages in OCR order (most coversheet-like first with pre-ranking)
+        """
+        if self._prerank_enabled() and len(candidates) > 1:
+            candidates = self.coversheet_ranker.rank_pages(candidates)
+        return list(candidates[:self.OCR_MAX_PAGES])
+    
+    def _download_ocr_pages(
+        self,
+        page_blob_paths: Dict[int, str],
+        page_sizes: Dict[int, int],
+        temp_files_to_cleanup: List[str]
+    ) -> List[SplitPage]:
+        """
+        Rebuild the split pages of a document resuming at OCR, keeping only the pages OCR reads.
+        
+        The candidate window (_ocr_candidate_page_count) is downloaded into memory and the
+        pages OCR reads are picked with _select_ocr_pages; no page files are written. Blobs
+        that do not fit the in-memory budget are spilled to temp files by the blob client and
+        deleted unless selected. Every other page keeps its metadata only.
+        
+        Args:
+            page_blob_paths: Page number -> blob path (from pages_metadata)
+            page_sizes: Page number -> file size in bytes (from pages_metadata)
+            temp_files_to_cleanup: Temp file list extended with spilled pages kept for OCR
+            
+        Returns:
+            SplitPage list in page order
+            
+        Raises:
+            DocumentProcessorError: If a page download fails
+        """
+        page_numbers = sorted(page_blob_paths)
+        candidate_numbers = page_numbers[:self._ocr_candidate_page_count()]
+        try:
+            downloads = self.blob_client.download_many_to_buffers(
+                [page_blob_paths[page_num] for page_num in candidate_numbers],
+                container_name=settings.azure_storage_dest_container
+            )
+        except BlobStorageError as e:
+            logger.error(f"Failed to download OCR pages: {e}", exc_info=True)
+            raise DocumentProcessorError(f"Failed to download OCR pages: {e}") from e
+        
+        candidates = [
+            SplitPage(
+                page_number=page_num,
+                local_path=download.get('local_path'),
+                dest_blob_path=page_blob_paths[page_num],
+                content_type="application/pdf",
+                file_size_bytes=download.get('size_bytes') or 0,
+                sha256=None,  # Not needed for resume
+                content=download.get('data')
+            )
+            for page_num, download in zip(candidate_numbers, downloads)
+        ]
+        selected = {page.page_number for page in self._select_ocr_pages(candidates)}
+        for page in candidates:
+            if page.page_number in selected:
+                if page.local_path:
+                    temp_files_to_cleanup.append(page.local_path)
+                continue
+            if page.local_path:
+                Path(page.local_path).unlink(missing_ok=True)
+            page.local_path = None
+            page.content = None
+        logger.info(f"Resuming OCR with pages {sorted(selected)} of {len(page_numbers)}")
+        
+        candidates_by_number = {page.page_number: page for page in candidates}
+        return [
+            candidates_by_number.get(page_num) or SplitPage(
+                page_number=page_num,
+                local_path=None,
+                dest_blob_path=page_blob_paths[page_num],
+                content_type="application/pdf",
+                file_size_bytes=page_sizes.get(page_num, 0),
+                sha256=None
+            )
+            for page_num in page_numbers
+        ]
+    
     def _process_ocr(
         self,
         db: Session,
@@ -1550,8 +1997,9 @@ class DocumentProcessor:
         packet_document.ocr_status = 'IN_PROGRESS'
         db.flush()
         
-        # Run OCR on each split page SEQUENTIALLY (one at a time) to reduce load on OCR service
-        # This prevents overwhelming the service with parallel requests
+        # Run OCR on the split pages: one at a time with a delay between requests, or up to
+        # OCR_PAGE_CONCURRENCY at once (the process-wide OCR rate limiter bounds the load
+        # across all packets). Results are always handled in page order.
         page_ocr_results = []
         ocr_errors = []
         failed_pages = []  # Store failed pages for retry at end
@@ -1567,21 +2015,34 @@ class DocumentProcessor:
                 # Download pages as needed (this should have been done before calling _process_ocr)
                 logger.warning("split_result.pages is empty but page_count > 0 - this should not happen in resume flow")
         
-        # Limit to first 10 pages only (fail fast to manual review if needed)
-        max_pages_to_process = 10
-        pages_to_process_limited = pages_to_process[:max_pages_to_process]
+        # Limit to OCR_MAX_PAGES pages only (fail fast to manual review if needed). With
+        # pre-ranking the most coversheet-like candidate pages are taken, in ranked order.
+        # Pages past the selection of a streaming split or OCR resume keep metadata only.
+        max_pages_to_process = self.OCR_MAX_PAGES
+        ocr_candidates = [
+            page for page in pages_to_process[:self._ocr_candidate_page_count()]
+            if page.local_path or getattr(page, 'content', None) is not None
+        ]
+        pages_to_process_limited = self._select_ocr_pages(ocr_candidates)
         
         if len(pages_to_process) > max_pages_to_process:
             logger.info(
-                f"Limiting OCR to first {max_pages_to_process} pages "
+                f"Limiting OCR to {max_pages_to_process} of the first {len(ocr_candidates)} pages "
                 f"(document has {len(pages_to_process)} total pages). "
                 f"If OCR fails, remaining pages will be available for manual review."
             )
         
-        logger.info(
-            f"Processing {len(pages_to_process_limited)} pages sequentially "
-            f"with {delay_between_requests}s delay between requests"
-        )
+        page_concurrency = max(1, int(settings.ocr_page_concurrency))
+        if page_concurrency > 1:
+            logger.info(
+                f"Processing {len(pages_to_process_limited)} pages with up to {page_concurrency} "
+                f"concurrent OCR requests"
+            )
+        else:
+            logger.info(
+                f"Processing {len(pages_to_process_limited)} pages sequentially "
+                f"with {delay_between_requests}s delay between requests"
+            )
         
         coversheet_found = False
         coversheet_page_number = None
@@ -1590,38 +2051,37 @@ class DocumentProcessor:
         total_ocr_attempts = 0
         max_total_attempts = 3
         
-        for page_idx, page in enumerate(pages_to_process_limited):
-            # Check if we've exceeded max total attempts
-            if total_ocr_attempts >= max_total_attempts:
-                remaining_count = len(pages_to_process_limited) - page_idx
-                logger.warning(
-                    f"Max total OCR attempts ({max_total_attempts}) reached. "
-                    f"Stopping OCR processing. {remaining_count} pages remaining. "
-                    f"Will proceed to graceful failure handler."
-                )
-                # Mark remaining pages as skipped
-                for remaining_page in pages_to_process_limited[page_idx:]:
+        page_outcomes = self._iter_page_ocr(
+            pages_to_process_limited[:max_total_attempts],
+            page_concurrency=page_concurrency,
+            delay_between_requests=delay_between_requests
+        )
+        try:
+            for page, ocr_result, ocr_error in page_outcomes:
+                if isinstance(ocr_error, OCRServiceUnavailableError):
+                    # OCR service is down - park the job instead of spending attempts
+                    raise ocr_error
+                total_ocr_attempts += 1
+                if ocr_error is not None:
+                    logger.error(
+                        f"OCR failed for page {page.page_number} (attempt {total_ocr_attempts}/{max_total_attempts}): {ocr_error}",
+                        exc_info=ocr_error
+                    )
+                    ocr_errors.append(f"Page {page.page_number}: {ocr_error}")
+                    # Mark this page as failed in results
                     page_ocr_results.append({
-                        'page_number': remaining_page.page_number,
+                        'page_number': page.page_number,
                         'fields': {},
                         'overall_document_confidence': 0.0,
                         'duration_ms': 0,
                         'coversheet_type': '',
                         'doc_type': '',
-                        'error': f'Skipped: max total attempts ({max_total_attempts}) reached',
+                        'error': str(ocr_error),
                         'raw': {}
                     })
-                break  # Exit loop, proceed to graceful failure
-            
-            try:
-                total_ocr_attempts += 1
-                logger.info(
-                    f"Running OCR on page {page.page_number}: {page.local_path} "
-                    f"(attempt {total_ocr_attempts}/{max_total_attempts} total)"
-                )
-                
-                # Run OCR on the local PDF file (OCR service has its own retries, but we track total attempts)
-                ocr_result = self.ocr_service.run_ocr_on_pdf(page.local_path)
+                    # Don't retry failed pages at end - we have max 3 total attempts
+                    # If we've hit the limit, we'll proceed to graceful failure
+                    continue
                 
                 fields = ocr_result.get('fields', {})
                 field_count = len(fields)
@@ -1660,30 +2120,31 @@ class DocumentProcessor:
                         break  # Stop processing remaining pages
                     # Note: If no page meets threshold, we'll process all pages
                     # and use coversheet detector to find best page
-            
-            except OCRServiceError as e:
-                logger.error(
-                    f"OCR failed for page {page.page_number} (attempt {total_ocr_attempts}/{max_total_attempts}): {e}",
-                    exc_info=True
+        finally:
+            # Cancels OCR requests not yet started when we stop early
+            page_outcomes.close()
+        
+        # Check if we've exceeded max total attempts with pages left
+        if not coversheet_found and total_ocr_attempts >= max_total_attempts:
+            remaining_pages_limited = pages_to_process_limited[total_ocr_attempts:]
+            if remaining_pages_limited:
+                logger.warning(
+                    f"Max total OCR attempts ({max_total_attempts}) reached. "
+                    f"Stopping OCR processing. {len(remaining_pages_limited)} pages remaining. "
+                    f"Will proceed to graceful failure handler."
                 )
-                ocr_errors.append(f"Page {page.page_number}: {e}")
-                # Mark this page as failed in results
-                page_ocr_results.append({
-                    'page_number': page.page_number,
-                    'fields': {},
-                    'overall_document_confidence': 0.0,
-                    'duration_ms': 0,
-                    'coversheet_type': '',
-                    'doc_type': '',
-                    'error': str(e),
-                    'raw': {}
-                })
-                # Don't retry failed pages at end - we have max 3 total attempts
-                # If we've hit the limit, we'll proceed to graceful failure
-            
-            # Add delay between requests to reduce load on OCR service
-            if delay_between_requests > 0 and page != pages_to_process[-1]:  # Don't delay after last page
-                time.sleep(delay_between_requests)
+                # Mark remaining pages as skipped
+                for remaining_page in remaining_pages_limited:
+                    page_ocr_results.append({
+                        'page_number': remaining_page.page_number,
+                        'fields': {},
+                        'overall_document_confidence': 0.0,
+                        'duration_ms': 0,
+                        'coversheet_type': '',
+                        'doc_type': '',
+                        'error': f'Skipped: max total attempts ({max_total_attempts}) reached',
+                        'raw': {}
+                    })
         
         # If we stopped early due to finding coversheet, log remaining pages
         if coversheet_found:
@@ -1836,6 +2297,9 @@ class DocumentProcessor:
                         'skip_reason': f'Early stopping: coversheet found at page {coversheet_page_number}'
                     })
         
+        # Pre-ranking OCRs pages out of order; persist them in page order
+        ocr_metadata_pages.sort(key=lambda page_meta: page_meta['page_number'])
+        
         ocr_metadata = {
             'version': 'v1',
             'pages': ocr_metadata_pages,
@@ -4,6 +4,7 @@ Implements resume-on-retry using existing DB fields as checkpoints.
 No schema changes required.
 """
 import logging
+import threading
 from typing import Optional, Dict, Any
 from pathlib import Path
 from datetime import datetime, timezone
@@ -52,7 +53,8 @@ def check_resume_state(
     Uses existing DB fields as checkpoints:
     - ocr_status == 'DONE' → fully processed, no resume needed
     - split_status == 'DONE' and pages_metadata exists → resume from OCR
-    - consolidated_blob_path exists → resume from split
+    - consolidated_blob_path exists → resume from split (pages recorded in
+      pages_metadata with a matching hash are not uploaded again)
     - packet_document exists → resume from merge/download
     
     Args:
@@ -227,3 +229,143 @@ def get_page_blob_paths_from_metadata(packet_document: PacketDocumentDB) -> Dict
     
     return result
 
+
+
+def get_page_hashes_from_metadata(packet_document: PacketDocumentDB) -> Dict[int, Dict[str, Any]]:
+    """
+    Extract page blob paths and sha256 hashes from committed pages_metadata.pages.
+    
+    Args:
+        packet_document: PacketDocumentDB instance
+        
+    Returns:
+        Dict mapping page_number to {'page_number', 'blob_path', 'sha256'} (pages without a hash are omitted)
+    """
+    pages_metadata = packet_document.pages_metadata
+    if not isinstance(pages_metadata, dict):
+        return {}
+    
+    result = {}
+    for page in pages_metadata.get('pages', []):
+        page_num = page.get('page_number')
+        blob_path = page.get('blob_path') or page.get('relative_path')
+        if isinstance(page_num, int) and blob_path and page.get('sha256'):
+            result[page_num] = {'page_number': page_num, 'blob_path': blob_path, 'sha256': page['sha256']}
+    
+    return result
+
+
+def get_page_upload_checkpoint(packet_document: PacketDocumentDB) -> Dict[int, Dict[str, Any]]:
+    """
+    Extract per-page upload progress recorded by PageUploadCheckpoint.
+    
+    Args:
+        packet_document: PacketDocumentDB instance
+        
+    Returns:
+        Dict mapping page_number to {'page_number', 'blob_path', 'sha256'}
+    """
+    pages_metadata = packet_document.pages_metadata
+    if not isinstance(pages_metadata, dict):
+        return {}
+    
+    checkpoint = pages_metadata.get('upload_checkpoint') or {}
+    result = {}
+    for page in checkpoint.get('pages', []):
+        page_num = page.get('page_number')
+        if isinstance(page_num, int) and page.get('blob_path') and page.get('sha256'):
+            result[page_num] = page
+    
+    return result
+
+
+class PageUploadCheckpoint:
+    """
+    Records page upload progress (blob path and sha256) in pages_metadata.upload_checkpoint
+    while Step 9 runs, so a resume from split only uploads pages that are missing or changed.
+    
+    Progress is written every flush_every pages and on flush(); the existing
+    pages_metadata.pages are left untouched until Transaction C replaces the whole
+    pages_metadata (which also drops the checkpoint).
+    """
+    
+    def __init__(self, packet_document_id: int, flush_every: int = 10):
+        self.packet_document_id = packet_document_id
+        self.flush_every = max(1, flush_every)
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._pending = 0
+    
+    def load(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Load page hashes known from earlier runs.
+        
+        Combines the committed pages_metadata.pages (previous build, REPLACE policy) with
+        progress recorded by an interrupted attempt, which is newer and wins. Only the
+        interrupted attempt's progress is carried forward into this checkpoint.
+        """
+        with get_db_session() as db:
+            packet_document = db.query(PacketDocumentDB).filter(
+                PacketDocumentDB.packet_document_id == self.packet_document_id
+            ).first()
+            if not packet_document:
+                return {}
+            known = get_page_hashes_from_metadata(packet_document)
+            entries = get_page_upload_checkpoint(packet_document)
+        with self._lock:
+            self._entries = dict(entries)
+        known.update(entries)
+        return known
+    
+    def record(self, page: Dict[str, Any], upload_result: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record one uploaded page (signature matches BlobStorageClient.upload_pages on_uploaded).
+        
+        Flushes to the DB every flush_every pages; a failed flush is logged and retried
+        with the next one, it never fails the upload.
+        """
+        with self._lock:
+            self._entries[page['page_number']] = {
+                'page_number': page['page_number'],
+                'blob_path': page['dest_blob_path'],
+                'sha256': page.get('sha256'),
+            }
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._flush_locked()
+    
+    def flush(self) -> None:
+        """Write progress not yet recorded to the DB"""
+        with self._lock:
+            if self._pending:
+                self._flush_locked()
+    
+    def _flush_locked(self) -> None:
+        try:
+            with get_db_session() as db:
+                packet_document = db.query(PacketDocumentDB).filter(
+                    PacketDocumentDB.packet_document_id == self.packet_document_id
+                ).first()
+                if not packet_document:
+                    return
+                
+                pages_metadata = packet_document.pages_metadata
+                if not isinstance(pages_metadata, dict):
+                    pages_metadata = {'version': 'v1', 'pages': pages_metadata or []}
+                pages_metadata = dict(pages_metadata)
+                pages_metadata['upload_checkpoint'] = {
+                    'pages': [self._entries[n] for n in sorted(self._entries)],
+                    'updated_at': datetime.now(timezone.utc).isoformat()
+                }
+                packet_document.pages_metadata = pages_metadata
+                flag_modified(packet_document, 'pages_metadata')
+                db.commit()
+            self._pending = 0
+            logger.debug(
+                f"Page upload checkpoint saved: packet_document_id={self.packet_document_id}, "
+                f"pages={len(self._entries)}"
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to save page upload checkpoint for packet_document_id={self.packet_document_id}: {e}"
+            )
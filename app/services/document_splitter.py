@@ -11,12 +11,13 @@ All output is standardized to PDF format:
 Output files are temporary only. They must be uploaded to Azure Blob Storage
 by the DocumentProcessor after splitting.
 """
+import io
 import os
 import hashlib
 import logging
 import tempfile
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Union
 from pydantic import BaseModel, Field
 
 # PDF handling - prefer PyMuPDF (fitz) for production-ready form field preservation
@@ -53,6 +54,20 @@ try:
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+from app.services.cpu_pool import get_cpu_pool
+from app.services.tiff_passthrough import get_passthrough_image, build_image_pdf, open_tiff
+
+logger = logging.getLogger(__name__)
+
+FLATTEN_ALL = "all"
+FLATTEN_SELECTIVE = "selective"
+
+# Default flattening resolution (matches the original 2x zoom of 72 dpi page space)
+DEFAULT_FLATTEN_DPI = 144
+
+# Pages produced per chunk when streaming large documents (iter_split_pdf, TIFF frames)
+DEFAULT_CHUNK_PAGES = 50
+
 
 class DocumentSplitError(Exception):
     """Custom exception for document splitting operations"""
@@ -62,11 +77,12 @@ class DocumentSplitError(Exception):
 class SplitPage(BaseModel):
     """Metadata for a single split page"""
     page_number: int = Field(..., description="Page number (1-based)")
-    local_path: str = Field(..., description="Temporary local path of generated split PDF")
+    local_path: Optional[str] = Field(None, description="Temporary local path of generated split PDF (None if kept in memory)")
     dest_blob_path: str = Field(..., description="Relative blob path where this page will be uploaded")
     content_type: str = Field(default="application/pdf", description="MIME type (always application/pdf)")
     file_size_bytes: int = Field(..., description="File size in bytes")
     sha256: Optional[str] = Field(None, description="SHA256 hash of the file (optional)")
+    content: Optional[bytes] = Field(None, exclude=True, repr=False, description="PDF bytes for pages kept in memory")
 
 
 class SplitResult(BaseModel):
@@ -84,7 +100,7 @@ class SplitResult(BaseModel):
             "pages": [
                 {
                     "page_number": page.page_number,
-                    "file_name": os.path.basename(page.local_path),
+                    "file_name": os.path.basename(page.local_path or page.dest_blob_path),
                     "relative_path": page.dest_blob_path,
                     "is_coversheet": False,  # Will be set by coversheet detection logic
                     "content_type": page.content_type,
@@ -103,13 +119,38 @@ class DocumentSplitter:
     All output is standardized to PDF format for consistent UI preview and OCR processing.
     """
     
-    def __init__(self, temp_dir: Optional[str] = None):
+    def __init__(
+        self,
+        temp_dir: Optional[str] = None,
+        flatten_mode: str = FLATTEN_SELECTIVE,
+        flatten_dpi: int = DEFAULT_FLATTEN_DPI,
+        tiff_passthrough: bool = True,
+        chunk_pages: int = DEFAULT_CHUNK_PAGES,
+        streaming_page_threshold: int = 0,
+        streaming_min_bytes: int = 0
+    ):
         """
         Initialize document splitter.
         
         Args:
             temp_dir: Base directory for temporary files. If None, uses system temp directory.
+            flatten_mode: PDF page flattening: 'selective' renders only pages with form
+                widgets or annotations (other pages are copied as-is), 'all' renders every page
+            flatten_dpi: Resolution used when rendering a page to flatten it
+            tiff_passthrough: Embed CCITT G4/JPEG TIFF frames without decoding them
+            chunk_pages: Pages per chunk for iter_split_pdf and TIFF frame conversion
+            streaming_page_threshold: PDFs with more pages are split in streaming chunks (0 = never)
+            streaming_min_bytes: PDFs larger than this are split in streaming chunks (0 = never)
         """
+        if flatten_mode not in (FLATTEN_ALL, FLATTEN_SELECTIVE):
+            raise ValueError(f"flatten_mode must be '{FLATTEN_SELECTIVE}' or '{FLATTEN_ALL}', got '{flatten_mode}'")
+        self.flatten_mode = flatten_mode
+        self.flatten_dpi = max(36, int(flatten_dpi))
+        self.tiff_passthrough = tiff_passthrough
+        self.chunk_pages = max(1, int(chunk_pages))
+        self.streaming_page_threshold = max(0, int(streaming_page_threshold))
+        self.streaming_min_bytes = max(0, int(streaming_min_bytes))
+        
         if temp_dir:
             self.temp_dir = Path(temp_dir)
             self.temp_dir.mkdir(parents=True, exist_ok=True)
@@ -195,6 +236,162 @@ class DocumentSplitter:
             # Wrap other exceptions
             raise DocumentSplitError(f"Failed to split document: {e}") from e
     
+    def should_stream(self, page_count: int, size_bytes: int) -> bool:
+        """
+        Check whether a PDF is large enough to be split in streaming chunks.
+        
+        Args:
+            page_count: Number of pages in the PDF
+            size_bytes: Size of the PDF file
+            
+        Returns:
+            True if either streaming threshold is enabled and exceeded
+        """
+        if self.streaming_page_threshold and page_count > self.streaming_page_threshold:
+            return True
+        return bool(self.streaming_min_bytes and size_bytes > self.streaming_min_bytes)
+    
+    def iter_split_pdf(
+        self,
+        *,
+        input_path: str,
+        unique_id: str,
+        document_unique_identifier: str,
+        chunk_pages: Optional[int] = None
+    ) -> Iterator[SplitResult]:
+        """
+        Split a PDF into per-page PDFs in chunks (streaming mode for very large documents).
+        
+        Each chunk is written only when the previous one has been consumed, so the caller
+        can upload a chunk and delete its files before the next one is produced; peak
+        scratch disk is one chunk instead of the whole document. The source PDF stays
+        open (pages are loaded on demand) until the iterator is exhausted or closed.
+        
+        Args:
+            input_path: Local file path to the PDF
+            unique_id: Unique identifier for the message/packet
+            document_unique_identifier: Unique identifier for the document
+            chunk_pages: Pages per chunk (default: self.chunk_pages)
+            
+        Yields:
+            SplitResult per chunk (page_count is the chunk's page count; page numbers are
+            document-wide)
+            
+        Raises:
+            DocumentSplitError: If splitting fails
+        """
+        if PDF_LIB is None:
+            raise DocumentSplitError(
+                "PDF library not available. Install PyMuPDF (recommended) or pypdf: pip install PyMuPDF"
+            )
+        if not Path(input_path).exists():
+            raise DocumentSplitError(f"Input file does not exist: {input_path}")
+        
+        chunk_pages = max(1, chunk_pages or self.chunk_pages)
+        processing_path = f"service_ops_processing/{unique_id}/{document_unique_identifier}/"
+        pages_dir = self.temp_dir / unique_id / document_unique_identifier / "pages"
+        pages_dir.mkdir(parents=True, exist_ok=True)
+        
+        input_file = None
+        try:
+            if PDF_LIB == "PyMuPDF":
+                doc = fitz.open(input_path)
+                total_pages = len(doc)
+            else:
+                input_file = open(input_path, 'rb')
+                doc = pypdf.PdfReader(input_file)
+                total_pages = len(doc.pages)
+        except Exception as e:
+            if input_file is not None:
+                input_file.close()
+            raise DocumentSplitError(f"Failed to open PDF: {e}") from e
+        
+        logger.info(f"Streaming split of {total_pages}-page PDF in chunks of {chunk_pages}: {input_path}")
+        
+        try:
+            for start in range(0, total_pages, chunk_pages):
+                page_numbers = range(start, min(start + chunk_pages, total_pages))
+                try:
+                    if PDF_LIB == "PyMuPDF":
+                        pages = self._split_fitz_document(doc, pages_dir, processing_path, page_numbers=page_numbers)
+                    else:
+                        pages = self._split_pypdf_pages(doc, page_numbers, pages_dir, processing_path)
+                except DocumentSplitError:
+                    raise
+                except Exception as e:
+                    raise DocumentSplitError(
+                        f"Failed to split PDF pages {page_numbers.start + 1}-{page_numbers.stop}: {e}"
+                    ) from e
+                
+                yield SplitResult(
+                    processing_path=processing_path,
+                    page_count=len(pages),
+                    pages=pages,
+                    local_paths=[page.local_path for page in pages if page.local_path]
+                )
+        finally:
+            if PDF_LIB == "PyMuPDF":
+                doc.close()
+            elif input_file is not None:
+                input_file.close()
+    
+    @staticmethod
+    def get_pdf_page_count(input_path: str) -> int:
+        """Count the pages of a PDF without loading them"""
+        if PDF_LIB == "PyMuPDF":
+            with fitz.open(input_path) as doc:
+                return len(doc)
+        if PDF_LIB is None:
+            raise DocumentSplitError("PDF library not available")
+        with open(input_path, 'rb') as input_file:
+            return len(pypdf.PdfReader(input_file).pages)
+    
+    def split_open_pdf(
+        self,
+        doc,
+        *,
+        unique_id: str,
+        document_unique_identifier: str,
+        in_memory: bool = False
+    ) -> SplitResult:
+        """
+        Split an already open PyMuPDF document into per-page PDFs.
+        
+        Used by PDFMerger.merge_and_split so the consolidated document is split from
+        memory instead of being re-opened and re-parsed from disk. The document is not
+        closed.
+        
+        Args:
+            doc: Open fitz.Document
+            unique_id: Unique identifier for the message/packet
+            document_unique_identifier: Unique identifier for the document
+            in_memory: Keep page PDFs as bytes (SplitPage.content) instead of writing files
+            
+        Returns:
+            SplitResult with metadata for all split pages
+            
+        Raises:
+            DocumentSplitError: If splitting fails or PyMuPDF is not available
+        """
+        if PDF_LIB != "PyMuPDF":
+            raise DocumentSplitError("Splitting an open PDF document requires PyMuPDF")
+        
+        processing_path = f"service_ops_processing/{unique_id}/{document_unique_identifier}/"
+        pages_dir = self.temp_dir / unique_id / document_unique_identifier / "pages"
+        pages_dir.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            pages = self._split_fitz_document(doc, pages_dir, processing_path, in_memory=in_memory)
+        except Exception as e:
+            raise DocumentSplitError(f"Failed to split PDF: {e}") from e
+        
+        return SplitResult(
+            processing_path=processing_path,
+            page_count=len(pages),
+            pages=pages,
+            local_paths=[page.local_path for page in pages if page.local_path]
+        )
+    
     def _split_pdf(self, input_path: Path, output_dir: Path, processing_path: str) -> List[SplitPage]:
         """Split PDF into per-page PDFs, preserving form fields and annotations"""
         if PDF_LIB is None:
@@ -208,102 +405,18 @@ class DocumentSplitter:
             if PDF_LIB == "PyMuPDF":
                 # Use PyMuPDF (fitz) - production-ready, preserves form fields and annotations
                 doc = fitz.open(input_path)
-                total_pages = len(doc)
-                
-                for page_num in range(total_pages):
-                    # CRITICAL: Flatten form fields by rendering the page
-                    # Form field values are stored in AcroForm dictionary, not as visible text.
-                    # We need to render the page (which shows form field values) and save that rendered version.
-                    page = doc[page_num]
-                    
-                    # Render page to image at high resolution to capture form field values as visible text
-                    # Then convert back to PDF - this "flattens" form fields into actual page content
-                    mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better quality
-                    pix = page.get_pixmap(matrix=mat, alpha=False)
-                    
-                    # Create new single-page document from the rendered image
-                    single_page_doc = fitz.open()  # Create new empty document
-                    # Insert the rendered page as a new page
-                    single_page_doc.new_page(width=page.rect.width, height=page.rect.height)
-                    new_page = single_page_doc[0]
-                    # Insert the rendered image
-                    new_page.insert_image(new_page.rect, pixmap=pix)
-                    
-                    # Output file path
-                    page_filename = f"page_{page_num + 1:04d}.pdf"
-                    output_path = output_dir / page_filename
-                    
-                    # Save the single-page PDF with flattened form fields (now as visible text/image)
-                    single_page_doc.save(output_path, deflate=True, garbage=4)
-                    single_page_doc.close()
-                    pix = None  # Free memory
-                    
-                    # Get file size and hash
-                    file_size = output_path.stat().st_size
-                    sha256 = self._calculate_sha256(output_path)
-                    
-                    # Destination blob path
-                    dest_blob_path = f"{processing_path}pages/{page_filename}"
-                    
-                    pages.append(SplitPage(
-                        page_number=page_num + 1,
-                        local_path=str(output_path),
-                        dest_blob_path=dest_blob_path,
-                        content_type="application/pdf",
-                        file_size_bytes=file_size,
-                        sha256=sha256
-                    ))
-                
-                doc.close()
+                try:
+                    pages = self._split_fitz_document(doc, output_dir, processing_path)
+                finally:
+                    doc.close()
                 
             else:
                 # Fallback to pypdf (has form field preservation issues)
                 with open(input_path, 'rb') as input_file:
                     pdf_reader = pypdf.PdfReader(input_file)
-                    total_pages = len(pdf_reader.pages)
-                    
-                    for page_num in range(total_pages):
-                        # Create single-page PDF
-                        pdf_writer = pypdf.PdfWriter()
-                        page = pdf_reader.pages[page_num]
-                        pdf_writer.add_page(page)
-                        
-                        # Try to preserve annotations (pypdf has limitations with form fields)
-                        try:
-                            if "/Annots" in page:
-                                if len(pdf_writer.pages) > 0:
-                                    pdf_writer.pages[0]["/Annots"] = page["/Annots"]
-                        except Exception as preserve_error:
-                            import logging
-                            logger = logging.getLogger(__name__)
-                            logger.warning(
-                                f"Could not preserve annotations/form fields for page {page_num + 1}: {preserve_error}. "
-                                f"Consider using PyMuPDF for better form field preservation."
-                            )
-                        
-                        # Output file path
-                        page_filename = f"page_{page_num + 1:04d}.pdf"
-                        output_path = output_dir / page_filename
-                        
-                        # Write single-page PDF
-                        with open(output_path, 'wb') as output_file:
-                            pdf_writer.write(output_file)
-                        
-                        # Get file size and hash
-                        file_size = output_path.stat().st_size
-                        sha256 = self._calculate_sha256(output_path)
-                        
-                        # Destination blob path
-                        dest_blob_path = f"{processing_path}pages/{page_filename}"
-                        
-                        pages.append(SplitPage(
-                            page_number=page_num + 1,
-                            local_path=str(output_path),
-                            dest_blob_path=dest_blob_path,
-                            content_type="application/pdf",
-                            file_size_bytes=file_size,
-                            sha256=sha256
-                        ))
+                    pages = self._split_pypdf_pages(
+                        pdf_reader, range(len(pdf_reader.pages)), output_dir, processing_path
+                    )
         
         except Exception as e:
             # Clean up any created files
@@ -317,13 +430,184 @@ class DocumentSplitter:
         
         return pages
     
+    def _split_pypdf_pages(
+        self,
+        pdf_reader,
+        page_numbers: range,
+        output_dir: Path,
+        processing_path: str
+    ) -> List[SplitPage]:
+        """
+        Write one single-page PDF per page of an open pypdf reader (fallback when PyMuPDF
+        is not available). Pages already written are removed on failure.
+        """
+        pages = []
+        try:
+            for page_num in page_numbers:
+                # Create single-page PDF
+                pdf_writer = pypdf.PdfWriter()
+                page = pdf_reader.pages[page_num]
+                pdf_writer.add_page(page)
+                
+                # Try to preserve annotations (pypdf has limitations with form fields)
+                try:
+                    if "/Annots" in page:
+                        if len(pdf_writer.pages) > 0:
+                            pdf_writer.pages[0]["/Annots"] = page["/Annots"]
+                except Exception as preserve_error:
+                    logger.warning(
+                        f"Could not preserve annotations/form fields for page {page_num + 1}: {preserve_error}. "
+                        f"Consider using PyMuPDF for better form field preservation."
+                    )
+                
+                # Output file path
+                page_filename = f"page_{page_num + 1:04d}.pdf"
+                output_path = output_dir / page_filename
+                
+                # Write single-page PDF (hashed as it is written)
+                with open(output_path, 'wb') as output_file:
+                    writer = HashingWriter(output_file)
+                    pdf_writer.write(writer)
+                
+                file_size = writer.size
+                sha256 = writer.hexdigest()
+                
+                # Destination blob path
+                dest_blob_path = f"{processing_path}pages/{page_filename}"
+                
+                pages.append(SplitPage(
+                    page_number=page_num + 1,
+                    local_path=str(output_path),
+                    dest_blob_path=dest_blob_path,
+                    content_type="application/pdf",
+                    file_size_bytes=file_size,
+                    sha256=sha256
+                ))
+        except Exception:
+            for written in pages:
+                Path(written.local_path).unlink(missing_ok=True)
+            raise
+        
+        return pages
+    
+    def _split_fitz_document(
+        self,
+        doc,
+        output_dir: Path,
+        processing_path: str,
+        in_memory: bool = False,
+        page_numbers: Optional[range] = None
+    ) -> List[SplitPage]:
+        """
+        Write one single-page PDF per page of an open PyMuPDF document.
+        
+        Pages with form widgets or annotations are flattened by rendering (see flatten_mode);
+        other pages are copied as-is. With in_memory the page PDFs are kept as bytes
+        instead of files. page_numbers (0-based) limits the split to a chunk of the
+        document. Pages already written are removed on failure.
+        """
+        if page_numbers is None:
+            page_numbers = range(len(doc))
+        pages = []
+        flattened_count = 0
+        
+        needs_flattening = {
+            page_num: self.flatten_mode == FLATTEN_ALL or self._page_needs_flattening(doc[page_num])
+            for page_num in page_numbers
+        }
+        # Rendering runs in the CPU pool; each page to flatten is sent as its own
+        # one-page PDF and results come back in page order
+        rendered_pages = get_cpu_pool().imap(
+            flatten_page_pdf,
+            (
+                (self._extract_page_pdf(doc, page_num), self.flatten_dpi)
+                for page_num in page_numbers if needs_flattening[page_num]
+            )
+        )
+        
+        try:
+            for page_num in page_numbers:
+                if needs_flattening[page_num]:
+                    # CRITICAL: Flatten form fields by rendering the page
+                    # Form field values are stored in AcroForm dictionary, not as visible text.
+                    # The rendered page comes back serialized and is used as-is.
+                    content = next(rendered_pages)
+                    flattened_count += 1
+                else:
+                    # No widgets or annotations: copy the original page (vector text and
+                    # embedded scan images stay as they are - no re-rendering)
+                    content = self._extract_page_pdf(doc, page_num, deflate=True, garbage=4)
+                
+                # Output file path
+                page_filename = f"page_{page_num + 1:04d}.pdf"
+                output_path = output_dir / page_filename
+                
+                # Hash the page bytes before they are kept in memory or written
+                file_size = len(content)
+                sha256 = hashlib.sha256(content).hexdigest()
+                if in_memory:
+                    local_path = None
+                else:
+                    output_path.write_bytes(content)
+                    content = None
+                    local_path = str(output_path)
+                
+                # Destination blob path
+                dest_blob_path = f"{processing_path}pages/{page_filename}"
+                
+                pages.append(SplitPage(
+                    page_number=page_num + 1,
+                    local_path=local_path,
+                    dest_blob_path=dest_blob_path,
+                    content_type="application/pdf",
+                    file_size_bytes=file_size,
+                    sha256=sha256,
+                    content=content
+                ))
+        except Exception:
+            rendered_pages.close()  # Cancel renders not yet started
+            for written in pages:
+                if written.local_path:
+                    Path(written.local_path).unlink(missing_ok=True)
+            raise
+        
+        logger.info(
+            f"Split PDF into {len(pages)} pages (flatten_mode={self.flatten_mode}, "
+            f"flattened={flattened_count}, dpi={self.flatten_dpi})"
+        )
+        
+        return pages
+    
+    @staticmethod
+    def _extract_page_pdf(doc, page_num: int, **save_options) -> bytes:
+        """Copy one page (with its widgets and annotations) into a standalone PDF"""
+        single_page_doc = fitz.open()
+        try:
+            single_page_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
+            return single_page_doc.tobytes(**save_options)
+        finally:
+            single_page_doc.close()
+    
+    @staticmethod
+    def _page_needs_flattening(page) -> bool:
+        """
+        Check whether a PDF page has form widgets or annotations that must be rendered.
+        
+        Links are not annotations in PyMuPDF's annots() and are carried over by copying.
+        """
+        if page.first_widget is not None:
+            return True
+        return page.first_annot is not None
+    
     def _split_tiff(self, input_path: Path, output_dir: Path, processing_path: str) -> List[SplitPage]:
         """
         Split multi-page TIFF into per-frame PDFs.
         
         Uses seek+copy pattern to ensure each frame has independent pixel data.
         ImageSequence.Iterator can yield shared references, causing duplicate pages.
-        Each TIFF frame becomes one separate PDF file.
+        Each TIFF frame becomes one separate PDF file. Frames are converted chunk_pages
+        at a time and written before the next chunk, so only one chunk of page PDFs is
+        held in memory. Each chunk task gets the file path, not the TIFF bytes.
         """
         if not PIL_AVAILABLE:
             raise DocumentSplitError(
@@ -335,84 +619,26 @@ class DocumentSplitter:
             )
         
         pages = []
-        img = None
         
         try:
-            # Open TIFF image
-            img = Image.open(input_path)
+            logger.info(f"Splitting TIFF in chunks of {self.chunk_pages} frames: {input_path}")
             
-            # Load image to ensure n_frames is reliable (TIFF pages are a linked list)
-            img.load()
-            
-            # Build frames with seek+copy to ensure each frame has independent pixel data
-            # ImageSequence.Iterator can yield shared references, causing duplicate pages
-            frames = []
-            frame_idx = 0
             while True:
-                try:
-                    img.seek(frame_idx)
-                    frames.append(img.copy())  # Independent copy of pixel data
-                    frame_idx += 1
-                except EOFError:
+                # Decode frames and render one PDF per frame in the CPU pool
+                first_frame = len(pages)
+                frame_pdfs = get_cpu_pool().run(
+                    tiff_to_page_pdfs, str(input_path), self.tiff_passthrough, first_frame, self.chunk_pages
+                )
+                if not frame_pdfs:
+                    break
+                self._write_tiff_frames(frame_pdfs, first_frame, pages, output_dir, processing_path)
+                if len(frame_pdfs) < self.chunk_pages:
                     break
             
-            if not frames:
+            if not pages:
                 raise DocumentSplitError(f"TIFF file has no frames: {input_path}")
             
-            logger = logging.getLogger(__name__)
-            logger.info(f"Splitting TIFF with {len(frames)} frames: {input_path}")
-            
-            # Process each frame (already copied with independent pixel data)
-            for frame_idx, frame in enumerate(frames):
-                try:
-                    # Convert frame to RGB if necessary
-                    # Frame is already a copy, but we may need to convert color mode
-                    if frame.mode != 'RGB':
-                        frame_img = frame.convert('RGB')
-                    else:
-                        frame_img = frame  # Already RGB and independent copy
-                    
-                    # Output file path
-                    page_filename = f"page_{frame_idx + 1:04d}.pdf"
-                    output_path = output_dir / page_filename
-                    
-                    # Convert frame to PDF using reportlab
-                    # Get image dimensions
-                    img_width, img_height = frame_img.size
-                    
-                    # Create PDF with image
-                    c = canvas.Canvas(str(output_path), pagesize=(img_width, img_height))
-                    # Draw image at full size
-                    c.drawImage(ImageReader(frame_img), 0, 0, width=img_width, height=img_height)
-                    c.save()
-                    
-                    # Get file size and hash
-                    file_size = output_path.stat().st_size
-                    sha256 = self._calculate_sha256(output_path)
-                    
-                    # Destination blob path
-                    dest_blob_path = f"{processing_path}pages/{page_filename}"
-                    
-                    pages.append(SplitPage(
-                        page_number=frame_idx + 1,
-                        local_path=str(output_path),
-                        dest_blob_path=dest_blob_path,
-                        content_type="application/pdf",
-                        file_size_bytes=file_size,
-                        sha256=sha256
-                    ))
-                    
-                except Exception as e:
-                    # Clean up on error
-                    for page in pages:
-                        if Path(page.local_path).exists():
-                            try:
-                                Path(page.local_path).unlink()
-                            except Exception:
-                                pass
-                    raise DocumentSplitError(f"Failed to process TIFF frame {frame_idx + 1}: {e}") from e
-            
-            logger.info(f"Successfully split {len(frames)}-frame TIFF into {len(pages)} PDF pages")
+            logger.info(f"Successfully split {len(pages)}-frame TIFF into {len(pages)} PDF pages")
             
         except DocumentSplitError:
             # Re-raise DocumentSplitError as-is
@@ -426,16 +652,49 @@ class DocumentSplitter:
                     except Exception:
                         pass
             raise DocumentSplitError(f"Failed to split TIFF: {e}") from e
-        finally:
-            # Ensure image is closed
-            if img is not None:
-                try:
-                    img.close()
-                except Exception:
-                    pass
         
         return pages
     
+    @staticmethod
+    def _write_tiff_frames(
+        frame_pdfs: List[bytes],
+        first_frame: int,
+        pages: List[SplitPage],
+        output_dir: Path,
+        processing_path: str
+    ) -> None:
+        """Write a chunk of converted TIFF frames and append them to pages"""
+        for frame_idx, frame_pdf in enumerate(frame_pdfs, start=first_frame):
+            try:
+                # Output file path
+                page_filename = f"page_{frame_idx + 1:04d}.pdf"
+                output_path = output_dir / page_filename
+                output_path.write_bytes(frame_pdf)
+                file_size = len(frame_pdf)
+                sha256 = hashlib.sha256(frame_pdf).hexdigest()
+                
+                # Destination blob path
+                dest_blob_path = f"{processing_path}pages/{page_filename}"
+                
+                pages.append(SplitPage(
+                    page_number=frame_idx + 1,
+                    local_path=str(output_path),
+                    dest_blob_path=dest_blob_path,
+                    content_type="application/pdf",
+                    file_size_bytes=file_size,
+                    sha256=sha256
+                ))
+                
+            except Exception as e:
+                # Clean up on error
+                for page in pages:
+                    if Path(page.local_path).exists():
+                        try:
+                            Path(page.local_path).unlink()
+                        except Exception:
+                            pass
+                raise DocumentSplitError(f"Failed to process TIFF frame {frame_idx + 1}: {e}") from e
+    
     def _split_image(self, input_path: Path, output_dir: Path, processing_path: str) -> List[SplitPage]:
         """Convert single image (JPG/PNG) to 1-page PDF"""
         if not PIL_AVAILABLE:
@@ -462,15 +721,16 @@ class DocumentSplitter:
             page_filename = "page_0001.pdf"
             output_path = output_dir / page_filename
             
-            # Convert image to PDF using reportlab
-            c = canvas.Canvas(str(output_path), pagesize=(img_width, img_height))
-            # Draw image at full size
-            c.drawImage(ImageReader(img), 0, 0, width=img_width, height=img_height)
-            c.save()
+            # Convert image to PDF using reportlab (hashed as it is written)
+            with open(output_path, 'wb') as output_file:
+                writer = HashingWriter(output_file)
+                c = canvas.Canvas(writer, pagesize=(img_width, img_height))
+                # Draw image at full size
+                c.drawImage(ImageReader(img), 0, 0, width=img_width, height=img_height)
+                c.save()
             
-            # Get file size and hash
-            file_size = output_path.stat().st_size
-            sha256 = self._calculate_sha256(output_path)
+            file_size = writer.size
+            sha256 = writer.hexdigest()
             
             # Destination blob path
             dest_blob_path = f"{processing_path}pages/{page_filename}"
@@ -510,8 +770,9 @@ class DocumentSplitter:
             page_filename = "page_0001.pdf"
             output_path = output_dir / page_filename
             
-            # Create PDF with text
-            c = canvas.Canvas(str(output_path), pagesize=letter)
+            # Create PDF with text (rendered in memory, hashed before it is written)
+            buffer = io.BytesIO()
+            c = canvas.Canvas(buffer, pagesize=letter)
             width, height = letter
             
             # Set margins
@@ -550,9 +811,10 @@ class DocumentSplitter:
             
             c.save()
             
-            # Get file size and hash
-            file_size = output_path.stat().st_size
-            sha256 = self._calculate_sha256(output_path)
+            content = buffer.getvalue()
+            file_size = len(content)
+            sha256 = hashlib.sha256(content).hexdigest()
+            output_path.write_bytes(content)
             
             # Destination blob path
             dest_blob_path = f"{processing_path}pages/{page_filename}"
@@ -576,11 +838,107 @@ class DocumentSplitter:
                     pass
             raise DocumentSplitError(f"Failed to convert text to PDF: {e}") from e
     
-    def _calculate_sha256(self, file_path: Path) -> str:
-        """Calculate SHA256 hash of a file"""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+class HashingWriter:
+    """
+    File wrapper that computes the SHA256 and size of everything written through it,
+    so a page is hashed as it is produced instead of re-reading the written file.
+    """
+    
+    def __init__(self, file):
+        self._file = file
+        self._hash = hashlib.sha256()
+        self.size = 0
+    
+    def write(self, data) -> int:
+        self._hash.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+    
+    def tell(self) -> int:
+        return self._file.tell()
+    
+    def flush(self) -> None:
+        self._file.flush()
+    
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+# CPU pool tasks (module-level so worker processes can unpickle them)
+
+def flatten_page_pdf(page_pdf: bytes, dpi: int) -> bytes:
+    """
+    Render a one-page PDF (form field values and annotations included) to an image-only page.
+    
+    Args:
+        page_pdf: Standalone one-page PDF
+        dpi: Rendering resolution
+        
+    Returns:
+        One-page PDF bytes whose only content is the rendered image
+    """
+    with fitz.open(stream=page_pdf, filetype="pdf") as src_doc:
+        page = src_doc[0]
+        zoom = dpi / 72.0
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        
+        # Insert the rendered image as the only content of a new page
+        with fitz.open() as flat_doc:
+            new_page = flat_doc.new_page(width=page.rect.width, height=page.rect.height)
+            new_page.insert_image(new_page.rect, pixmap=pix)
+            return flat_doc.tobytes(deflate=True, garbage=4)
 
+
+def tiff_to_page_pdfs(
+    source: Union[str, bytes],
+    passthrough: bool = True,
+    first_frame: int = 0,
+    max_frames: Optional[int] = None
+) -> List[bytes]:
+    """
+    Convert each TIFF frame to its own one-page PDF.
+    
+    CCITT G4 and JPEG frames are embedded without decoding when passthrough is set
+    (see tiff_passthrough); other frames are decoded with seek+copy so each frame has
+    independent pixel data (ImageSequence.Iterator can yield shared references,
+    causing duplicate pages). first_frame/max_frames select a chunk of frames.
+    
+    Args:
+        source: TIFF file path (memory-mapped) or bytes
+        passthrough: Embed CCITT G4/JPEG frames without decoding
+        first_frame: First frame to convert (0-based)
+        max_frames: Frames to convert (None = to the end)
+    
+    Returns:
+        One PDF per frame, in frame order (empty if the TIFF has no frames from first_frame)
+    """
+    page_pdfs = []
+    with open_tiff(source) as (img, data):
+        frame_idx = first_frame
+        while max_frames is None or len(page_pdfs) < max_frames:
+            try:
+                img.seek(frame_idx)
+            except EOFError:
+                break
+            
+            passthrough_image = get_passthrough_image(img, data) if passthrough else None
+            if passthrough_image is not None:
+                page_pdfs.append(build_image_pdf([passthrough_image]))
+                frame_idx += 1
+                continue
+            
+            frame = img.copy()  # Independent copy of pixel data
+            
+            # Convert frame to RGB if necessary
+            if frame.mode != 'RGB':
+                frame = frame.convert('RGB')
+            
+            # Convert frame to PDF using reportlab, image at full size
+            img_width, img_height = frame.size
+            buffer = io.BytesIO()
+            c = canvas.Canvas(buffer, pagesize=(img_width, img_height))
+            c.drawImage(ImageReader(frame), 0, 0, width=img_width, height=img_height)
+            c.save()
+            page_pdfs.append(buffer.getvalue())
+            frame_idx += 1
+    return page_pdfs
@@ -0,0 +1,273 @@
+"""
+HTTP Client
+Process-wide pooled async HTTP client for outbound service calls (OCR, LetterGen,
+JSON Generator).
+
+Creating an httpx client per attempt paid a fresh TCP+TLS handshake on every call to
+the same few hosts. All calls now share one httpx.AsyncClient:
+- keep-alive pooling: idle connections are reused for http_client_keepalive_expiry_seconds
+- per-host limit: at most http_client_max_connections_per_host requests to one host at once
+  (one slow service cannot take the whole pool)
+- optional HTTP/2 (requires the h2 package; falls back to HTTP/1.1 when it is missing)
+
+The client runs on its own event loop thread, so the same pool serves async callers
+(await request/post) and the synchronous clients that run on executor threads
+(request_sync/post_sync), whatever event loop or thread they are called from.
+
+RetryPolicy and http_timeout give the integrations one retry and timeout policy;
+service-specific handling (error parsing, OCR circuit breaker) stays in the callers.
+"""
+import asyncio
+import importlib.util
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Coroutine, Dict, FrozenSet, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Server errors retried by default (other statuses fail immediately)
+DEFAULT_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry policy shared by the HTTP integrations.
+
+    Attempts are 1-based; the delay before retrying attempt n is
+    base_seconds * 2 ** (n - 1), doubled for slow_statuses (overloaded service).
+    """
+    max_attempts: int
+    base_seconds: float = 1.0
+    retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES
+    slow_statuses: FrozenSet[int] = frozenset()
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    def has_attempts_left(self, attempt: int) -> bool:
+        return attempt < self.max_attempts
+
+    def delay_seconds(self, attempt: int, status_code: Optional[int] = None) -> float:
+        delay = self.base_seconds * (2 ** (attempt - 1))
+        if status_code in self.slow_statuses:
+            delay *= 2
+        return delay
+
+
+def http_timeout(
+    read_seconds: float,
+    connect_seconds: Optional[float] = None,
+    write_seconds: float = 30.0,
+    pool_seconds: float = 30.0
+) -> httpx.Timeout:
+    """
+    Build a request timeout with a separate (short) connect timeout
+
+    Args:
+        read_seconds: Time to wait for the response
+        connect_seconds: Time to establish a connection (defaults to HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS)
+        write_seconds: Time to send the request body
+        pool_seconds: Time to wait for a pooled connection
+
+    Returns:
+        httpx.Timeout
+    """
+    if connect_seconds is None:
+        connect_seconds = settings.http_client_connect_timeout_seconds
+    return httpx.Timeout(
+        connect=min(connect_seconds, read_seconds),
+        read=read_seconds,
+        write=write_seconds,
+        pool=pool_seconds
+    )
+
+
+class PooledHTTPClient:
+    """
+    Shared httpx.AsyncClient running on a dedicated event loop thread.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 30.0,
+        max_connections_per_host: int = 0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize client (the event loop thread starts on first request)
+
+        Args:
+            max_connections: Connections open at once across all hosts
+            max_keepalive_connections: Idle connections kept for reuse
+            keepalive_expiry_seconds: Time an idle connection is kept
+            max_connections_per_host: Requests to one host at once (0 = only max_connections)
+            http2: Negotiate HTTP/2 where the server supports it (requires h2)
+            transport: Custom httpx transport (tests)
+        """
+        self.max_connections = max(1, int(max_connections))
+        self.max_keepalive_connections = max(0, int(max_keepalive_connections))
+        self.keepalive_expiry_seconds = max(0.0, float(keepalive_expiry_seconds))
+        self.max_connections_per_host = max(0, int(max_connections_per_host))
+        self.http2 = bool(http2)
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP_CLIENT_HTTP2 is set but the h2 package is not installed - using HTTP/1.1")
+            self.http2 = False
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        # Per-host semaphores and counters (only touched on the client's loop thread)
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._requests = 0
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="http-client", daemon=True)
+                thread.start()
+                self._client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive_connections,
+                        keepalive_expiry=self.keepalive_expiry_seconds
+                    ),
+                    http2=self.http2,
+                    transport=self._transport
+                )
+                self._loop, self._thread = loop, thread
+                logger.info(
+                    f"HTTP client started: max_connections={self.max_connections}, "
+                    f"per_host={self.max_connections_per_host or 'unlimited'}, http2={self.http2}"
+                )
+            return self._loop
+
+    def _submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._start())
+
+    async def _send(self, method: str, url: str, timeout: Union[httpx.Timeout, float, None], kwargs: Dict[str, Any]) -> httpx.Response:
+        host = urlsplit(url).netloc
+        slots = self._host_slots.get(host)
+        if slots is None and self.max_connections_per_host:
+            slots = self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        if slots is not None:
+            await slots.acquire()
+        self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        self._requests += 1
+        try:
+            if timeout is None:
+                return await self._client.request(method, url, **kwargs)
+            return await self._client.request(method, url, timeout=timeout, **kwargs)
+        finally:
+            self._in_flight[host] -= 1
+            if slots is not None:
+                slots.release()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: Union[httpx.Timeout, float, None] = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request from async code (any event loop)
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            timeout: Request timeout (None = httpx default)
+            **kwargs: Passed to httpx.AsyncClient.request (json, files, params, headers, ...)
+
+        Returns:
+            httpx.Response with the body read
+
+        Raises:
+            httpx.RequestError: On timeouts and connection errors
+        """
+        return await asyncio.wrap_future(self._submit(self._send(method, url, timeout, kwargs)))
+
+    def request_sync(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: Union[httpx.Timeout, float, None] = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request from a synchronous thread (blocks until the response is read)"""
+        return self._submit(self._send(method, url, timeout, kwargs)).result()
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def post_sync(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request_sync("POST", url, **kwargs)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'started': self._loop is not None,
+            'max_connections': self.max_connections,
+            'max_connections_per_host': self.max_connections_per_host,
+            'http2': self.http2,
+            'in_flight': {host: count for host, count in dict(self._in_flight).items() if count},
+            'requests': self._requests
+        }
+
+    def close(self) -> None:
+        """Close pooled connections and stop the event loop thread"""
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+        except Exception as e:
+            logger.warning(f"Error closing HTTP client connections: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+        self._host_slots.clear()
+        logger.info("HTTP client stopped")
+
+
+# Global client instance (shared by all outbound integrations in this process)
+_http_client: Optional[PooledHTTPClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHTTPClient:
+    """Get or create the global pooled HTTP client"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = PooledHTTPClient(
+                    max_connections=settings.http_client_max_connections,
+                    max_keepalive_connections=settings.http_client_max_keepalive_connections,
+                    keepalive_expiry_seconds=settings.http_client_keepalive_expiry_seconds,
+                    max_connections_per_host=settings.http_client_max_connections_per_host,
+                    http2=settings.http_client_http2
+                )
+    return _http_client
+
+
+def close_http_client() -> None:
+    """Close the global HTTP client's connections (application shutdown)"""
+    if _http_client is not None:
+        _http_client.close()
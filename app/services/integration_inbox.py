@@ -10,6 +10,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 
 from app.services.db import SessionLocal, get_db_session
+from app.services.channel_scheduler import INBOX_LANE_FILTERS
+from app.utils.sla import SUBMISSION_TYPE_FIELD_NAMES, SUBMISSION_TYPE_PAYLOAD_KEYS
 from app.models.integration_db import SendServiceOpsDB
 
 logger = logging.getLogger(__name__)
@@ -125,11 +127,17 @@ class IntegrationInboxService:
         """
         Poll for new messages from integration.send_serviceops
         
+        Projects only scalar columns and the JSON keys intake needs (message_type and the
+        submission type used for the SLA due date). The full payload is loaded once, when
+        the job is processed (get_source_message), so large ESMD payloads are not shipped
+        over the wire on every poll.
+        
         Args:
             batch_size: Maximum number of messages to fetch
             
         Returns:
-            List of message dictionaries with message_id, decision_tracking_id, payload, created_at
+            List of message dictionaries with message_id, decision_tracking_id, message_type,
+            created_at, channel_type_id, message_type_id, submission_type
         """
         # Use fresh session for this read operation
         db = self._get_db(fresh=True)
@@ -141,14 +149,15 @@ class IntegrationInboxService:
             # Documents can be missing/empty - will be handled gracefully in processing
             # For type 2/3: Only require decision_tracking_id (UTN events don't have documents)
             # Include channel_type_id and message_type_id from table
-            query = text("""
+            query = text(f"""
                 SELECT 
                     message_id,
                     decision_tracking_id,
-                    payload,
+                    payload->>'message_type' AS message_type,
                     created_at,
                     channel_type_id,
-                    message_type_id
+                    message_type_id,
+                    {self._submission_type_projection()} AS submission_type
                 FROM integration.send_serviceops
                 WHERE is_deleted = false
                     AND (
@@ -190,10 +199,11 @@ class IntegrationInboxService:
                 messages.append({
                     'message_id': row[0],
                     'decision_tracking_id': str(row[1]),
-                    'payload': row[2],
+                    'message_type': row[2],  # payload->>'message_type'
                     'created_at': row[3],
                     'channel_type_id': row[4] if len(row) > 4 else None,  # Can be None for backward compatibility
-                    'message_type_id': row[5] if len(row) > 5 else None  # message_type_id from table
+                    'message_type_id': row[5] if len(row) > 5 else None,  # message_type_id from table
+                    'submission_type': row[6] if len(row) > 6 else None  # Raw submission type known at intake
                 })
             
             return messages
@@ -205,6 +215,25 @@ class IntegrationInboxService:
             logger.error(f"Error polling new messages: {e}", exc_info=True)
             raise
     
+    @staticmethod
+    def _submission_type_projection() -> str:
+        """
+        SQL expression for the submission type known at intake (mirrors app.utils.sla)
+        
+        Genzeon Portal payloads carry coversheet fields in payload.ocr.fields (either
+        {"value": ...} objects or plain strings); any channel may send an explicit
+        top-level submission_type/submissionType/priority.
+        """
+        portal_fields = []
+        for field_name in SUBMISSION_TYPE_FIELD_NAMES:
+            path = f"payload->'ocr'->'fields'->'{field_name}'"
+            portal_fields.append(f"COALESCE({path}->>'value', CASE WHEN jsonb_typeof({path}) = 'string' THEN {path} #>> '{{}}' END)")
+        top_level = [f"payload->>'{key}'" for key in SUBMISSION_TYPE_PAYLOAD_KEYS]
+        return (
+            f"COALESCE(CASE WHEN channel_type_id = 1 THEN COALESCE({', '.join(portal_fields)}) END, "
+            f"{', '.join(top_level)})"
+        )
+    
     def insert_into_inbox(
         self,
         message_id: int,
@@ -212,7 +241,8 @@ class IntegrationInboxService:
         message_type: str,
         source_created_at: datetime,
         channel_type_id: Optional[int] = None,
-        message_type_id: Optional[int] = None
+        message_type_id: Optional[int] = None,
+        due_at: Optional[datetime] = None
     ) -> Optional[int]:
         """
         Idempotently insert a message into inbox
@@ -224,6 +254,7 @@ class IntegrationInboxService:
             source_created_at: Created timestamp from source table
             channel_type_id: Channel type ID (1=Portal, 2=Fax, 3=ESMD), optional for backward compatibility
             message_type_id: Message type ID (1=intake, 2=UTN success, 3=UTN fail), optional for backward compatibility
+            due_at: SLA due date used as claim priority (see app.utils.sla.calculate_inbox_due_at)
             
         Returns:
             inbox_id if inserted, None if already exists (idempotent)
@@ -241,7 +272,8 @@ class IntegrationInboxService:
                         source_created_at,
                         status,
                         channel_type_id,
-                        message_type_id
+                        message_type_id,
+                        due_at
                     )
                     VALUES (
                         :message_id,
@@ -250,7 +282,8 @@ class IntegrationInboxService:
                         :source_created_at,
                         'NEW',
                         :channel_type_id,
-                        :message_type_id
+                        :message_type_id,
+                        :due_at
                     )
                     ON CONFLICT (message_id) DO NOTHING
                     RETURNING inbox_id
@@ -261,7 +294,8 @@ class IntegrationInboxService:
                     'message_type': message_type,
                     'source_created_at': source_created_at,
                     'channel_type_id': channel_type_id,
-                    'message_type_id': message_type_id
+                    'message_type_id': message_type_id,
+                    'due_at': due_at
                 }
             ).fetchone()
             
@@ -279,13 +313,405 @@ class IntegrationInboxService:
             logger.error(f"Error inserting into inbox: {e}", exc_info=True)
             raise
     
+    def ingest_batch(
+        self,
+        rows: List[Dict[str, Any]],
+        max_created_at: datetime,
+        max_message_id: int
+    ) -> List[Dict[str, int]]:
+        """
+        Insert a polled batch into the inbox and advance the watermark in one transaction
+        
+        Uses a single multi-row INSERT ... ON CONFLICT (message_id) DO NOTHING, so the cycle
+        costs one commit instead of one per message plus one for the watermark, and rows can
+        never be inserted without the watermark moving past them (or vice versa).
+        
+        Args:
+            rows: Dicts with message_id, decision_tracking_id, message_type, source_created_at,
+                channel_type_id, message_type_id, due_at (same fields as insert_into_inbox)
+            max_created_at: Maximum created_at in the polled batch
+            max_message_id: message_id paired with max_created_at
+            
+        Returns:
+            List of {'inbox_id', 'message_id'} for newly inserted rows (duplicates are skipped)
+        """
+        if not rows:
+            return []
+        
+        params: Dict[str, Any] = {
+            'max_created_at': max_created_at,
+            'max_message_id': max_message_id
+        }
+        values_sql = []
+        for index, row in enumerate(rows):
+            values_sql.append(
+                f"(:message_id_{index}, CAST(:decision_tracking_id_{index} AS UUID), :message_type_{index}, "
+                f":source_created_at_{index}, 'NEW', :channel_type_id_{index}, :message_type_id_{index}, "
+                f":due_at_{index})"
+            )
+            params[f'message_id_{index}'] = row['message_id']
+            params[f'decision_tracking_id_{index}'] = str(row['decision_tracking_id'])  # Ensure it's a string for UUID cast
+            params[f'message_type_{index}'] = row['message_type']
+            params[f'source_created_at_{index}'] = row['source_created_at']
+            params[f'channel_type_id_{index}'] = row.get('channel_type_id')
+            params[f'message_type_id_{index}'] = row.get('message_type_id')
+            params[f'due_at_{index}'] = row.get('due_at')
+        
+        # Use fresh session: inserts and watermark commit together
+        db = self._get_db(fresh=True)
+        try:
+            result = db.execute(
+                text(f"""
+                    INSERT INTO service_ops.integration_inbox (
+                        message_id,
+                        decision_tracking_id,
+                        message_type,
+                        source_created_at,
+                        status,
+                        channel_type_id,
+                        message_type_id,
+                        due_at
+                    )
+                    VALUES {", ".join(values_sql)}
+                    ON CONFLICT (message_id) DO NOTHING
+                    RETURNING inbox_id, message_id
+                """),
+                params
+            ).fetchall()
+            
+            db.execute(
+                text("""
+                    INSERT INTO service_ops.integration_poll_watermark (
+                        id,
+                        last_created_at,
+                        last_message_id,
+                        updated_at
+                    )
+                    VALUES (1, :max_created_at, :max_message_id, NOW())
+                    ON CONFLICT (id) 
+                    DO UPDATE SET 
+                        last_created_at = GREATEST(
+                            service_ops.integration_poll_watermark.last_created_at,
+                            EXCLUDED.last_created_at
+                        ),
+                        last_message_id = GREATEST(
+                            service_ops.integration_poll_watermark.last_message_id,
+                            EXCLUDED.last_message_id
+                        ),
+                        updated_at = NOW()
+                """),
+                params
+            )
+            
+            db.commit()
+            return [{'inbox_id': row[0], 'message_id': row[1]} for row in result]
+        except Exception as e:
+            try:
+                db.rollback()
+            except Exception:
+                pass
+            logger.error(f"Error ingesting batch into inbox: {e}", exc_info=True)
+            raise
+    
+    # Eligible, unlocked pending rows (shared by claim_jobs candidate queries)
+    _CLAIMABLE_WHERE = """
+                        status IN ('NEW', 'FAILED')
+                            AND next_attempt_at <= NOW()
+                            AND (
+                                locked_at IS NULL
+                                OR COALESCE(lease_expires_at, locked_at + make_interval(secs => :lease_seconds)) < NOW()
+                            )"""
+    
+    # SLA claim key with aging (earliest first)
+    _CLAIM_KEY = """COALESCE(due_at, source_created_at + INTERVAL '72 hours')
+                                - (NOW() - source_created_at) * :aging_factor"""
+    
+    # Earliest-due rows (index order) that aging may reorder in one claim
+    CLAIM_AGING_WINDOW = 100
+    
+    def _claim_window_sql(self, lane_filter: str = "") -> str:
+        """
+        Build the FROM clause of claim_jobs candidate queries: a bounded, unlocked window
+        of claimable rows joined back to integration_inbox
+        
+        Up to a constant, the aged claim key equals due date + aging_factor * source_created_at,
+        so the claim order does not depend on NOW(). It does depend on the aging factor (a
+        setting), and serving it from an index would take an expression index per factor,
+        maintained on every inbox write. Instead the window is read in
+        (due_at, source_created_at, message_id) order, which idx_integration_inbox_due_at_pending
+        (migration 033) serves without a sort, and stops after :aging_window rows. Callers
+        re-order the window by the aged claim key, so aging is a bounded tiebreak among the
+        earliest-due rows instead of a sort of every pending row.
+        
+        The window takes no locks. Callers lock only the rows they pick with
+        FOR UPDATE OF integration_inbox SKIP LOCKED under their LIMIT, and re-check
+        _CLAIMABLE_WHERE on the locked row, so concurrent claimers skip only rows another
+        claimer actually picked, not its whole window.
+        
+        Args:
+            lane_filter: Optional extra SQL predicate (one lane's rows)
+        """
+        lane_sql = f"\n                                AND {lane_filter}" if lane_filter else ""
+        return f"""(
+                            SELECT inbox_id
+                            FROM service_ops.integration_inbox
+                            WHERE {self._CLAIMABLE_WHERE}{lane_sql}
+                            ORDER BY due_at ASC, source_created_at ASC, message_id ASC
+                            LIMIT :aging_window
+                        ) claim_window
+                        JOIN service_ops.integration_inbox USING (inbox_id)
+                        WHERE {self._CLAIMABLE_WHERE}"""
+    
+    def claim_jobs(
+        self,
+        worker_id: str,
+        limit: int,
+        lease_seconds: int,
+        priority_aging_factor: float = 1.0,
+        lanes: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Atomically claim up to `limit` eligible jobs in one statement (multi-worker safe)
+        
+        Each claimed row gets a lease (lease_expires_at = NOW() + lease_seconds). The worker
+        must call renew_leases() while a job is still running; rows whose lease expires are
+        reclaimed by StuckJobReclaimer.
+        
+        Jobs are claimed earliest SLA due date first. For starvation protection the claim key
+        is aged: every hour a job waits pulls its key forward by priority_aging_factor hours,
+        so a Standard job cannot be overtaken indefinitely by newer Expedited jobs. Order
+        within the same SLA class stays first-in, first-out. Aging re-orders only the
+        CLAIM_AGING_WINDOW earliest-due claimable rows, which are read from the pending-row
+        index instead of sorting the whole backlog.
+        
+        With `lanes` (see ChannelFairScheduler.plan), each lane offers up to its quota of
+        rows (in claim key order) and slots are filled in weighted fair order across lanes:
+        the n-th row of a lane gets finish tag (in_flight + n) / weight, lowest tags win.
+        
+        Args:
+            worker_id: Unique identifier for this worker
+            limit: Maximum number of jobs to claim
+            lease_seconds: Lease duration per claimed row
+            priority_aging_factor: Hours of priority gained per hour waited (0 = strict earliest-due-first)
+            lanes: Optional lane -> {'quota', 'weight', 'in_flight'}; only these lanes are claimed
+            
+        Returns:
+            List of job dicts (same shape as claim_job), empty if no jobs available
+        """
+        if limit <= 0:
+            return []
+        
+        params = {
+            'worker_id': worker_id,
+            'limit': limit,
+            'lease_seconds': lease_seconds,
+            'aging_factor': priority_aging_factor,
+            'aging_window': max(self.CLAIM_AGING_WINDOW, limit)
+        }
+        
+        if lanes is not None:
+            lane_plan = {lane: offer for lane, offer in lanes.items() if offer['quota'] > 0}
+            if not lane_plan:
+                return []
+            candidates_sql = self._fair_candidates_sql(lane_plan, params)
+        else:
+            candidates_sql = f"""
+                    candidates AS (
+                        SELECT inbox_id
+                        FROM {self._claim_window_sql()}
+                        ORDER BY
+                            {self._CLAIM_KEY} ASC,
+                            source_created_at ASC,
+                            message_id ASC
+                        LIMIT :limit
+                        FOR UPDATE OF integration_inbox SKIP LOCKED
+                    ),"""
+        
+        # Use fresh session for each claim
+        db = self._get_db(fresh=True)
+        try:
+            result = db.execute(
+                text(f"""
+                    WITH {candidates_sql}
+                    claimed AS (
+                        UPDATE service_ops.integration_inbox
+                        SET 
+                            status = 'PROCESSING',
+                            locked_by = :worker_id,
+                            locked_at = NOW(),
+                            lease_expires_at = NOW() + make_interval(secs => :lease_seconds),
+                            attempt_count = attempt_count + 1,
+                            updated_at = NOW()
+                        FROM candidates
+                        WHERE integration_inbox.inbox_id = candidates.inbox_id
+                        RETURNING integration_inbox.*
+                    )
+                    SELECT 
+                        inbox_id,
+                        message_id,
+                        decision_tracking_id,
+                        message_type,
+                        source_created_at,
+                        status,
+                        attempt_count,
+                        locked_by,
+                        locked_at,
+                        channel_type_id,
+                        message_type_id,
+                        lease_expires_at,
+                        due_at
+                    FROM claimed
+                    ORDER BY due_at ASC NULLS LAST, source_created_at ASC, message_id ASC
+                """),
+                params
+            ).fetchall()
+            
+            if result:
+                db.commit()
+                return [self._job_from_row(row) for row in result]
+            else:
+                db.rollback()
+                return []
+        except Exception as e:
+            try:
+                db.rollback()
+            except Exception:
+                pass
+            logger.error(f"Error claiming jobs: {e}", exc_info=True)
+            raise
+    
+    def _fair_candidates_sql(self, lane_plan: Dict[str, Dict[str, float]], params: Dict[str, Any]) -> str:
+        """
+        Build the candidates CTE for lane-aware claiming (adds lane parameters to params)
+        
+        Each lane locks up to its quota of rows in a separate CTE (FOR UPDATE is not allowed
+        on UNION or window queries; only the quota is locked, not the lane's claim window),
+        then rows are ranked per lane and picked by finish tag.
+        Rows locked but not picked are released when the claim transaction commits.
+        """
+        lane_ctes = []
+        lane_selects = []
+        tag_cases = []
+        for index, (lane, offer) in enumerate(lane_plan.items()):
+            params[f'quota_{index}'] = int(offer['quota'])
+            params[f'weight_{index}'] = float(offer['weight'])
+            params[f'in_flight_{index}'] = int(offer['in_flight'])
+            lane_ctes.append(f"""
+                    lane_{index} AS (
+                        SELECT inbox_id, {index} AS lane_index, {self._CLAIM_KEY} AS claim_key,
+                            source_created_at, message_id
+                        FROM {self._claim_window_sql(INBOX_LANE_FILTERS[lane])}
+                        ORDER BY claim_key ASC, source_created_at ASC, message_id ASC
+                        LIMIT :quota_{index}
+                        FOR UPDATE OF integration_inbox SKIP LOCKED
+                    ),""")
+            lane_selects.append(f"SELECT * FROM lane_{index}")
+            tag_cases.append(f"WHEN {index} THEN (:in_flight_{index} + lane_rank) / :weight_{index}")
+        
+        union_sql = "\n                        UNION ALL ".join(lane_selects)
+        tag_sql = " ".join(tag_cases)
+        return "".join(lane_ctes) + f"""
+                    lane_candidates AS (
+                        {union_sql}
+                    ),
+                    ranked AS (
+                        SELECT inbox_id, lane_index, claim_key, source_created_at, message_id,
+                            ROW_NUMBER() OVER (
+                                PARTITION BY lane_index
+                                ORDER BY claim_key ASC, source_created_at ASC, message_id ASC
+                            ) AS lane_rank
+                        FROM lane_candidates
+                    ),
+                    candidates AS (
+                        SELECT inbox_id
+                        FROM ranked
+                        ORDER BY
+                            CASE lane_index {tag_sql} END ASC,
+                            claim_key ASC,
+                            source_created_at ASC,
+                            message_id ASC
+                        LIMIT :limit
+                    ),"""
+    
+    def renew_leases(self, inbox_ids: List[int], worker_id: str, lease_seconds: int) -> List[int]:
+        """
+        Extend the lease on jobs this worker still holds (one statement for all jobs)
+        
+        Only rows still PROCESSING and locked by worker_id are renewed. A missing id in
+        the result means the lease was lost (e.g. reclaimed after expiry) and the worker
+        should not assume exclusive ownership any more.
+        
+        Args:
+            inbox_ids: Inbox IDs currently held by this worker
+            worker_id: Worker that claimed the jobs
+            lease_seconds: New lease duration from now
+            
+        Returns:
+            List of inbox_ids whose lease was renewed
+        """
+        if not inbox_ids:
+            return []
+        
+        # Use fresh session
+        db = self._get_db(fresh=True)
+        try:
+            result = db.execute(
+                text("""
+                    UPDATE service_ops.integration_inbox
+                    SET 
+                        lease_expires_at = NOW() + make_interval(secs => :lease_seconds),
+                        updated_at = NOW()
+                    WHERE inbox_id = ANY(:inbox_ids)
+                        AND status = 'PROCESSING'
+                        AND locked_by = :worker_id
+                    RETURNING inbox_id
+                """),
+                {
+                    'inbox_ids': list(inbox_ids),
+                    'worker_id': worker_id,
+                    'lease_seconds': lease_seconds
+                }
+            ).fetchall()
+            
+            db.commit()
+            return [row[0] for row in result]
+        except Exception as e:
+            try:
+                db.rollback()
+            except Exception:
+                pass
+            logger.error(f"Error renewing leases: {e}", exc_info=True)
+            raise
+    
+    @staticmethod
+    def _job_from_row(row) -> Dict[str, Any]:
+        """Convert a claimed inbox row to a job dict"""
+        return {
+            'inbox_id': row[0],
+            'message_id': row[1],
+            'decision_tracking_id': str(row[2]),
+            'message_type': row[3],
+            'source_created_at': row[4],
+            'status': row[5],
+            'attempt_count': row[6],
+            'locked_by': row[7],
+            'locked_at': row[8],
+            'channel_type_id': row[9] if len(row) > 9 else None,  # Can be None
+            'message_type_id': row[10] if len(row) > 10 else None,  # Can be None
+            'lease_expires_at': row[11] if len(row) > 11 else None,
+            'due_at': row[12] if len(row) > 12 else None
+        }
+    
     def claim_job(self, worker_id: str, stale_lock_minutes: int = 10) -> Optional[Dict[str, Any]]:
         """
         Atomically claim one eligible job for processing (multi-worker safe)
         
+        Prefer claim_jobs() for batch claiming with explicit leases. Jobs are claimed
+        strictly earliest-due first (index order, no aging).
+        
         Args:
             worker_id: Unique identifier for this worker
-            stale_lock_minutes: Minutes after which a lock is considered stale
+            stale_lock_minutes: Lease length in minutes (also the stale threshold for rows without a lease)
             
         Returns:
             Dict with job details if claimed, None if no jobs available
@@ -302,6 +728,7 @@ class IntegrationInboxService:
                             status = 'PROCESSING',
                             locked_by = :worker_id,
                             locked_at = NOW(),
+                            lease_expires_at = NOW() + INTERVAL '{stale_lock_minutes} minutes',
                             attempt_count = attempt_count + 1,
                             updated_at = NOW()
                         WHERE inbox_id = (
@@ -311,9 +738,9 @@ class IntegrationInboxService:
                                 AND next_attempt_at <= NOW()
                                 AND (
                                     locked_at IS NULL
-                                    OR locked_at < NOW() - INTERVAL '{stale_lock_minutes} minutes'
+                                    OR COALESCE(lease_expires_at, locked_at + INTERVAL '{stale_lock_minutes} minutes') < NOW()
                                 )
-                            ORDER BY source_created_at ASC, message_id ASC
+                            ORDER BY due_at ASC, source_created_at ASC, message_id ASC
                             LIMIT 1
                             FOR UPDATE SKIP LOCKED
                         )
@@ -385,6 +812,7 @@ class IntegrationInboxService:
                         updated_at = NOW(),
                         locked_by = NULL,
                         locked_at = NULL,
+                        lease_expires_at = NULL,
                         last_error = NULL
                     WHERE inbox_id = :inbox_id
                 """),
@@ -459,6 +887,7 @@ class IntegrationInboxService:
                         END,
                         locked_by = NULL,
                         locked_at = NULL,
+                        lease_expires_at = NULL,
                         updated_at = NOW()
                     WHERE inbox_id = :inbox_id
                 """),
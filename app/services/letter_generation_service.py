@@ -13,6 +13,7 @@ from app.models.packet_db import PacketDB
 from app.models.packet_decision_db import PacketDecisionDB
 from app.models.document_db import PacketDocumentDB
 from app.config import settings
+from app.services.http_client import RetryPolicy, get_http_client, http_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +39,10 @@ class LetterGenerationService:
         self.timeout = settings.lettergen_timeout_seconds
         self.max_retries = settings.lettergen_max_retries
         self.retry_base_seconds = settings.lettergen_retry_base_seconds
+        self.retry_policy = RetryPolicy(
+            max_attempts=self.max_retries,
+            base_seconds=self.retry_base_seconds
+        )
         
         if not self.base_url:
             logger.warning("LETTERGEN_BASE_URL not configured. Letter generation will fail.")
@@ -354,54 +359,53 @@ class LetterGenerationService:
                     f"Attempt {attempt + 1}/{self.max_retries}"
                 )
                 
-                with httpx.Client(timeout=self.timeout) as client:
-                    response = client.post(url, json=payload)
+                response = get_http_client().post_sync(url, json=payload, timeout=http_timeout(self.timeout))
+                
+                if response.status_code == 200:
+                    return response.json()
+                elif response.status_code == 400:
+                    # Bad Request - don't retry
+                    error_details = response.json() if response.content else {}
+                    error_msg = error_details.get('detail', error_details.get('message', 'Bad request'))
+                    raise LetterGenerationError(
+                        f"LetterGen API bad request (400): {error_msg} | "
+                        f"Details: {error_details}"
+                    )
+                elif response.status_code == 422:
+                    # Validation error - don't retry
+                    # Parse detailed validation errors from FastAPI format
+                    error_details = response.json() if response.content else {}
+                    error_msg = error_details.get('detail', 'Validation error')
                     
-                    if response.status_code == 200:
-                        return response.json()
-                    elif response.status_code == 400:
-                        # Bad Request - don't retry
-                        error_details = response.json() if response.content else {}
-                        error_msg = error_details.get('detail', error_details.get('message', 'Bad request'))
-                        raise LetterGenerationError(
-                            f"LetterGen API bad request (400): {error_msg} | "
-                            f"Details: {error_details}"
-                        )
-                    elif response.status_code == 422:
-                        # Validation error - don't retry
-                        # Parse detailed validation errors from FastAPI format
-                        error_details = response.json() if response.content else {}
-                        error_msg = error_details.get('detail', 'Validation error')
-                        
-                        # Extract field-level errors if available
-                        if isinstance(error_msg, list):
-                            # FastAPI validation error format: [{"loc": ["body", "field"], "msg": "...", "type": "..."}]
-                            field_errors = []
-                            for err in error_msg:
-                                if isinstance(err, dict):
-                                    loc = err.get('loc', [])
-                                    msg = err.get('msg', '')
-                                    field_errors.append(f"{'.'.join(str(x) for x in loc)}: {msg}")
-                            error_msg = "; ".join(field_errors) if field_errors else "Validation error"
-                        elif isinstance(error_msg, dict):
-                            error_msg = error_msg.get('message', str(error_msg))
-                        else:
-                            error_msg = str(error_msg)
-                        
-                        raise LetterGenerationError(
-                            f"LetterGen API validation error (422): {error_msg} | "
-                            f"Details: {error_details}"
-                        )
-                    elif response.status_code in [500, 502, 503, 504]:
-                        # Server error - retry
-                        error_msg = f"LetterGen API server error ({response.status_code})"
-                        last_exception = LetterGenerationError(error_msg)
-                        logger.warning(f"{error_msg} | Attempt {attempt + 1}/{self.max_retries}")
+                    # Extract field-level errors if available
+                    if isinstance(error_msg, list):
+                        # FastAPI validation error format: [{"loc": ["body", "field"], "msg": "...", "type": "..."}]
+                        field_errors = []
+                        for err in error_msg:
+                            if isinstance(err, dict):
+                                loc = err.get('loc', [])
+                                msg = err.get('msg', '')
+                                field_errors.append(f"{'.'.join(str(x) for x in loc)}: {msg}")
+                        error_msg = "; ".join(field_errors) if field_errors else "Validation error"
+                    elif isinstance(error_msg, dict):
+                        error_msg = error_msg.get('message', str(error_msg))
                     else:
-                        # Other error - don't retry
-                        error_msg = f"LetterGen API error ({response.status_code}): {response.text}"
-                        raise LetterGenerationError(error_msg)
-                        
+                        error_msg = str(error_msg)
+                    
+                    raise LetterGenerationError(
+                        f"LetterGen API validation error (422): {error_msg} | "
+                        f"Details: {error_details}"
+                    )
+                elif self.retry_policy.is_retryable_status(response.status_code):
+                    # Server error - retry
+                    error_msg = f"LetterGen API server error ({response.status_code})"
+                    last_exception = LetterGenerationError(error_msg)
+                    logger.warning(f"{error_msg} | Attempt {attempt + 1}/{self.max_retries}")
+                else:
+                    # Other error - don't retry
+                    error_msg = f"LetterGen API error ({response.status_code}): {response.text}"
+                    raise LetterGenerationError(error_msg)
+            
             except httpx.TimeoutException as e:
                 last_exception = LetterGenerationError(f"LetterGen API timeout: {str(e)}")
                 logger.warning(f"LetterGen API timeout | Attempt {attempt + 1}/{self.max_retries}")
@@ -413,8 +417,8 @@ class LetterGenerationService:
                 raise
             
             # Exponential backoff before retry
-            if attempt < self.max_retries - 1:
-                delay = self.retry_base_seconds * (2 ** attempt)
+            if self.retry_policy.has_attempts_left(attempt + 1):
+                delay = self.retry_policy.delay_seconds(attempt + 1)
                 logger.debug(f"Waiting {delay}s before retry...")
                 time.sleep(delay)
         
@@ -5,6 +5,7 @@ Uses IntegrationInboxService for idempotent processing
 """
 import asyncio
 import logging
+import time
 import uuid
 from typing import List, Optional
 from datetime import datetime
@@ -16,10 +17,18 @@ from app.models.integration_db import SendServiceOpsDB
 from app.models.packet_db import PacketDB
 from app.models.document_db import PacketDocumentDB
 from app.services.payload_parser import PayloadParser
-from app.services.document_processor import DocumentProcessor, DocumentProcessorError
+from app.services.document_processor import (
+    DocumentProcessor,
+    DocumentProcessorDeferredError,
+    DocumentProcessorError
+)
 from app.services.integration_inbox import IntegrationInboxService
 from app.services.status_update_service import StatusUpdateService
 from app.services.stuck_job_reclaimer import StuckJobReclaimer
+from app.services.db_notification_listener import get_notification_listener
+from app.services.channel_scheduler import ChannelFairScheduler, lane_for_job
+from app.services.pipeline_stages import get_document_pipeline
+from app.utils.sla import calculate_inbox_due_at
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -32,12 +41,22 @@ class MessagePollerService:
     Uses IntegrationInboxService for idempotent message processing
     
     All workers run the poller. Job claiming uses FOR UPDATE SKIP LOCKED to prevent duplicates.
+    
+    When database notifications are enabled, the poller wakes on NOTIFY from
+    integration.send_serviceops inserts and the timed poll becomes a slow safety sweep.
     """
     
     def __init__(self):
         self.is_running = False
         self.poll_task: Optional[asyncio.Task] = None
+        self.worker_pool_task: Optional[asyncio.Task] = None
         self.worker_id = f"worker-{uuid.uuid4()}"
+        self.notify_event: Optional[asyncio.Event] = None
+        # Set by the intake loop after each poll; wakes the worker pool to drain the inbox
+        self.jobs_available = asyncio.Event()
+        self.active_job_count = 0
+        self.lane_in_flight: dict = {}  # lane -> jobs running (see channel_scheduler)
+        self.channel_scheduler = ChannelFairScheduler.from_settings(settings)
         # Don't create inbox_service here - create fresh instance for each operation
         self.status_update_service = StatusUpdateService()
         self.stuck_job_reclaimer = StuckJobReclaimer(
@@ -57,7 +76,19 @@ class MessagePollerService:
             return
         
         self.is_running = True
+        
+        # Subscribe to intake notifications before the first poll so nothing is missed
+        if settings.db_notify_enabled:
+            try:
+                listener = get_notification_listener()
+                self.notify_event = listener.subscribe(settings.db_notify_intake_channel)
+                await listener.start()
+            except Exception as e:
+                logger.warning(f"Failed to start intake notification listener, using timed polling only: {e}")
+                self.notify_event = None
+        
         self.poll_task = asyncio.create_task(self._poll_loop())
+        self.worker_pool_task = asyncio.create_task(self._worker_pool_loop())
         
         # Add exception handler to prevent unhandled exceptions from crashing the worker
         def handle_task_exception(task: asyncio.Task):
@@ -77,10 +108,12 @@ class MessagePollerService:
                 self.is_running = False
         
         self.poll_task.add_done_callback(handle_task_exception)
+        self.worker_pool_task.add_done_callback(handle_task_exception)
         
         logger.info(
             f"✅ Message poller started as LEADER (interval: {settings.message_poller_interval_seconds}s, "
-            f"batch_size: {settings.message_poller_batch_size}, worker_id={self.worker_id})"
+            f"batch_size: {settings.message_poller_batch_size}, max_workers: {settings.pipeline_max_workers}, "
+            f"worker_id={self.worker_id})"
         )
     
     async def stop(self):
@@ -89,28 +122,56 @@ class MessagePollerService:
             return
         
         self.is_running = False
-        if self.poll_task:
-            self.poll_task.cancel()
-            try:
-                await self.poll_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self.poll_task, self.worker_pool_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        
+        if self.notify_event is not None:
+            listener = get_notification_listener()
+            listener.unsubscribe(settings.db_notify_intake_channel, self.notify_event)
+            self.notify_event = None
+            if not listener.get_status()["channels"]:
+                await listener.stop()
         
         logger.info("Message poller stopped")
     
+    async def _wait_for_next_cycle(self):
+        """
+        Wait until the next poll cycle.
+        
+        While the notification listener is connected, wake on NOTIFY (debounced to
+        coalesce bursts) or after the safety sweep interval. Otherwise fall back to
+        the regular poll interval.
+        """
+        listener = get_notification_listener()
+        if self.notify_event is not None and listener.is_connected:
+            woke = await listener.wait(self.notify_event, settings.message_poller_sweep_interval_seconds)
+            if woke:
+                logger.debug("Message poller woken by database notification")
+                await asyncio.sleep(settings.db_notify_debounce_seconds)
+                self.notify_event.clear()
+            return
+        
+        await asyncio.sleep(settings.message_poller_interval_seconds)
+    
     async def _poll_loop(self):
         """Main polling loop"""
-        reclaimer_counter = 0
-        reclaimer_interval = 5  # Run reclaimer every 5 poll cycles
+        # Run reclaimer on a fixed wall-clock cadence (5 regular poll intervals),
+        # independent of how often notifications wake the loop
+        reclaimer_interval_seconds = settings.message_poller_interval_seconds * 5
+        last_reclaimer_run = time.monotonic()
         
         while self.is_running:
             try:
                 await self._poll_and_process()
                 
                 # Run stuck job reclaimer periodically
-                reclaimer_counter += 1
-                if reclaimer_counter >= reclaimer_interval:
-                    reclaimer_counter = 0
+                if time.monotonic() - last_reclaimer_run >= reclaimer_interval_seconds:
+                    last_reclaimer_run = time.monotonic()
                     try:
                         loop = asyncio.get_event_loop()
                         stats = await loop.run_in_executor(
@@ -132,9 +193,9 @@ class MessagePollerService:
             except Exception as e:
                 logger.error(f"Error in message poller loop: {e}", exc_info=True)
             
-            # Wait before next poll
+            # Wait before next poll (notification or timed sweep)
             try:
-                await asyncio.sleep(settings.message_poller_interval_seconds)
+                await self._wait_for_next_cycle()
             except asyncio.CancelledError:
                 break
     
@@ -184,70 +245,39 @@ class MessagePollerService:
             else:
                 logger.info(f"Found {len(messages)} new message(s) to insert into inbox")
                 
-                # Step 2: Insert messages into inbox (idempotent)
+                # Step 2: Build inbox rows and track max for watermark update
                 max_created_at = None
                 max_message_id = 0
-                inserted_count = 0
+                inbox_rows = []
                 
                 for msg in messages:
-                    # Get message_type_id from message (1=intake, 2=UTN success, 3=UTN fail)
-                    message_type_id = msg.get('message_type_id')
-                    if message_type_id is None:
-                        message_type_id = 1  # Default to 1 for backward compatibility
-                    
-                    # Infer message_type from payload if missing
-                    message_type = msg['payload'].get('message_type')
-                    if not message_type:
-                        # Infer from message_type_id or structure
-                        if message_type_id == 2:
-                            message_type = 'UTN'
-                        elif message_type_id == 3:
-                            message_type = 'UTN_FAIL'
-                        elif 'decision_tracking_id' in msg['payload'] and 'documents' in msg['payload']:
-                            message_type = 'ingest_file_package'
-                        else:
-                            message_type = 'ingest_file_package'  # Default for backward compatibility
+                    inbox_rows.append(self._inbox_row_from_message(msg))
                     
-                    # Extract channel_type_id from message (can be None for backward compatibility)
-                    channel_type_id = msg.get('channel_type_id')
-                    
-                    inbox_id = await loop.run_in_executor(
-                        None,
-                        inbox_service.insert_into_inbox,
-                        msg['message_id'],
-                        msg['decision_tracking_id'],
-                        message_type,
-                        msg['created_at'],
-                        channel_type_id,  # Pass channel_type_id
-                        message_type_id  # Pass message_type_id
-                    )
-                    
-                    if inbox_id:
-                        inserted_count += 1
-                        logger.info(f"Inserted new message into inbox: inbox_id={inbox_id}, message_id={msg['message_id']}")
-                    
-                    # Track max for watermark update
                     if max_created_at is None or msg['created_at'] > max_created_at:
                         max_created_at = msg['created_at']
                         max_message_id = msg['message_id']
                     elif msg['created_at'] == max_created_at and msg['message_id'] > max_message_id:
                         max_message_id = msg['message_id']
                 
-                # Step 3: Update watermark
-                if max_created_at:
-                    await loop.run_in_executor(
-                        None,
-                        inbox_service.update_watermark,
-                        max_created_at,
-                        max_message_id
-                    )
-                    logger.debug(f"Updated watermark: created_at={max_created_at}, message_id={max_message_id}")
+                # Step 3: Insert batch (idempotent) and advance watermark in one transaction
+                inserted = await loop.run_in_executor(
+                    None,
+                    inbox_service.ingest_batch,
+                    inbox_rows,
+                    max_created_at,
+                    max_message_id
+                )
                 
-                if inserted_count > 0:
-                    logger.info(f"Inserted {inserted_count} new message(s) into inbox")
+                for row in inserted:
+                    logger.info(f"Inserted new message into inbox: inbox_id={row['inbox_id']}, message_id={row['message_id']}")
+                logger.debug(f"Updated watermark: created_at={max_created_at}, message_id={max_message_id}")
+                
+                if inserted:
+                    logger.info(f"Inserted {len(inserted)} new message(s) into inbox")
             
-            # Step 4: Process claimed jobs from inbox
-            await self._process_claimed_jobs()
+            # Step 4: Wake the worker pool to claim and process jobs from inbox
+            # (signalled every cycle - other workers may have inserted rows, and FAILED rows mature)
+            self.jobs_available.set()
             
         except Exception as e:
             logger.error(f"Error in poll and process: {e}", exc_info=True)
@@ -255,103 +285,333 @@ class MessagePollerService:
             # Clean up inbox service
             inbox_service.close()
     
-    async def _process_claimed_jobs(self):
-        """Process jobs claimed from inbox"""
-        # Process jobs with configurable concurrency limit
-        # Increased cap to 5 concurrent jobs for faster processing
-        max_jobs_per_cycle = min(settings.message_poller_batch_size, 5)  # Cap at 5 concurrent jobs
-        loop = asyncio.get_event_loop()
+    def _inbox_row_from_message(self, msg: dict) -> dict:
+        """
+        Build an integration_inbox row from a polled send_serviceops message
         
-        for iteration in range(max_jobs_per_cycle):
-            # Create fresh inbox service for each claim to avoid transaction issues
-            inbox_service = IntegrationInboxService()
+        Args:
+            msg: Message dict from IntegrationInboxService.poll_new_messages
+            
+        Returns:
+            Row dict for IntegrationInboxService.ingest_batch
+        """
+        # Get message_type_id from message (1=intake, 2=UTN success, 3=UTN fail)
+        message_type_id = msg.get('message_type_id')
+        if message_type_id is None:
+            message_type_id = 1  # Default to 1 for backward compatibility
+        
+        # message_type is projected from payload->>'message_type'; infer if missing
+        message_type = msg.get('message_type')
+        if not message_type:
+            # Infer from message_type_id or structure
+            if message_type_id == 2:
+                message_type = 'UTN'
+            elif message_type_id == 3:
+                message_type = 'UTN_FAIL'
+            else:
+                message_type = 'ingest_file_package'  # Default for backward compatibility
+        
+        # Extract channel_type_id from message (can be None for backward compatibility)
+        channel_type_id = msg.get('channel_type_id')
+        
+        return {
+            'message_id': msg['message_id'],
+            'decision_tracking_id': msg['decision_tracking_id'],
+            'message_type': message_type,
+            'source_created_at': msg['created_at'],
+            'channel_type_id': channel_type_id,
+            'message_type_id': message_type_id,
+            # SLA due date used as claim priority (earliest due is processed first)
+            'due_at': calculate_inbox_due_at(msg['created_at'], msg.get('submission_type'), message_type_id)
+        }
+    
+    async def _worker_pool_loop(self):
+        """
+        Worker pool loop: drain the inbox whenever the intake loop signals, and at
+        least once per poll interval so FAILED jobs are retried when their backoff expires.
+        """
+        while self.is_running:
             try:
-                # Claim a job
-                job = await loop.run_in_executor(
-                    None,
-                    inbox_service.claim_job,
-                    self.worker_id,
-                    10  # stale_lock_minutes
+                await self._process_claimed_jobs()
+            except asyncio.CancelledError:
+                logger.info("Message poller worker pool cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Error in message poller worker pool: {e}", exc_info=True)
+            
+            try:
+                await asyncio.wait_for(
+                    self.jobs_available.wait(),
+                    timeout=settings.message_poller_interval_seconds
                 )
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                break
+            self.jobs_available.clear()
+    
+    def _get_worker_pool_size(self) -> int:
+        """
+        Size the worker pool from current DB connection pool headroom.
+        
+        - CRITICAL pool (or no headroom): 1 worker, so records never accumulate
+        - WARNING pool: half of pipeline_max_workers
+        - Otherwise: pipeline_max_workers, capped by the connections available to
+          background work (pipeline_db_connections_per_job each)
+        """
+        from app.services.connection_pool_monitor import get_pool_usage
+        max_workers = max(1, settings.pipeline_max_workers)
+        
+        try:
+            usage = get_pool_usage()
+        except Exception as e:
+            logger.warning(f"Could not read connection pool usage, using 1 worker: {e}")
+            return 1
+        
+        if usage['status'] == 'CRITICAL' or usage['available_for_background'] <= 0:
+            return 1
+        
+        size = max_workers
+        if usage['status'] == 'WARNING':
+            size = max(1, max_workers // 2)
+        
+        per_job = max(1, settings.pipeline_db_connections_per_job)
+        return max(1, min(size, usage['available_for_background'] // per_job))
+    
+    async def _process_claimed_jobs(self):
+        """
+        Drain the inbox with a bounded pool of concurrent pipeline workers.
+        
+        Free worker slots are refilled with a batch claim whenever a job finishes, so
+        processing is continuous while a backlog exists. The pool size is re-evaluated
+        from connection pool usage before every claim. Returns once the inbox has no
+        claimable jobs and all in-flight jobs are finished.
+        
+        Lanes that came back empty are not offered again during the drain until
+        jobs_available is signalled; then every lane is probed again, so jobs that arrive
+        mid-drain are claimed into free slots right away.
+        
+        Slots are shared across channel lanes (UTN, Portal, Fax, ESMD) by weighted fair
+        scheduling with per-lane concurrency caps (ChannelFairScheduler), so cheap
+        Portal/UTN work keeps flowing during a burst of expensive OCR packets.
+        
+        Each claimed row carries a lease; a background task renews leases for every
+        job this worker still holds, so long OCR jobs are not reclaimed mid-flight.
+        
+        No new jobs are claimed while the document pipeline's first stage queue is full
+        (backpressure from a slow stage), so claimed rows do not sit leased in a queue.
+        """
+        loop = asyncio.get_event_loop()
+        in_flight: dict = {}  # asyncio.Task -> (inbox_id, lane)
+        held_inbox_ids: set = set()
+        exhausted_lanes: set = set()
+        wake_task: Optional[asyncio.Task] = None
+        renew_task = asyncio.create_task(self._renew_leases_loop(held_inbox_ids))
+        
+        try:
+            while True:
+                pool_size = self._get_worker_pool_size()
+                free_slots = pool_size - len(in_flight)
+                lane_plan = self.channel_scheduler.plan(free_slots, self.lane_in_flight, exhausted_lanes)
+                if in_flight and not get_document_pipeline().can_admit():
+                    lane_plan = {}  # Pipeline is backed up - wait for an in-flight job to finish
                 
-                if not job:
-                    # No jobs available
-                    break
-                
-                logger.info(f"Claimed job: inbox_id={job['inbox_id']}, message_id={job['message_id']}, attempt={job['attempt_count']}")
-                
-                try:
-                    # Get source message
-                    source_msg = await loop.run_in_executor(
-                        None,
-                        inbox_service.get_source_message,
-                        job['message_id']
-                    )
-                    
-                    if not source_msg:
-                        logger.error(f"Source message {job['message_id']} not found")
-                        # Use guaranteed status update
-                        await loop.run_in_executor(
+                if lane_plan:
+                    # Claim enough jobs to fill free slots in one round trip
+                    inbox_service = IntegrationInboxService()
+                    try:
+                        jobs = await loop.run_in_executor(
                             None,
-                            self.status_update_service.mark_failed_with_retry,
-                            job['inbox_id'],
-                            f"Source message {job['message_id']} not found in integration.send_serviceops",
-                            job.get('attempt_count')
+                            inbox_service.claim_jobs,
+                            self.worker_id,
+                            free_slots,
+                            settings.inbox_lease_seconds,
+                            settings.inbox_priority_aging_factor,
+                            lane_plan
                         )
-                        continue
+                    finally:
+                        inbox_service.close()
                     
-                    # Extract channel_type_id and message_type_id from job
-                    channel_type_id = job.get('channel_type_id')
-                    message_type_id = job.get('message_type_id')
-                    if message_type_id is None:
-                        message_type_id = 1  # Default to 1 for backward compatibility
+                    # When slots were left unfilled, every lane that returned less than its
+                    # quota has no more claimable rows in this drain
+                    if len(jobs) < free_slots:
+                        claimed_by_lane = {}
+                        for job in jobs:
+                            lane = lane_for_job(job)
+                            claimed_by_lane[lane] = claimed_by_lane.get(lane, 0) + 1
+                        for lane, offer in lane_plan.items():
+                            if claimed_by_lane.get(lane, 0) < offer['quota']:
+                                exhausted_lanes.add(lane)
                     
-                    # Process the message with channel_type_id and message_type_id
-                    await self._process_message(source_msg, job['inbox_id'], channel_type_id, message_type_id)
-                    
-                    # Mark as done (with guaranteed retry)
-                    result = await loop.run_in_executor(
-                        None,
-                        self.status_update_service.mark_done_with_retry,
-                        job['inbox_id']
-                    )
-                    
-                    if result.success:
-                        logger.info(f"Successfully processed job: inbox_id={job['inbox_id']}")
-                    else:
-                        logger.error(
-                            f"Failed to mark job as done after {result.attempts} attempts: "
-                            f"inbox_id={job['inbox_id']}, error={result.error}"
+                    if jobs:
+                        logger.info(
+                            f"Claimed {len(jobs)} job(s) (pool_size={pool_size}, in_flight={len(in_flight)}, "
+                            f"lanes_in_flight={self.lane_in_flight}, lease={settings.inbox_lease_seconds}s, "
+                            f"worker_id={self.worker_id})"
                         )
                     
-                    # CRITICAL: Add delay between processing jobs to:
-                    # 1. Release DB connection back to pool
-                    # 2. Allow auth/user requests to get connections
-                    # 3. Prevent overwhelming OCR service
-                    # Delay after each job except the last iteration (we break if no more jobs)
-                    if iteration < max_jobs_per_cycle - 1:
-                        delay_seconds = 3.0  # 3 second delay between jobs
-                        logger.debug(f"Delaying {delay_seconds}s before next job...")
-                        await asyncio.sleep(delay_seconds)
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    logger.error(
-                        f"Error processing job inbox_id={job['inbox_id']}: {error_msg}",
-                        exc_info=True
-                    )
-                    # Mark as failed (with guaranteed retry)
-                    await loop.run_in_executor(
-                        None,
-                        self.status_update_service.mark_failed_with_retry,
-                        job['inbox_id'],
-                        error_msg,
-                        job.get('attempt_count')
+                    for job in jobs:
+                        lane = lane_for_job(job)
+                        held_inbox_ids.add(job['inbox_id'])
+                        self.lane_in_flight[lane] = self.lane_in_flight.get(lane, 0) + 1
+                        task = asyncio.create_task(self._process_claimed_job(job))
+                        in_flight[task] = (job['inbox_id'], lane)
+                
+                self.active_job_count = len(in_flight)
+                if not in_flight:
+                    break
+                
+                # Wait for any worker to finish (refill its slot) or for new jobs to be signalled
+                if wake_task is None:
+                    wake_task = asyncio.create_task(self.jobs_available.wait())
+                done, _ = await asyncio.wait(list(in_flight) + [wake_task], return_when=asyncio.FIRST_COMPLETED)
+                if wake_task in done:
+                    # New jobs may be in lanes that were empty earlier in this drain
+                    self.jobs_available.clear()
+                    exhausted_lanes.clear()
+                    done.discard(wake_task)
+                    wake_task = None
+                for task in done:
+                    inbox_id, lane = in_flight.pop(task)
+                    held_inbox_ids.discard(inbox_id)
+                    self.lane_in_flight[lane] -= 1
+                    if not task.cancelled() and task.exception():
+                        logger.error(f"Unexpected error in pipeline worker: {task.exception()}")
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if wake_task is not None:
+                wake_task.cancel()
+            self.active_job_count = 0
+            self.lane_in_flight = {}
+            renew_task.cancel()
+            try:
+                await renew_task
+            except asyncio.CancelledError:
+                pass
+    
+    async def _renew_leases_loop(self, held_inbox_ids: set):
+        """
+        Periodically renew leases for jobs this worker still holds
+        
+        Args:
+            held_inbox_ids: Live set of inbox_ids held by this worker (shrinks as jobs finish)
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(settings.inbox_lease_renew_interval_seconds)
+            if not held_inbox_ids:
+                continue
+            
+            inbox_ids = list(held_inbox_ids)
+            inbox_service = IntegrationInboxService()
+            try:
+                renewed = await loop.run_in_executor(
+                    None,
+                    inbox_service.renew_leases,
+                    inbox_ids,
+                    self.worker_id,
+                    settings.inbox_lease_seconds
+                )
+                lost = set(inbox_ids) - set(renewed)
+                if lost:
+                    logger.warning(
+                        f"Lost lease on inbox_id(s) {sorted(lost)} (no longer PROCESSING/locked by {self.worker_id})"
                     )
+                else:
+                    logger.debug(f"Renewed lease on {len(renewed)} job(s)")
+            except Exception as e:
+                # Don't stop renewing - the next attempt may succeed before the lease expires
+                logger.warning(f"Failed to renew job leases: {e}")
             finally:
-                # Clean up inbox service
                 inbox_service.close()
     
+    async def _process_claimed_job(self, job: dict):
+        """Process a single claimed job and record its final status"""
+        loop = asyncio.get_event_loop()
+        logger.info(f"Claimed job: inbox_id={job['inbox_id']}, message_id={job['message_id']}, attempt={job['attempt_count']}")
+        
+        # Create fresh inbox service for this job to avoid transaction issues
+        inbox_service = IntegrationInboxService()
+        try:
+            # Get source message
+            source_msg = await loop.run_in_executor(
+                None,
+                inbox_service.get_source_message,
+                job['message_id']
+            )
+            
+            if not source_msg:
+                logger.error(f"Source message {job['message_id']} not found")
+                # Use guaranteed status update
+                await loop.run_in_executor(
+                    None,
+                    self.status_update_service.mark_failed_with_retry,
+                    job['inbox_id'],
+                    f"Source message {job['message_id']} not found in integration.send_serviceops",
+                    job.get('attempt_count')
+                )
+                return
+            
+            # Extract channel_type_id and message_type_id from job
+            channel_type_id = job.get('channel_type_id')
+            message_type_id = job.get('message_type_id')
+            if message_type_id is None:
+                message_type_id = 1  # Default to 1 for backward compatibility
+            
+            # Process the message with channel_type_id and message_type_id
+            await self._process_message(source_msg, job['inbox_id'], channel_type_id, message_type_id)
+            
+            # Mark as done (with guaranteed retry)
+            result = await loop.run_in_executor(
+                None,
+                self.status_update_service.mark_done_with_retry,
+                job['inbox_id']
+            )
+            
+            if result.success:
+                logger.info(f"Successfully processed job: inbox_id={job['inbox_id']}")
+            else:
+                logger.error(
+                    f"Failed to mark job as done after {result.attempts} attempts: "
+                    f"inbox_id={job['inbox_id']}, error={result.error}"
+                )
+        except DocumentProcessorDeferredError as e:
+            logger.warning(
+                f"Job parked: inbox_id={job['inbox_id']}, retry in {e.retry_after_seconds:.0f}s: {e}"
+            )
+            # Re-queue without consuming an attempt (with guaranteed retry)
+            result = await loop.run_in_executor(
+                None,
+                self.status_update_service.mark_deferred_with_retry,
+                job['inbox_id'],
+                str(e),
+                e.retry_after_seconds
+            )
+            
+            if not result.success:
+                logger.error(
+                    f"Failed to mark job as deferred after {result.attempts} attempts: "
+                    f"inbox_id={job['inbox_id']}, error={result.error}"
+                )
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(
+                f"Error processing job inbox_id={job['inbox_id']}: {error_msg}",
+                exc_info=True
+            )
+            # Mark as failed (with guaranteed retry)
+            await loop.run_in_executor(
+                None,
+                self.status_update_service.mark_failed_with_retry,
+                job['inbox_id'],
+                error_msg,
+                job.get('attempt_count')
+            )
+        finally:
+            # Clean up inbox service
+            inbox_service.close()
+    
     def _fetch_messages(self) -> List[SendServiceOpsDB]:
         """
         Fetch unprocessed messages from integration.send_serviceops
@@ -577,6 +837,9 @@ class MessagePollerService:
                 inbox_id
             )
             logger.info(f"Message {message.message_id} processed successfully")
+        except DocumentProcessorDeferredError as e:
+            logger.warning(f"Document processing deferred for message {message.message_id}: {e}")
+            raise  # Re-raise to park the job
         except DocumentProcessorError as e:
             logger.error(f"Document processing failed for message {message.message_id}: {e}", exc_info=True)
             raise  # Re-raise to trigger retry logic
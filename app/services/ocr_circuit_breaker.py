@@ -0,0 +1,147 @@
+"""
+OCR Circuit Breaker
+Stops sending requests to the OCR microservice while it is down.
+
+During an OCR outage every job would otherwise burn its retries and OCR attempts and
+land in graceful failure / manual review. The breaker counts consecutive failed
+requests (5xx, timeouts, connection errors) across all OCR clients in the process:
+- CLOSED: requests flow; failure_threshold consecutive failures open the circuit
+- OPEN: requests are refused until reset_timeout_seconds have passed
+- HALF_OPEN: one probe request is let through; success closes the circuit,
+  failure opens it again (a probe that never reports back is replaced after
+  reset_timeout_seconds)
+
+Refused requests raise OCRServiceUnavailableError in the OCR client, and the document
+processor parks the job (DocumentProcessorDeferredError) until the circuit may have closed.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class OCRCircuitBreaker:
+    """
+    Consecutive-failure circuit breaker shared by all OCR clients in this process.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_seconds: float = 60.0):
+        """
+        Initialize breaker (closed)
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 = never open)
+            reset_timeout_seconds: Time the circuit stays open before a probe request
+        """
+        self.failure_threshold = max(0, int(failure_threshold))
+        self.reset_timeout_seconds = max(0.0, float(reset_timeout_seconds))
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+            return STATE_HALF_OPEN
+        return self._state
+
+    def retry_after_seconds(self) -> float:
+        """Seconds until the circuit lets a probe request through (0 when not open)"""
+        with self._lock:
+            if self._state != STATE_OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout_seconds - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now.
+
+        Returns:
+            True when closed, or for the single probe request once the open period is over
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == STATE_CLOSED:
+                return True
+            if state == STATE_HALF_OPEN:
+                now = time.monotonic()
+                if self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout_seconds:
+                    self._state = STATE_HALF_OPEN
+                    self._probe_started_at = now
+                    return True
+            return False
+
+    def record_success(self) -> None:
+        """Report a request the service answered (closes the circuit)"""
+        with self._lock:
+            was_open = self._state != STATE_CLOSED
+            self._state = STATE_CLOSED
+            self._consecutive_failures = 0
+            self._probe_started_at = None
+        if was_open:
+            logger.info("OCR circuit closed: service is answering again")
+
+    def record_failure(self) -> None:
+        """Report a failed request (5xx, timeout, connection error)"""
+        with self._lock:
+            self._consecutive_failures += 1
+            probe_failed = self._state == STATE_HALF_OPEN
+            threshold_reached = (
+                self._state == STATE_CLOSED
+                and self.failure_threshold
+                and self._consecutive_failures >= self.failure_threshold
+            )
+            if not (probe_failed or threshold_reached):
+                return
+            self._state = STATE_OPEN
+            self._opened_at = time.monotonic()
+            self._probe_started_at = None
+            self._times_opened += 1
+            failures = self._consecutive_failures
+        logger.warning(
+            f"OCR circuit opened after {failures} consecutive failures; "
+            f"requests refused for {self.reset_timeout_seconds:.0f}s"
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self._current_state(),
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout_seconds': self.reset_timeout_seconds,
+                'times_opened': self._times_opened
+            }
+
+
+# Global breaker instance (shared by all OCR clients in this process)
+_ocr_circuit_breaker: Optional[OCRCircuitBreaker] = None
+_ocr_circuit_breaker_lock = threading.Lock()
+
+
+def get_ocr_circuit_breaker() -> OCRCircuitBreaker:
+    """Get or create the global OCR circuit breaker"""
+    global _ocr_circuit_breaker
+    if _ocr_circuit_breaker is None:
+        with _ocr_circuit_breaker_lock:
+            if _ocr_circuit_breaker is None:
+                _ocr_circuit_breaker = OCRCircuitBreaker(
+                    failure_threshold=settings.ocr_circuit_failure_threshold,
+                    reset_timeout_seconds=settings.ocr_circuit_reset_seconds
+                )
+    return _ocr_circuit_breaker
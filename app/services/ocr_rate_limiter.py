@@ -0,0 +1,189 @@
+"""
+OCR Rate Limiter
+Process-wide limit on requests sent to the OCR microservice.
+
+Every OCR HTTP attempt (including retries) takes a slot from one shared limiter, so
+pages of one packet and pages of different packets can be OCR'd in parallel without
+exceeding what the service can take:
+- requests_per_second: token bucket refilled continuously; bursts up to one second
+  of tokens (0 = no rate limit)
+- max_in_flight: requests waiting on the service at once (0 = no limit)
+
+Callers block until a slot is free. Retry backoff happens outside the slot, so a
+request sleeping before its next attempt does not hold capacity.
+
+Adaptive mode (AIMD) treats max_in_flight as a ceiling and tunes the allowed
+concurrency from OCR outcomes reported by the client:
+- additive increase: every successful request within the latency target adds
+  1/limit, so the limit grows by about one per round of requests
+- multiplicative decrease: an overload signal (5xx, timeout, connection error, or a
+  response slower than the latency target) multiplies the limit by decrease_factor,
+  at most once per DECREASE_INTERVAL_SECONDS so one burst of failures counts once
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Minimum time between two multiplicative decreases
+DECREASE_INTERVAL_SECONDS = 1.0
+
+
+class OCRRateLimiter:
+    """
+    Token bucket plus in-flight cap shared by all OCR clients in this process.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 0.0,
+        max_in_flight: int = 0,
+        adaptive: bool = False,
+        min_in_flight: int = 1,
+        latency_target_seconds: float = 0.0,
+        decrease_factor: float = 0.5
+    ):
+        """
+        Initialize limiter
+
+        Args:
+            requests_per_second: Sustained request rate (0 = no rate limit)
+            max_in_flight: Concurrent requests allowed (0 = no limit); the ceiling in adaptive mode
+            adaptive: Tune allowed concurrency with AIMD (requires max_in_flight > 0)
+            min_in_flight: Lowest concurrency AIMD decreases to
+            latency_target_seconds: Responses slower than this count as overload (0 = ignore latency)
+            decrease_factor: Multiplier applied to the limit on overload
+        """
+        self.requests_per_second = max(0.0, float(requests_per_second))
+        self.max_in_flight = max(0, int(max_in_flight))
+        self.adaptive = bool(adaptive) and self.max_in_flight > 0
+        self.min_in_flight = min(max(1, int(min_in_flight)), max(1, self.max_in_flight))
+        self.latency_target_seconds = max(0.0, float(latency_target_seconds))
+        self.decrease_factor = min(max(0.1, float(decrease_factor)), 0.9)
+        self._limit = float(self.max_in_flight)
+        self._last_decrease = 0.0
+        self._decreases = 0
+        self._capacity = max(1.0, self.requests_per_second)
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._acquired = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self.requests_per_second)
+        self._last_refill = now
+
+    def acquire(self) -> None:
+        """Wait for a request slot (in-flight capacity and a rate token)"""
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self.max_in_flight and self._in_flight >= self.concurrency_limit:
+                        self._cond.wait()
+                        continue
+                    if not self.requests_per_second:
+                        break
+                    self._refill()
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        break
+                    self._cond.wait((1.0 - self._tokens) / self.requests_per_second)
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+            self._acquired += 1
+
+    def release(self) -> None:
+        """Return a request slot"""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @property
+    def concurrency_limit(self) -> int:
+        """Requests currently allowed in flight (0 = no limit)"""
+        return int(self._limit) if self.adaptive else self.max_in_flight
+
+    def record_success(self, latency_seconds: float) -> None:
+        """Report a completed request (additive increase, or decrease if slower than the target)"""
+        if not self.adaptive:
+            return
+        if self.latency_target_seconds and latency_seconds > self.latency_target_seconds:
+            self.record_overload()
+            return
+        with self._cond:
+            previous = self.concurrency_limit
+            self._limit = min(float(self.max_in_flight), self._limit + 1.0 / max(1.0, self._limit))
+            if self.concurrency_limit > previous:
+                self._cond.notify_all()
+
+    def record_overload(self) -> None:
+        """Report an overload signal (multiplicative decrease)"""
+        if not self.adaptive:
+            return
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease < DECREASE_INTERVAL_SECONDS:
+                return
+            previous = self.concurrency_limit
+            self._limit = max(float(self.min_in_flight), self._limit * self.decrease_factor)
+            self._last_decrease = now
+            self._decreases += 1
+        if self.concurrency_limit < previous:
+            logger.warning(f"OCR overload: concurrency limit lowered from {previous} to {self.concurrency_limit}")
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a request slot for the duration of one OCR HTTP call"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'requests_per_second': self.requests_per_second,
+                'max_in_flight': self.max_in_flight,
+                'adaptive': self.adaptive,
+                'concurrency_limit': self.concurrency_limit,
+                'decreases': self._decreases,
+                'in_flight': self._in_flight,
+                'waiting': self._waiting,
+                'requests': self._acquired
+            }
+
+
+# Global limiter instance (shared by all OCR clients in this process)
+_ocr_rate_limiter: Optional[OCRRateLimiter] = None
+_ocr_rate_limiter_lock = threading.Lock()
+
+
+def get_ocr_rate_limiter() -> OCRRateLimiter:
+    """Get or create the global OCR rate limiter"""
+    global _ocr_rate_limiter
+    if _ocr_rate_limiter is None:
+        with _ocr_rate_limiter_lock:
+            if _ocr_rate_limiter is None:
+                _ocr_rate_limiter = OCRRateLimiter(
+                    requests_per_second=settings.ocr_requests_per_second,
+                    max_in_flight=settings.ocr_max_in_flight,
+                    adaptive=settings.ocr_adaptive_concurrency,
+                    min_in_flight=settings.ocr_min_in_flight,
+                    latency_target_seconds=settings.ocr_latency_target_seconds
+                )
+                logger.info(
+                    f"OCR rate limiter: requests_per_second={_ocr_rate_limiter.requests_per_second}, "
+                    f"max_in_flight={_ocr_rate_limiter.max_in_flight}, adaptive={_ocr_rate_limiter.adaptive}"
+                )
+    return _ocr_rate_limiter
@@ -0,0 +1,187 @@
+"""
+OCR Result Cache
+Persistent cache of OCR results keyed by page content hash and OCR model id.
+
+The same page bytes are OCR'd again on REPLACE rebuilds, manual trigger-ocr /
+mark-coversheet runs and resumed jobs. OCRService looks the page's SHA-256 up in
+service_ops.ocr_result_cache (migration 034) before sending it, so repeat OCR of an
+unchanged page is one indexed query instead of seconds of OCR service time.
+
+Keys use the OCR model id so results from an older model are never reused. Lookups
+use the model id of the latest live OCR response seen by this process, or
+OCR_RESULT_CACHE_MODEL_ID until the first live response arrives.
+
+The cache never fails OCR: database errors are logged and the page is OCR'd as usual
+(the cache is skipped for ERROR_BACKOFF_SECONDS so a database problem does not add a
+failing round trip to every page).
+"""
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.services.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+CACHE_TABLE = "service_ops.ocr_result_cache"
+
+# Time the cache is skipped after a database error
+ERROR_BACKOFF_SECONDS = 60.0
+
+
+class OCRResultCache:
+    """
+    Database-backed OCR result cache shared by all OCR clients in this process.
+    """
+
+    def __init__(self, enabled: bool = True, model_id: str = "coversheet-extraction", ttl_days: int = 0):
+        """
+        Initialize cache
+
+        Args:
+            enabled: Consult and fill the cache (False = every page is OCR'd)
+            model_id: OCR model assumed for lookups until a live OCR response reports one
+            ttl_days: Ignore results older than this (0 = never expire)
+        """
+        self.enabled = bool(enabled)
+        self.ttl_days = max(0, int(ttl_days))
+        self._lock = threading.Lock()
+        self._model_id = model_id
+        self._skip_until = 0.0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._errors = 0
+
+    @property
+    def model_id(self) -> str:
+        return self._model_id
+
+    def _available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._skip_until
+
+    def _record_error(self, action: str, error: Exception) -> None:
+        with self._lock:
+            self._errors += 1
+            self._skip_until = time.monotonic() + ERROR_BACKOFF_SECONDS
+        if 'does not exist' in str(error):
+            logger.error(
+                f"OCR result cache table {CACHE_TABLE} does not exist. "
+                f"Please run migration 034_create_ocr_result_cache.sql. Error: {error}"
+            )
+        else:
+            logger.warning(
+                f"OCR result cache {action} failed (cache skipped for {ERROR_BACKOFF_SECONDS:.0f}s): {error}"
+            )
+
+    def get(self, page_sha256: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the OCR result for a page
+
+        Args:
+            page_sha256: SHA-256 (hex) of the page PDF bytes
+
+        Returns:
+            Normalized OCR result, or None on a miss (or when the cache is unavailable)
+        """
+        if not page_sha256 or not self._available():
+            return None
+        db = SessionLocal()
+        try:
+            row = db.execute(
+                text(f"""
+                    UPDATE {CACHE_TABLE}
+                    SET hit_count = hit_count + 1,
+                        last_hit_at = NOW()
+                    WHERE page_sha256 = :page_sha256
+                      AND ocr_model_id = :ocr_model_id
+                      AND (:ttl_days = 0 OR created_at > NOW() - make_interval(days => :ttl_days))
+                    RETURNING result
+                """),
+                {'page_sha256': page_sha256, 'ocr_model_id': self._model_id, 'ttl_days': self.ttl_days}
+            ).fetchone()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._record_error("lookup", e)
+            return None
+        finally:
+            db.close()
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return row[0] if isinstance(row[0], dict) else json.loads(row[0])
+
+    def put(self, page_sha256: str, result: Dict[str, Any]) -> None:
+        """
+        Store a live OCR result (and adopt its model id for later lookups)
+
+        Args:
+            page_sha256: SHA-256 (hex) of the page PDF bytes
+            result: Normalized OCR result
+        """
+        model_id = result.get('model_id') or self._model_id
+        if model_id != self._model_id:
+            logger.info(f"OCR model changed from {self._model_id} to {model_id}: cached results of the old model are no longer used")
+            self._model_id = model_id
+        if not page_sha256 or not self._available():
+            return
+        db = SessionLocal()
+        try:
+            db.execute(
+                text(f"""
+                    INSERT INTO {CACHE_TABLE} (page_sha256, ocr_model_id, result, created_at)
+                    VALUES (:page_sha256, :ocr_model_id, CAST(:result AS JSONB), NOW())
+                    ON CONFLICT (page_sha256, ocr_model_id) DO UPDATE
+                    SET result = EXCLUDED.result,
+                        created_at = EXCLUDED.created_at
+                """),
+                {'page_sha256': page_sha256, 'ocr_model_id': model_id, 'result': json.dumps(result, default=str)}
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._record_error("store", e)
+            return
+        finally:
+            db.close()
+        with self._lock:
+            self._stores += 1
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'model_id': self._model_id,
+                'hits': self._hits,
+                'misses': self._misses,
+                'stores': self._stores,
+                'errors': self._errors
+            }
+
+
+# Global cache instance (shared by all OCR clients in this process)
+_ocr_result_cache: Optional[OCRResultCache] = None
+_ocr_result_cache_lock = threading.Lock()
+
+
+def get_ocr_result_cache() -> OCRResultCache:
+    """Get or create the global OCR result cache"""
+    global _ocr_result_cache
+    if _ocr_result_cache is None:
+        with _ocr_result_cache_lock:
+            if _ocr_result_cache is None:
+                _ocr_result_cache = OCRResultCache(
+                    enabled=settings.ocr_result_cache_enabled,
+                    model_id=settings.ocr_result_cache_model_id,
+                    ttl_days=settings.ocr_result_cache_ttl_days
+                )
+    return _ocr_result_cache
@@ -2,13 +2,17 @@
 OCR Service Client
 HTTP client for calling the wiser-service-operations-ocr microservice
 """
+import hashlib
 import time
 from pathlib import Path
 from typing import Dict, Any, Optional
 from logging import getLogger
-import httpx
 
 from app.config import settings
+from app.services.ocr_rate_limiter import OCRRateLimiter, get_ocr_rate_limiter
+from app.services.ocr_circuit_breaker import OCRCircuitBreaker, STATE_OPEN, get_ocr_circuit_breaker
+from app.services.http_client import RetryPolicy, get_http_client, http_timeout
+from app.services.ocr_result_cache import OCRResultCache, get_ocr_result_cache
 
 # Import httpx exceptions with fallback
 try:
@@ -26,18 +30,36 @@ class OCRServiceError(Exception):
     pass
 
 
+class OCRServiceUnavailableError(OCRServiceError):
+    """The OCR circuit is open - the request was not sent (retry after retry_after_seconds)"""
+    
+    def __init__(self, message: str, retry_after_seconds: float = 0.0):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
 class OCRService:
     """
     HTTP client for OCR service
     
-    Calls the wiser-service-operations-ocr microservice to process PDF pages.
+    Calls the wiser-service-operations-ocr microservice to process PDF pages over the
+    shared pooled HTTP client (connections are reused across pages and packets).
+    Each HTTP attempt takes a slot from the process-wide OCR rate limiter, so the client
+    is safe to call from several threads at once. Attempt outcomes feed the limiter's
+    adaptive concurrency (overload on 5xx/429/timeouts/connection errors) and request
+    outcomes feed the process-wide circuit breaker; while the circuit is open requests
+    fail fast with OCRServiceUnavailableError instead of being sent.
+    Pages whose bytes were OCR'd before are answered from the OCR result cache.
     """
     
     def __init__(
         self,
         base_url: Optional[str] = None,
         timeout_seconds: Optional[int] = None,
-        max_retries: Optional[int] = None
+        max_retries: Optional[int] = None,
+        rate_limiter: Optional[OCRRateLimiter] = None,
+        circuit_breaker: Optional[OCRCircuitBreaker] = None,
+        result_cache: Optional[OCRResultCache] = None
     ):
         """
         Initialize OCR service client
@@ -46,10 +68,16 @@ class OCRService:
             base_url: Base URL for OCR service (defaults to OCR_BASE_URL from settings)
             timeout_seconds: Request timeout in seconds (defaults to OCR_TIMEOUT_SECONDS from settings)
             max_retries: Maximum retry attempts for transient failures (defaults to OCR_MAX_RETRIES from settings)
+            rate_limiter: Limiter shared by OCR requests (defaults to the process-wide limiter)
+            circuit_breaker: Breaker shared by OCR requests (defaults to the process-wide breaker)
+            result_cache: Cache of OCR results by page hash (defaults to the process-wide cache)
         """
         self.base_url = (base_url or settings.ocr_base_url).rstrip('/')
         self.timeout_seconds = timeout_seconds or settings.ocr_timeout_seconds
         self.max_retries = max_retries or settings.ocr_max_retries
+        self.rate_limiter = rate_limiter or get_ocr_rate_limiter()
+        self.circuit_breaker = circuit_breaker or get_ocr_circuit_breaker()
+        self.result_cache = result_cache or get_ocr_result_cache()
         
         if not self.base_url:
             raise OCRServiceError(
@@ -58,18 +86,26 @@ class OCRService:
         
         # Construct full endpoint URL
         self.endpoint_url = f"{self.base_url}/api/v1/ocr/coversheet"
+        self.timeout = http_timeout(self.timeout_seconds)
+        # Any 5xx is retried; 502/503 (overload) back off twice as long
+        self.retry_policy = RetryPolicy(
+            max_attempts=self.max_retries,
+            retry_statuses=frozenset(range(500, 600)),
+            slow_statuses=frozenset({502, 503})
+        )
         
         logger.info(
             f"OCRService initialized: base_url={self.base_url}, "
             f"timeout={self.timeout_seconds}s, max_retries={self.max_retries}"
         )
     
-    def run_ocr_on_pdf(self, local_pdf_path: str) -> Dict[str, Any]:
+    def run_ocr_on_pdf(self, local_pdf_path: str, content_sha256: Optional[str] = None) -> Dict[str, Any]:
         """
         Run OCR on a local PDF file
         
         Args:
             local_pdf_path: Path to local PDF file
+            content_sha256: SHA-256 of the file if already known (computed otherwise)
             
         Returns:
             Normalized OCR response dictionary with:
@@ -99,65 +135,106 @@ class OCRService:
         except Exception as e:
             raise OCRServiceError(f"Failed to read PDF file {local_pdf_path}: {e}") from e
         
+        return self.run_ocr_on_bytes(file_content, pdf_path.name, content_sha256=content_sha256)
+    
+    def run_ocr_on_bytes(
+        self,
+        file_content: bytes,
+        file_name: str,
+        content_sha256: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run OCR on an in-memory PDF (e.g. a split page that was never written to disk)
+        
+        Args:
+            file_content: PDF bytes
+            file_name: File name sent with the multipart upload (used in logs)
+            content_sha256: SHA-256 of file_content if already known (computed otherwise)
+            
+        Returns:
+            Normalized OCR response dictionary (same as run_ocr_on_pdf)
+            
+        Raises:
+            OCRServiceUnavailableError: If the OCR circuit is open
+            OCRServiceError: If OCR processing fails after retries
+        """
+        # Identical page bytes were OCR'd before - reuse the result
+        page_sha256 = content_sha256 or hashlib.sha256(file_content).hexdigest()
+        cached = self.result_cache.get(page_sha256)
+        if cached is not None:
+            logger.info(f"OCR result cache hit: {file_name} (sha256={page_sha256[:12]})")
+            return dict(cached, duration_ms=0, cache_hit=True)
+        
+        if not self.circuit_breaker.allow_request():
+            raise self._circuit_open_error(file_name)
+        
         # Retry logic for transient failures
         last_error = None
         for attempt in range(1, self.max_retries + 1):
+            # Stop retrying once the service is known to be down (the job is parked instead)
+            if attempt > 1 and self.circuit_breaker.state == STATE_OPEN:
+                raise self._circuit_open_error(file_name)
             try:
-                start_time = time.time()
-                
                 # Prepare multipart form data
                 files = {
-                    'file': (pdf_path.name, file_content, 'application/pdf')
+                    'file': (file_name, file_content, 'application/pdf')
                 }
                 
-                # Make HTTP request
-                with httpx.Client(timeout=self.timeout_seconds) as client:
-                    response = client.post(
+                # Make HTTP request (waits for a slot from the shared rate limiter)
+                with self.rate_limiter.slot():
+                    start_time = time.time()
+                    response = get_http_client().post_sync(
                         self.endpoint_url,
                         files=files,
-                        params={'order_mode': 'service'}  # Use service order mode
+                        params={'order_mode': 'service'},  # Use service order mode
+                        timeout=self.timeout
                     )
                 
                 duration_ms = int((time.time() - start_time) * 1000)
                 
                 # Check response status
                 if response.status_code == 200:
+                    self.circuit_breaker.record_success()
+                    self.rate_limiter.record_success(duration_ms / 1000)
                     result = response.json()
                     
                     # Normalize response format
                     normalized = self._normalize_response(result, duration_ms)
+                    self.result_cache.put(page_sha256, normalized)
                     
                     logger.info(
-                        f"OCR completed successfully: {local_pdf_path} "
+                        f"OCR completed successfully: {file_name} "
                         f"(confidence={normalized.get('overall_document_confidence', 0):.2f}, "
                         f"fields={len(normalized.get('fields', {}))}, duration={duration_ms}ms)"
                     )
                     
                     return normalized
                 
-                elif response.status_code >= 500:
+                elif self.retry_policy.is_retryable_status(response.status_code):
                     # Server error (502 Bad Gateway, 503 Service Unavailable, etc.) - retry with longer backoff
                     error_msg = f"OCR service returned {response.status_code}: {response.text[:200]}"
                     logger.warning(
                         f"OCR service error (attempt {attempt}/{self.max_retries}): {error_msg}"
                     )
                     last_error = OCRServiceError(error_msg)
+                    self.rate_limiter.record_overload()
                     
-                    if attempt < self.max_retries:
-                        # Exponential backoff with longer delays for 502/503 errors
-                        # 502/503 indicate service overload, so use longer backoff
-                        if response.status_code in [502, 503]:
-                            wait_time = 2 ** attempt  # Longer backoff: 2s, 4s, 8s, 16s, 32s
-                        else:
-                            wait_time = 2 ** (attempt - 1)  # Standard backoff: 1s, 2s, 4s
+                    if self.retry_policy.has_attempts_left(attempt):
+                        # Exponential backoff: 1s, 2s, 4s; 502/503 indicate service overload,
+                        # so they back off longer: 2s, 4s, 8s, 16s, 32s
+                        wait_time = self.retry_policy.delay_seconds(attempt, response.status_code)
                         logger.info(f"Retrying OCR in {wait_time} seconds...")
                         time.sleep(wait_time)
                         continue
                     else:
+                        self.circuit_breaker.record_failure()
                         raise last_error
                 
                 else:
-                    # Client error (4xx) - don't retry
+                    # Client error (4xx) - don't retry (the service is up; 429 still means overload)
+                    self.circuit_breaker.record_success()
+                    if response.status_code == 429:
+                        self.rate_limiter.record_overload()
                     error_msg = f"OCR service returned {response.status_code}: {response.text[:200]}"
                     logger.error(f"OCR service client error: {error_msg}")
                     raise OCRServiceError(error_msg)
@@ -168,13 +245,15 @@ class OCRService:
                     f"OCR timeout (attempt {attempt}/{self.max_retries}): {error_msg}"
                 )
                 last_error = OCRServiceError(f"{error_msg}: {e}")
+                self.rate_limiter.record_overload()
                 
-                if attempt < self.max_retries:
-                    wait_time = 2 ** (attempt - 1)
+                if self.retry_policy.has_attempts_left(attempt):
+                    wait_time = self.retry_policy.delay_seconds(attempt)
                     logger.info(f"Retrying OCR in {wait_time} seconds...")
                     time.sleep(wait_time)
                     continue
                 else:
+                    self.circuit_breaker.record_failure()
                     raise last_error
             
             except RequestError as e:
@@ -183,18 +262,36 @@ class OCRService:
                     f"OCR request error (attempt {attempt}/{self.max_retries}): {error_msg}"
                 )
                 last_error = OCRServiceError(f"{error_msg}: {e}")
+                self.rate_limiter.record_overload()
                 
-                if attempt < self.max_retries:
-                    wait_time = 2 ** (attempt - 1)
+                if self.retry_policy.has_attempts_left(attempt):
+                    wait_time = self.retry_policy.delay_seconds(attempt)
                     logger.info(f"Retrying OCR in {wait_time} seconds...")
                     time.sleep(wait_time)
                     continue
                 else:
+                    self.circuit_breaker.record_failure()
                     raise last_error
         
         # If we get here, all retries failed
+        self.circuit_breaker.record_failure()
         raise last_error or OCRServiceError("OCR processing failed after all retries")
     
+    def _circuit_open_error(self, file_name: str) -> OCRServiceUnavailableError:
+        retry_after = self.circuit_breaker.retry_after_seconds() or self.circuit_breaker.reset_timeout_seconds
+        return OCRServiceUnavailableError(
+            f"OCR service unavailable (circuit open); {file_name} not sent, retry in {retry_after:.0f}s",
+            retry_after_seconds=retry_after
+        )
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Current adaptive concurrency, circuit breaker and result cache state (shared by all OCR clients)"""
+        return {
+            'rate_limiter': self.rate_limiter.get_status(),
+            'circuit_breaker': self.circuit_breaker.get_status(),
+            'result_cache': self.result_cache.get_status()
+        }
+    
     def _normalize_response(self, raw_response: Dict[str, Any], duration_ms: int) -> Dict[str, Any]:
         """
         Normalize OCR service response to consistent format
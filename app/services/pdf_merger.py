@@ -9,9 +9,11 @@ Supports:
 
 All input files are normalized to PDF format before merging.
 """
+import io
 import logging
+import os
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union, TYPE_CHECKING
 import tempfile
 
 # PDF handling - prefer PyMuPDF (fitz) for production-ready form field preservation
@@ -47,8 +49,14 @@ try:
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+from app.services.cpu_pool import get_cpu_pool
+from app.services.tiff_passthrough import PassthroughImage, get_passthrough_image, build_image_pdf, open_tiff
+
 logger = logging.getLogger(__name__)
 
+if TYPE_CHECKING:
+    from app.services.document_splitter import DocumentSplitter, SplitResult
+
 
 class PDFMergeError(Exception):
     """Custom exception for PDF merge operations"""
@@ -65,18 +73,23 @@ class PDFMerger:
     - Text files: rendered to PDF
     """
     
-    def __init__(self, temp_dir: Optional[str] = None):
+    def __init__(self, temp_dir: Optional[str] = None, tiff_passthrough: bool = True, tiff_chunk_frames: int = 50):
         """
         Initialize PDF merger.
         
         Args:
             temp_dir: Base directory for temporary files. If None, uses system temp directory.
+            tiff_passthrough: Embed CCITT G4/JPEG TIFF frames without decoding them
+            tiff_chunk_frames: TIFF frames converted per CPU pool task for TIFF files on disk
         """
         if PDF_LIB is None:
             raise PDFMergeError(
                 "No PDF library available. Please install PyMuPDF (fitz), pypdf, or PyPDF2."
             )
         
+        self.tiff_passthrough = tiff_passthrough
+        self.tiff_chunk_frames = max(1, tiff_chunk_frames)
+        
         if temp_dir:
             self.temp_dir = Path(temp_dir)
             self.temp_dir.mkdir(parents=True, exist_ok=True)
@@ -105,56 +118,14 @@ class PDFMerger:
         Raises:
             PDFMergeError: If merging fails
         """
-        if len(input_paths) != len(mime_types):
-            raise PDFMergeError(
-                f"input_paths ({len(input_paths)}) and mime_types ({len(mime_types)}) "
-                "must have the same length"
-            )
-        
-        if not input_paths:
-            raise PDFMergeError("No input files provided for merging")
+        self._validate_inputs(input_paths, mime_types)
         
         logger.info(f"Merging {len(input_paths)} documents into consolidated PDF: {output_path}")
         
-        # Normalize all inputs to PDF format first
-        normalized_pdfs = []
         temp_files_to_cleanup = []
-        
         try:
-            for idx, (input_path, mime_type) in enumerate(zip(input_paths, mime_types)):
-                input_path_obj = Path(input_path)
-                if not input_path_obj.exists():
-                    raise PDFMergeError(f"Input file does not exist: {input_path}")
-                
-                mime_lower = mime_type.lower().strip()
-                
-                # Normalize to PDF
-                # Handle various PDF MIME type formats: "pdf", "application/pdf", "image/pdf", etc.
-                if (mime_lower == "pdf" or 
-                    mime_lower == "application/pdf" or 
-                    mime_lower.endswith("/pdf")):
-                    # Already PDF, use as-is
-                    normalized_pdfs.append(str(input_path_obj))
-                elif mime_lower in ["image/tiff", "image/tif"]:
-                    # Convert TIFF to PDF
-                    pdf_path = self._convert_tiff_to_pdf(input_path_obj, idx)
-                    normalized_pdfs.append(pdf_path)
-                    temp_files_to_cleanup.append(pdf_path)
-                elif mime_lower in ["image/jpeg", "image/jpg", "image/png"]:
-                    # Convert image to PDF
-                    pdf_path = self._convert_image_to_pdf(input_path_obj, idx)
-                    normalized_pdfs.append(pdf_path)
-                    temp_files_to_cleanup.append(pdf_path)
-                elif mime_lower == "text/plain" or mime_lower.endswith("/plain"):
-                    # Convert text to PDF
-                    pdf_path = self._convert_text_to_pdf(input_path_obj, idx)
-                    normalized_pdfs.append(pdf_path)
-                    temp_files_to_cleanup.append(pdf_path)
-                else:
-                    raise PDFMergeError(
-                        f"Unsupported MIME type for merging: {mime_type}. "
-                        f"Supported types: PDF, TIFF, JPEG, PNG, TXT"
-                    )
+            # Normalize all inputs to PDF format first
+            normalized_pdfs = self._normalize_to_pdfs(input_paths, mime_types, temp_files_to_cleanup)
             
             # Merge all normalized PDFs
             total_pages = self._merge_pdfs(normalized_pdfs, output_path)
@@ -167,12 +138,357 @@ class PDFMerger:
             return total_pages
             
         finally:
-            # Cleanup temporary normalized PDFs
-            for temp_file in temp_files_to_cleanup:
-                try:
-                    Path(temp_file).unlink()
-                except Exception as e:
-                    logger.warning(f"Failed to cleanup temp file {temp_file}: {e}")
+            self._cleanup(temp_files_to_cleanup)
+    
+    def merge_and_split(
+        self,
+        input_paths: List[str],
+        mime_types: List[str],
+        output_path: str,
+        splitter: "DocumentSplitter",
+        unique_id: str,
+        document_unique_identifier: str = "CONSOLIDATED"
+    ) -> Tuple[int, Optional["SplitResult"]]:
+        """
+        Merge documents into a consolidated PDF and split it into per-page PDFs in one pass.
+        
+        The consolidated PDF is still written to output_path (it is uploaded as the
+        packet's consolidated blob), but the per-page PDFs are produced from the same
+        in-memory document instead of re-opening and re-parsing the written file.
+        
+        If the merged PDF exceeds the splitter's streaming thresholds (see
+        DocumentSplitter.should_stream) it is not split here; the SplitResult is None and
+        the caller splits output_path in chunks with DocumentSplitter.iter_split_pdf.
+        
+        Args:
+            input_paths: List of local file paths to merge (in order)
+            mime_types: List of MIME types corresponding to input_paths
+            output_path: Local file path for the merged PDF output
+            splitter: DocumentSplitter used to emit the per-page PDFs
+            unique_id: Unique identifier for the message/packet (split work directory)
+            document_unique_identifier: Document identifier for the split work directory
+            
+        Returns:
+            Tuple of (total pages in the merged PDF, SplitResult or None in streaming mode)
+            
+        Raises:
+            PDFMergeError: If merging fails
+            DocumentSplitError: If splitting fails
+        """
+        if PDF_LIB != "PyMuPDF":
+            # No in-memory document to share - merge to disk, then split the file
+            total_pages = self.merge_documents(input_paths, mime_types, output_path)
+            if splitter.should_stream(total_pages, Path(output_path).stat().st_size):
+                return total_pages, None
+            split_result = splitter.split_document(
+                input_path=output_path,
+                unique_id=unique_id,
+                document_unique_identifier=document_unique_identifier,
+                original_file_name="consolidated.pdf",
+                mime_type="application/pdf"
+            )
+            return total_pages, split_result
+        
+        self._validate_inputs(input_paths, mime_types)
+        
+        logger.info(f"Merging and splitting {len(input_paths)} documents in one pass: {output_path}")
+        
+        temp_files_to_cleanup = []
+        merged_doc = None
+        try:
+            normalized_pdfs = self._normalize_to_pdfs(input_paths, mime_types, temp_files_to_cleanup)
+            try:
+                merged_doc = self._build_merged_pymupdf(normalized_pdfs)
+                merged_doc.save(output_path)
+            except Exception as e:
+                raise PDFMergeError(f"Failed to merge PDFs: {e}") from e
+            total_pages = len(merged_doc)
+            
+            if splitter.should_stream(total_pages, Path(output_path).stat().st_size):
+                logger.info(
+                    f"Merged {len(input_paths)} documents into {output_path} ({total_pages} total pages); "
+                    f"leaving split to streaming mode"
+                )
+                return total_pages, None
+            
+            split_result = splitter.split_open_pdf(
+                merged_doc,
+                unique_id=unique_id,
+                document_unique_identifier=document_unique_identifier
+            )
+            
+            logger.info(
+                f"Successfully merged {len(input_paths)} documents into {output_path} "
+                f"({total_pages} total pages) and split into {split_result.page_count} pages"
+            )
+            
+            return total_pages, split_result
+            
+        finally:
+            if merged_doc is not None:
+                merged_doc.close()
+            self._cleanup(temp_files_to_cleanup)
+    
+    def merge_and_split_buffers(
+        self,
+        sources: List[Union[str, bytes]],
+        mime_types: List[str],
+        output_path: str,
+        splitter: "DocumentSplitter",
+        unique_id: str,
+        document_unique_identifier: str = "CONSOLIDATED",
+        max_memory_bytes: int = 0
+    ) -> Tuple[int, Optional[bytes], Optional["SplitResult"]]:
+        """
+        Merge and split without temp files when the packet is small enough.
+        
+        Sources may be in-memory bytes or local file paths (a download that did not fit
+        in memory). Whether the packet stays in memory, and whether it is left to
+        streaming mode, is decided from the page count and total source size before
+        anything is serialized. If the sources add up to at most max_memory_bytes the
+        consolidated PDF is returned as bytes and the per-page PDFs stay in memory
+        (SplitPage.content); otherwise the merged document is saved straight to
+        output_path and pages are written to disk as in merge_and_split. Above the
+        splitter's streaming thresholds the PDF is always saved to output_path and the
+        SplitResult is None, as in merge_and_split.
+        
+        Callers with packets known to exceed the budget should use merge_and_split.
+        
+        Args:
+            sources: Document bytes or local file paths (in order)
+            mime_types: List of MIME types corresponding to sources
+            output_path: Local file path used if the consolidated PDF spills to disk
+            splitter: DocumentSplitter used to emit the per-page PDFs
+            unique_id: Unique identifier for the message/packet (split work directory)
+            document_unique_identifier: Document identifier for the split work directory
+            max_memory_bytes: Largest packet (total source size) kept in memory
+            
+        Returns:
+            Tuple of (total pages, consolidated PDF bytes or None if written to output_path,
+            SplitResult or None in streaming mode)
+            
+        Raises:
+            PDFMergeError: If merging fails or PyMuPDF is not available
+            DocumentSplitError: If splitting fails
+        """
+        if PDF_LIB != "PyMuPDF":
+            raise PDFMergeError("In-memory merging requires PyMuPDF")
+        
+        self._validate_inputs(sources, mime_types)
+        
+        source_bytes = sum(self._source_size(source) for source in sources)
+        in_memory = source_bytes <= max_memory_bytes
+        
+        temp_files_to_cleanup = []
+        merged_doc = None
+        try:
+            try:
+                merged_doc = fitz.open()
+                for index, (source, mime_type) in enumerate(zip(sources, mime_types)):
+                    src_doc = self._open_source_as_pdf(source, mime_type, index, temp_files_to_cleanup)
+                    try:
+                        merged_doc.insert_pdf(src_doc)
+                    finally:
+                        src_doc.close()
+                total_pages = len(merged_doc)
+                
+                # Streaming thresholds are checked on the page count and source size before
+                # anything is serialized, so a very large document goes straight to disk
+                if splitter.should_stream(total_pages, source_bytes):
+                    merged_doc.save(output_path)
+                    logger.info(
+                        f"Merged {len(sources)} documents ({total_pages} pages) on disk: {output_path}; "
+                        f"leaving split to streaming mode"
+                    )
+                    return total_pages, None, None
+                
+                if in_memory:
+                    consolidated_data = merged_doc.tobytes()
+                else:
+                    # Over budget - never hold a serialized copy of the whole packet
+                    merged_doc.save(output_path)
+                    consolidated_data = None
+            except PDFMergeError:
+                raise
+            except Exception as e:
+                raise PDFMergeError(f"Failed to merge documents in memory: {e}") from e
+            
+            if in_memory and len(consolidated_data) > max_memory_bytes:
+                # Conversion grew the packet past the budget (e.g. rendered text or images)
+                Path(output_path).write_bytes(consolidated_data)
+                consolidated_data = None
+                in_memory = False
+            
+            split_result = splitter.split_open_pdf(
+                merged_doc,
+                unique_id=unique_id,
+                document_unique_identifier=document_unique_identifier,
+                in_memory=in_memory
+            )
+            
+            logger.info(
+                f"Merged {len(sources)} documents ({total_pages} pages) and split into "
+                f"{split_result.page_count} pages {'in memory' if in_memory else f'on disk: {output_path}'}"
+            )
+            
+            return total_pages, consolidated_data, split_result
+        finally:
+            if merged_doc is not None:
+                merged_doc.close()
+            self._cleanup(temp_files_to_cleanup)
+    
+    @staticmethod
+    def _source_size(source: Union[str, bytes]) -> int:
+        """Size in bytes of an in-memory or on-disk source document"""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return len(source)
+        try:
+            return Path(source).stat().st_size
+        except OSError:
+            return 0
+    
+    def _open_source_as_pdf(
+        self,
+        source: Union[str, bytes],
+        mime_type: str,
+        index: int = 0,
+        temp_files_to_cleanup: Optional[List[str]] = None
+    ) -> "fitz.Document":
+        """
+        Open a document (bytes or file path) as a PDF.
+        
+        In-memory sources are converted in memory. Non-PDF files on disk are converted
+        to a temp PDF as in merge_and_split instead of being read back into memory.
+        
+        Args:
+            source: Document bytes or local file path
+            mime_type: MIME type of the document
+            index: Position of the source in the packet (names temp files)
+            temp_files_to_cleanup: Receives temp PDFs converted from files (caller cleans up)
+            
+        Returns:
+            Open fitz.Document (caller closes it)
+        """
+        data = source if isinstance(source, (bytes, bytearray, memoryview)) else None
+        if data is None and not Path(source).exists():
+            raise PDFMergeError(f"Input file does not exist: {source}")
+        
+        mime_lower = mime_type.lower().strip()
+        
+        if mime_lower == "pdf" or mime_lower == "application/pdf" or mime_lower.endswith("/pdf"):
+            if data is not None:
+                return fitz.open(stream=bytes(data), filetype="pdf")
+            return fitz.open(source)
+        
+        if data is None:
+            if temp_files_to_cleanup is None:
+                temp_files_to_cleanup = []
+            converted = self._normalize_to_pdfs([source], [mime_type], temp_files_to_cleanup, start_index=index)
+            return fitz.open(converted[0])
+        
+        # Conversions run in the CPU pool; only the resulting PDF bytes come back
+        if mime_lower in ["image/tiff", "image/tif"]:
+            if not PIL_AVAILABLE:
+                raise PDFMergeError("PIL/Pillow not available for TIFF conversion")
+            pdf_data, frame_count = get_cpu_pool().run(tiff_to_pdf_bytes, bytes(data), self.tiff_passthrough)
+            if not frame_count:
+                raise PDFMergeError("TIFF file has no frames")
+            return fitz.open(stream=pdf_data, filetype="pdf")
+        
+        if mime_lower in ["image/jpeg", "image/jpg", "image/png"]:
+            if not PIL_AVAILABLE:
+                raise PDFMergeError("PIL/Pillow not available for image conversion")
+            return fitz.open(stream=get_cpu_pool().run(image_to_pdf_bytes, bytes(data)), filetype="pdf")
+        
+        if mime_lower == "text/plain" or mime_lower.endswith("/plain"):
+            if not REPORTLAB_AVAILABLE:
+                raise PDFMergeError("ReportLab not available for text-to-PDF conversion")
+            text_content = bytes(data).decode('utf-8', errors='ignore')
+            return fitz.open(stream=get_cpu_pool().run(text_to_pdf_bytes, text_content), filetype="pdf")
+        
+        raise PDFMergeError(
+            f"Unsupported MIME type for merging: {mime_type}. "
+            f"Supported types: PDF, TIFF, JPEG, PNG, TXT"
+        )
+    
+    @staticmethod
+    def _validate_inputs(input_paths: List[str], mime_types: List[str]) -> None:
+        """Validate merge inputs"""
+        if len(input_paths) != len(mime_types):
+            raise PDFMergeError(
+                f"input_paths ({len(input_paths)}) and mime_types ({len(mime_types)}) "
+                "must have the same length"
+            )
+        
+        if not input_paths:
+            raise PDFMergeError("No input files provided for merging")
+    
+    def _normalize_to_pdfs(
+        self,
+        input_paths: List[str],
+        mime_types: List[str],
+        temp_files_to_cleanup: List[str],
+        start_index: int = 0
+    ) -> List[str]:
+        """
+        Normalize all inputs to PDF files.
+        
+        Args:
+            input_paths: List of local file paths (in order)
+            mime_types: List of MIME types corresponding to input_paths
+            temp_files_to_cleanup: Receives the converted temp PDFs (caller cleans up)
+            start_index: Packet position of the first input (names the converted temp PDFs)
+            
+        Returns:
+            List of PDF file paths (in input order)
+        """
+        normalized_pdfs = []
+        
+        for idx, (input_path, mime_type) in enumerate(zip(input_paths, mime_types), start=start_index):
+            input_path_obj = Path(input_path)
+            if not input_path_obj.exists():
+                raise PDFMergeError(f"Input file does not exist: {input_path}")
+            
+            mime_lower = mime_type.lower().strip()
+            
+            # Normalize to PDF
+            # Handle various PDF MIME type formats: "pdf", "application/pdf", "image/pdf", etc.
+            if (mime_lower == "pdf" or 
+                mime_lower == "application/pdf" or 
+                mime_lower.endswith("/pdf")):
+                # Already PDF, use as-is
+                normalized_pdfs.append(str(input_path_obj))
+            elif mime_lower in ["image/tiff", "image/tif"]:
+                # Convert TIFF to PDF
+                pdf_path = self._convert_tiff_to_pdf(input_path_obj, idx)
+                normalized_pdfs.append(pdf_path)
+                temp_files_to_cleanup.append(pdf_path)
+            elif mime_lower in ["image/jpeg", "image/jpg", "image/png"]:
+                # Convert image to PDF
+                pdf_path = self._convert_image_to_pdf(input_path_obj, idx)
+                normalized_pdfs.append(pdf_path)
+                temp_files_to_cleanup.append(pdf_path)
+            elif mime_lower == "text/plain" or mime_lower.endswith("/plain"):
+                # Convert text to PDF
+                pdf_path = self._convert_text_to_pdf(input_path_obj, idx)
+                normalized_pdfs.append(pdf_path)
+                temp_files_to_cleanup.append(pdf_path)
+            else:
+                raise PDFMergeError(
+                    f"Unsupported MIME type for merging: {mime_type}. "
+                    f"Supported types: PDF, TIFF, JPEG, PNG, TXT"
+                )
+        
+        return normalized_pdfs
+    
+    @staticmethod
+    def _cleanup(temp_files: List[str]) -> None:
+        """Cleanup temporary normalized PDFs"""
+        for temp_file in temp_files:
+            try:
+                Path(temp_file).unlink()
+            except Exception as e:
+                logger.warning(f"Failed to cleanup temp file {temp_file}: {e}")
     
     def _merge_pdfs(self, pdf_paths: List[str], output_path: str) -> int:
         """
@@ -192,19 +508,25 @@ class PDFMerger:
     
     def _merge_pdfs_pymupdf(self, pdf_paths: List[str], output_path: str) -> int:
         """Merge PDFs using PyMuPDF (fitz)"""
+        merged_doc = self._build_merged_pymupdf(pdf_paths)
+        try:
+            merged_doc.save(output_path)
+            return len(merged_doc)
+        finally:
+            merged_doc.close()
+    
+    def _build_merged_pymupdf(self, pdf_paths: List[str]) -> "fitz.Document":
+        """Build the merged document in memory (caller saves and closes it)"""
         merged_doc = fitz.open()
-        total_pages = 0
-        
-        for pdf_path in pdf_paths:
-            src_doc = fitz.open(pdf_path)
-            merged_doc.insert_pdf(src_doc)
-            total_pages += len(src_doc)
-            src_doc.close()
-        
-        merged_doc.save(output_path)
-        merged_doc.close()
-        
-        return total_pages
+        try:
+            for pdf_path in pdf_paths:
+                src_doc = fitz.open(pdf_path)
+                merged_doc.insert_pdf(src_doc)
+                src_doc.close()
+        except Exception:
+            merged_doc.close()
+            raise
+        return merged_doc
     
     def _merge_pdfs_pypdf(self, pdf_paths: List[str], output_path: str) -> int:
         """Merge PDFs using pypdf/PyPDF2"""
@@ -225,75 +547,76 @@ class PDFMerger:
         finally:
             merger.close()
     
+    def _converted_pdf_path(self, index: int, kind: str) -> Path:
+        """
+        Create a uniquely named temp PDF for a converted input.
+        
+        Several packets merge concurrently in one process and share temp_dir, so the
+        name must not depend on the input index alone.
+        
+        Args:
+            index: Packet position of the input
+            kind: Source kind ("tiff", "image" or "text")
+            
+        Returns:
+            Path of the new (empty) temp file
+        """
+        fd, path = tempfile.mkstemp(prefix=f"normalized_{index}_", suffix=f"_{kind}.pdf", dir=str(self.temp_dir))
+        os.close(fd)
+        return Path(path)
+    
     def _convert_tiff_to_pdf(self, tiff_path: Path, index: int) -> str:
         """
         Convert multi-page TIFF to PDF with all frames.
         
         Uses seek+copy pattern to ensure each frame has independent pixel data.
         ImageSequence.Iterator can yield shared references, causing all pages to show the same image.
-        Each TIFF frame becomes one distinct PDF page.
+        Each TIFF frame becomes one distinct PDF page. With PyMuPDF, frames are converted
+        tiff_chunk_frames at a time from the file path and appended to the output PDF, so
+        neither the TIFF nor the whole converted PDF is held in memory.
         """
         if not PIL_AVAILABLE:
             raise PDFMergeError("PIL/Pillow not available for TIFF conversion")
         
-        output_path = self.temp_dir / f"normalized_{index}_tiff.pdf"
+        output_path = self._converted_pdf_path(index, "tiff")
         
         try:
-            # Open TIFF image
-            img = Image.open(tiff_path)
-            
-            # Load image to ensure n_frames is reliable (TIFF pages are a linked list)
-            img.load()
-            
-            # Build frames with seek+copy to ensure each frame has independent pixel data
-            # ImageSequence.Iterator can yield shared references, causing duplicate pages
-            frames = []
-            frame_idx = 0
-            while True:
-                try:
-                    img.seek(frame_idx)
-                    frames.append(img.copy())  # Independent copy of pixel data
-                    frame_idx += 1
-                except EOFError:
-                    break
-            
-            if not frames:
-                raise PDFMergeError(f"TIFF file has no frames: {tiff_path}")
-            
-            logger.info(f"Converting TIFF with {len(frames)} frames to PDF: {tiff_path}")
-            
             if PDF_LIB == "PyMuPDF":
                 # Use PyMuPDF for better quality - create one page per frame
-                pdf_doc = fitz.open()
-                
-                for frame_idx, frame in enumerate(frames):
-                    # Convert frame to RGB if necessary
-                    if frame.mode != 'RGB':
-                        frame = frame.convert('RGB')
-                    
-                    # Create a page for this frame
-                    pdf_page = pdf_doc.new_page(width=frame.width, height=frame.height)
-                    
-                    # Save frame to temporary file for PyMuPDF to insert
-                    # PyMuPDF needs a file path, not PIL Image object
-                    temp_frame_path = self.temp_dir / f"temp_frame_{index}_{frame_idx}.png"
-                    frame.save(temp_frame_path, "PNG")
-                    
-                    # Insert frame as image on PDF page
-                    pdf_page.insert_image(
-                        fitz.Rect(0, 0, frame.width, frame.height),
-                        filename=str(temp_frame_path)
+                # (frame decoding runs in the CPU pool, off the GIL of this process)
+                frame_count = 0
+                while True:
+                    pdf_data, chunk_frames = get_cpu_pool().run(
+                        tiff_to_pdf_bytes, str(tiff_path), self.tiff_passthrough, frame_count, self.tiff_chunk_frames
                     )
-                    
-                    # Clean up temp frame file
-                    try:
-                        temp_frame_path.unlink()
-                    except Exception as e:
-                        logger.warning(f"Failed to cleanup temp frame file {temp_frame_path}: {e}")
+                    if not chunk_frames:
+                        break
+                    if frame_count == 0:
+                        output_path.write_bytes(pdf_data)
+                    else:
+                        self._append_pdf(output_path, pdf_data)
+                    frame_count += chunk_frames
+                    if chunk_frames < self.tiff_chunk_frames:
+                        break
+                if not frame_count:
+                    raise PDFMergeError(f"TIFF file has no frames: {tiff_path}")
                 
-                pdf_doc.save(str(output_path))
-                pdf_doc.close()
+                logger.info(f"Converted TIFF with {frame_count} frames to PDF: {tiff_path}")
             else:
+                # Open TIFF image
+                img = Image.open(tiff_path)
+                
+                # Load image to ensure n_frames is reliable (TIFF pages are a linked list)
+                img.load()
+                
+                frames = self._load_tiff_frames(img)
+                frame_count = len(frames)
+                
+                if not frames:
+                    raise PDFMergeError(f"TIFF file has no frames: {tiff_path}")
+                
+                logger.info(f"Converting TIFF with {frame_count} frames to PDF: {tiff_path}")
+                
                 # Fallback: convert to PDF using PIL + reportlab
                 if not REPORTLAB_AVAILABLE:
                     raise PDFMergeError("ReportLab not available for TIFF conversion")
@@ -330,18 +653,19 @@ class PDFMerger:
                     verify_reader = pypdf.PdfReader(f)
                     actual_pages = len(verify_reader.pages)
             
-            if actual_pages != len(frames):
+            if actual_pages != frame_count:
                 logger.warning(
-                    f"TIFF conversion page count mismatch: expected {len(frames)} pages, "
+                    f"TIFF conversion page count mismatch: expected {frame_count} pages, "
                     f"got {actual_pages} pages in PDF {output_path}"
                 )
             
-            logger.info(f"Successfully converted {len(frames)}-frame TIFF to {actual_pages}-page PDF")
+            logger.info(f"Successfully converted {frame_count}-frame TIFF to {actual_pages}-page PDF")
             
             return str(output_path)
             
         except PDFMergeError:
-            # Re-raise PDFMergeError as-is
+            # Re-raise PDFMergeError as-is (after removing the partial output)
+            output_path.unlink(missing_ok=True)
             raise
         except Exception as e:
             # Clean up output file on error
@@ -359,28 +683,74 @@ class PDFMerger:
             except Exception:
                 pass
     
+    @staticmethod
+    def _append_pdf(output_path: Path, pdf_data: bytes) -> None:
+        """Append the pages of pdf_data to the PDF file at output_path (incremental save)"""
+        with fitz.open(str(output_path)) as output_doc, fitz.open(stream=pdf_data, filetype="pdf") as chunk_doc:
+            output_doc.insert_pdf(chunk_doc)
+            output_doc.saveIncr()
+    
+    @staticmethod
+    def _load_tiff_frames(img) -> list:
+        """
+        Copy every frame of an open TIFF.
+        
+        Uses seek+copy so each frame has independent pixel data
+        (ImageSequence.Iterator can yield shared references, causing duplicate pages).
+        """
+        frames = []
+        frame_idx = 0
+        while True:
+            try:
+                img.seek(frame_idx)
+                frames.append(img.copy())  # Independent copy of pixel data
+                frame_idx += 1
+            except EOFError:
+                break
+        return frames
+    
+    @staticmethod
+    def _frames_to_fitz(frames: list) -> "fitz.Document":
+        """Build an in-memory PDF with one page per image frame (caller closes it)"""
+        pdf_doc = fitz.open()
+        
+        for frame in frames:
+            # Convert frame to RGB if necessary
+            if frame.mode != 'RGB':
+                frame = frame.convert('RGB')
+            
+            # Create a page for this frame
+            pdf_page = pdf_doc.new_page(width=frame.width, height=frame.height)
+            
+            # Encode frame as PNG in memory and insert it as the page image
+            png_buffer = io.BytesIO()
+            frame.save(png_buffer, "PNG")
+            pdf_page.insert_image(
+                fitz.Rect(0, 0, frame.width, frame.height),
+                stream=png_buffer.getvalue()
+            )
+        
+        return pdf_doc
+    
     def _convert_image_to_pdf(self, image_path: Path, index: int) -> str:
         """Convert image (PNG/JPG) to PDF"""
         if not PIL_AVAILABLE:
             raise PDFMergeError("PIL/Pillow not available for image conversion")
         
-        output_path = self.temp_dir / f"normalized_{index}_image.pdf"
+        output_path = self._converted_pdf_path(index, "image")
         
         try:
-            img = Image.open(image_path)
             if PDF_LIB == "PyMuPDF":
                 # Use PyMuPDF for better quality
-                pdf_doc = fitz.open()
-                pdf_page = pdf_doc.new_page(width=img.width, height=img.height)
-                pdf_page.insert_image(fitz.Rect(0, 0, img.width, img.height), filename=str(image_path))
-                pdf_doc.save(str(output_path))
-                pdf_doc.close()
+                output_path.write_bytes(get_cpu_pool().run(image_to_pdf_bytes, image_path.read_bytes()))
             else:
+                img = Image.open(image_path)
                 # Fallback: convert to PDF using PIL
                 img.save(str(output_path), "PDF", resolution=100.0)
             
             return str(output_path)
         except Exception as e:
+            output_path.unlink(missing_ok=True)
             raise PDFMergeError(f"Failed to convert image to PDF: {e}") from e
     
     def _convert_text_to_pdf(self, text_path: Path, index: int) -> str:
@@ -388,53 +758,145 @@ class PDFMerger:
         if not REPORTLAB_AVAILABLE:
             raise PDFMergeError("ReportLab not available for text-to-PDF conversion")
         
-        output_path = self.temp_dir / f"normalized_{index}_text.pdf"
+        output_path = self._converted_pdf_path(index, "text")
         
         try:
             # Read text file
             with open(text_path, 'r', encoding='utf-8', errors='ignore') as f:
                 text_content = f.read()
             
-            # Create PDF with text
-            c = canvas.Canvas(str(output_path), pagesize=letter)
-            width, height = letter
-            
-            # Simple text rendering (wraps at page width)
-            y = height - 50
-            line_height = 14
-            margin = 50
-            
-            for line in text_content.split('\n'):
-                if y < margin:
-                    c.showPage()
-                    y = height - 50
-                
-                # Truncate long lines
-                max_chars = int((width - 2 * margin) / 7)  # Approximate char width
-                if len(line) > max_chars:
-                    # Split long lines
-                    words = line.split()
-                    current_line = ""
-                    for word in words:
-                        if len(current_line + word) > max_chars:
-                            if current_line:
-                                c.drawString(margin, y, current_line)
-                                y -= line_height
-                                if y < margin:
-                                    c.showPage()
-                                    y = height - 50
-                            current_line = word + " "
-                        else:
-                            current_line += word + " "
-                    if current_line:
-                        c.drawString(margin, y, current_line)
-                        y -= line_height
-                else:
-                    c.drawString(margin, y, line)
-                    y -= line_height
-            
-            c.save()
+            output_path.write_bytes(get_cpu_pool().run(text_to_pdf_bytes, text_content))
             return str(output_path)
         except Exception as e:
+            output_path.unlink(missing_ok=True)
             raise PDFMergeError(f"Failed to convert text to PDF: {e}") from e
+    
+    @staticmethod
+    def _image_to_fitz(data: bytes) -> "fitz.Document":
+        """Build an in-memory one-page PDF from JPG/PNG bytes (caller closes it)"""
+        with Image.open(io.BytesIO(data)) as img:
+            width, height = img.width, img.height
+        pdf_doc = fitz.open()
+        pdf_page = pdf_doc.new_page(width=width, height=height)
+        pdf_page.insert_image(fitz.Rect(0, 0, width, height), stream=data)
+        return pdf_doc
+    
+    @staticmethod
+    def _render_text_pdf(text_content: str, target) -> None:
+        """
+        Render text to a PDF.
+        
+        Args:
+            text_content: Text to render
+            target: Output file path or writable binary buffer
+        """
+        # Create PDF with text
+        c = canvas.Canvas(target, pagesize=letter)
+        width, height = letter
+        
+        # Simple text rendering (wraps at page width)
+        y = height - 50
+        line_height = 14
+        margin = 50
+        
+        for line in text_content.split('\n'):
+            if y < margin:
+                c.showPage()
+                y = height - 50
+            
+            # Truncate long lines
+            max_chars = int((width - 2 * margin) / 7)  # Approximate char width
+            if len(line) > max_chars:
+                # Split long lines
+                words = line.split()
+                current_line = ""
+                for word in words:
+                    if len(current_line + word) > max_chars:
+                        if current_line:
+                            c.drawString(margin, y, current_line)
+                            y -= line_height
+                            if y < margin:
+                                c.showPage()
+                                y = height - 50
+                        current_line = word + " "
+                    else:
+                        current_line += word + " "
+                if current_line:
+                    c.drawString(margin, y, current_line)
+                    y -= line_height
+            else:
+                c.drawString(margin, y, line)
+                y -= line_height
+        
+        c.save()
+
+
+# CPU pool tasks (module-level so worker processes can unpickle them)
+
+def tiff_to_pdf_bytes(
+    source: Union[str, bytes],
+    passthrough: bool = True,
+    first_frame: int = 0,
+    max_frames: Optional[int] = None
+) -> Tuple[bytes, int]:
+    """
+    Convert a TIFF (or a chunk of its frames) to a PDF with one page per frame.
+    
+    CCITT G4 and JPEG frames are embedded without decoding when passthrough is set
+    (see tiff_passthrough); other frames are decoded and inserted as images.
+    
+    Args:
+        source: TIFF file path (memory-mapped) or bytes
+        passthrough: Embed CCITT G4/JPEG frames without decoding
+        first_frame: First frame to convert (0-based)
+        max_frames: Frames to convert (None = to the end)
+    
+    Returns:
+        Tuple of (PDF bytes, frame count); frame count 0 means no frames from first_frame
+    """
+    # Per frame: a passthrough image, or a decoded frame copy
+    frames = []
+    with open_tiff(source) as (img, data):
+        frame_idx = first_frame
+        while max_frames is None or len(frames) < max_frames:
+            try:
+                img.seek(frame_idx)
+            except EOFError:
+                break
+            passthrough_image = get_passthrough_image(img, data) if passthrough else None
+            frames.append(passthrough_image if passthrough_image is not None else img.copy())
+            frame_idx += 1
+    if not frames:
+        return b"", 0
+    
+    if all(isinstance(frame, PassthroughImage) for frame in frames):
+        return build_image_pdf(frames), len(frames)
+    
+    pdf_doc = fitz.open()
+    try:
+        for frame in frames:
+            if isinstance(frame, PassthroughImage):
+                with fitz.open(stream=build_image_pdf([frame]), filetype="pdf") as frame_doc:
+                    pdf_doc.insert_pdf(frame_doc)
+            else:
+                with PDFMerger._frames_to_fitz([frame]) as frame_doc:
+                    pdf_doc.insert_pdf(frame_doc)
+        return pdf_doc.tobytes(), len(frames)
+    finally:
+        pdf_doc.close()
+
+
+def image_to_pdf_bytes(data: bytes) -> bytes:
+    """Convert JPG/PNG bytes to a one-page PDF"""
+    pdf_doc = PDFMerger._image_to_fitz(data)
+    try:
+        return pdf_doc.tobytes()
+    finally:
+        pdf_doc.close()
+
 
+def text_to_pdf_bytes(text_content: str) -> bytes:
+    """Render text to a PDF"""
+    buffer = io.BytesIO()
+    PDFMerger._render_text_pdf(text_content, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,223 @@
+"""
+Pipeline Stages
+Per-stage concurrency limits and bounded queues for document processing.
+
+DocumentProcessor runs each packet through download -> merge -> upload -> split ->
+page_upload -> ocr (Transactions B-D commit at the end of upload, page_upload and
+ocr). Fresh packets are split together with the merge (PDFMerger.merge_and_split);
+the split stage is used when resuming from a stored consolidated PDF. Packets run concurrently in the message poller's worker pool; the stage gates
+let network-bound and CPU-bound stages overlap across packets (packet B splits
+while packet A waits on OCR) while each stage keeps its own concurrency limit.
+
+Backpressure: a packet moving to the next stage keeps its current stage slot until
+it is admitted to the next stage's queue, so a slow stage fills its queue and then
+stalls the stages in front of it. The worker pool stops claiming new jobs while the
+first stage's queue is full.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+STAGE_DOWNLOAD = 'download'
+STAGE_MERGE = 'merge'
+STAGE_UPLOAD = 'upload'
+STAGE_SPLIT = 'split'
+STAGE_PAGE_UPLOAD = 'page_upload'
+STAGE_OCR = 'ocr'
+
+STAGES = [STAGE_DOWNLOAD, STAGE_MERGE, STAGE_UPLOAD, STAGE_SPLIT, STAGE_PAGE_UPLOAD, STAGE_OCR]
+
+
+def parse_stage_concurrency(value: Optional[str], default: int) -> Dict[str, int]:
+    """
+    Parse a "stage:limit,stage:limit" setting; stages not listed get the default
+
+    Args:
+        value: Setting string, e.g. "download:4,merge:2"
+        default: Limit for stages that are not listed
+
+    Returns:
+        Dict of stage -> limit for every stage
+    """
+    parsed = {stage: default for stage in STAGES}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        try:
+            stage, raw = item.split(":", 1)
+            stage = stage.strip().lower()
+            if stage not in parsed:
+                logger.warning(f"Ignoring unknown pipeline stage '{stage}' (known stages: {STAGES})")
+                continue
+            parsed[stage] = max(1, int(raw))
+        except ValueError:
+            logger.warning(f"Ignoring invalid pipeline stage setting '{item}' (expected stage:limit)")
+    return parsed
+
+
+class PipelineStage:
+    """
+    One stage: at most `concurrency` packets active, at most `queue_size` waiting.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_size: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self._cond = threading.Condition()
+
+    def reserve(self) -> None:
+        """Take a queue slot (blocks while the queue is full - backpressure)"""
+        with self._cond:
+            while self.queued >= self.queue_size:
+                self._cond.wait()
+            self.queued += 1
+
+    def activate(self) -> None:
+        """Move from the queue to an active slot (blocks while the stage is at capacity)"""
+        with self._cond:
+            while self.active >= self.concurrency:
+                self._cond.wait()
+            self.queued -= 1
+            self.active += 1
+            self._cond.notify_all()
+
+    def release(self) -> None:
+        """Give up the active slot"""
+        with self._cond:
+            self.active -= 1
+            self.completed += 1
+            self._cond.notify_all()
+
+    def cancel_reservation(self) -> None:
+        """Give up a queue slot that was never activated"""
+        with self._cond:
+            self.queued -= 1
+            self._cond.notify_all()
+
+    def has_queue_capacity(self) -> bool:
+        with self._cond:
+            return self.queued < self.queue_size
+
+    def get_status(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                'active': self.active,
+                'queued': self.queued,
+                'concurrency': self.concurrency,
+                'queue_size': self.queue_size,
+                'completed': self.completed
+            }
+
+
+class PipelineRun:
+    """
+    Tracks one packet's position in the pipeline.
+
+    Usage:
+        with pipeline.run() as run:
+            run.enter(STAGE_DOWNLOAD)
+            ...
+            run.enter(STAGE_MERGE)   # releases download once admitted to merge's queue
+    """
+
+    def __init__(self, pipeline: "DocumentPipeline"):
+        self.pipeline = pipeline
+        self.current: Optional[PipelineStage] = None
+
+    def enter(self, stage_name: str) -> None:
+        """
+        Move this packet to `stage_name`
+
+        Args:
+            stage_name: One of STAGES
+        """
+        stage = self.pipeline.stages[stage_name]
+        if stage is self.current:
+            return
+
+        stage.reserve()
+        try:
+            # Admitted to the next queue - now the previous stage can take another packet
+            self._release_current()
+            stage.activate()
+        except BaseException:
+            stage.cancel_reservation()
+            raise
+        self.current = stage
+
+    def _release_current(self) -> None:
+        if self.current is not None:
+            self.current.release()
+            self.current = None
+
+    def close(self) -> None:
+        self._release_current()
+
+
+class DocumentPipeline:
+    """
+    Process-wide set of stage gates shared by all DocumentProcessor instances.
+    """
+
+    def __init__(self, concurrency: Optional[Dict[str, int]] = None, queue_size: int = 8):
+        """
+        Initialize pipeline
+
+        Args:
+            concurrency: Active packets allowed per stage (default: 1 per stage)
+            queue_size: Packets allowed to wait for each stage
+        """
+        concurrency = concurrency or {}
+        self.stages = {
+            stage: PipelineStage(stage, max(1, concurrency.get(stage, 1)), max(1, queue_size))
+            for stage in STAGES
+        }
+
+    @classmethod
+    def from_settings(cls) -> "DocumentPipeline":
+        """Build pipeline from PIPELINE_STAGE_CONCURRENCY / PIPELINE_STAGE_QUEUE_SIZE"""
+        return cls(
+            concurrency=parse_stage_concurrency(settings.pipeline_stage_concurrency, 2),
+            queue_size=settings.pipeline_stage_queue_size
+        )
+
+    @contextmanager
+    def run(self) -> Iterator[PipelineRun]:
+        """Context manager for one packet; releases its stage slot on exit (including errors)"""
+        pipeline_run = PipelineRun(self)
+        try:
+            yield pipeline_run
+        finally:
+            pipeline_run.close()
+
+    def can_admit(self) -> bool:
+        """True if the first stage can queue another packet (used by the worker pool)"""
+        return self.stages[STAGES[0]].has_queue_capacity()
+
+    def get_status(self) -> Dict[str, Dict[str, int]]:
+        """Per-stage active/queued counts and limits"""
+        return {stage: self.stages[stage].get_status() for stage in STAGES}
+
+
+# Global pipeline instance (shared by all processors in this process)
+_pipeline: Optional[DocumentPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_document_pipeline() -> DocumentPipeline:
+    """Get or create the global document pipeline"""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = DocumentPipeline.from_settings()
+    return _pipeline
@@ -102,21 +102,50 @@ class StatusUpdateService:
             attempt_count=attempt_count
         )
     
+    def mark_deferred_with_retry(
+        self,
+        inbox_id: int,
+        error_message: str,
+        retry_after_seconds: float
+    ) -> StatusUpdateResult:
+        """
+        Park a job that could not run because a dependency is unavailable.
+        
+        The job goes back to FAILED so it is claimed again after retry_after_seconds,
+        without consuming one of its attempts (it is never marked DEAD for this).
+        
+        Args:
+            inbox_id: Inbox ID of the parked job
+            error_message: Error message to store
+            retry_after_seconds: Delay before the job may be claimed again
+            
+        Returns:
+            StatusUpdateResult indicating success or failure
+        """
+        return self._update_status_with_retry(
+            inbox_id=inbox_id,
+            target_status='DEFERRED',
+            error_message=error_message,
+            retry_after_seconds=retry_after_seconds
+        )
+    
     def _update_status_with_retry(
         self,
         inbox_id: int,
         target_status: str,
         error_message: Optional[str],
-        attempt_count: Optional[int] = None
+        attempt_count: Optional[int] = None,
+        retry_after_seconds: float = 0.0
     ) -> StatusUpdateResult:
         """
         Update inbox status with retry logic.
         
         Args:
             inbox_id: Inbox ID
-            target_status: Target status ('DONE' or 'FAILED')
-            error_message: Error message (for FAILED status)
+            target_status: Target status ('DONE', 'FAILED' or 'DEFERRED')
+            error_message: Error message (for FAILED/DEFERRED status)
             attempt_count: Optional attempt count (for FAILED status)
+            retry_after_seconds: Delay before the job is claimable again (for DEFERRED status)
             
         Returns:
             StatusUpdateResult
@@ -187,6 +216,7 @@ class StatusUpdateService:
                                 END,
                                 locked_by = NULL,
                                 locked_at = NULL,
+                                lease_expires_at = NULL,
                                 updated_at = NOW()
                             WHERE inbox_id = :inbox_id
                         """),
@@ -197,6 +227,28 @@ class StatusUpdateService:
                             'backoff_minutes': self._backoff_interval_to_minutes(backoff_interval)
                         }
                     )
+                elif target_status == 'DEFERRED':
+                    # Back to FAILED without consuming the attempt claim_jobs counted
+                    result = db.execute(
+                        text("""
+                            UPDATE service_ops.integration_inbox
+                            SET 
+                                status = 'FAILED',
+                                last_error = :error_message,
+                                next_attempt_at = NOW() + make_interval(secs => :retry_after_seconds),
+                                attempt_count = GREATEST(attempt_count - 1, 0),
+                                locked_by = NULL,
+                                locked_at = NULL,
+                                lease_expires_at = NULL,
+                                updated_at = NOW()
+                            WHERE inbox_id = :inbox_id
+                        """),
+                        {
+                            'inbox_id': inbox_id,
+                            'error_message': (error_message or '')[:1000],  # Limit length
+                            'retry_after_seconds': max(1.0, float(retry_after_seconds))
+                        }
+                    )
                 else:
                     # For DONE status
                     result = db.execute(
@@ -207,6 +259,7 @@ class StatusUpdateService:
                                 updated_at = NOW(),
                                 locked_by = NULL,
                                 locked_at = NULL,
+                                lease_expires_at = NULL,
                                 last_error = NULL
                             WHERE inbox_id = :inbox_id
                         """),
@@ -268,11 +321,11 @@ class StatusUpdateService:
             exc_info=last_exception  # Log full stack trace of original exception
         )
         
-        # Job will be reclaimed by StuckJobReclaimer (runs every 5 poll cycles)
-        # Reclaimer will detect it as stuck (locked_at > stale_lock_minutes) and reset to NEW or mark FAILED
+        # Job will be reclaimed by StuckJobReclaimer (runs every 5 poll intervals)
+        # Reclaimer will detect it as stuck (lease expired) and reset to NEW or mark FAILED
         logger.warning(
             f"Job {inbox_id} will be reclaimed by StuckJobReclaimer "
-            f"(runs every 5 poll cycles, threshold: 10 minutes). "
+            f"(runs every 5 poll intervals, once its lease expires). "
             f"Job will be retried or marked as FAILED based on attempt_count."
         )
         
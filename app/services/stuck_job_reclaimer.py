@@ -1,7 +1,7 @@
 """
 Stuck Job Reclaimer
 Detects and recovers jobs stuck in PROCESSING status.
-Runs periodically to reset stale locks.
+Runs periodically to reset expired leases (or stale locks on rows claimed without a lease).
 
 Uses atomic batch-based updates for production safety:
 - Single atomic UPDATE per batch (no SELECT then UPDATE per row)
@@ -27,7 +27,8 @@ class StuckJobReclaimer:
     
     A job is considered "stuck" if:
     - Status is PROCESSING
-    - locked_at is older than stale_lock_minutes
+    - lease_expires_at has passed (workers renew leases while a job is running)
+    - or, for rows without a lease, locked_at is older than stale_lock_minutes
     
     Recovery policy:
     - If attempt_count < max_attempts: Reset to NEW (retry)
@@ -45,7 +46,7 @@ class StuckJobReclaimer:
         Initialize stuck job reclaimer.
         
         Args:
-            stale_lock_minutes: Minutes after which a lock is considered stale (default: 10)
+            stale_lock_minutes: Minutes after which a lock without a lease is considered stale (default: 10)
             max_attempts: Maximum attempts before marking as FAILED (default: 5)
             batch_size: Maximum jobs to process per batch (default: 200)
             status_update_service: StatusUpdateService instance (creates new if None)
@@ -91,7 +92,7 @@ class StuckJobReclaimer:
                     FROM service_ops.integration_inbox
                     WHERE status = 'PROCESSING'
                       AND locked_at IS NOT NULL
-                      AND locked_at < NOW() - INTERVAL '1 minute' * :stale_lock_minutes
+                      AND COALESCE(lease_expires_at, locked_at + INTERVAL '1 minute' * :stale_lock_minutes) < NOW()
                 """),
                 {'stale_lock_minutes': self.stale_lock_minutes}
             ).scalar()
@@ -104,7 +105,7 @@ class StuckJobReclaimer:
             
             logger.warning(
                 f"Detected {stats['detected']} stuck job(s) in PROCESSING status "
-                f"(locked_at older than {self.stale_lock_minutes} minutes)"
+                f"(lease expired, or locked_at older than {self.stale_lock_minutes} minutes without a lease)"
             )
             
             # Step A2: Atomic batch reset-to-NEW (single UPDATE with CTE, single commit)
@@ -116,7 +117,7 @@ class StuckJobReclaimer:
                         FROM service_ops.integration_inbox
                         WHERE status = 'PROCESSING'
                           AND locked_at IS NOT NULL
-                          AND locked_at < NOW() - INTERVAL '1 minute' * :stale_lock_minutes
+                          AND COALESCE(lease_expires_at, locked_at + INTERVAL '1 minute' * :stale_lock_minutes) < NOW()
                           AND attempt_count < :max_attempts
                         ORDER BY locked_at ASC
                         LIMIT :batch_size
@@ -127,11 +128,12 @@ class StuckJobReclaimer:
                         status = 'NEW',
                         locked_by = NULL,
                         locked_at = NULL,
+                        lease_expires_at = NULL,
                         updated_at = NOW()
                     FROM candidates
                     WHERE integration_inbox.inbox_id = candidates.inbox_id
                       AND integration_inbox.status = 'PROCESSING'
-                      AND integration_inbox.locked_at < NOW() - INTERVAL '1 minute' * :stale_lock_minutes
+                      AND COALESCE(integration_inbox.lease_expires_at, integration_inbox.locked_at + INTERVAL '1 minute' * :stale_lock_minutes) < NOW()
                     RETURNING 
                         integration_inbox.inbox_id,
                         integration_inbox.attempt_count,
@@ -171,7 +173,7 @@ class StuckJobReclaimer:
                         FROM service_ops.integration_inbox
                         WHERE status = 'PROCESSING'
                           AND locked_at IS NOT NULL
-                          AND locked_at < NOW() - INTERVAL '1 minute' * :stale_lock_minutes
+                          AND COALESCE(lease_expires_at, locked_at + INTERVAL '1 minute' * :stale_lock_minutes) < NOW()
                           AND attempt_count >= :max_attempts
                           AND (locked_by IS NULL OR locked_by NOT LIKE 'reclaimer:%')
                         ORDER BY locked_at ASC
@@ -185,7 +187,7 @@ class StuckJobReclaimer:
                     FROM candidates
                     WHERE integration_inbox.inbox_id = candidates.inbox_id
                       AND integration_inbox.status = 'PROCESSING'
-                      AND integration_inbox.locked_at < NOW() - INTERVAL '1 minute' * :stale_lock_minutes
+                      AND COALESCE(integration_inbox.lease_expires_at, integration_inbox.locked_at + INTERVAL '1 minute' * :stale_lock_minutes) < NOW()
                       AND integration_inbox.attempt_count >= :max_attempts
                       AND (integration_inbox.locked_by IS NULL OR integration_inbox.locked_by NOT LIKE 'reclaimer:%')
                     RETURNING 
@@ -218,7 +220,7 @@ class StuckJobReclaimer:
                     
                     try:
                         error_msg = (
-                            f"Stuck in PROCESSING for > {self.stale_lock_minutes} minutes "
+                            f"Stuck in PROCESSING with expired lease "
                             f"(locked_at={locked_at}). Max attempts ({self.max_attempts}) exceeded."
                         )
                         
@@ -0,0 +1,249 @@
+"""
+TIFF Passthrough
+Lossless TIFF-to-PDF conversion for frames whose compression PDF can decode natively.
+
+Fax TIFFs are almost always CCITT Group 4 (bilevel) and scanner TIFFs are often
+JPEG-compressed. PDF supports both codecs as image filters (CCITTFaxDecode and
+DCTDecode), so such a frame's compressed strip is embedded as-is in the page image
+instead of being decoded with Pillow and re-encoded: no pixel work, no quality loss
+and a much smaller page for bilevel faxes.
+
+A frame qualifies when it is stored in a single strip (so the strip is one complete
+codec stream), has no rotation and uses:
+- CCITT Group 4, 1 bit per pixel, MSB-first fill order
+- JPEG (compression 7), 8-bit grayscale, RGB or YCbCr, contiguous planes
+
+Everything else returns None and the caller uses its decode path.
+
+Pages are sized in points equal to the frame's pixel size, like the decode path.
+"""
+import io
+import mmap
+from contextlib import contextmanager
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# TIFF tags
+TAG_IMAGE_WIDTH = 256
+TAG_IMAGE_LENGTH = 257
+TAG_BITS_PER_SAMPLE = 258
+TAG_COMPRESSION = 259
+TAG_PHOTOMETRIC = 262
+TAG_FILL_ORDER = 266
+TAG_STRIP_OFFSETS = 273
+TAG_ORIENTATION = 274
+TAG_SAMPLES_PER_PIXEL = 277
+TAG_ROWS_PER_STRIP = 278
+TAG_STRIP_BYTE_COUNTS = 279
+TAG_PLANAR_CONFIG = 284
+TAG_JPEG_TABLES = 347
+
+COMPRESSION_CCITT_G4 = 4
+COMPRESSION_JPEG = 7
+
+PHOTOMETRIC_WHITE_IS_ZERO = 0
+PHOTOMETRIC_BLACK_IS_ZERO = 1
+PHOTOMETRIC_RGB = 2
+PHOTOMETRIC_YCBCR = 6
+
+
+class PassthroughImage(NamedTuple):
+    """A frame's compressed stream and the PDF image dictionary entries to decode it"""
+    width: int
+    height: int
+    color_space: str
+    bits_per_component: int
+    filter: str
+    decode_parms: str
+    data: bytes
+
+
+def _first(value, default=None):
+    """TIFF tag values may be scalars or tuples"""
+    if isinstance(value, (tuple, list)):
+        return value[0] if value else default
+    return default if value is None else value
+
+
+def get_passthrough_image(img, data: bytes) -> Optional[PassthroughImage]:
+    """
+    Get the current frame of an open TIFF as an embeddable compressed image.
+
+    Args:
+        img: Pillow TIFF image positioned (seek) on the frame
+        data: Complete TIFF file bytes (the strip is sliced from it)
+
+    Returns:
+        PassthroughImage, or None if the frame needs decoding
+    """
+    tags = getattr(img, 'tag_v2', None)
+    if not tags:
+        return None
+
+    try:
+        compression = _first(tags.get(TAG_COMPRESSION), 1)
+        if compression not in (COMPRESSION_CCITT_G4, COMPRESSION_JPEG):
+            return None
+
+        width = int(_first(tags.get(TAG_IMAGE_WIDTH)))
+        height = int(_first(tags.get(TAG_IMAGE_LENGTH)))
+        offsets = tags.get(TAG_STRIP_OFFSETS)
+        byte_counts = tags.get(TAG_STRIP_BYTE_COUNTS)
+        offsets = offsets if isinstance(offsets, (tuple, list)) else (offsets,)
+        byte_counts = byte_counts if isinstance(byte_counts, (tuple, list)) else (byte_counts,)
+        rows_per_strip = _first(tags.get(TAG_ROWS_PER_STRIP), height)
+
+        # One strip holding the whole image (tiled TIFFs have no StripOffsets)
+        if len(offsets) != 1 or len(byte_counts) != 1 or offsets[0] is None or rows_per_strip < height:
+            return None
+        if _first(tags.get(TAG_ORIENTATION), 1) != 1:
+            return None
+
+        start, length = int(offsets[0]), int(byte_counts[0])
+        if width <= 0 or height <= 0 or length <= 0 or start + length > len(data):
+            return None
+        strip = bytes(data[start:start + length])
+
+        bits = _first(tags.get(TAG_BITS_PER_SAMPLE), 1)
+        samples = _first(tags.get(TAG_SAMPLES_PER_PIXEL), 1)
+        photometric = _first(tags.get(TAG_PHOTOMETRIC), PHOTOMETRIC_WHITE_IS_ZERO)
+
+        if compression == COMPRESSION_CCITT_G4:
+            if bits != 1 or samples != 1 or _first(tags.get(TAG_FILL_ORDER), 1) != 1:
+                return None
+            if photometric not in (PHOTOMETRIC_WHITE_IS_ZERO, PHOTOMETRIC_BLACK_IS_ZERO):
+                return None
+            # The codec's white runs are 0 bits; PDF shows them as white unless BlackIs1,
+            # so BlackIsZero frames (0 bits are black pixels) need BlackIs1
+            black_is_1 = "true" if photometric == PHOTOMETRIC_BLACK_IS_ZERO else "false"
+            return PassthroughImage(
+                width=width,
+                height=height,
+                color_space="/DeviceGray",
+                bits_per_component=1,
+                filter="/CCITTFaxDecode",
+                decode_parms=f"<< /K -1 /Columns {width} /Rows {height} /BlackIs1 {black_is_1} >>",
+                data=strip
+            )
+
+        # JPEG: 8-bit gray or 3-channel, interleaved planes
+        if bits != 8 or _first(tags.get(TAG_PLANAR_CONFIG), 1) != 1:
+            return None
+        if samples == 1 and photometric in (PHOTOMETRIC_WHITE_IS_ZERO, PHOTOMETRIC_BLACK_IS_ZERO):
+            if photometric == PHOTOMETRIC_WHITE_IS_ZERO:
+                return None  # Inverted grayscale - let the decode path handle it
+            color_space = "/DeviceGray"
+            decode_parms = ""
+        elif samples == 3 and photometric in (PHOTOMETRIC_RGB, PHOTOMETRIC_YCBCR):
+            color_space = "/DeviceRGB"
+            # Components stored as RGB must not get the default YCbCr->RGB transform
+            decode_parms = "<< /ColorTransform 0 >>" if photometric == PHOTOMETRIC_RGB else ""
+        else:
+            return None
+
+        # The strip is an abbreviated JPEG stream; shared tables live in JPEGTables
+        tables = tags.get(TAG_JPEG_TABLES)
+        if not strip.startswith(b"\xff\xd8"):
+            return None
+        if tables:
+            tables = bytes(tables)
+            if not (tables.startswith(b"\xff\xd8") and tables.endswith(b"\xff\xd9")):
+                return None
+            strip = tables[:-2] + strip[2:]
+
+        return PassthroughImage(
+            width=width,
+            height=height,
+            color_space=color_space,
+            bits_per_component=8,
+            filter="/DCTDecode",
+            decode_parms=decode_parms,
+            data=strip
+        )
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
+def build_image_pdf(images: List[PassthroughImage]) -> bytes:
+    """
+    Build a PDF with one page per image, each image filling its page.
+
+    Args:
+        images: Compressed images (embedded without re-encoding)
+
+    Returns:
+        PDF bytes
+    """
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    def stream(header: str, payload: bytes) -> bytes:
+        return (
+            f"<< {header} /Length {len(payload)} >>\nstream\n".encode("latin-1")
+            + payload + b"\nendstream"
+        )
+
+    catalog_num = add(b"")  # Filled once the page tree is known
+    pages_num = add(b"")
+    page_nums = []
+    for image in images:
+        decode_parms = f" /DecodeParms {image.decode_parms}" if image.decode_parms else ""
+        image_num = add(stream(
+            f"/Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+            f"/ColorSpace {image.color_space} /BitsPerComponent {image.bits_per_component} "
+            f"/Filter {image.filter}{decode_parms}",
+            image.data
+        ))
+        content_num = add(stream("", f"q {image.width} 0 0 {image.height} 0 0 cm /Im0 Do Q".encode("latin-1")))
+        page_nums.append(add(
+            f"<< /Type /Page /Parent {pages_num} 0 R /MediaBox [0 0 {image.width} {image.height}] "
+            f"/Resources << /XObject << /Im0 {image_num} 0 R >> >> /Contents {content_num} 0 R >>".encode("latin-1")
+        ))
+
+    kids = " ".join(f"{num} 0 R" for num in page_nums)
+    objects[pages_num - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_nums)} >>".encode("latin-1")
+    objects[catalog_num - 1] = f"<< /Type /Catalog /Pages {pages_num} 0 R >>".encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for num, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n".encode("latin-1") + obj + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("latin-1")
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_num} 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+    return bytes(out)
+
+
+@contextmanager
+def open_tiff(source: Union[str, bytes]) -> Iterator[Tuple[Any, Any]]:
+    """
+    Open a TIFF from bytes or a local file path for frame-by-frame reading.
+
+    A file is memory-mapped instead of read, so CPU pool tasks receive only its path
+    and strips are sliced from the mapping (only the frames in use are paged in).
+
+    Args:
+        source: TIFF bytes or local file path
+
+    Yields:
+        Tuple of (Pillow image, TIFF data for get_passthrough_image)
+    """
+    from PIL import Image
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        with Image.open(io.BytesIO(source)) as img:
+            yield img, source
+        return
+    with open(source, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            with Image.open(f) as img:
+                yield img, data
@@ -0,0 +1,132 @@
+"""
+SLA Utility
+Submission type normalization and due date calculation shared by the document
+processor (packet.due_date) and the integration inbox (claim priority).
+"""
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+EXPEDITED_SLA_HOURS = 48
+STANDARD_SLA_HOURS = 72
+
+EXPEDITED_KEYWORDS = ['expedited', 'expedite', 'urgent', 'rush']
+STANDARD_KEYWORDS = ['standard', 'normal', 'routine', 'regular']
+
+# Field names that carry the submission type in extracted fields (OCR or payload.ocr)
+SUBMISSION_TYPE_FIELD_NAMES = [
+    'Submission Type', 'submissionType', 'submission_type',
+    'Priority', 'priority'  # Fallback to priority if submission type not found
+]
+
+# Top-level payload keys a sender may use to state the submission type explicitly
+SUBMISSION_TYPE_PAYLOAD_KEYS = ['submission_type', 'submissionType', 'priority']
+
+
+def normalize_submission_type(submission_type: Optional[str]) -> Optional[str]:
+    """
+    Normalize submission type value to 'Expedited' or 'Standard'.
+
+    Uses partial matching (starts with) to handle values like:
+    - 'expedited-initial' -> 'Expedited'
+    - 'standard-initial' -> 'Standard'
+
+    Args:
+        submission_type: Raw submission type value from OCR/payload
+
+    Returns:
+        'Expedited', 'Standard', or None (if unrecognized)
+    """
+    if not submission_type:
+        return None
+
+    value_lower = str(submission_type).strip().lower()
+
+    for keyword in EXPEDITED_KEYWORDS:
+        if value_lower.startswith(keyword):
+            return 'Expedited'
+
+    for keyword in STANDARD_KEYWORDS:
+        if value_lower.startswith(keyword):
+            return 'Standard'
+
+    # Unrecognized - return None for manual review
+    return None
+
+
+def calculate_due_date(received_date: datetime, submission_type: Optional[str] = None) -> datetime:
+    """
+    Calculate due date based on received_date and submission_type.
+
+    SLA rules (received_date and due date normalized to midnight UTC):
+    - Expedited: 48 hours
+    - Standard: 72 hours (default if None or unrecognized)
+
+    Args:
+        received_date: When the packet was received (normalized to midnight)
+        submission_type: Raw or normalized submission type
+
+    Returns:
+        Due date timestamp (at midnight UTC)
+    """
+    # Ensure timezone-aware
+    if received_date.tzinfo is None:
+        received_date = received_date.replace(tzinfo=timezone.utc)
+
+    # Normalize received_date to midnight for SLA calculation (extract date only)
+    normalized_received_date = datetime(
+        year=received_date.year,
+        month=received_date.month,
+        day=received_date.day,
+        tzinfo=timezone.utc
+    )
+
+    if normalize_submission_type(submission_type) == 'Expedited':
+        sla_hours = EXPEDITED_SLA_HOURS
+    else:
+        sla_hours = STANDARD_SLA_HOURS
+
+    due_date = normalized_received_date + timedelta(hours=sla_hours)
+
+    # Normalize due date to midnight (SLA is based on date, not time)
+    return datetime(
+        year=due_date.year,
+        month=due_date.month,
+        day=due_date.day,
+        tzinfo=timezone.utc
+    )
+
+
+def calculate_inbox_due_at(
+    source_created_at: datetime,
+    submission_type: Optional[str] = None,
+    message_type_id: Optional[int] = None
+) -> datetime:
+    """
+    Claim priority key for an integration_inbox row (earliest due is claimed first).
+
+    - UTN events (message_type_id 2/3): due immediately - cheap, and they unblock
+      downstream letters for packets that are already in flight
+    - Intake: SLA due date from the submission type known at intake
+      (defaults to Standard when it will only be known after OCR)
+
+    The intake submission type comes from the poll projection (Portal payload.ocr
+    fields or explicit payload keys, see IntegrationInboxService.poll_new_messages).
+
+    Args:
+        source_created_at: created_at of the source message (received time)
+        submission_type: Raw submission type known at intake, if any
+        message_type_id: Message type ID (1=intake, 2=UTN success, 3=UTN fail)
+
+    Returns:
+        Timezone-aware due timestamp
+    """
+    if source_created_at.tzinfo is None:
+        source_created_at = source_created_at.replace(tzinfo=timezone.utc)
+
+    if message_type_id in (2, 3):
+        return source_created_at
+
+    return calculate_due_date(source_created_at, submission_type)
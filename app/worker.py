@@ -0,0 +1,198 @@
+"""
+WISeR Service Operations - Standalone Pipeline Worker
+Runs the background pipeline outside the web tier:
+  - MessagePollerService (intake, document pipeline, StuckJobReclaimer sweeps)
+  - ClinicalOpsInboxProcessor (ClinicalOps decisions -> JSON Generator)
+
+Usage:
+    python -m app.worker                 # WORKER_PROCESSES processes (default 1)
+    python -m app.worker --processes 2
+
+Web workers should then run with RUN_BACKGROUND_TASKS=false so API latency does not
+depend on how many packets are in flight. Each worker process has its own DB pool,
+sized by WORKER_DB_POOL_SIZE (falls back to DB_POOL_SIZE).
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+import sys
+import time
+from typing import Dict
+
+from app.config import settings
+
+
+logging.basicConfig(
+    level=getattr(logging, settings.log_level.upper()),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(processName)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ],
+    force=True
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before restarting a worker process that exited unexpectedly
+RESTART_DELAY_SECONDS = 5
+# Seconds to wait for services to stop gracefully
+SHUTDOWN_TIMEOUT_SECONDS = 30
+
+
+def configure_db_pool() -> None:
+    """
+    Apply worker DB pool sizing to settings.
+
+    Must run before app.services.db is imported - the engine is created at import time.
+    Bounds match Settings.validate_pool_size (5..200, max_overflow = 1.5x pool_size).
+    """
+    if settings.worker_db_pool_size is None:
+        return
+
+    pool_size = max(5, min(200, settings.worker_db_pool_size))
+    settings.db_pool_size = pool_size
+    settings.db_max_overflow = int(pool_size * 1.5)
+
+
+async def run_worker(stop_event: asyncio.Event) -> None:
+    """
+    Start background services and run until stop_event is set.
+
+    Args:
+        stop_event: Event that signals shutdown (set by SIGTERM/SIGINT handlers)
+    """
+    from app.services.db import test_connection, close_all_connections, get_pool_status
+    from app.services.cpu_pool import shutdown_cpu_pool
+    from app.services.http_client import close_http_client
+    from app.services.message_poller import get_message_poller
+    from app.services.clinical_ops_inbox_processor import ClinicalOpsInboxProcessor
+
+    if test_connection():
+        pool_status = get_pool_status()
+        logger.info(f"Worker database pool initialized: pool_size={pool_status['pool_size']}")
+    else:
+        logger.error("Database connection test failed - worker may not function correctly")
+
+    services = []
+
+    if settings.message_poller_enabled:
+        message_poller = get_message_poller()
+        await message_poller.start()
+        if message_poller.is_running:
+            logger.info("✅ Message poller started in worker process")
+            services.append(message_poller)
+        else:
+            logger.warning("⚠️ Message poller did not start")
+    else:
+        logger.info("Message poller is disabled")
+
+    if getattr(settings, 'clinical_ops_poller_enabled', True):
+        clinical_ops_processor = ClinicalOpsInboxProcessor()
+        await clinical_ops_processor.start()
+        if clinical_ops_processor.is_running:
+            logger.info("✅ ClinicalOps inbox processor started in worker process")
+            services.append(clinical_ops_processor)
+        else:
+            logger.warning("⚠️ ClinicalOps inbox processor did not start")
+    else:
+        logger.info("ClinicalOps inbox processor is disabled")
+
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("Worker shutting down - stopping background services...")
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(service.stop() for service in services), return_exceptions=True),
+                timeout=SHUTDOWN_TIMEOUT_SECONDS
+            )
+            logger.info("✅ Worker services stopped")
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Shutdown timeout - some services did not stop gracefully")
+        # Same teardown order as the web lifespan: CPU pool, outbound HTTP, then DB
+        shutdown_cpu_pool()
+        close_http_client()
+        close_all_connections()
+
+
+def _run_process() -> None:
+    """Entry point of a single worker process."""
+    configure_db_pool()
+
+    async def _main():
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop_event.set)
+        await run_worker(stop_event)
+
+    asyncio.run(_main())
+
+
+def main() -> None:
+    """Parse arguments and run (or supervise) worker processes."""
+    parser = argparse.ArgumentParser(description="WISeR ServiceOps pipeline worker")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=settings.worker_processes,
+        help="Number of worker processes (default: WORKER_PROCESSES)"
+    )
+    args = parser.parse_args()
+    process_count = max(1, args.processes)
+
+    logger.info(
+        f"Starting WISeR pipeline worker: processes={process_count}, "
+        f"db_pool_size={settings.worker_db_pool_size or settings.db_pool_size}, "
+        f"max_workers_per_process={settings.pipeline_max_workers}"
+    )
+
+    if process_count == 1:
+        _run_process()
+        return
+
+    # Supervise N processes; restart any that exit unexpectedly
+    ctx = multiprocessing.get_context("spawn")
+    processes: Dict[int, multiprocessing.Process] = {}
+    shutting_down = False
+
+    def _start(index: int) -> None:
+        process = ctx.Process(target=_run_process, name=f"pipeline-worker-{index}")
+        process.start()
+        processes[index] = process
+        logger.info(f"Started {process.name} (pid={process.pid})")
+
+    def _shutdown(signum, frame):
+        nonlocal shutting_down
+        shutting_down = True
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    for index in range(process_count):
+        _start(index)
+
+    while not shutting_down:
+        time.sleep(1)
+        for index, process in list(processes.items()):
+            if not process.is_alive() and not shutting_down:
+                logger.error(
+                    f"{process.name} exited unexpectedly (exitcode={process.exitcode}) - "
+                    f"restarting in {RESTART_DELAY_SECONDS}s"
+                )
+                time.sleep(RESTART_DELAY_SECONDS)
+                if not shutting_down:
+                    _start(index)
+
+    for process in processes.values():
+        process.join(timeout=SHUTDOWN_TIMEOUT_SECONDS + 5)
+    logger.info("Pipeline worker supervisor stopped")
+
+
+if __name__ == "__main__":
+    main()
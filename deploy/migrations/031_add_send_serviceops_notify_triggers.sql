@@ -0,0 +1,74 @@
+-- Migration 031: Add LISTEN/NOTIFY triggers for event-driven intake
+-- Purpose: Wake the message poller and ClinicalOps processor as soon as new rows arrive
+--          instead of waiting for the next timed poll
+-- Schema: integration, service_ops
+-- Date: 2026-10-16
+--
+-- Channels:
+--   serviceops_intake       - AFTER INSERT on integration.send_serviceops (MessagePollerService)
+--   clinical_ops_decisions  - AFTER INSERT/UPDATE of decision columns on service_ops.send_serviceops
+--                             (ClinicalOpsInboxProcessor)
+--
+-- The notification payload is only the message_id. Listeners treat a notification as a
+-- "wake up and poll" signal; the watermark query remains the source of truth, so a lost
+-- notification is picked up by the timed safety sweep.
+-- Channel names must match DB_NOTIFY_INTAKE_CHANNEL / DB_NOTIFY_CLINICAL_OPS_CHANNEL.
+
+BEGIN;
+
+-- ============================================================================
+-- 1. integration.send_serviceops -> serviceops_intake
+-- ============================================================================
+CREATE OR REPLACE FUNCTION integration.notify_send_serviceops_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('serviceops_intake', NEW.message_id::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_send_serviceops_notify_insert ON integration.send_serviceops;
+CREATE TRIGGER trg_send_serviceops_notify_insert
+    AFTER INSERT ON integration.send_serviceops
+    FOR EACH ROW
+    EXECUTE FUNCTION integration.notify_send_serviceops_insert();
+
+COMMENT ON FUNCTION integration.notify_send_serviceops_insert() IS
+    'Sends pg_notify(serviceops_intake, message_id) for every new integration message so the ServiceOps message poller wakes immediately.';
+
+-- ============================================================================
+-- 2. service_ops.send_serviceops -> clinical_ops_decisions
+-- ============================================================================
+-- Fires on INSERT and on UPDATE of the columns that make a row eligible for the
+-- ClinicalOps processor (decision JSON written, Phase 2 payload written).
+CREATE OR REPLACE FUNCTION service_ops.notify_clinical_ops_send_serviceops()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.clinical_ops_decision_json IS NOT NULL OR NEW.json_sent_to_integration IS NOT NULL THEN
+        PERFORM pg_notify('clinical_ops_decisions', NEW.message_id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_clinical_ops_send_serviceops_notify ON service_ops.send_serviceops;
+CREATE TRIGGER trg_clinical_ops_send_serviceops_notify
+    AFTER INSERT OR UPDATE OF clinical_ops_decision_json, json_sent_to_integration
+    ON service_ops.send_serviceops
+    FOR EACH ROW
+    EXECUTE FUNCTION service_ops.notify_clinical_ops_send_serviceops();
+
+COMMENT ON FUNCTION service_ops.notify_clinical_ops_send_serviceops() IS
+    'Sends pg_notify(clinical_ops_decisions, message_id) when a ClinicalOps decision or Phase 2 payload is written so the ClinicalOps processor wakes immediately.';
+
+COMMIT;
+
+-- ============================================================================
+-- Verification (run manually)
+-- ============================================================================
+-- SELECT tgname, tgrelid::regclass FROM pg_trigger
+-- WHERE tgname IN ('trg_send_serviceops_notify_insert', 'trg_clinical_ops_send_serviceops_notify');
+--
+-- In psql session 1:  LISTEN serviceops_intake;
+-- In psql session 2:  INSERT INTO integration.send_serviceops (...) VALUES (...);
+-- Session 1 should print: Asynchronous notification "serviceops_intake" with payload "<message_id>"
@@ -0,0 +1,27 @@
+-- Migration 032: Add lease expiry to integration_inbox
+-- Purpose: Replace the fixed 10-minute stale-lock guess with per-row leases
+-- Schema: service_ops
+-- Date: 2026-10-16
+--
+-- Workers claim batches of inbox rows with a lease (lease_expires_at) and renew it
+-- while a job is still running. The StuckJobReclaimer only reclaims PROCESSING rows
+-- whose lease has expired. Rows claimed before this migration (lease_expires_at IS NULL)
+-- fall back to locked_at + stale_lock_minutes.
+
+BEGIN;
+
+ALTER TABLE service_ops.integration_inbox
+ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN service_ops.integration_inbox.lease_expires_at IS
+    'Lease expiry for the worker in locked_by. Renewed while the job runs; a PROCESSING row with an expired lease is reclaimable. NULL when not claimed.';
+
+-- Index for reclaiming expired leases
+CREATE INDEX IF NOT EXISTS idx_integration_inbox_lease_expires_at
+    ON service_ops.integration_inbox(lease_expires_at)
+    WHERE status = 'PROCESSING';
+
+COMMENT ON INDEX service_ops.idx_integration_inbox_lease_expires_at IS
+    'Index for StuckJobReclaimer: find PROCESSING rows whose lease has expired.';
+
+COMMIT;
@@ -0,0 +1,40 @@
+-- Migration 033: Add SLA due date (claim priority) to integration_inbox
+-- Purpose: Claim jobs earliest-due first instead of strictly by arrival order
+-- Schema: service_ops
+-- Date: 2026-10-16
+--
+-- due_at is set at insert time from the submission type known at intake (Portal payload.ocr,
+-- explicit payload fields) and message type (UTN events are due immediately). Rows whose
+-- submission type is only known after OCR default to the Standard SLA (72h).
+-- Existing rows are backfilled with the Standard SLA from source_created_at.
+
+BEGIN;
+
+ALTER TABLE service_ops.integration_inbox
+ADD COLUMN IF NOT EXISTS due_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN service_ops.integration_inbox.due_at IS
+    'SLA due date used as claim priority (earliest first). Derived at insert from submission type, channel and message type.';
+
+-- Backfill: Standard SLA (midnight of received date + 72h) for existing rows, UTN events due immediately
+UPDATE service_ops.integration_inbox
+SET due_at = CASE
+        WHEN message_type_id IN (2, 3) THEN source_created_at
+        ELSE date_trunc('day', source_created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' + INTERVAL '72 hours'
+    END
+WHERE due_at IS NULL;
+
+-- Index for priority claiming of pending rows. claim_jobs reads pending rows in this index order
+-- and stops after a bounded window (IntegrationInboxService.CLAIM_AGING_WINDOW); aging only
+-- re-orders rows inside that window. The aged claim key orders rows like
+-- due_at + aging_factor * source_created_at, which would need an expression index per aging
+-- factor, maintained on every inbox write. The window is read without locks; only the rows
+-- a claim picks are locked.
+CREATE INDEX IF NOT EXISTS idx_integration_inbox_due_at_pending
+    ON service_ops.integration_inbox(due_at, source_created_at, message_id)
+    WHERE status IN ('NEW', 'FAILED');
+
+COMMENT ON INDEX service_ops.idx_integration_inbox_due_at_pending IS
+    'Index for claim_jobs: pending rows read in SLA due date order (bounded aging window).';
+
+COMMIT;
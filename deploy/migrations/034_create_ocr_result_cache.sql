@@ -0,0 +1,39 @@
+-- Migration 034: Create ocr_result_cache table
+-- Purpose: Reuse OCR results for page bytes that were already OCR'd (rebuilds, re-runs, resumes)
+-- Schema: service_ops
+-- Date: 2026-10-16
+--
+-- Rows are keyed by the SHA-256 of the page PDF sent to OCR and the OCR model that produced
+-- the result, so a model change never serves results from the previous model.
+-- Rows older than OCR_RESULT_CACHE_TTL_DAYS are ignored by lookups; purge them with
+--   DELETE FROM service_ops.ocr_result_cache WHERE created_at < NOW() - INTERVAL '90 days';
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS service_ops.ocr_result_cache (
+    page_sha256 CHAR(64) NOT NULL,
+    ocr_model_id VARCHAR(200) NOT NULL,
+    result JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_hit_at TIMESTAMPTZ,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (page_sha256, ocr_model_id)
+);
+
+COMMENT ON TABLE service_ops.ocr_result_cache IS
+    'Normalized OCR results keyed by page content hash and OCR model id. Consulted before calling the OCR service.';
+
+COMMENT ON COLUMN service_ops.ocr_result_cache.page_sha256 IS
+    'SHA-256 (hex) of the single-page PDF bytes sent to OCR';
+
+COMMENT ON COLUMN service_ops.ocr_result_cache.ocr_model_id IS
+    'model_id reported by the OCR service for this result';
+
+COMMENT ON COLUMN service_ops.ocr_result_cache.result IS
+    'Normalized OCR response (same shape as OCRService.run_ocr_on_pdf returns)';
+
+-- Index for purging expired rows
+CREATE INDEX IF NOT EXISTS idx_ocr_result_cache_created_at
+    ON service_ops.ocr_result_cache(created_at);
+
+COMMIT;
@@ -0,0 +1,169 @@
+"""
+Unit tests for concurrent blob transfers (BlobStorageClient.download_many_to_temp, upload_pages):
+- Results come back in input (merge) order regardless of completion order
+- In-flight downloads never exceed max_concurrency
+- Blobs with the same file name get distinct temp files
+- The first failure cancels queued downloads and removes files already written
+- Page uploads are bounded and return results keyed by page number
+"""
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app.services.blob_storage import BlobStorageClient, BlobStorageError
+
+
+@pytest.fixture
+def client(tmp_path):
+    return BlobStorageClient(
+        storage_account_url="https://example.blob.core.windows.net",
+        container_name="source",
+        temp_dir=str(tmp_path)
+    )
+
+
+def _fake_download(delays, tracker=None, fail_on=None):
+    """Build a download_to_file replacement that writes the blob name and records concurrency"""
+    lock = threading.Lock()
+
+    def download_to_file(blob_path_or_url, local_path, container_name=None, timeout=300):
+        if tracker is not None:
+            with lock:
+                tracker['current'] += 1
+                tracker['max'] = max(tracker['max'], tracker['current'])
+        try:
+            time.sleep(delays.get(blob_path_or_url, 0))
+            if blob_path_or_url == fail_on:
+                raise BlobStorageError(f"Blob not found: {blob_path_or_url}")
+            Path(local_path).write_text(blob_path_or_url)
+            return {'local_path': local_path, 'size_bytes': len(blob_path_or_url)}
+        finally:
+            if tracker is not None:
+                with lock:
+                    tracker['current'] -= 1
+
+    return download_to_file
+
+
+class TestDownloadManyToTemp:
+    """Test bounded concurrent downloads"""
+
+    def test_results_keep_input_order(self, client):
+        urls = [f"https://example.blob.core.windows.net/source/doc{i}.pdf" for i in range(4)]
+        # First document is the slowest, so it completes last
+        client.download_to_file = _fake_download({urls[0]: 0.1})
+
+        results = client.download_many_to_temp(urls, subdir="consolidated/u1", max_concurrency=4)
+
+        assert [Path(r['local_path']).read_text() for r in results] == urls
+
+    def test_in_flight_downloads_are_bounded(self, client):
+        urls = [f"path/doc{i}.pdf" for i in range(6)]
+        tracker = {'current': 0, 'max': 0}
+        client.download_to_file = _fake_download({u: 0.02 for u in urls}, tracker)
+
+        results = client.download_many_to_temp(urls, max_concurrency=2)
+
+        assert len(results) == 6
+        assert tracker['max'] == 2
+
+    def test_same_file_name_gets_distinct_temp_files(self, client):
+        urls = ["a/scan.tiff", "b/scan.tiff"]
+        client.download_to_file = _fake_download({})
+
+        results = client.download_many_to_temp(urls, subdir="dup", max_concurrency=2)
+
+        paths = [r['local_path'] for r in results]
+        assert len(set(paths)) == 2
+        assert [Path(p).read_text() for p in paths] == urls
+
+    def test_first_failure_cancels_remaining_and_cleans_up(self, client):
+        urls = ["ok0.pdf", "missing.pdf", "ok2.pdf", "ok3.pdf", "ok4.pdf"]
+        started = []
+        fake = _fake_download({u: 0.05 for u in urls if u != "missing.pdf"}, fail_on="missing.pdf")
+
+        def download_to_file(blob_path_or_url, local_path, **kwargs):
+            started.append(blob_path_or_url)
+            return fake(blob_path_or_url, local_path, **kwargs)
+
+        client.download_to_file = download_to_file
+
+        with pytest.raises(BlobStorageError, match="missing.pdf"):
+            client.download_many_to_temp(urls, subdir="fail", max_concurrency=2)
+
+        # Queued downloads were not started and nothing is left behind
+        assert len(started) < len(urls)
+        assert list((client.temp_dir / "fail").iterdir()) == []
+
+    def test_sequential_mode_cleans_up_on_failure(self, client):
+        client.download_to_file = _fake_download({}, fail_on="b.pdf")
+
+        with pytest.raises(BlobStorageError):
+            client.download_many_to_temp(["a.pdf", "b.pdf", "c.pdf"], subdir="seq", max_concurrency=1)
+
+        assert list((client.temp_dir / "seq").iterdir()) == []
+
+
+class TestUploadPages:
+    """Test bounded concurrent page uploads"""
+
+    def test_results_keyed_by_page_number(self, client):
+        pages = [
+            {'page_number': n, 'local_path': f"/tmp/page_{n}.pdf", 'dest_blob_path': f"pages/p{n}.pdf",
+             'content_type': 'application/pdf'}
+            for n in (1, 2, 3)
+        ]
+        tracker = {'current': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def upload_file(local_path, dest_blob_path, container_name=None, overwrite=True,
+                        content_type=None, timeout=300):
+            with lock:
+                tracker['current'] += 1
+                tracker['max'] = max(tracker['max'], tracker['current'])
+            # Page 1 finishes last
+            time.sleep(0.05 if dest_blob_path.endswith("p1.pdf") else 0.01)
+            with lock:
+                tracker['current'] -= 1
+            return {'blob_path': dest_blob_path, 'size_bytes': 10, 'container': container_name}
+
+        client.upload_file = upload_file
+
+        results = client.upload_pages(pages, container_name="dest", max_concurrency=2)
+
+        assert sorted(results) == [1, 2, 3]
+        assert results[1]['blob_path'] == "pages/p1.pdf"
+        assert results[3]['container'] == "dest"
+        assert tracker['max'] == 2
+
+    def test_first_failure_raises(self, client):
+        pages = [
+            {'page_number': n, 'local_path': f"/tmp/page_{n}.pdf", 'dest_blob_path': f"pages/p{n}.pdf"}
+            for n in range(1, 6)
+        ]
+        started = []
+
+        def upload_file(local_path, dest_blob_path, **kwargs):
+            started.append(dest_blob_path)
+            if dest_blob_path.endswith("p1.pdf"):
+                raise BlobStorageError("Client error: 403")
+            time.sleep(0.05)
+            return {'blob_path': dest_blob_path, 'size_bytes': 10}
+
+        client.upload_file = upload_file
+
+        with pytest.raises(BlobStorageError, match="403"):
+            client.upload_pages(pages, container_name="dest", max_concurrency=2)
+
+        assert len(started) < len(pages)
@@ -0,0 +1,197 @@
+"""
+Unit tests for weighted fair scheduling across channel lanes:
+- Lane mapping from channel_type_id / message_type_id
+- Per-lane quotas honour concurrency caps and exhausted lanes
+- claim_jobs builds one locked candidate set per lane with weighted finish tags
+- The poller keeps claiming cheap lanes while an expensive lane is capped
+- A lane found empty during a drain is offered again once new jobs are signalled
+"""
+import pytest
+import sys
+import asyncio
+from unittest.mock import MagicMock, Mock, patch
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app.models.channel_type import ChannelType
+from app.services.channel_scheduler import ChannelFairScheduler, lane_for_job, parse_lane_values
+from app.services.integration_inbox import IntegrationInboxService
+from app.services.message_poller import MessagePollerService
+
+
+class TestLanes:
+    """Test lane mapping and settings parsing"""
+
+    @pytest.mark.parametrize("channel_type_id,message_type_id,expected", [
+        (ChannelType.GENZEON_PORTAL, 1, 'portal'),
+        (ChannelType.GENZEON_FAX, 1, 'fax'),
+        (ChannelType.ESMD, 1, 'esmd'),
+        (None, None, 'esmd'),
+        (ChannelType.GENZEON_FAX, 2, 'utn'),
+        (ChannelType.ESMD, 3, 'utn'),
+    ])
+    def test_lane_for_job(self, channel_type_id, message_type_id, expected):
+        job = {'channel_type_id': channel_type_id, 'message_type_id': message_type_id}
+        assert lane_for_job(job) == expected
+
+    def test_parse_lane_values_ignores_invalid_entries(self):
+        parsed = parse_lane_values("portal:3, fax:x, bogus:2", 1.0)
+
+        assert parsed == {'utn': 1.0, 'portal': 3.0, 'fax': 1.0, 'esmd': 1.0}
+
+
+class TestPlan:
+    """Test per-lane quotas"""
+
+    def test_plan_caps_busy_lane_and_skips_exhausted(self):
+        scheduler = ChannelFairScheduler(
+            weights={'utn': 4, 'portal': 3, 'fax': 1, 'esmd': 1},
+            caps={'utn': 4, 'portal': 4, 'fax': 2, 'esmd': 2}
+        )
+
+        plan = scheduler.plan(free_slots=3, in_flight_by_lane={'fax': 2, 'esmd': 1}, exhausted_lanes={'utn'})
+
+        assert 'fax' not in plan  # at cap
+        assert 'utn' not in plan  # no backlog
+        assert plan['portal'] == {'quota': 3, 'weight': 3.0, 'in_flight': 0}
+        assert plan['esmd']['quota'] == 1
+
+    def test_plan_without_free_slots_is_empty(self):
+        assert ChannelFairScheduler().plan(0, {}) == {}
+
+
+class TestFairClaimQuery:
+    """Test lane-aware claim query"""
+
+    @patch('app.services.integration_inbox.SessionLocal')
+    def test_claim_jobs_with_lanes_builds_weighted_query(self, mock_session_local):
+        mock_db_session = MagicMock()
+        mock_db_session.execute.return_value.fetchall.return_value = []
+        mock_session_local.return_value = mock_db_session
+
+        lanes = {
+            'portal': {'quota': 2, 'weight': 3.0, 'in_flight': 1},
+            'fax': {'quota': 0, 'weight': 1.0, 'in_flight': 2},
+            'esmd': {'quota': 2, 'weight': 1.0, 'in_flight': 0},
+        }
+        IntegrationInboxService().claim_jobs("worker-1", 2, 600, 1.0, lanes)
+
+        query_text, params = mock_db_session.execute.call_args[0]
+        query = str(query_text)
+        assert 'lane_0 AS' in query and 'lane_1 AS' in query and 'lane_2 AS' not in query
+        assert query.count('FOR UPDATE OF integration_inbox SKIP LOCKED') == 2
+        assert 'channel_type_id = 1' in query
+        assert params['quota_0'] == 2 and params['weight_0'] == 3.0 and params['in_flight_0'] == 1
+        assert params['limit'] == 2
+
+    def test_claim_jobs_without_lane_quota_skips_query(self):
+        with patch('app.services.integration_inbox.SessionLocal') as mock_session_local:
+            lanes = {'fax': {'quota': 0, 'weight': 1.0, 'in_flight': 2}}
+            assert IntegrationInboxService().claim_jobs("worker-1", 2, 600, 1.0, lanes) == []
+            mock_session_local.assert_not_called()
+
+
+class TestPollerFairScheduling:
+    """Test poller lane accounting"""
+
+    @pytest.mark.asyncio
+    @patch('app.services.message_poller.IntegrationInboxService')
+    async def test_capped_lane_is_not_offered_while_cheap_lane_continues(self, mock_inbox_service_class):
+        poller = MessagePollerService()
+        poller.channel_scheduler = ChannelFairScheduler(caps={'utn': 4, 'portal': 4, 'fax': 1, 'esmd': 1})
+        poller._get_worker_pool_size = Mock(return_value=3)
+
+        offered = []
+
+        def claim_jobs(worker_id, limit, lease_seconds, aging_factor, lanes):
+            offered.append((dict(lanes), dict(poller.lane_in_flight)))
+            if len(offered) == 1:
+                return [
+                    {'inbox_id': 1, 'channel_type_id': ChannelType.GENZEON_FAX, 'message_type_id': 1},
+                    {'inbox_id': 2, 'channel_type_id': ChannelType.GENZEON_PORTAL, 'message_type_id': 1},
+                    {'inbox_id': 3, 'channel_type_id': ChannelType.GENZEON_PORTAL, 'message_type_id': 1},
+                ]
+            return []
+
+        mock_inbox_service = MagicMock()
+        mock_inbox_service.claim_jobs.side_effect = claim_jobs
+        mock_inbox_service_class.return_value = mock_inbox_service
+
+        release_fax = asyncio.Event()
+
+        async def fake_job(job):
+            if job['channel_type_id'] == ChannelType.GENZEON_FAX:
+                await release_fax.wait()
+
+        poller._process_claimed_job = fake_job
+
+        async def release_later():
+            await asyncio.sleep(0.05)
+            release_fax.set()
+
+        releaser = asyncio.create_task(release_later())
+        await poller._process_claimed_jobs()
+        await releaser
+
+        # The fax lane is never offered while its single slot is busy
+        assert 'fax' in offered[0][0]
+        refills_while_fax_busy = [lanes for lanes, busy in offered if busy.get('fax')]
+        assert refills_while_fax_busy
+        assert all('fax' not in lanes and 'portal' in lanes for lanes in refills_while_fax_busy)
+        assert poller.lane_in_flight == {}
+
+    @pytest.mark.asyncio
+    @patch('app.services.message_poller.IntegrationInboxService')
+    async def test_exhausted_lane_is_reprobed_when_jobs_arrive_mid_drain(self, mock_inbox_service_class):
+        poller = MessagePollerService()
+        poller.channel_scheduler = ChannelFairScheduler(caps={'utn': 4, 'portal': 4, 'fax': 2, 'esmd': 2})
+        poller._get_worker_pool_size = Mock(return_value=3)
+
+        offered = []
+
+        def claim_jobs(worker_id, limit, lease_seconds, aging_factor, lanes):
+            offered.append(dict(lanes))
+            if len(offered) == 1:
+                # Only fax rows are claimable: the portal lane is marked exhausted
+                return [
+                    {'inbox_id': 1, 'channel_type_id': ChannelType.GENZEON_FAX, 'message_type_id': 1},
+                    {'inbox_id': 2, 'channel_type_id': ChannelType.GENZEON_FAX, 'message_type_id': 1},
+                ]
+            if 'portal' in lanes and len(offered) == 2:
+                return [{'inbox_id': 3, 'channel_type_id': ChannelType.GENZEON_PORTAL, 'message_type_id': 1}]
+            return []
+
+        mock_inbox_service = MagicMock()
+        mock_inbox_service.claim_jobs.side_effect = claim_jobs
+        mock_inbox_service_class.return_value = mock_inbox_service
+
+        portal_done = asyncio.Event()
+        fax_running_when_portal_ran = []
+
+        async def fake_job(job):
+            if job['channel_type_id'] == ChannelType.GENZEON_FAX:
+                # The fax drain only ends after the portal job has run
+                await asyncio.wait_for(portal_done.wait(), timeout=1)
+            else:
+                fax_running_when_portal_ran.append(poller.lane_in_flight.get('fax', 0))
+                portal_done.set()
+
+        poller._process_claimed_job = fake_job
+
+        async def portal_job_arrives():
+            await asyncio.sleep(0.02)
+            poller.jobs_available.set()
+
+        signaller = asyncio.create_task(portal_job_arrives())
+        await poller._process_claimed_jobs()
+        await signaller
+
+        assert 'portal' in offered[0] and 'portal' in offered[1]
+        assert fax_running_when_portal_ran == [2]
+        assert poller.lane_in_flight == {}
@@ -789,8 +789,8 @@ class TestCallJsonGeneratorPhase2:
         mock_response.json.return_value = {"status": "success"}
         mock_response.raise_for_status = Mock()
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(return_value=mock_response)
+        with patch('app.services.clinical_ops_inbox_processor.get_http_client') as mock_client:
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
             
             result = await processor._call_json_generator_phase2(sample_decision_tracking_id)
             
@@ -808,13 +808,13 @@ class TestCallJsonGeneratorPhase2:
     @pytest.mark.asyncio
     async def test_call_json_generator_phase2_retry_on_timeout(self, processor, sample_decision_tracking_id):
         """Test retry logic on timeout"""
-        with patch('httpx.AsyncClient') as mock_client:
+        with patch('app.services.clinical_ops_inbox_processor.get_http_client') as mock_client:
             # First attempt: timeout, second attempt: success
             mock_post = AsyncMock(side_effect=[
                 httpx.ReadTimeout("Timeout"),
                 Mock(json=Mock(return_value={"status": "success"}), raise_for_status=Mock())
             ])
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
             
             with patch('asyncio.sleep', new_callable=AsyncMock):  # Mock sleep to speed up test
                 result = await processor._call_json_generator_phase2(sample_decision_tracking_id)
@@ -831,8 +831,8 @@ class TestCallJsonGeneratorPhase2:
         
         error = httpx.HTTPStatusError("Bad Request", request=Mock(), response=mock_response)
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(side_effect=error)
+        with patch('app.services.clinical_ops_inbox_processor.get_http_client') as mock_client:
+            mock_client.return_value.post = AsyncMock(side_effect=error)
             
             result = await processor._call_json_generator_phase2(sample_decision_tracking_id)
             
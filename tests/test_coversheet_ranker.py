@@ -0,0 +1,166 @@
+"""
+Unit tests for local coversheet pre-ranking:
+- score_page_text rewards coversheet titles, labels and "Label:" lines and penalizes prose
+- CoversheetRanker orders pages by score; ties, blank and unreadable pages keep page order
+- DocumentProcessor OCRs the top-ranked candidate first and stops there, persisting OCR metadata in page order
+- Resuming at OCR keeps only the selected pages, ranked in memory without writing page files
+"""
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+fitz = pytest.importorskip("fitz")
+
+from app.config import settings
+from app.services.coversheet_ranker import CoversheetRanker, score_page_text
+from app.services.document_splitter import SplitPage, SplitResult
+
+COVERSHEET_TEXT = """Prior Authorization Request - Medicare Part B
+Beneficiary Name: Jane Doe
+Medicare ID: 1EG4-TE5-MK73
+Date of Birth: 01/02/1950
+Rendering Provider NPI: 1234567890
+HCPCS: E0601
+Diagnosis Code: G47.33
+"""
+LETTER_TEXT = "Dear reviewer, please find the attached clinical notes for this patient. " * 60
+
+
+def _page(tmp_path, page_number, text):
+    doc = fitz.open()
+    page = doc.new_page()
+    if text:
+        page.insert_textbox(fitz.Rect(36, 36, 576, 756), text, fontsize=6)
+    path = tmp_path / f"page_{page_number}.pdf"
+    doc.save(str(path))
+    doc.close()
+    return SplitPage(
+        page_number=page_number,
+        local_path=str(path),
+        dest_blob_path=f"pages/page_{page_number}.pdf",
+        content_type="application/pdf",
+        file_size_bytes=path.stat().st_size,
+        sha256=None
+    )
+
+
+class TestScorePageText:
+    """Test text scoring"""
+
+    def test_coversheet_beats_letter_and_blank(self):
+        assert score_page_text(COVERSHEET_TEXT) > score_page_text("") == 0.0
+        assert score_page_text(LETTER_TEXT) < 0.0
+
+    def test_labels_counted_once(self):
+        assert score_page_text("NPI: 1\nNPI: 2\n") == score_page_text("NPI: 1\n") + 1.5
+
+
+class TestCoversheetRanker:
+    """Test page ordering"""
+
+    def test_coversheet_ranked_first(self, tmp_path):
+        pages = [
+            _page(tmp_path, 1, LETTER_TEXT),
+            _page(tmp_path, 2, ""),
+            _page(tmp_path, 3, COVERSHEET_TEXT),
+        ]
+
+        ranked = CoversheetRanker().rank_pages(pages)
+
+        # Blank (scanned) pages rank above prose
+        assert [page.page_number for page in ranked] == [3, 2, 1]
+
+    def test_ties_and_unreadable_pages_keep_order(self, tmp_path):
+        pages = [_page(tmp_path, 1, ""), _page(tmp_path, 2, "")]
+        missing = SplitPage(
+            page_number=3,
+            local_path=str(tmp_path / "missing.pdf"),
+            dest_blob_path="pages/page_3.pdf",
+            content_type="application/pdf",
+            file_size_bytes=0,
+            sha256=None
+        )
+
+        ranked = CoversheetRanker().rank_pages([missing] + pages)
+
+        assert [page.page_number for page in ranked] == [1, 2, 3]
+
+
+class TestProcessorPreRanking:
+    """Test OCR follows the ranked order"""
+
+    def test_coversheet_ocr_first(self, tmp_path, monkeypatch):
+        from app.services.document_processor import DocumentProcessor
+
+        monkeypatch.setattr(settings, 'ocr_coversheet_prerank', True)
+        monkeypatch.setattr(settings, 'ocr_prerank_max_pages', 30)
+        monkeypatch.setattr(settings, 'ocr_stop_after_coversheet', True)
+        monkeypatch.setattr(settings, 'ocr_page_concurrency', 1)
+        monkeypatch.setattr(settings, 'ocr_delay_between_requests', 0)
+        pages = [_page(tmp_path, number, LETTER_TEXT) for number in range(1, 5)]
+        pages.append(_page(tmp_path, 5, COVERSHEET_TEXT))
+
+        processor = DocumentProcessor.__new__(DocumentProcessor)
+        processor.ocr_service = Mock()
+        processor.ocr_service.run_ocr_on_pdf.return_value = {
+            'fields': {f"field_{i}": {'value': 'x', 'confidence': 0.9} for i in range(25)},
+            'overall_document_confidence': 0.9
+        }
+        processor.coversheet_detector = Mock()
+        processor.coversheet_ranker = CoversheetRanker()
+        processor.part_classifier = Mock()
+        processor.part_classifier.classify_part_type.return_value = "PART_B"
+        packet_document = Mock(ocr_status='NOT_STARTED', pages_metadata=None)
+
+        with patch('app.services.document_processor.flag_modified'):
+            processor._process_ocr(
+                db=Mock(),
+                packet_document=packet_document,
+                split_result=SplitResult(processing_path="", page_count=5, pages=pages, local_paths=[]),
+                temp_files_to_cleanup=[]
+            )
+
+        processor.ocr_service.run_ocr_on_pdf.assert_called_once_with(pages[4].local_path, content_sha256=None)
+        assert packet_document.coversheet_page_number == 5
+        assert [page['page_number'] for page in packet_document.ocr_metadata['pages']] == [1, 2, 3, 4, 5]
+
+    def test_resume_keeps_only_selected_pages(self, tmp_path, monkeypatch):
+        from app.services.document_processor import DocumentProcessor
+
+        monkeypatch.setattr(settings, 'ocr_coversheet_prerank', True)
+        monkeypatch.setattr(settings, 'ocr_prerank_max_pages', 3)
+        texts = {1: LETTER_TEXT, 2: LETTER_TEXT, 3: COVERSHEET_TEXT, 4: "", 5: ""}
+        contents = {}
+        for number, text in texts.items():
+            page = _page(tmp_path, number, text)
+            contents[page.dest_blob_path] = Path(page.local_path).read_bytes()
+        blob_paths = {number: f"pages/page_{number}.pdf" for number in texts}
+
+        processor = DocumentProcessor.__new__(DocumentProcessor)
+        processor.OCR_MAX_PAGES = 2
+        processor.coversheet_ranker = CoversheetRanker()
+        processor.blob_client = Mock()
+        processor.blob_client.download_many_to_buffers.side_effect = lambda paths, **kwargs: [
+            {'data': contents[path], 'local_path': None, 'size_bytes': len(contents[path])} for path in paths
+        ]
+        temp_files = []
+
+        pages = processor._download_ocr_pages(blob_paths, {4: 40, 5: 50}, temp_files)
+
+        # Only the pre-ranking window is fetched, into memory
+        downloaded, = processor.blob_client.download_many_to_buffers.call_args.args
+        assert downloaded == [blob_paths[1], blob_paths[2], blob_paths[3]]
+        assert [page.page_number for page in pages] == [1, 2, 3, 4, 5]
+        assert [page.content is not None for page in pages] == [True, False, True, False, False]
+        assert all(page.local_path is None for page in pages) and temp_files == []
+        assert [page.file_size_bytes for page in pages[3:]] == [40, 50]
+        assert [page.page_number for page in processor._select_ocr_pages(pages)] == [3, 1]
@@ -0,0 +1,165 @@
+"""
+Unit tests for the CPU pool:
+- Tasks run in the calling thread when the pool is disabled (0 workers)
+- imap yields results in input order and keeps the caller's in-flight tasks bounded
+- Submissions block while the pool is full (bounded queue depth)
+- Page flattening and TIFF splitting give the same output through worker processes
+"""
+import pytest
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.cpu_pool import CpuPool
+
+fitz = pytest.importorskip("fitz")
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files"""
+    temp_path = Path(tempfile.mkdtemp())
+    yield temp_path
+    shutil.rmtree(temp_path, ignore_errors=True)
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    pool = CpuPool(max_workers=2, max_queue=2)
+    yield pool
+    pool.shutdown()
+
+
+class TestInlinePool:
+    """Test the disabled pool"""
+
+    def test_tasks_run_inline(self):
+        pool = CpuPool(max_workers=0)
+        caller = threading.current_thread()
+        seen = []
+
+        result = pool.run(lambda x: seen.append(threading.current_thread()) or x * 2, 21)
+
+        assert result == 42
+        assert seen == [caller]
+        assert not pool.enabled
+
+    def test_inline_errors_are_raised(self):
+        pool = CpuPool(max_workers=0)
+
+        with pytest.raises(ZeroDivisionError):
+            pool.run(divmod, 1, 0)
+
+
+class TestBoundedPool:
+    """Test ordering and bounded queue depth"""
+
+    def test_imap_keeps_input_order(self, process_pool):
+        results = list(process_pool.imap(pow, ((n, 2) for n in range(10))))
+
+        assert results == [n * n for n in range(10)]
+        assert process_pool.get_status()['in_flight'] == 0
+
+    def test_imap_window_is_bounded(self):
+        pool = CpuPool(max_workers=0)
+        pool.max_in_flight = 3
+        submitted = []
+        consumed = []
+
+        def fake_submit(fn, *args):
+            submitted.append(args)
+            # Never more than the window of this caller's results waiting
+            assert len(submitted) - len(consumed) <= 3
+            future = Future()
+            future.set_result(fn(*args))
+            return future
+
+        pool.submit = fake_submit
+        for result in pool.imap(pow, ((n, 1) for n in range(8))):
+            consumed.append(result)
+
+        assert consumed == list(range(8))
+
+    def test_submit_blocks_while_pool_is_full(self, process_pool):
+        futures = [process_pool.submit(time.sleep, 0.3) for _ in range(4)]
+        blocked = threading.Event()
+        done = threading.Event()
+
+        def submit_one_more():
+            blocked.set()
+            process_pool.submit(pow, 2, 2).result()
+            done.set()
+
+        thread = threading.Thread(target=submit_one_more)
+        thread.start()
+
+        assert blocked.wait(1)
+        # 2 workers + 2 queued are in flight - the fifth submission waits
+        assert not done.wait(0.1)
+        for future in futures:
+            future.result()
+        assert done.wait(5)
+        thread.join(5)
+
+
+class TestPdfTasks:
+    """Test splitter/merger output through worker processes"""
+
+    def test_flattening_through_worker_processes(self, temp_dir, process_pool):
+        from app.services.document_splitter import DocumentSplitter
+
+        input_path = temp_dir / "form.pdf"
+        doc = fitz.open()
+        for text in ("Plain page", "Form page"):
+            doc.new_page(width=612, height=792).insert_text((72, 72), text)
+        widget = fitz.Widget()
+        widget.field_name = "beneficiary_name"
+        widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+        widget.field_value = "Jane Doe"
+        widget.rect = fitz.Rect(72, 100, 300, 130)
+        doc[1].add_widget(widget)
+        doc.save(input_path)
+        doc.close()
+
+        with patch('app.services.document_splitter.get_cpu_pool', return_value=process_pool):
+            result = DocumentSplitter(temp_dir=str(temp_dir / "out")).split_document(
+                input_path=str(input_path),
+                unique_id="u1",
+                document_unique_identifier="CONSOLIDATED",
+                original_file_name="form.pdf",
+                mime_type="application/pdf"
+            )
+
+        with fitz.open(result.pages[0].local_path) as plain:
+            assert plain[0].get_text().strip() == "Plain page"
+        with fitz.open(result.pages[1].local_path) as form:
+            assert form[0].get_text().strip() == ""
+            assert len(form[0].get_images()) == 1
+            assert form[0].first_widget is None
+
+    def test_tiff_split_through_worker_processes(self, temp_dir, process_pool):
+        from app.services.document_splitter import DocumentSplitter
+
+        tiff_path = temp_dir / "fax.tiff"
+        frames = [Image.new('L', (200, 100), color=shade) for shade in (0, 128, 255)]
+        frames[0].save(tiff_path, save_all=True, append_images=frames[1:])
+
+        with patch('app.services.document_splitter.get_cpu_pool', return_value=process_pool):
+            result = DocumentSplitter(temp_dir=str(temp_dir / "out")).split_document(
+                input_path=str(tiff_path),
+                unique_id="u1",
+                document_unique_identifier="FAX",
+                original_file_name="fax.tiff",
+                mime_type="image/tiff"
+            )
+
+        assert result.page_count == 3
+        assert len({p.sha256 for p in result.pages}) == 3
+        for page in result.pages:
+            with fitz.open(page.local_path) as page_doc:
+                assert page_doc[0].rect.width == 200
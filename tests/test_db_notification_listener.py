@@ -0,0 +1,149 @@
+"""
+Unit tests for event-driven intake (Postgres LISTEN/NOTIFY):
+- Notifications fan out to channel subscribers
+- Connection loss is detected and wakes subscribers
+- Pollers wait on notifications while connected and fall back to timed polling otherwise
+"""
+import pytest
+import sys
+import asyncio
+from unittest.mock import Mock, MagicMock, patch, AsyncMock
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app.services.db_notification_listener import DbNotificationListener
+from app.services.message_poller import MessagePollerService
+from app.services.clinical_ops_inbox_processor import ClinicalOpsInboxProcessor
+
+
+def _notify(channel, payload):
+    notify = Mock()
+    notify.channel = channel
+    notify.payload = payload
+    return notify
+
+
+class TestDbNotificationListener:
+    """Test notification fan-out and wait semantics"""
+
+    @pytest.mark.asyncio
+    async def test_notification_sets_only_matching_channel(self):
+        listener = DbNotificationListener(dsn="postgresql://test")
+        intake_event = listener.subscribe("serviceops_intake")
+        clinical_event = listener.subscribe("clinical_ops_decisions")
+
+        listener._conn = Mock()
+        listener._conn.notifies = [_notify("serviceops_intake", "101")]
+        listener._on_readable()
+
+        assert intake_event.is_set()
+        assert not clinical_event.is_set()
+        assert listener.notifications_received == 1
+        assert listener.last_notification_at is not None
+
+    @pytest.mark.asyncio
+    async def test_poll_failure_marks_connection_lost(self):
+        listener = DbNotificationListener(dsn="postgresql://test")
+        listener._conn = Mock()
+        listener._conn.poll.side_effect = Exception("server closed the connection unexpectedly")
+        listener._connection_lost = asyncio.Event()
+
+        listener._on_readable()
+
+        assert listener._connection_lost.is_set()
+
+    @pytest.mark.asyncio
+    async def test_wait_returns_false_on_timeout(self):
+        listener = DbNotificationListener(dsn="postgresql://test")
+        event = listener.subscribe("serviceops_intake")
+
+        assert await listener.wait(event, timeout=0.01) is False
+
+    @pytest.mark.asyncio
+    async def test_wait_returns_true_and_clears_event(self):
+        listener = DbNotificationListener(dsn="postgresql://test")
+        event = listener.subscribe("serviceops_intake")
+        event.set()
+
+        assert await listener.wait(event, timeout=1) is True
+        assert not event.is_set()
+
+    def test_unsubscribe_removes_empty_channel(self):
+        listener = DbNotificationListener(dsn="postgresql://test")
+        event = listener.subscribe("serviceops_intake")
+
+        listener.unsubscribe("serviceops_intake", event)
+
+        assert listener.get_status()["channels"] == []
+
+
+class TestPollerNotificationWait:
+    """Test poller wait behaviour with and without a connected listener"""
+
+    @pytest.mark.asyncio
+    async def test_message_poller_uses_sweep_interval_when_connected(self):
+        poller = MessagePollerService()
+        poller.notify_event = asyncio.Event()
+        listener = Mock()
+        listener.is_connected = True
+        listener.wait = AsyncMock(return_value=False)
+
+        with patch('app.services.message_poller.get_notification_listener', return_value=listener), \
+             patch('app.services.message_poller.settings') as mock_settings, \
+             patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            mock_settings.message_poller_sweep_interval_seconds = 600
+            mock_settings.message_poller_interval_seconds = 180
+            await poller._wait_for_next_cycle()
+
+        listener.wait.assert_awaited_once_with(poller.notify_event, 600)
+        mock_sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_message_poller_debounces_after_notification(self):
+        poller = MessagePollerService()
+        poller.notify_event = asyncio.Event()
+        listener = Mock()
+        listener.is_connected = True
+        listener.wait = AsyncMock(return_value=True)
+
+        with patch('app.services.message_poller.get_notification_listener', return_value=listener), \
+             patch('app.services.message_poller.settings') as mock_settings, \
+             patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            mock_settings.message_poller_sweep_interval_seconds = 600
+            mock_settings.db_notify_debounce_seconds = 1.0
+            await poller._wait_for_next_cycle()
+
+        mock_sleep.assert_awaited_once_with(1.0)
+
+    @pytest.mark.asyncio
+    async def test_message_poller_falls_back_to_interval_when_disconnected(self):
+        poller = MessagePollerService()
+        poller.notify_event = asyncio.Event()
+        listener = Mock()
+        listener.is_connected = False
+        listener.wait = AsyncMock()
+
+        with patch('app.services.message_poller.get_notification_listener', return_value=listener), \
+             patch('app.services.message_poller.settings') as mock_settings, \
+             patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            mock_settings.message_poller_interval_seconds = 180
+            await poller._wait_for_next_cycle()
+
+        listener.wait.assert_not_awaited()
+        mock_sleep.assert_awaited_once_with(180)
+
+    @pytest.mark.asyncio
+    async def test_clinical_ops_falls_back_to_interval_without_subscription(self):
+        processor = ClinicalOpsInboxProcessor()
+        processor.notify_event = None
+
+        with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            await processor._wait_for_next_cycle()
+
+        mock_sleep.assert_awaited_once_with(processor.poll_interval_seconds)
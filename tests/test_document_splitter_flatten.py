@@ -0,0 +1,153 @@
+"""
+Unit tests for selective flattening in DocumentSplitter._split_pdf:
+- Pages without widgets/annotations are copied as-is (text layer kept, no rendering)
+- Pages with form widgets or annotations are rendered to an image
+- flatten_mode='all' renders every page (previous behaviour)
+- flatten_dpi controls the rendering resolution
+- PDFMerger.merge_and_split emits the same pages from the in-memory merged document
+"""
+import pytest
+import shutil
+import tempfile
+from pathlib import Path
+
+fitz = pytest.importorskip("fitz")
+
+from app.services.document_splitter import DocumentSplitter, FLATTEN_ALL, FLATTEN_SELECTIVE
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files"""
+    temp_path = Path(tempfile.mkdtemp())
+    yield temp_path
+    shutil.rmtree(temp_path, ignore_errors=True)
+
+
+@pytest.fixture
+def form_pdf(temp_dir):
+    """3-page PDF: plain text, text + filled form field, text + highlight annotation"""
+    path = temp_dir / "input.pdf"
+    doc = fitz.open()
+    for text in ("Plain page", "Form page", "Annotated page"):
+        page = doc.new_page(width=612, height=792)
+        page.insert_text((72, 72), text)
+
+    widget = fitz.Widget()
+    widget.field_name = "beneficiary_name"
+    widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+    widget.field_value = "Jane Doe"
+    widget.rect = fitz.Rect(72, 100, 300, 130)
+    doc[1].add_widget(widget)
+
+    doc[2].add_highlight_annot(fitz.Rect(70, 60, 200, 80))
+
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _split(splitter, input_path):
+    return splitter.split_document(
+        input_path=str(input_path),
+        unique_id="u1",
+        document_unique_identifier="CONSOLIDATED",
+        original_file_name="consolidated.pdf",
+        mime_type="application/pdf"
+    )
+
+
+def _page_summary(local_path):
+    with fitz.open(local_path) as doc:
+        page = doc[0]
+        return {
+            'text': page.get_text().strip(),
+            'images': page.get_images(),
+            'widgets': page.first_widget is not None,
+        }
+
+
+class TestSelectiveFlattening:
+    """Test split modes"""
+
+    def test_selective_mode_renders_only_form_and_annotated_pages(self, temp_dir, form_pdf):
+        splitter = DocumentSplitter(temp_dir=str(temp_dir / "out"), flatten_mode=FLATTEN_SELECTIVE)
+
+        result = _split(splitter, form_pdf)
+
+        assert result.page_count == 3
+        plain, form, annotated = [_page_summary(p.local_path) for p in result.pages]
+
+        # Copied page keeps its text layer and has no rendered image
+        assert plain['text'] == "Plain page"
+        assert plain['images'] == []
+
+        # Form and annotated pages are flattened to a single image without widgets
+        for flattened in (form, annotated):
+            assert flattened['text'] == ""
+            assert len(flattened['images']) == 1
+            assert not flattened['widgets']
+
+        assert result.pages[0].file_size_bytes < result.pages[1].file_size_bytes
+
+    def test_all_mode_renders_every_page(self, temp_dir, form_pdf):
+        splitter = DocumentSplitter(temp_dir=str(temp_dir / "out"), flatten_mode=FLATTEN_ALL)
+
+        result = _split(splitter, form_pdf)
+
+        for page in result.pages:
+            summary = _page_summary(page.local_path)
+            assert summary['text'] == ""
+            assert len(summary['images']) == 1
+
+    def test_flatten_dpi_controls_render_resolution(self, temp_dir, form_pdf):
+        widths = {}
+        for dpi in (72, 144):
+            splitter = DocumentSplitter(temp_dir=str(temp_dir / f"out_{dpi}"), flatten_dpi=dpi)
+            result = _split(splitter, form_pdf)
+            with fitz.open(result.pages[1].local_path) as doc:
+                widths[dpi] = doc[0].get_images()[0][2]  # image width in pixels
+
+        assert widths[72] == 612
+        assert widths[144] == 1224
+
+    def test_invalid_flatten_mode_rejected(self, temp_dir):
+        with pytest.raises(ValueError):
+            DocumentSplitter(temp_dir=str(temp_dir), flatten_mode="never")
+
+
+class TestMergeAndSplit:
+    """Test single-pass merge+split from the in-memory merged document"""
+
+    def test_merge_and_split_matches_merge_then_split(self, temp_dir, form_pdf):
+        from app.services.pdf_merger import PDFMerger
+
+        second = temp_dir / "second.pdf"
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), "Second document")
+        doc.save(second)
+        doc.close()
+
+        merger = PDFMerger(temp_dir=str(temp_dir / "merge"))
+        splitter = DocumentSplitter(temp_dir=str(temp_dir / "split"))
+        output_path = temp_dir / "consolidated.pdf"
+
+        total_pages, result = merger.merge_and_split(
+            input_paths=[str(form_pdf), str(second)],
+            mime_types=["application/pdf", "application/pdf"],
+            output_path=str(output_path),
+            splitter=splitter,
+            unique_id="u1"
+        )
+
+        # Consolidated PDF is still written for upload
+        with fitz.open(output_path) as consolidated:
+            assert len(consolidated) == 4
+        assert total_pages == 4
+        assert result.page_count == 4
+        assert [p.page_number for p in result.pages] == [1, 2, 3, 4]
+        assert _page_summary(result.pages[0].local_path)['text'] == "Plain page"
+        assert _page_summary(result.pages[3].local_path)['text'] == "Second document"
+        # Form page is flattened exactly as in split_document
+        assert len(_page_summary(result.pages[1].local_path)['images']) == 1
+        assert all(Path(p).exists() for p in result.local_paths)
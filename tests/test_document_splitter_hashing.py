@@ -0,0 +1,84 @@
+"""
+Unit tests for page hashing in DocumentSplitter:
+- HashingWriter hashes and counts everything written through it
+- Split pages carry the SHA256 and size of the file actually written (PDF and text input)
+"""
+import hashlib
+import io
+import pytest
+import shutil
+import tempfile
+from pathlib import Path
+
+from app.services.document_splitter import DocumentSplitter, HashingWriter
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files"""
+    temp_path = Path(tempfile.mkdtemp())
+    yield temp_path
+    shutil.rmtree(temp_path, ignore_errors=True)
+
+
+def _assert_pages_hashed(result):
+    for page in result.pages:
+        data = Path(page.local_path).read_bytes()
+        assert page.sha256 == hashlib.sha256(data).hexdigest()
+        assert page.file_size_bytes == len(data)
+
+
+class TestHashingWriter:
+    """Test the hashing file wrapper"""
+
+    def test_hash_and_size_match_written_bytes(self):
+        target = io.BytesIO()
+        writer = HashingWriter(target)
+
+        writer.write(b"%PDF-1.7\n")
+        writer.write(b"%%EOF")
+
+        assert target.getvalue() == b"%PDF-1.7\n%%EOF"
+        assert writer.size == len(target.getvalue())
+        assert writer.tell() == writer.size
+        assert writer.hexdigest() == hashlib.sha256(target.getvalue()).hexdigest()
+
+
+class TestSplitPageHashes:
+    """Test that split pages are hashed as they are produced"""
+
+    def test_pdf_pages(self, temp_dir):
+        fitz = pytest.importorskip("fitz")
+        input_path = temp_dir / "input.pdf"
+        doc = fitz.open()
+        for text in ("First page", "Second page"):
+            doc.new_page(width=612, height=792).insert_text((72, 72), text)
+        doc.save(input_path)
+        doc.close()
+
+        result = DocumentSplitter(temp_dir=str(temp_dir / "out")).split_document(
+            input_path=str(input_path),
+            unique_id="u1",
+            document_unique_identifier="CONSOLIDATED",
+            original_file_name="input.pdf",
+            mime_type="application/pdf"
+        )
+
+        assert result.page_count == 2
+        _assert_pages_hashed(result)
+
+    def test_text_page(self, temp_dir):
+        pytest.importorskip("reportlab")
+        input_path = temp_dir / "note.txt"
+        input_path.write_text("Beneficiary: Jane Doe\nProcedure: 64483\n")
+
+        result = DocumentSplitter(temp_dir=str(temp_dir / "out")).split_document(
+            input_path=str(input_path),
+            unique_id="u1",
+            document_unique_identifier="NOTE",
+            original_file_name="note.txt",
+            mime_type="text/plain"
+        )
+
+        assert result.page_count == 1
+        _assert_pages_hashed(result)
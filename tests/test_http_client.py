@@ -0,0 +1,110 @@
+"""
+Unit tests for the shared pooled HTTP client:
+- PooledHTTPClient serves synchronous threads and async callers from one client
+- Requests to one host are capped by max_connections_per_host
+- RetryPolicy classifies statuses and computes exponential backoff
+"""
+import asyncio
+import threading
+import pytest
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from app.services.http_client import PooledHTTPClient, RetryPolicy, http_timeout
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def client(calls):
+    async def handler(request):
+        calls.append((request.method, str(request.url), threading.current_thread().name))
+        return httpx.Response(200, json={'path': request.url.path})
+
+    pooled = PooledHTTPClient(transport=httpx.MockTransport(handler))
+    yield pooled
+    pooled.close()
+
+
+class TestPooledHTTPClient:
+    """Test the shared client"""
+
+    def test_sync_and_async_share_one_loop(self, client, calls):
+        response = client.post_sync("http://ocr.local/api/v1/ocr", json={}, timeout=http_timeout(5))
+
+        async def call_async():
+            return await client.post("http://jsongen.local/generate", json={})
+
+        async_response = asyncio.run(call_async())
+
+        assert response.json() == {'path': '/api/v1/ocr'}
+        assert async_response.json() == {'path': '/generate'}
+        # Both requests ran on the client's own event loop thread
+        assert [thread for _, _, thread in calls] == ["http-client", "http-client"]
+        assert client.get_status()['requests'] == 2
+
+    def test_per_host_limit(self):
+        active = {'ocr.local': 0}
+        peak = []
+
+        async def handler(request):
+            active[request.url.host] += 1
+            peak.append(active[request.url.host])
+            await asyncio.sleep(0.02)
+            active[request.url.host] -= 1
+            return httpx.Response(200)
+
+        pooled = PooledHTTPClient(max_connections_per_host=2, transport=httpx.MockTransport(handler))
+        try:
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                list(executor.map(lambda _: pooled.post_sync("http://ocr.local/ocr"), range(6)))
+        finally:
+            pooled.close()
+
+        assert max(peak) == 2
+        assert len(peak) == 6
+
+    def test_errors_reach_the_caller(self):
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        pooled = PooledHTTPClient(transport=httpx.MockTransport(handler))
+        try:
+            with pytest.raises(httpx.ConnectError):
+                pooled.post_sync("http://lettergen.local/api/v2/affirmation", json={})
+        finally:
+            pooled.close()
+
+    def test_close_stops_loop_thread(self, client):
+        client.post_sync("http://ocr.local/ocr")
+
+        client.close()
+
+        assert client.get_status()['started'] is False
+        assert not any(thread.name == "http-client" for thread in threading.enumerate())
+
+    def test_http2_requires_h2(self):
+        with patch('app.services.http_client.importlib.util.find_spec', return_value=None):
+            assert PooledHTTPClient(http2=True).http2 is False
+
+
+class TestRetryPolicy:
+    """Test the shared retry policy"""
+
+    def test_backoff(self):
+        policy = RetryPolicy(max_attempts=5, base_seconds=1.0, slow_statuses=frozenset({502, 503}))
+
+        assert [policy.delay_seconds(attempt) for attempt in (1, 2, 3)] == [1.0, 2.0, 4.0]
+        assert [policy.delay_seconds(attempt, 502) for attempt in (1, 2, 3)] == [2.0, 4.0, 8.0]
+        assert policy.has_attempts_left(4) and not policy.has_attempts_left(5)
+
+    def test_classification(self):
+        policy = RetryPolicy(max_attempts=3)
+
+        assert policy.is_retryable_status(503)
+        assert not policy.is_retryable_status(501)
+        assert not policy.is_retryable_status(422)
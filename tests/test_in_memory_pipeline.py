@@ -0,0 +1,281 @@
+"""
+Unit tests for the in-memory packet path:
+- download_many_to_buffers keeps blobs in memory up to the budget and spills the rest to temp files
+- upload_pages uploads in-memory pages from bytes
+- PDFMerger.merge_and_split_buffers keeps small packets in memory and saves large ones straight to disk
+- Converted inputs get unique temp names, so packets merging concurrently never share a file
+- DocumentProcessor writes over-budget packets to temp files for the file-based merge
+- OCRService.run_ocr_on_bytes posts in-memory page PDFs
+"""
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app.services.blob_storage import BlobStorageClient
+
+fitz = pytest.importorskip("fitz")
+
+
+@pytest.fixture
+def client(tmp_path):
+    return BlobStorageClient(
+        storage_account_url="https://example.blob.core.windows.net",
+        container_name="source",
+        temp_dir=str(tmp_path)
+    )
+
+
+def _fake_blob_client(contents):
+    """Build a _get_blob_client replacement serving download streams for the given blob contents"""
+    def get_blob_client(blob_path_or_url, container_name=None):
+        data = contents[blob_path_or_url]
+        stream = MagicMock()
+        stream.size = len(data)
+        stream.properties.etag = '"etag"'
+        stream.properties.content_settings.content_type = 'application/pdf'
+        stream.readall.return_value = data
+        stream.readinto.side_effect = lambda f: f.write(data)
+        blob_client = MagicMock()
+        blob_client.download_blob.return_value = stream
+        return blob_client
+
+    return get_blob_client
+
+
+def _pdf_bytes(text, pages=1):
+    doc = fitz.open()
+    for n in range(pages):
+        doc.new_page().insert_text((72, 72), f"{text} {n + 1}")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class TestDownloadManyToBuffers:
+    """Test memory budget for concurrent downloads"""
+
+    def test_blobs_over_budget_spill_to_temp_files(self, client):
+        contents = {"doc1.pdf": b"a" * 60, "doc2.pdf": b"b" * 60, "doc3.pdf": b"c" * 30}
+        client._get_blob_client = _fake_blob_client(contents)
+
+        results = client.download_many_to_buffers(
+            list(contents), subdir="consolidated/u1", max_concurrency=1, max_memory_bytes=100
+        )
+
+        # doc1 and doc3 fit the 100-byte budget; doc2 would exceed it
+        assert results[0]['data'] == contents["doc1.pdf"]
+        assert results[0]['local_path'] is None
+        assert results[1]['data'] is None
+        assert Path(results[1]['local_path']).read_bytes() == contents["doc2.pdf"]
+        assert results[2]['data'] == contents["doc3.pdf"]
+        assert [r['size_bytes'] for r in results] == [60, 60, 30]
+
+    def test_zero_budget_writes_every_blob_to_disk(self, client):
+        contents = {"doc1.pdf": b"a" * 10}
+        client._get_blob_client = _fake_blob_client(contents)
+
+        results = client.download_many_to_buffers(list(contents), max_memory_bytes=0)
+
+        assert results[0]['data'] is None
+        assert Path(results[0]['local_path']).exists()
+
+
+class TestUploadPagesFromMemory:
+    """Test page uploads from bytes"""
+
+    @patch('app.services.blob_storage.settings')
+    def test_in_memory_pages_upload_bytes(self, mock_settings, client):
+        mock_settings.azure_storage_source_container = "source"
+        mock_settings.container_name = "source"
+        mock_settings.blob_upload_max_concurrency = 2
+        blob_client = MagicMock()
+        blob_client.upload_blob.return_value = {'etag': '"etag"'}
+        uploaded = {}
+
+        def upload_blob(data, **kwargs):
+            uploaded['data'] = data.read()
+            return {'etag': '"etag"'}
+
+        blob_client.upload_blob.side_effect = upload_blob
+        client._get_blob_client = Mock(return_value=blob_client)
+        client.resolve_blob_url = Mock(return_value="https://example/dest/page_0001.pdf")
+
+        results = client.upload_pages(
+            [{'page_number': 1, 'local_path': None, 'data': b"%PDF page", 'dest_blob_path': 'p/page_0001.pdf'}],
+            container_name="dest"
+        )
+
+        assert uploaded['data'] == b"%PDF page"
+        assert results[1]['size_bytes'] == 9
+        assert results[1]['content_type'] == 'application/pdf'
+        assert results[1]['etag'] == '"etag"'
+
+    @patch('app.services.blob_storage.settings')
+    def test_upload_bytes_refuses_source_container(self, mock_settings, client):
+        mock_settings.azure_storage_source_container = "source"
+        mock_settings.container_name = "source"
+
+        with pytest.raises(RuntimeError):
+            client.upload_bytes(b"data", "p/page_0001.pdf", container_name="source")
+
+
+class TestMergeAndSplitBuffers:
+    """Test in-memory merge+split and the spill threshold"""
+
+    @pytest.fixture
+    def merger_and_splitter(self, tmp_path):
+        from app.services.pdf_merger import PDFMerger
+        from app.services.document_splitter import DocumentSplitter
+        return PDFMerger(temp_dir=str(tmp_path / "merge")), DocumentSplitter(temp_dir=str(tmp_path / "split"))
+
+    def test_small_packet_stays_in_memory(self, tmp_path, merger_and_splitter):
+        merger, splitter = merger_and_splitter
+        second = tmp_path / "second.pdf"
+        second.write_bytes(_pdf_bytes("Second"))
+        output_path = tmp_path / "consolidated.pdf"
+
+        total_pages, consolidated, result = merger.merge_and_split_buffers(
+            sources=[_pdf_bytes("First", pages=2), str(second)],
+            mime_types=["application/pdf", "application/pdf"],
+            output_path=str(output_path),
+            splitter=splitter,
+            unique_id="u1",
+            max_memory_bytes=10 * 1024 * 1024
+        )
+
+        assert total_pages == 3
+        assert not output_path.exists()
+        with fitz.open(stream=consolidated, filetype="pdf") as doc:
+            assert len(doc) == 3
+        assert result.local_paths == []
+        for page in result.pages:
+            assert page.local_path is None
+            assert page.file_size_bytes == len(page.content)
+        with fitz.open(stream=result.pages[2].content, filetype="pdf") as doc:
+            assert doc[0].get_text().strip() == "Second 1"
+        assert all(p['file_name'].endswith('.pdf') for p in result.pages_metadata['pages'])
+
+    def test_large_packet_spills_to_disk(self, tmp_path, merger_and_splitter):
+        merger, splitter = merger_and_splitter
+        output_path = tmp_path / "consolidated.pdf"
+
+        total_pages, consolidated, result = merger.merge_and_split_buffers(
+            sources=[_pdf_bytes("First", pages=2)],
+            mime_types=["application/pdf"],
+            output_path=str(output_path),
+            splitter=splitter,
+            unique_id="u1",
+            max_memory_bytes=1
+        )
+
+        assert consolidated is None
+        with fitz.open(output_path) as doc:
+            assert len(doc) == total_pages == 2
+        assert all(page.content is None for page in result.pages)
+        assert all(Path(p).exists() for p in result.local_paths)
+
+    def test_over_budget_packet_is_never_serialized_in_memory(self, tmp_path, merger_and_splitter):
+        merger, splitter = merger_and_splitter
+        output_path = tmp_path / "consolidated.pdf"
+        image_path = tmp_path / "scan.png"
+        with fitz.open() as doc:
+            doc.new_page(width=100, height=100)
+            doc[0].get_pixmap().save(str(image_path))
+        tobytes = fitz.Document.tobytes
+
+        def page_tobytes(doc, *args, **kwargs):
+            # Single-page PDFs are fine; the two-page packet must only be saved to disk
+            assert len(doc) == 1, "consolidated PDF serialized in memory"
+            return tobytes(doc, *args, **kwargs)
+
+        with patch.object(merger, '_convert_image_to_pdf', wraps=merger._convert_image_to_pdf) as convert, \
+                patch.object(fitz.Document, 'tobytes', page_tobytes):
+            total_pages, consolidated, result = merger.merge_and_split_buffers(
+                sources=[str(image_path), str(image_path)],
+                mime_types=["image/png", "image/png"],
+                output_path=str(output_path),
+                splitter=splitter,
+                unique_id="u1",
+                max_memory_bytes=1
+            )
+
+        assert consolidated is None and total_pages == 2
+        with fitz.open(output_path) as doc:
+            assert len(doc) == 2
+        # Images on disk are converted through temp PDFs, which are cleaned up
+        assert [c.args[1] for c in convert.call_args_list] == [0, 1]
+        assert list((tmp_path / "merge").iterdir()) == []
+
+    def test_converted_inputs_at_same_index_do_not_collide(self, tmp_path, merger_and_splitter):
+        merger, _ = merger_and_splitter
+        first = tmp_path / "first.txt"
+        first.write_text("First packet")
+        second = tmp_path / "second.txt"
+        second.write_text("Second packet")
+
+        # Two packets whose text source sits at index 0
+        first_pdf = merger._convert_text_to_pdf(first, 0)
+        second_pdf = merger._convert_text_to_pdf(second, 0)
+
+        assert first_pdf != second_pdf
+        assert Path(first_pdf).name.startswith("normalized_0_") and first_pdf.endswith("_text.pdf")
+        with fitz.open(first_pdf) as doc:
+            assert "First packet" in doc[0].get_text()
+        with fitz.open(second_pdf) as doc:
+            assert "Second packet" in doc[0].get_text()
+
+
+class TestSpillDownloads:
+    """Test over-budget packets are moved to disk before merging"""
+
+    def test_in_memory_downloads_written_to_temp_files(self, tmp_path):
+        from app.services.document_processor import DocumentProcessor
+        processor = DocumentProcessor.__new__(DocumentProcessor)
+        processor.temp_dir = tmp_path
+        docs = [
+            {'data': b"%PDF first", 'local_path': None, 'file_name': "first.pdf"},
+            {'data': None, 'local_path': str(tmp_path / "spilled.tif"), 'file_name': "second.tif"},
+        ]
+        temp_files = []
+
+        processor._spill_downloads_to_disk(docs, "u1", temp_files)
+
+        assert docs[0]['data'] is None
+        assert Path(docs[0]['local_path']).read_bytes() == b"%PDF first"
+        assert docs[0]['local_path'].endswith(".pdf")
+        assert docs[1]['local_path'] == str(tmp_path / "spilled.tif")
+        assert temp_files == [docs[0]['local_path']]
+
+
+class TestOCROnBytes:
+    """Test OCR on in-memory page PDFs"""
+
+    def test_run_ocr_on_bytes_posts_content(self):
+        from app.services.ocr_service import OCRService
+        with patch('app.services.ocr_service.settings') as mock_settings:
+            mock_settings.ocr_base_url = "http://test-ocr-service"
+            mock_settings.ocr_timeout_seconds = 120
+            mock_settings.ocr_max_retries = 1
+            service = OCRService()
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'fields': {}, 'overall_document_confidence': 0.9}
+        mock_client = Mock()
+        mock_client.post_sync.return_value = mock_response
+
+        with patch('app.services.ocr_service.get_http_client', return_value=mock_client):
+            result = service.run_ocr_on_bytes(b"%PDF page", "page_0001.pdf")
+
+        assert result['overall_document_confidence'] == 0.9
+        files = mock_client.post_sync.call_args.kwargs['files']
+        assert files['file'] == ('page_0001.pdf', b"%PDF page", 'application/pdf')
@@ -0,0 +1,103 @@
+"""
+Unit tests for bulk inbox ingestion:
+- One multi-row INSERT ... ON CONFLICT DO NOTHING for the whole polled batch
+- Watermark advanced in the same transaction (single commit)
+- Failure rolls back inserts and watermark together
+- Poll projects scalar columns only (no full payload)
+"""
+import pytest
+import sys
+from unittest.mock import MagicMock, patch
+from datetime import datetime
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app.services.integration_inbox import IntegrationInboxService
+
+
+def _row(message_id, channel_type_id=3):
+    return {
+        'message_id': message_id,
+        'decision_tracking_id': '04eb1038-f6cf-4359-81a0-cee8468fa3bb',
+        'message_type': 'ingest_file_package',
+        'source_created_at': datetime(2026, 1, 6),
+        'channel_type_id': channel_type_id,
+        'message_type_id': 1,
+        'due_at': datetime(2026, 1, 9)
+    }
+
+
+class TestIngestBatch:
+    """Test IntegrationInboxService.ingest_batch"""
+
+    @patch('app.services.integration_inbox.SessionLocal')
+    def test_single_insert_and_watermark_single_commit(self, mock_session_local):
+        mock_db_session = MagicMock()
+        insert_result = MagicMock()
+        insert_result.fetchall.return_value = [(11, 270)]  # 271 already in inbox
+        mock_db_session.execute.side_effect = [insert_result, MagicMock()]
+        mock_session_local.return_value = mock_db_session
+
+        inserted = IntegrationInboxService().ingest_batch(
+            [_row(270), _row(271, None)], datetime(2026, 1, 6), 271
+        )
+
+        assert inserted == [{'inbox_id': 11, 'message_id': 270}]
+        assert mock_db_session.execute.call_count == 2
+        mock_db_session.commit.assert_called_once()
+
+        insert_sql, insert_params = mock_db_session.execute.call_args_list[0][0]
+        assert 'ON CONFLICT (message_id) DO NOTHING' in str(insert_sql)
+        assert insert_params['message_id_0'] == 270
+        assert insert_params['message_id_1'] == 271
+        assert insert_params['channel_type_id_1'] is None
+
+        watermark_sql, watermark_params = mock_db_session.execute.call_args_list[1][0]
+        assert 'integration_poll_watermark' in str(watermark_sql)
+        assert watermark_params['max_message_id'] == 271
+
+    @patch('app.services.integration_inbox.SessionLocal')
+    def test_watermark_failure_rolls_back_inserts(self, mock_session_local):
+        mock_db_session = MagicMock()
+        mock_db_session.execute.side_effect = [MagicMock(), Exception("watermark update failed")]
+        mock_session_local.return_value = mock_db_session
+
+        with pytest.raises(Exception, match="watermark update failed"):
+            IntegrationInboxService().ingest_batch([_row(270)], datetime(2026, 1, 6), 270)
+
+        mock_db_session.rollback.assert_called_once()
+        mock_db_session.commit.assert_not_called()
+
+    def test_empty_batch_skips_query(self):
+        with patch('app.services.integration_inbox.SessionLocal') as mock_session_local:
+            assert IntegrationInboxService().ingest_batch([], datetime(2026, 1, 6), 0) == []
+            mock_session_local.assert_not_called()
+
+
+class TestPollProjection:
+    """Test payload-free poll projection"""
+
+    @patch('app.services.integration_inbox.SessionLocal')
+    def test_poll_does_not_select_full_payload(self, mock_session_local):
+        mock_db_session = MagicMock()
+        mock_db_session.execute.return_value.fetchone.return_value = (datetime(2026, 1, 1), 0)
+        mock_db_session.execute.return_value.fetchall.return_value = [
+            (272, "b1c2d3e4-5678-4abc-9def-234567890abc", "ingest_file_package", datetime(2026, 1, 6), 1, 1, "Expedited"),
+        ]
+        mock_session_local.return_value = mock_db_session
+
+        messages = IntegrationInboxService().poll_new_messages(batch_size=10)
+
+        query = str(mock_db_session.execute.call_args[0][0])
+        select_list = query.split('FROM integration.send_serviceops')[0]
+        assert "payload->>'message_type' AS message_type" in select_list
+        assert "payload," not in select_list
+        assert messages[0]['message_type'] == 'ingest_file_package'
+        assert messages[0]['submission_type'] == 'Expedited'
+        assert 'payload' not in messages[0]
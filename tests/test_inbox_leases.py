@@ -0,0 +1,251 @@
+"""
+Unit tests for batch job claiming with leases:
+- claim_jobs claims up to N rows in one statement and sets a lease
+- renew_leases extends leases only for rows still held by the worker
+- Message poller claims once per cycle and renews leases while jobs run
+- Jobs signalled while the worker pool drains are claimed before the drain ends
+"""
+import pytest
+import sys
+import asyncio
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
+from datetime import datetime
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app.services.integration_inbox import IntegrationInboxService
+from app.services.message_poller import MessagePollerService
+
+
+def _claimed_row(inbox_id, message_id, channel_type_id=3):
+    return (
+        inbox_id,
+        message_id,
+        "04eb1038-f6cf-4359-81a0-cee8468fa3bb",
+        "ingest_file_package",
+        datetime(2026, 1, 6),
+        "PROCESSING",
+        1,
+        "worker-1",
+        datetime(2026, 1, 6),
+        channel_type_id,
+        1,
+        datetime(2026, 1, 6, 0, 10)
+    )
+
+
+class TestClaimJobs:
+    """Test IntegrationInboxService.claim_jobs / renew_leases"""
+
+    @pytest.fixture
+    def mock_db_session(self):
+        return MagicMock()
+
+    @patch('app.services.integration_inbox.SessionLocal')
+    def test_claim_jobs_returns_all_claimed_rows(self, mock_session_local, mock_db_session):
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = [_claimed_row(1, 100), _claimed_row(2, 101, None)]
+        mock_db_session.execute.return_value = mock_result
+        mock_session_local.return_value = mock_db_session
+
+        jobs = IntegrationInboxService().claim_jobs("worker-1", limit=5, lease_seconds=600)
+
+        assert [job['inbox_id'] for job in jobs] == [1, 2]
+        assert jobs[0]['channel_type_id'] == 3
+        assert jobs[1]['channel_type_id'] is None
+        assert jobs[0]['lease_expires_at'] == datetime(2026, 1, 6, 0, 10)
+        mock_db_session.commit.assert_called_once()
+
+        # One statement with limit and lease parameters
+        assert mock_db_session.execute.call_count == 1
+        query_text, params = mock_db_session.execute.call_args[0]
+        assert 'FOR UPDATE OF integration_inbox SKIP LOCKED' in str(query_text)
+        assert 'lease_expires_at' in str(query_text)
+        assert params['limit'] == 5
+        assert params['lease_seconds'] == 600
+
+    @patch('app.services.integration_inbox.SessionLocal')
+    def test_claim_jobs_empty_rolls_back(self, mock_session_local, mock_db_session):
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = []
+        mock_db_session.execute.return_value = mock_result
+        mock_session_local.return_value = mock_db_session
+
+        jobs = IntegrationInboxService().claim_jobs("worker-1", limit=5, lease_seconds=600)
+
+        assert jobs == []
+        mock_db_session.rollback.assert_called_once()
+
+    def test_claim_jobs_zero_limit_skips_query(self):
+        with patch('app.services.integration_inbox.SessionLocal') as mock_session_local:
+            assert IntegrationInboxService().claim_jobs("worker-1", limit=0, lease_seconds=600) == []
+            mock_session_local.assert_not_called()
+
+    @patch('app.services.integration_inbox.SessionLocal')
+    def test_renew_leases_returns_renewed_ids(self, mock_session_local, mock_db_session):
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = [(1,)]
+        mock_db_session.execute.return_value = mock_result
+        mock_session_local.return_value = mock_db_session
+
+        renewed = IntegrationInboxService().renew_leases([1, 2], "worker-1", 600)
+
+        assert renewed == [1]
+        params = mock_db_session.execute.call_args[0][1]
+        assert params['worker_id'] == "worker-1"
+        assert params['inbox_ids'] == [1, 2]
+
+
+class TestPollerLeases:
+    """Test message poller claim/renew behaviour"""
+
+    @pytest.mark.asyncio
+    @patch('app.services.message_poller.IntegrationInboxService')
+    async def test_process_claimed_jobs_claims_batch_once(self, mock_inbox_service_class):
+        poller = MessagePollerService()
+        mock_inbox_service = MagicMock()
+        mock_inbox_service.claim_jobs.side_effect = [
+            [
+                {'inbox_id': 1, 'message_id': 100, 'attempt_count': 1},
+                {'inbox_id': 2, 'message_id': 101, 'attempt_count': 1},
+            ],
+            [],
+        ]
+        mock_inbox_service_class.return_value = mock_inbox_service
+        poller._process_claimed_job = AsyncMock()
+        poller._get_worker_pool_size = Mock(return_value=4)
+
+        await poller._process_claimed_jobs()
+
+        # One batch claim for the free slots; the ESMD lane filled its quota, so it is polled again
+        assert mock_inbox_service.claim_jobs.call_count == 2
+        assert mock_inbox_service.claim_jobs.call_args_list[0][0][1] == 4
+        assert poller._process_claimed_job.await_count == 2
+
+    @pytest.mark.asyncio
+    @patch('app.services.message_poller.IntegrationInboxService')
+    async def test_renew_leases_loop_renews_held_jobs(self, mock_inbox_service_class):
+        poller = MessagePollerService()
+        mock_inbox_service = MagicMock()
+        mock_inbox_service.renew_leases.return_value = [1]
+        mock_inbox_service_class.return_value = mock_inbox_service
+
+        held = {1}
+        with patch('app.services.message_poller.settings') as mock_settings:
+            mock_settings.inbox_lease_renew_interval_seconds = 0
+            mock_settings.inbox_lease_seconds = 600
+            task = asyncio.create_task(poller._renew_leases_loop(held))
+            for _ in range(20):
+                await asyncio.sleep(0.01)
+                if mock_inbox_service.renew_leases.called:
+                    break
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        args = mock_inbox_service.renew_leases.call_args[0]
+        assert args == ([1], poller.worker_id, 600)
+
+
+class TestWorkerPool:
+    """Test concurrent worker pool sizing and draining"""
+
+    def _usage(self, status='OK', available=10):
+        return {'status': status, 'available_for_background': available}
+
+    @pytest.mark.parametrize("status,available,expected", [
+        ('OK', 20, 4),        # full pool
+        ('OK', 5, 2),         # capped by connections (5 // 2)
+        ('WARNING', 20, 2),   # halved under pressure
+        ('CRITICAL', 20, 1),  # single worker
+        ('OK', 0, 1),         # no headroom still processes one job
+    ])
+    def test_worker_pool_size_follows_pool_usage(self, status, available, expected):
+        poller = MessagePollerService()
+        with patch('app.services.connection_pool_monitor.get_pool_usage',
+                   return_value=self._usage(status, available)), \
+             patch('app.services.message_poller.settings') as mock_settings:
+            mock_settings.pipeline_max_workers = 4
+            mock_settings.pipeline_db_connections_per_job = 2
+            assert poller._get_worker_pool_size() == expected
+
+    @pytest.mark.asyncio
+    @patch('app.services.message_poller.IntegrationInboxService')
+    async def test_process_claimed_jobs_runs_concurrently_and_refills(self, mock_inbox_service_class):
+        poller = MessagePollerService()
+        mock_inbox_service = MagicMock()
+        mock_inbox_service.claim_jobs.side_effect = [
+            [{'inbox_id': 1, 'message_id': 100}, {'inbox_id': 2, 'message_id': 101}],
+            [{'inbox_id': 3, 'message_id': 102}],
+            [],  # backlog drained
+        ]
+        mock_inbox_service_class.return_value = mock_inbox_service
+
+        running = 0
+        peak = 0
+
+        async def fake_job(job):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        poller._process_claimed_job = fake_job
+        poller._get_worker_pool_size = Mock(return_value=2)
+
+        await poller._process_claimed_jobs()
+
+        assert peak == 2
+        # Refill claims only ask for free slots
+        assert mock_inbox_service.claim_jobs.call_args_list[0][0][1] == 2
+        assert all(c[0][1] <= 2 for c in mock_inbox_service.claim_jobs.call_args_list)
+        assert poller.active_job_count == 0
+
+    @pytest.mark.asyncio
+    @patch('app.services.message_poller.IntegrationInboxService')
+    async def test_jobs_signalled_mid_drain_are_claimed(self, mock_inbox_service_class):
+        poller = MessagePollerService()
+        claims = []
+        second_job_claimed = asyncio.Event()
+
+        def claim_jobs(*args):
+            claims.append(args)
+            if len(claims) == 1:
+                # Fewer rows than free slots: every lane looks drained
+                return [{'inbox_id': 1, 'message_id': 100}]
+            if len(claims) == 2:
+                return [{'inbox_id': 2, 'message_id': 101}]
+            return []
+
+        mock_inbox_service = MagicMock()
+        mock_inbox_service.claim_jobs.side_effect = claim_jobs
+        mock_inbox_service_class.return_value = mock_inbox_service
+
+        async def fake_job(job):
+            if job['inbox_id'] == 1:
+                # Long job keeps the drain open until the new job has been claimed
+                await asyncio.wait_for(second_job_claimed.wait(), timeout=1)
+            else:
+                second_job_claimed.set()
+
+        poller._process_claimed_job = fake_job
+        poller._get_worker_pool_size = Mock(return_value=2)
+
+        async def signal_later():
+            await asyncio.sleep(0.02)
+            poller.jobs_available.set()
+
+        signaller = asyncio.create_task(signal_later())
+        await poller._process_claimed_jobs()
+        await signaller
+
+        assert second_job_claimed.is_set()
+        assert len(claims) >= 2
+        assert not poller.jobs_available.is_set()
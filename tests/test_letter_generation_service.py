@@ -190,8 +190,8 @@ class TestBuildDismissalRequest:
 class TestCallLetterGenAPI:
     """Test calling LetterGen API"""
     
-    @patch('httpx.Client')
-    def test_call_lettergen_api_success(self, mock_client_class, letter_service):
+    @patch('app.services.letter_generation_service.get_http_client')
+    def test_call_lettergen_api_success(self, mock_get_http_client, letter_service):
         """Test successful API call"""
         mock_response = Mock()
         mock_response.status_code = 200
@@ -206,10 +206,8 @@ class TestCallLetterGenAPI:
         }
         
         mock_client = Mock()
-        mock_client.__enter__ = Mock(return_value=mock_client)
-        mock_client.__exit__ = Mock(return_value=False)
-        mock_client.post.return_value = mock_response
-        mock_client_class.return_value = mock_client
+        mock_client.post_sync.return_value = mock_response
+        mock_get_http_client.return_value = mock_client
         
         response = letter_service._call_lettergen_api_with_retry(
             "/api/v2/affirmation",
@@ -219,8 +217,8 @@ class TestCallLetterGenAPI:
         assert response["blob_url"] == "https://storage.example.com/letter.pdf"
         assert response["filename"] == "letter.pdf"
     
-    @patch('httpx.Client')
-    def test_call_lettergen_api_422_validation_error(self, mock_client_class, letter_service):
+    @patch('app.services.letter_generation_service.get_http_client')
+    def test_call_lettergen_api_422_validation_error(self, mock_get_http_client, letter_service):
         """Test API returns 422 validation error (no retry)"""
         mock_response = Mock()
         mock_response.status_code = 422
@@ -231,10 +229,8 @@ class TestCallLetterGenAPI:
         mock_response.content = b'{"message": "Validation error"}'
         
         mock_client = Mock()
-        mock_client.__enter__ = Mock(return_value=mock_client)
-        mock_client.__exit__ = Mock(return_value=False)
-        mock_client.post.return_value = mock_response
-        mock_client_class.return_value = mock_client
+        mock_client.post_sync.return_value = mock_response
+        mock_get_http_client.return_value = mock_client
         
         with pytest.raises(LetterGenerationError) as exc_info:
             letter_service._call_lettergen_api_with_retry(
@@ -245,9 +241,9 @@ class TestCallLetterGenAPI:
         assert "422" in str(exc_info.value)
         assert "Validation error" in str(exc_info.value)
     
-    @patch('httpx.Client')
+    @patch('app.services.letter_generation_service.get_http_client')
     @patch('time.sleep')
-    def test_call_lettergen_api_500_retry(self, mock_sleep, mock_client_class, letter_service):
+    def test_call_lettergen_api_500_retry(self, mock_sleep, mock_get_http_client, letter_service):
         """Test API returns 500, then succeeds on retry"""
         # First call: 500
         # Second call: 200
@@ -262,10 +258,8 @@ class TestCallLetterGenAPI:
         }
         
         mock_client = Mock()
-        mock_client.__enter__ = Mock(return_value=mock_client)
-        mock_client.__exit__ = Mock(return_value=False)
-        mock_client.post.side_effect = [mock_response_500, mock_response_200]
-        mock_client_class.return_value = mock_client
+        mock_client.post_sync.side_effect = [mock_response_500, mock_response_200]
+        mock_get_http_client.return_value = mock_client
         
         response = letter_service._call_lettergen_api_with_retry(
             "/api/v2/affirmation",
@@ -273,21 +267,19 @@ class TestCallLetterGenAPI:
         )
         
         assert response["blob_url"] == "https://storage.example.com/letter.pdf"
-        assert mock_client.post.call_count == 2
+        assert mock_client.post_sync.call_count == 2
         mock_sleep.assert_called_once()  # Should sleep before retry
     
-    @patch('httpx.Client')
+    @patch('app.services.letter_generation_service.get_http_client')
     @patch('time.sleep')
-    def test_call_lettergen_api_timeout_retry(self, mock_sleep, mock_client_class, letter_service):
+    def test_call_lettergen_api_timeout_retry(self, mock_sleep, mock_get_http_client, letter_service):
         """Test API timeout, then succeeds on retry"""
         mock_client = Mock()
-        mock_client.__enter__ = Mock(return_value=mock_client)
-        mock_client.__exit__ = Mock(return_value=False)
-        mock_client.post.side_effect = [
+        mock_client.post_sync.side_effect = [
             httpx.TimeoutException("Request timed out"),
             Mock(status_code=200, json=lambda: {"blob_url": "https://storage.example.com/letter.pdf"})
         ]
-        mock_client_class.return_value = mock_client
+        mock_get_http_client.return_value = mock_client
         
         response = letter_service._call_lettergen_api_with_retry(
             "/api/v2/affirmation",
@@ -295,7 +287,7 @@ class TestCallLetterGenAPI:
         )
         
         assert response["blob_url"] == "https://storage.example.com/letter.pdf"
-        assert mock_client.post.call_count == 2
+        assert mock_client.post_sync.call_count == 2
 
 
 class TestGenerateLetter:
@@ -35,28 +35,28 @@ class TestMessagePollerChannelType:
             {
                 'message_id': 270,
                 'decision_tracking_id': '04eb1038-f6cf-4359-81a0-cee8468fa3bb',
-                'payload': {'documents': []},
+                'message_type': 'ingest_file_package',
                 'created_at': datetime(2026, 1, 6),
                 'channel_type_id': ChannelType.ESMD  # 3
             },
             {
                 'message_id': 271,
                 'decision_tracking_id': 'e7b8c1e2-1234-4cde-9abc-1234567890ab',
-                'payload': {'documents': []},
+                'message_type': 'ingest_file_package',
                 'created_at': datetime(2026, 1, 6),
                 'channel_type_id': ChannelType.GENZEON_FAX  # 2
             },
             {
                 'message_id': 272,
                 'decision_tracking_id': 'b1c2d3e4-5678-4abc-9def-234567890abc',
-                'payload': {'documents': []},
+                'message_type': 'ingest_file_package',
                 'created_at': datetime(2026, 1, 6),
                 'channel_type_id': ChannelType.GENZEON_PORTAL  # 1
             },
             {
                 'message_id': 100,
                 'decision_tracking_id': 'old-uuid',
-                'payload': {'documents': []},
+                'message_type': 'ingest_file_package',
                 'created_at': datetime(2026, 1, 1),
                 'channel_type_id': None  # Backward compatibility
             }
@@ -70,37 +70,34 @@ class TestMessagePollerChannelType:
         poller_service,
         sample_messages
     ):
-        """Test _poll_and_process passes channel_type_id to insert_into_inbox"""
+        """Test _poll_and_process passes channel_type_id to ingest_batch"""
         # Mock inbox service
         mock_inbox_service = MagicMock()
         mock_inbox_service_class.return_value = mock_inbox_service
         mock_inbox_service.poll_new_messages.return_value = sample_messages
-        mock_inbox_service.insert_into_inbox.return_value = 123  # inbox_id
-        mock_inbox_service.update_watermark.return_value = None
+        mock_inbox_service.ingest_batch.return_value = [{'inbox_id': 123, 'message_id': 270}]
         
         # Mock _process_claimed_jobs to avoid actual processing
         poller_service._process_claimed_jobs = AsyncMock()
         
         await poller_service._poll_and_process()
         
-        # Verify insert_into_inbox was called with channel_type_id for each message
-        assert mock_inbox_service.insert_into_inbox.call_count == 4
+        # Verify the whole batch is ingested in one call with channel_type_id per row
+        assert mock_inbox_service.ingest_batch.call_count == 1
+        mock_inbox_service.insert_into_inbox.assert_not_called()
+        mock_inbox_service.update_watermark.assert_not_called()
+        rows, max_created_at, max_message_id = mock_inbox_service.ingest_batch.call_args[0]
         
-        # Check first call (ESMD)
-        call_args_esmd = mock_inbox_service.insert_into_inbox.call_args_list[0]
-        assert call_args_esmd[0][4] == ChannelType.ESMD  # channel_type_id parameter
-        
-        # Check second call (Fax)
-        call_args_fax = mock_inbox_service.insert_into_inbox.call_args_list[1]
-        assert call_args_fax[0][4] == ChannelType.GENZEON_FAX
-        
-        # Check third call (Portal)
-        call_args_portal = mock_inbox_service.insert_into_inbox.call_args_list[2]
-        assert call_args_portal[0][4] == ChannelType.GENZEON_PORTAL
+        assert [row['channel_type_id'] for row in rows] == [
+            ChannelType.ESMD,
+            ChannelType.GENZEON_FAX,
+            ChannelType.GENZEON_PORTAL,
+            None  # backward compatibility
+        ]
         
-        # Check fourth call (None - backward compatibility)
-        call_args_none = mock_inbox_service.insert_into_inbox.call_args_list[3]
-        assert call_args_none[0][4] is None
+        # Watermark advances to the newest message in the batch
+        assert max_created_at == datetime(2026, 1, 6)
+        assert max_message_id == 272
     
     @pytest.mark.asyncio
     @patch('app.services.message_poller.DocumentProcessor')
@@ -221,7 +218,7 @@ class TestMessagePollerChannelType:
         mock_inbox_service = MagicMock()
         mock_inbox_service_class.return_value = mock_inbox_service
         
-        # Mock claim_job to return job with channel_type_id
+        # Mock claim_jobs to return job with channel_type_id
         mock_job = {
             'inbox_id': 123,
             'message_id': 270,
@@ -231,7 +228,7 @@ class TestMessagePollerChannelType:
             'attempt_count': 1,
             'channel_type_id': ChannelType.ESMD
         }
-        mock_inbox_service.claim_job.return_value = mock_job
+        mock_inbox_service.claim_jobs.return_value = [mock_job]
         
         # Mock get_source_message
         mock_message = MagicMock(spec=SendServiceOpsDB)
@@ -0,0 +1,228 @@
+"""
+Unit tests for OCR overload protection:
+- OCRCircuitBreaker opens after consecutive failures, probes when half-open and closes on success
+- OCRRateLimiter adaptive mode raises concurrency additively and lowers it multiplicatively
+- OCRService fails fast with OCRServiceUnavailableError while the circuit is open
+- StatusUpdateService parks deferred jobs without consuming an attempt
+- The message poller logs when a deferred job cannot be parked
+"""
+import pytest
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+import httpx
+
+from app.services.ocr_circuit_breaker import OCRCircuitBreaker, STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
+from app.services.ocr_rate_limiter import OCRRateLimiter
+from app.services.ocr_service import OCRService, OCRServiceError, OCRServiceUnavailableError
+from app.services.status_update_service import StatusUpdateResult, StatusUpdateService
+
+
+def _service(breaker, limiter=None, max_retries=2):
+    with patch('app.services.ocr_service.settings') as mock_settings:
+        mock_settings.ocr_base_url = "http://test-ocr-service"
+        mock_settings.ocr_timeout_seconds = 120
+        mock_settings.ocr_max_retries = max_retries
+        return OCRService(rate_limiter=limiter or OCRRateLimiter(), circuit_breaker=breaker)
+
+
+def _client(*responses):
+    mock_client = Mock()
+    mock_client.post_sync.side_effect = list(responses)
+    return mock_client
+
+
+class TestOCRCircuitBreaker:
+    """Test breaker state transitions"""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = OCRCircuitBreaker(failure_threshold=3, reset_timeout_seconds=60)
+
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == STATE_CLOSED
+
+        breaker.record_failure()
+
+        assert breaker.state == STATE_OPEN
+        assert not breaker.allow_request()
+        assert 0 < breaker.retry_after_seconds() <= 60
+        assert breaker.get_status()['times_opened'] == 1
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = OCRCircuitBreaker(failure_threshold=1, reset_timeout_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        assert breaker.state == STATE_HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+
+        assert breaker.state == STATE_CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_probe_reopens(self):
+        breaker = OCRCircuitBreaker(failure_threshold=1, reset_timeout_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == STATE_OPEN
+        assert breaker.get_status()['times_opened'] == 2
+
+    def test_zero_threshold_never_opens(self):
+        breaker = OCRCircuitBreaker(failure_threshold=0)
+        for _ in range(20):
+            breaker.record_failure()
+        assert breaker.allow_request()
+
+
+class TestAdaptiveConcurrency:
+    """Test AIMD tuning of the limiter"""
+
+    def test_additive_increase_up_to_ceiling(self):
+        limiter = OCRRateLimiter(max_in_flight=4, adaptive=True)
+        limiter._limit = 1.0
+
+        limiter.record_success(0.1)
+        assert limiter.concurrency_limit == 2
+        for _ in range(20):
+            limiter.record_success(0.1)
+
+        assert limiter.concurrency_limit == 4
+
+    def test_multiplicative_decrease_is_damped(self):
+        limiter = OCRRateLimiter(max_in_flight=8, adaptive=True, min_in_flight=2)
+
+        limiter.record_overload()
+        limiter.record_overload()
+        assert limiter.concurrency_limit == 4
+        assert limiter.get_status()['decreases'] == 1
+
+        limiter._last_decrease = 0.0
+        limiter.record_overload()
+        limiter._last_decrease = 0.0
+        limiter.record_overload()
+
+        assert limiter.concurrency_limit == 2
+
+    def test_slow_response_counts_as_overload(self):
+        limiter = OCRRateLimiter(max_in_flight=8, adaptive=True, latency_target_seconds=5.0)
+
+        limiter.record_success(6.0)
+
+        assert limiter.concurrency_limit == 4
+
+    def test_fixed_mode_ignores_signals(self):
+        limiter = OCRRateLimiter(max_in_flight=4)
+        limiter.record_overload()
+        assert limiter.concurrency_limit == 4
+
+
+class TestOCRServiceBreaker:
+    """Test the OCR client against the breaker"""
+
+    def test_open_circuit_fails_fast(self):
+        breaker = OCRCircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+        breaker.record_failure()
+        service = _service(breaker)
+        mock_client = _client()
+
+        with patch('app.services.ocr_service.get_http_client', return_value=mock_client):
+            with pytest.raises(OCRServiceUnavailableError) as exc_info:
+                service.run_ocr_on_bytes(b"%PDF", "page_0001.pdf")
+
+        assert exc_info.value.retry_after_seconds > 0
+        mock_client.post_sync.assert_not_called()
+
+    def test_failures_counted_per_request(self):
+        breaker = OCRCircuitBreaker(failure_threshold=2, reset_timeout_seconds=60)
+        limiter = OCRRateLimiter(max_in_flight=4, adaptive=True)
+        service = _service(breaker, limiter)
+        mock_client = _client(Mock(status_code=503, text="down"), httpx.TimeoutException("timeout"))
+
+        with patch('app.services.ocr_service.get_http_client', return_value=mock_client), patch('time.sleep'):
+            with pytest.raises(OCRServiceError):
+                service.run_ocr_on_bytes(b"%PDF", "page_0001.pdf")
+
+        # Two failed attempts, one failed request
+        assert breaker.get_status()['consecutive_failures'] == 1
+        assert breaker.state == STATE_CLOSED
+        assert limiter.concurrency_limit == 2
+
+    def test_success_closes_and_feeds_limiter(self):
+        breaker = OCRCircuitBreaker(failure_threshold=5)
+        breaker.record_failure()
+        limiter = OCRRateLimiter(max_in_flight=4, adaptive=True)
+        limiter._limit = 2.0
+        service = _service(breaker, limiter)
+        success = Mock(status_code=200)
+        success.json.return_value = {'fields': {}}
+
+        with patch('app.services.ocr_service.get_http_client', return_value=_client(success)):
+            service.run_ocr_on_bytes(b"%PDF", "page_0001.pdf")
+
+        assert breaker.get_status()['consecutive_failures'] == 0
+        assert limiter._limit == 2.5
+        assert set(service.get_status()) == {'rate_limiter', 'circuit_breaker', 'result_cache'}
+
+
+class TestDeferredStatus:
+    """Test parking a job without consuming an attempt"""
+
+    @patch('app.services.status_update_service.SessionLocal')
+    def test_mark_deferred(self, mock_session_local):
+        session = MagicMock()
+        session.execute.return_value.rowcount = 1
+        mock_session_local.return_value = session
+
+        result = StatusUpdateService(max_retries=3).mark_deferred_with_retry(
+            inbox_id=7, error_message="OCR deferred", retry_after_seconds=42.0
+        )
+
+        assert result.success is True
+        sql, params = session.execute.call_args.args
+        assert "status = 'FAILED'" in str(sql)
+        assert "attempt_count = GREATEST(attempt_count - 1, 0)" in str(sql)
+        assert params == {'inbox_id': 7, 'error_message': "OCR deferred", 'retry_after_seconds': 42.0}
+        session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch('app.services.message_poller.IntegrationInboxService')
+    async def test_failed_park_is_logged(self, mock_inbox_service_class):
+        from app.services.document_processor import DocumentProcessorDeferredError
+        from app.services.message_poller import MessagePollerService
+
+        poller = MessagePollerService()
+        poller._process_message = AsyncMock(
+            side_effect=DocumentProcessorDeferredError("OCR circuit open", retry_after_seconds=30.0)
+        )
+        poller.status_update_service = Mock()
+        poller.status_update_service.mark_deferred_with_retry.return_value = StatusUpdateResult(
+            success=False, attempts=3, error="database unavailable"
+        )
+
+        with patch('app.services.message_poller.logger') as mock_logger:
+            await poller._process_claimed_job({'inbox_id': 7, 'message_id': 100, 'attempt_count': 1})
+
+        poller.status_update_service.mark_deferred_with_retry.assert_called_once_with(7, "OCR circuit open", 30.0)
+        poller.status_update_service.mark_failed_with_retry.assert_not_called()
+        message, = mock_logger.error.call_args.args
+        assert "Failed to mark job as deferred after 3 attempts" in message
+        assert "database unavailable" in message
@@ -42,6 +42,8 @@ class TestOCRSequentialProcessing:
             page = Mock(spec=SplitPage)
             page.page_number = i
             page.local_path = f"/tmp/page_{i}.pdf"
+            page.sha256 = None
+            page.content = None
             pages.append(page)
         
         result = Mock(spec=SplitResult)
@@ -119,7 +121,7 @@ class TestOCRSequentialProcessing:
     def test_early_stopping_when_coversheet_found(self, mock_ocr_service, mock_split_result, mock_packet_document, mock_db):
         """Test that processing stops when strong coversheet candidate is found"""
         # Page 3 will be the strong candidate
-        def mock_ocr_side_effect(path):
+        def mock_ocr_side_effect(path, **kwargs):
             page_num = int(path.split('_')[1].split('.')[0])
             if page_num == 3:
                 return {
@@ -226,7 +228,7 @@ class TestOCRSequentialProcessing:
         call_count = {'count': 0}
         page_2_attempts = {'count': 0}
         
-        def mock_ocr_side_effect(path):
+        def mock_ocr_side_effect(path, **kwargs):
             call_count['count'] += 1
             page_num = int(path.split('_')[1].split('.')[0])
             
@@ -293,7 +295,7 @@ class TestOCRSequentialProcessing:
     def test_skipped_pages_in_metadata(self, mock_ocr_service, mock_split_result, mock_packet_document, mock_db):
         """Test that skipped pages are included in metadata with status='skipped'"""
         # Page 3 will trigger early stopping
-        def mock_ocr_side_effect(path):
+        def mock_ocr_side_effect(path, **kwargs):
             page_num = int(path.split('_')[1].split('.')[0])
             if page_num == 3:
                 return {
@@ -0,0 +1,162 @@
+"""
+Unit tests for rate-limited concurrent OCR:
+- OCRRateLimiter caps requests in flight and paces requests with a token bucket
+- OCRService takes a limiter slot for every HTTP attempt
+- DocumentProcessor._iter_page_ocr OCRs pages concurrently and yields them in page order
+"""
+import pytest
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app.services.ocr_rate_limiter import OCRRateLimiter
+from app.services.ocr_service import OCRService, OCRServiceError
+from app.services.document_processor import DocumentProcessor
+from app.services.document_splitter import SplitPage
+
+
+def _page(n):
+    return SplitPage(
+        page_number=n,
+        local_path=f"/tmp/page_{n}.pdf",
+        dest_blob_path=f"pages/page_{n}.pdf",
+        content_type="application/pdf",
+        file_size_bytes=10
+    )
+
+
+class TestOCRRateLimiter:
+    """Test the shared limiter"""
+
+    def test_in_flight_cap(self):
+        limiter = OCRRateLimiter(max_in_flight=2)
+        peak = []
+        lock = threading.Lock()
+        active = [0]
+
+        def request():
+            with limiter.slot():
+                with lock:
+                    active[0] += 1
+                    peak.append(active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(peak) == 2
+        assert limiter.get_status()['in_flight'] == 0
+        assert limiter.get_status()['requests'] == 6
+
+    def test_token_bucket_paces_requests(self):
+        limiter = OCRRateLimiter(requests_per_second=20)
+        start = time.monotonic()
+
+        for _ in range(30):
+            with limiter.slot():
+                pass
+
+        # 20 tokens available at once, the other 10 arrive at 20/s
+        assert time.monotonic() - start >= 0.45
+
+    def test_unlimited(self):
+        limiter = OCRRateLimiter()
+        for _ in range(100):
+            limiter.acquire()
+        assert limiter.get_status()['in_flight'] == 100
+
+
+class TestOCRServiceLimiter:
+    """Test that every HTTP attempt takes a slot"""
+
+    def test_each_attempt_takes_a_slot(self):
+        limiter = Mock(wraps=OCRRateLimiter(max_in_flight=1))
+        with patch('app.services.ocr_service.settings') as mock_settings:
+            mock_settings.ocr_base_url = "http://test-ocr-service"
+            mock_settings.ocr_timeout_seconds = 120
+            mock_settings.ocr_max_retries = 3
+            service = OCRService(rate_limiter=limiter)
+
+        failure = Mock(status_code=503, text="busy")
+        success = Mock(status_code=200)
+        success.json.return_value = {'fields': {}}
+        mock_client = Mock()
+        mock_client.post_sync.side_effect = [failure, success]
+
+        with patch('app.services.ocr_service.get_http_client', return_value=mock_client), patch('time.sleep'):
+            service.run_ocr_on_bytes(b"%PDF", "page_0001.pdf")
+
+        assert limiter.slot.call_count == 2
+        assert limiter.get_status()['in_flight'] == 0
+
+
+class TestConcurrentPageOCR:
+    """Test concurrent page OCR in the processor"""
+
+    @pytest.fixture
+    def processor(self):
+        processor = DocumentProcessor.__new__(DocumentProcessor)
+        processor.ocr_service = Mock()
+        return processor
+
+    def test_results_in_page_order(self, processor):
+        running = []
+        both_started = threading.Event()
+
+        def run_ocr(path, **kwargs):
+            running.append(path)
+            if len(running) == 2:
+                both_started.set()
+            # Page 1 only finishes once page 2 has started (they run concurrently)
+            assert both_started.wait(timeout=5)
+            if path.endswith("page_2.pdf"):
+                raise OCRServiceError("OCR service returned 503")
+            return {'fields': {}, 'path': path}
+
+        processor.ocr_service.run_ocr_on_pdf.side_effect = run_ocr
+
+        outcomes = list(processor._iter_page_ocr(
+            [_page(1), _page(2), _page(3)], page_concurrency=2, delay_between_requests=1.0
+        ))
+
+        assert [page.page_number for page, _, _ in outcomes] == [1, 2, 3]
+        assert outcomes[0][1]['path'] == "/tmp/page_1.pdf"
+        assert isinstance(outcomes[1][2], OCRServiceError) and outcomes[1][1] is None
+        assert outcomes[2][2] is None
+
+    def test_closing_cancels_pending_pages(self, processor):
+        processor.ocr_service.run_ocr_on_pdf.side_effect = lambda path, **kwargs: time.sleep(0.05) or {'fields': {}}
+
+        outcomes = processor._iter_page_ocr(
+            [_page(n) for n in range(1, 7)], page_concurrency=2, delay_between_requests=0.0
+        )
+        next(outcomes)
+        outcomes.close()
+        time.sleep(0.2)
+
+        assert processor.ocr_service.run_ocr_on_pdf.call_count < 6
+
+    def test_sequential_mode_delays_between_pages(self, processor):
+        processor.ocr_service.run_ocr_on_pdf.return_value = {'fields': {}}
+
+        with patch('app.services.document_processor.time.sleep') as mock_sleep:
+            outcomes = list(processor._iter_page_ocr(
+                [_page(1), _page(2), _page(3)], page_concurrency=1, delay_between_requests=0.5
+            ))
+
+        assert len(outcomes) == 3
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.5, 0.5]
@@ -0,0 +1,149 @@
+"""
+Unit tests for the OCR result cache:
+- OCRResultCache looks results up by page hash and model id and stores live results
+- Database errors never fail OCR and pause the cache
+- OCRService answers repeat pages from the cache before the circuit breaker and HTTP call
+- DocumentProcessor passes the split page's sha256 to the OCR client
+"""
+import hashlib
+import sys
+from unittest.mock import MagicMock, Mock, patch
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app.services.ocr_circuit_breaker import OCRCircuitBreaker
+from app.services.ocr_rate_limiter import OCRRateLimiter
+from app.services.ocr_result_cache import OCRResultCache
+from app.services.ocr_service import OCRService
+from app.services.document_processor import DocumentProcessor
+from app.services.document_splitter import SplitPage
+
+PAGE_HASH = "a" * 64
+
+
+def _session(row=None):
+    session = MagicMock()
+    session.execute.return_value.fetchone.return_value = row
+    return session
+
+
+def _service(cache, breaker=None):
+    with patch('app.services.ocr_service.settings') as mock_settings:
+        mock_settings.ocr_base_url = "http://test-ocr-service"
+        mock_settings.ocr_timeout_seconds = 120
+        mock_settings.ocr_max_retries = 1
+        return OCRService(
+            rate_limiter=OCRRateLimiter(),
+            circuit_breaker=breaker or OCRCircuitBreaker(),
+            result_cache=cache
+        )
+
+
+class TestOCRResultCache:
+    """Test lookups and stores"""
+
+    @patch('app.services.ocr_result_cache.SessionLocal')
+    def test_hit_and_miss(self, mock_session_local):
+        cache = OCRResultCache(model_id="coversheet-v2", ttl_days=90)
+        mock_session_local.return_value = _session(({'fields': {'a': {}}},))
+
+        assert cache.get(PAGE_HASH) == {'fields': {'a': {}}}
+        params = mock_session_local.return_value.execute.call_args.args[1]
+        assert params == {'page_sha256': PAGE_HASH, 'ocr_model_id': "coversheet-v2", 'ttl_days': 90}
+
+        mock_session_local.return_value = _session(None)
+        assert cache.get(PAGE_HASH) is None
+        assert cache.get_status()['hits'] == 1 and cache.get_status()['misses'] == 1
+
+    @patch('app.services.ocr_result_cache.SessionLocal')
+    def test_store_adopts_live_model_id(self, mock_session_local):
+        cache = OCRResultCache(model_id="coversheet-v1")
+        session = mock_session_local.return_value = _session()
+
+        cache.put(PAGE_HASH, {'model_id': "coversheet-v2", 'fields': {}})
+
+        params = session.execute.call_args.args[1]
+        assert params['ocr_model_id'] == "coversheet-v2"
+        assert cache.model_id == "coversheet-v2"
+        session.commit.assert_called_once()
+
+    @patch('app.services.ocr_result_cache.SessionLocal')
+    def test_database_error_pauses_cache(self, mock_session_local):
+        cache = OCRResultCache()
+        mock_session_local.return_value.execute.side_effect = Exception('relation "service_ops.ocr_result_cache" does not exist')
+
+        assert cache.get(PAGE_HASH) is None
+        assert cache.get(PAGE_HASH) is None
+        cache.put(PAGE_HASH, {'fields': {}})
+
+        assert mock_session_local.call_count == 1
+        assert cache.get_status()['errors'] == 1
+
+    @patch('app.services.ocr_result_cache.SessionLocal')
+    def test_disabled(self, mock_session_local):
+        cache = OCRResultCache(enabled=False)
+
+        assert cache.get(PAGE_HASH) is None
+        cache.put(PAGE_HASH, {'fields': {}})
+
+        mock_session_local.assert_not_called()
+
+
+class TestOCRServiceCache:
+    """Test the OCR client consults the cache"""
+
+    def test_hit_skips_breaker_and_http(self):
+        cache = Mock()
+        cache.get.return_value = {'fields': {'beneficiary_name': {}}, 'duration_ms': 900}
+        breaker = OCRCircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        service = _service(cache, breaker)
+
+        with patch('app.services.ocr_service.get_http_client') as mock_get_http_client:
+            result = service.run_ocr_on_bytes(b"%PDF page", "page_0001.pdf")
+
+        assert result['cache_hit'] is True and result['duration_ms'] == 0
+        cache.get.assert_called_once_with(hashlib.sha256(b"%PDF page").hexdigest())
+        mock_get_http_client.assert_not_called()
+
+    def test_miss_stores_live_result(self):
+        cache = Mock()
+        cache.get.return_value = None
+        service = _service(cache)
+        response = Mock(status_code=200)
+        response.json.return_value = {'fields': {}, 'model_id': "coversheet-v2"}
+        mock_client = Mock()
+        mock_client.post_sync.return_value = response
+
+        with patch('app.services.ocr_service.get_http_client', return_value=mock_client):
+            result = service.run_ocr_on_bytes(b"%PDF page", "page_0001.pdf", content_sha256=PAGE_HASH)
+
+        cache.get.assert_called_once_with(PAGE_HASH)
+        cache.put.assert_called_once_with(PAGE_HASH, result)
+        assert 'cache_hit' not in result
+
+
+class TestProcessorPageHash:
+    """Test the processor reuses split page hashes"""
+
+    def test_page_sha256_passed_to_ocr(self):
+        processor = DocumentProcessor.__new__(DocumentProcessor)
+        processor.ocr_service = Mock()
+        page = SplitPage(
+            page_number=1,
+            local_path="/tmp/page_1.pdf",
+            dest_blob_path="pages/page_1.pdf",
+            content_type="application/pdf",
+            file_size_bytes=10,
+            sha256=PAGE_HASH
+        )
+
+        processor._run_page_ocr(page)
+
+        processor.ocr_service.run_ocr_on_pdf.assert_called_once_with("/tmp/page_1.pdf", content_sha256=PAGE_HASH)
@@ -51,18 +51,16 @@ class TestOCRServiceRetry:
             mock_response.text = "<html>502 Bad Gateway</html>"
             
             mock_client = Mock()
-            mock_client.post.return_value = mock_response
-            mock_client.__enter__ = Mock(return_value=mock_client)
-            mock_client.__exit__ = Mock(return_value=False)
+            mock_client.post_sync.return_value = mock_response
             
-            with patch('httpx.Client', return_value=mock_client):
+            with patch('app.services.ocr_service.get_http_client', return_value=mock_client):
                 with patch('time.sleep') as mock_sleep:
                     # Should raise after max retries
                     with pytest.raises(OCRServiceError):
                         ocr_service.run_ocr_on_pdf(tmp_path)
                     
                     # Verify retries were attempted
-                    assert mock_client.post.call_count == 5
+                    assert mock_client.post_sync.call_count == 5
                     
                     # Verify longer backoff for 502 (2^attempt: 2s, 4s, 8s, 16s, 32s)
                     sleep_calls = [call[0][0] for call in mock_sleep.call_args_list]
@@ -110,11 +108,9 @@ class TestOCRServiceRetry:
                 return mock_response
             
             mock_client = Mock()
-            mock_client.post.side_effect = mock_post_side_effect
-            mock_client.__enter__ = Mock(return_value=mock_client)
-            mock_client.__exit__ = Mock(return_value=False)
+            mock_client.post_sync.side_effect = mock_post_side_effect
             
-            with patch('httpx.Client', return_value=mock_client):
+            with patch('app.services.ocr_service.get_http_client', return_value=mock_client):
                 with patch('time.sleep'):
                     result = ocr_service.run_ocr_on_pdf(tmp_path)
                     
@@ -142,18 +138,16 @@ class TestOCRServiceRetry:
             mock_response.text = "502 Bad Gateway"
             
             mock_client = Mock()
-            mock_client.post.return_value = mock_response
-            mock_client.__enter__ = Mock(return_value=mock_client)
-            mock_client.__exit__ = Mock(return_value=False)
+            mock_client.post_sync.return_value = mock_response
             
-            with patch('httpx.Client', return_value=mock_client):
+            with patch('app.services.ocr_service.get_http_client', return_value=mock_client):
                 with patch('time.sleep'):
                     # Should raise after max retries (5)
                     with pytest.raises(OCRServiceError):
                         ocr_service.run_ocr_on_pdf(tmp_path)
                     
                     # Verify exactly max_retries attempts
-                    assert mock_client.post.call_count == 5
+                    assert mock_client.post_sync.call_count == 5
         finally:
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
@@ -0,0 +1,155 @@
+"""
+Unit tests for per-page upload checkpoints:
+- upload_pages stores each page's sha256 as blob metadata and reports finished pages
+- find_unchanged_pages only reuses blobs whose stored hash matches
+- PageUploadCheckpoint records progress in batches and keeps existing pages_metadata
+"""
+import pytest
+import sys
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app.services.blob_storage import BlobStorageClient, BlobStorageError
+from app.services.document_processor_resume import PageUploadCheckpoint, get_page_upload_checkpoint
+
+
+@pytest.fixture
+def client(tmp_path):
+    return BlobStorageClient(
+        storage_account_url="https://example.blob.core.windows.net",
+        container_name="source",
+        temp_dir=str(tmp_path)
+    )
+
+
+def _page(n, sha256=None):
+    return {'page_number': n, 'data': b"%PDF page", 'dest_blob_path': f"pages/p{n}.pdf", 'sha256': sha256}
+
+
+class TestUploadPagesHashes:
+    """Test hash metadata and progress callbacks"""
+
+    def test_sha256_is_stored_and_progress_reported(self, client):
+        uploaded = {}
+        reported = []
+
+        def upload_bytes(data, dest_blob_path, metadata=None, **kwargs):
+            uploaded[dest_blob_path] = metadata
+            return {'blob_path': dest_blob_path, 'size_bytes': len(data)}
+
+        client.upload_bytes = upload_bytes
+
+        client.upload_pages(
+            [_page(1, "aaa"), _page(2)],
+            container_name="dest",
+            max_concurrency=2,
+            on_uploaded=lambda page, result: reported.append(page['page_number'])
+        )
+
+        assert uploaded == {"pages/p1.pdf": {'sha256': "aaa"}, "pages/p2.pdf": None}
+        assert sorted(reported) == [1, 2]
+
+    def test_find_unchanged_pages(self, client):
+        stored = {"pages/p1.pdf": "aaa", "pages/p2.pdf": "old", "pages/p3.pdf": None}
+
+        def get_properties(blob_path, container_name=None):
+            if blob_path == "pages/p4.pdf":
+                raise BlobStorageError("Blob not found")
+            sha256 = stored[blob_path]
+            return {'metadata': {'sha256': sha256} if sha256 else {}}
+
+        client.get_properties = get_properties
+
+        unchanged = client.find_unchanged_pages(
+            [_page(1, "aaa"), _page(2, "new"), _page(3, "ccc"), _page(4, "ddd"), _page(5)],
+            container_name="dest",
+            max_concurrency=2
+        )
+
+        assert unchanged == {1}
+
+
+class TestPageUploadCheckpoint:
+    """Test checkpoint persistence"""
+
+    @pytest.fixture
+    def packet_document(self):
+        document = MagicMock()
+        document.pages_metadata = {'version': 'v1', 'pages': [{'page_number': 1, 'blob_path': "old/p1.pdf"}]}
+        return document
+
+    @pytest.fixture
+    def db_session(self, packet_document):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = packet_document
+
+        @contextmanager
+        def get_db_session():
+            yield db
+
+        with patch('app.services.document_processor_resume.get_db_session', get_db_session), \
+                patch('app.services.document_processor_resume.flag_modified'):
+            yield db
+
+    def test_progress_is_flushed_in_batches(self, db_session, packet_document):
+        checkpoint = PageUploadCheckpoint(packet_document_id=7, flush_every=2)
+
+        checkpoint.record({'page_number': 2, 'dest_blob_path': "pages/p2.pdf", 'sha256': "bbb"})
+        assert db_session.commit.call_count == 0
+
+        checkpoint.record({'page_number': 1, 'dest_blob_path': "pages/p1.pdf", 'sha256': "aaa"})
+        assert db_session.commit.call_count == 1
+
+        checkpoint.record({'page_number': 3, 'dest_blob_path': "pages/p3.pdf", 'sha256': "ccc"})
+        checkpoint.flush()
+        assert db_session.commit.call_count == 2
+
+        # Existing pages stay in place until Transaction C replaces pages_metadata
+        assert packet_document.pages_metadata['pages'] == [{'page_number': 1, 'blob_path': "old/p1.pdf"}]
+        assert sorted(get_page_upload_checkpoint(packet_document)) == [1, 2, 3]
+        assert get_page_upload_checkpoint(packet_document)[2]['sha256'] == "bbb"
+
+    def test_load_carries_earlier_progress_forward(self, db_session, packet_document):
+        packet_document.pages_metadata['upload_checkpoint'] = {
+            'pages': [{'page_number': 1, 'blob_path': "pages/p1.pdf", 'sha256': "aaa"}]
+        }
+        checkpoint = PageUploadCheckpoint(packet_document_id=7, flush_every=10)
+
+        assert sorted(checkpoint.load()) == [1]
+        checkpoint.record({'page_number': 2, 'dest_blob_path': "pages/p2.pdf", 'sha256': "bbb"})
+        checkpoint.flush()
+
+        assert sorted(get_page_upload_checkpoint(packet_document)) == [1, 2]
+
+    def test_failed_flush_does_not_raise(self, db_session):
+        db_session.commit.side_effect = RuntimeError("connection lost")
+        checkpoint = PageUploadCheckpoint(packet_document_id=7, flush_every=1)
+
+        checkpoint.record({'page_number': 1, 'dest_blob_path': "pages/p1.pdf", 'sha256': "aaa"})
+
+    def test_load_prefers_checkpoint_over_previous_build(self, db_session, packet_document):
+        # Previous build committed page 1/2 hashes; an interrupted rebuild then re-uploaded page 2
+        packet_document.pages_metadata = {
+            'version': 'v1',
+            'pages': [
+                {'page_number': 1, 'blob_path': "pages/p1.pdf", 'relative_path': "pages/p1.pdf", 'sha256': "aaa"},
+                {'page_number': 2, 'blob_path': "pages/p2.pdf", 'relative_path': "pages/p2.pdf", 'sha256': "old"},
+                {'page_number': 3, 'blob_path': "pages/p3.pdf", 'relative_path': "pages/p3.pdf", 'sha256': None},
+            ],
+            'upload_checkpoint': {
+                'pages': [{'page_number': 2, 'blob_path': "pages/p2.pdf", 'sha256': "new"}]
+            }
+        }
+        checkpoint = PageUploadCheckpoint(packet_document_id=7)
+
+        known = checkpoint.load()
+
+        assert {n: page['sha256'] for n, page in known.items()} == {1: "aaa", 2: "new"}
@@ -0,0 +1,169 @@
+"""
+Unit tests for the staged document pipeline:
+- Stage concurrency settings parsing
+- Each stage limits its active packets independently
+- A packet keeps its current stage until the next stage's queue admits it (backpressure)
+- Stage slots are released when processing fails
+- The poller stops claiming while the first stage's queue is full
+"""
+import pytest
+import sys
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app.services.pipeline_stages import (
+    DocumentPipeline, parse_stage_concurrency,
+    STAGES, STAGE_DOWNLOAD, STAGE_MERGE, STAGE_SPLIT
+)
+from app.services.message_poller import MessagePollerService
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestSettings:
+    """Test stage concurrency parsing"""
+
+    def test_parse_stage_concurrency_defaults_and_invalid_entries(self):
+        parsed = parse_stage_concurrency("merge:1, ocr:6, bogus:3, split:x", 2)
+
+        assert set(parsed) == set(STAGES)
+        assert parsed['merge'] == 1
+        assert parsed['ocr'] == 6
+        assert parsed['split'] == 2
+        assert parsed['download'] == 2
+
+
+class TestStageGates:
+    """Test per-stage concurrency and backpressure"""
+
+    def test_stage_limits_active_packets(self):
+        pipeline = DocumentPipeline(concurrency={STAGE_MERGE: 1}, queue_size=4)
+        release = threading.Event()
+        entered = []
+
+        def packet(n):
+            with pipeline.run() as run:
+                run.enter(STAGE_MERGE)
+                entered.append(n)
+                release.wait(2)
+
+        threads = [threading.Thread(target=packet, args=(n,)) for n in range(2)]
+        for t in threads:
+            t.start()
+
+        assert _wait_until(lambda: pipeline.get_status()[STAGE_MERGE]['queued'] == 1)
+        status = pipeline.get_status()[STAGE_MERGE]
+        assert status['active'] == 1
+        assert len(entered) == 1
+
+        release.set()
+        for t in threads:
+            t.join(2)
+
+        assert len(entered) == 2
+        assert pipeline.get_status()[STAGE_MERGE]['active'] == 0
+        assert pipeline.get_status()[STAGE_MERGE]['completed'] == 2
+
+    def test_full_next_queue_holds_current_stage(self):
+        pipeline = DocumentPipeline(concurrency={STAGE_MERGE: 1, STAGE_SPLIT: 1}, queue_size=1)
+        split = pipeline.stages[STAGE_SPLIT]
+        # Split is busy and its queue is full
+        split.reserve()
+        split.activate()
+        split.reserve()
+
+        moved = threading.Event()
+
+        def packet():
+            with pipeline.run() as run:
+                run.enter(STAGE_MERGE)
+                run.enter(STAGE_SPLIT)
+                moved.set()
+
+        thread = threading.Thread(target=packet)
+        thread.start()
+
+        # Blocked on split's queue while still holding merge
+        assert not moved.wait(0.1)
+        assert pipeline.get_status()[STAGE_MERGE]['active'] == 1
+
+        split.cancel_reservation()
+        assert _wait_until(lambda: pipeline.get_status()[STAGE_MERGE]['active'] == 0)
+        assert pipeline.get_status()[STAGE_SPLIT]['queued'] == 1
+
+        split.release()
+        assert moved.wait(2)
+        thread.join(2)
+        assert pipeline.get_status()[STAGE_SPLIT]['active'] == 0
+
+    def test_slot_released_when_processing_fails(self):
+        pipeline = DocumentPipeline(queue_size=2)
+
+        with pytest.raises(RuntimeError):
+            with pipeline.run() as run:
+                run.enter(STAGE_DOWNLOAD)
+                raise RuntimeError("download failed")
+
+        status = pipeline.get_status()[STAGE_DOWNLOAD]
+        assert status['active'] == 0
+        assert status['queued'] == 0
+
+    def test_can_admit_tracks_first_stage_queue(self):
+        pipeline = DocumentPipeline(queue_size=1)
+        assert pipeline.can_admit()
+
+        pipeline.stages[STAGE_DOWNLOAD].reserve()
+        assert not pipeline.can_admit()
+
+
+class TestPollerAdmission:
+    """Test the worker pool respects pipeline backpressure"""
+
+    @pytest.mark.asyncio
+    @patch('app.services.message_poller.get_document_pipeline')
+    @patch('app.services.message_poller.IntegrationInboxService')
+    async def test_no_refill_while_pipeline_backed_up(self, mock_inbox_service_class, mock_get_pipeline):
+        poller = MessagePollerService()
+        poller._get_worker_pool_size = Mock(return_value=2)
+
+        mock_pipeline = MagicMock()
+        mock_pipeline.can_admit.return_value = False
+        mock_get_pipeline.return_value = mock_pipeline
+
+        mock_inbox_service = MagicMock()
+        mock_inbox_service.claim_jobs.side_effect = [
+            [
+                {'inbox_id': 1, 'channel_type_id': 2, 'message_type_id': 1},
+                {'inbox_id': 2, 'channel_type_id': 2, 'message_type_id': 1},
+            ],
+            [],
+        ]
+        mock_inbox_service_class.return_value = mock_inbox_service
+
+        async def fake_job(job):
+            await asyncio.sleep(0.01 * job['inbox_id'])
+
+        poller._process_claimed_job = fake_job
+
+        await poller._process_claimed_jobs()
+
+        # The slot freed by job 1 is not refilled while job 2 is in flight and the
+        # pipeline is full; once the pool is empty the drain claims again
+        assert mock_inbox_service.claim_jobs.call_count == 2
@@ -0,0 +1,204 @@
+"""
+Unit tests for large-document streaming mode:
+- DocumentSplitter.iter_split_pdf splits a PDF lazily in chunks with document-wide page numbers
+- should_stream applies the page-count and size thresholds
+- PDFMerger leaves the split to streaming mode above the thresholds
+- TIFF frames are converted in chunks from the file path
+- DocumentProcessor uploads chunk by chunk and keeps only the OCR pages on disk
+"""
+import io
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+fitz = pytest.importorskip("fitz")
+
+from app.services.document_splitter import DocumentSplitter
+from app.services.pdf_merger import PDFMerger
+
+
+def _pdf_bytes(pages):
+    doc = fitz.open()
+    for n in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {n + 1}")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "consolidated.pdf"
+    path.write_bytes(_pdf_bytes(5))
+    return path
+
+
+class TestIterSplitPdf:
+    """Test chunked splitting"""
+
+    def test_chunks_cover_document_in_order(self, tmp_path, pdf_path):
+        splitter = DocumentSplitter(temp_dir=str(tmp_path / "split"), chunk_pages=2)
+
+        chunks = splitter.iter_split_pdf(
+            input_path=str(pdf_path), unique_id="u1", document_unique_identifier="CONSOLIDATED"
+        )
+        first = next(chunks)
+        # Later chunks are not written until they are requested
+        assert len(list((tmp_path / "split" / "u1" / "CONSOLIDATED" / "pages").iterdir())) == 2
+        rest = list(chunks)
+
+        assert [chunk.page_count for chunk in [first] + rest] == [2, 2, 1]
+        pages = [page for chunk in [first] + rest for page in chunk.pages]
+        assert [page.page_number for page in pages] == [1, 2, 3, 4, 5]
+        for page in pages:
+            with fitz.open(page.local_path) as doc:
+                assert doc[0].get_text().strip() == f"Page {page.page_number}"
+
+    def test_should_stream_thresholds(self, tmp_path):
+        assert not DocumentSplitter(temp_dir=str(tmp_path)).should_stream(10_000, 10 ** 10)
+
+        splitter = DocumentSplitter(temp_dir=str(tmp_path), streaming_page_threshold=200, streaming_min_bytes=1000)
+
+        assert not splitter.should_stream(200, 1000)
+        assert splitter.should_stream(201, 10)
+        assert splitter.should_stream(10, 1001)
+
+
+class TestMergerStreaming:
+    """Test that the merger defers large splits"""
+
+    def test_merge_and_split_defers_split(self, tmp_path, pdf_path):
+        splitter = DocumentSplitter(temp_dir=str(tmp_path / "split"), streaming_page_threshold=4)
+        output_path = tmp_path / "merged.pdf"
+
+        total_pages, result = PDFMerger(temp_dir=str(tmp_path / "merge")).merge_and_split(
+            input_paths=[str(pdf_path)],
+            mime_types=["application/pdf"],
+            output_path=str(output_path),
+            splitter=splitter,
+            unique_id="u1"
+        )
+
+        assert total_pages == 5 and result is None
+        assert splitter.get_pdf_page_count(str(output_path)) == 5
+
+    def test_merge_and_split_buffers_writes_to_disk(self, tmp_path):
+        splitter = DocumentSplitter(temp_dir=str(tmp_path / "split"), streaming_page_threshold=4)
+        output_path = tmp_path / "merged.pdf"
+
+        source = _pdf_bytes(5)
+
+        # The streaming decision is made before the merged PDF is serialized
+        with patch.object(fitz.Document, 'tobytes', side_effect=AssertionError("serialized in memory")):
+            total_pages, consolidated, result = PDFMerger(temp_dir=str(tmp_path / "merge")).merge_and_split_buffers(
+                sources=[source],
+                mime_types=["application/pdf"],
+                output_path=str(output_path),
+                splitter=splitter,
+                unique_id="u1",
+                max_memory_bytes=10 * 1024 * 1024
+            )
+
+        assert total_pages == 5
+        assert consolidated is None and result is None
+        assert output_path.exists()
+
+
+class TestTiffChunks:
+    """Test chunked TIFF frame conversion"""
+
+    def test_frames_split_across_chunks(self, tmp_path):
+        Image = pytest.importorskip("PIL.Image")
+        frames = [Image.new('L', (120, 80), shade) for shade in (0, 100, 200)]
+        buffer = io.BytesIO()
+        frames[0].save(buffer, 'TIFF', save_all=True, append_images=frames[1:])
+        tiff_path = tmp_path / "fax.tiff"
+        tiff_path.write_bytes(buffer.getvalue())
+
+        result = DocumentSplitter(temp_dir=str(tmp_path / "split"), chunk_pages=2).split_document(
+            input_path=str(tiff_path),
+            unique_id="u1",
+            document_unique_identifier="FAX",
+            original_file_name="fax.tiff",
+            mime_type="image/tiff"
+        )
+
+        assert [page.page_number for page in result.pages] == [1, 2, 3]
+        assert len({page.sha256 for page in result.pages}) == 3
+
+    def test_chunk_tasks_receive_file_path(self, tmp_path):
+        Image = pytest.importorskip("PIL.Image")
+        frames = [Image.new('1', (64, 64), shade) for shade in (0, 1, 0)]
+        tiff_path = tmp_path / "fax.tiff"
+        frames[0].save(tiff_path, 'TIFF', save_all=True, append_images=frames[1:], compression='group4')
+        pool = MagicMock()
+        pool.run.side_effect = lambda fn, *args: fn(*args)
+
+        with patch('app.services.document_splitter.get_cpu_pool', return_value=pool):
+            result = DocumentSplitter(temp_dir=str(tmp_path / "split"), chunk_pages=2).split_document(
+                input_path=str(tiff_path),
+                unique_id="u1",
+                document_unique_identifier="FAX",
+                original_file_name="fax.tiff",
+                mime_type="image/tiff"
+            )
+
+        # Each chunk task gets the path (not the TIFF bytes) and its frame range
+        assert [call.args[1:] for call in pool.run.call_args_list] == [
+            (str(tiff_path), True, 0, 2), (str(tiff_path), True, 2, 2)
+        ]
+        assert result.page_count == 3
+        with fitz.open(result.pages[1].local_path) as doc:
+            # G4 frames are still embedded from the memory-mapped file
+            assert doc.xref_get_key(doc[0].get_images()[0][0], "Filter")[1] == "/CCITTFaxDecode"
+
+
+class TestProcessorChunkedUpload:
+    """Test streaming split and upload in DocumentProcessor"""
+
+    def test_only_ocr_pages_stay_on_disk(self, tmp_path, pdf_path, monkeypatch):
+        from app.config import settings
+        from app.services.document_processor import DocumentProcessor
+
+        # OCR picks 2 pages out of the first 3 (pre-ranking window); page 3 ranks first
+        monkeypatch.setattr(settings, 'ocr_coversheet_prerank', True)
+        monkeypatch.setattr(settings, 'ocr_prerank_max_pages', 3)
+        processor = DocumentProcessor.__new__(DocumentProcessor)
+        processor.coversheet_ranker = MagicMock()
+        processor.coversheet_ranker.rank_pages.side_effect = lambda pages: sorted(
+            pages, key=lambda page: page.page_number != 3
+        )
+        processor.splitter = DocumentSplitter(temp_dir=str(tmp_path / "split"), chunk_pages=2)
+        processor.OCR_MAX_PAGES = 2
+        uploaded = []
+
+        def upload_split_pages(pages, **kwargs):
+            # Every page of the chunk is still on disk while it is uploaded
+            assert all(Path(page.local_path).exists() for page in pages)
+            uploaded.append([page.page_number for page in pages])
+            return [{'page_number': page.page_number} for page in pages]
+
+        processor._upload_split_pages = upload_split_pages
+        temp_files = []
+
+        split_result, page_metadata = processor._split_and_upload_in_chunks(
+            str(pdf_path), unique_id="u1", temp_files_to_cleanup=temp_files, upload_kwargs={}
+        )
+
+        assert uploaded == [[1, 2], [3, 4], [5]]
+        assert [entry['page_number'] for entry in page_metadata] == [1, 2, 3, 4, 5]
+        assert split_result.page_count == 5
+        assert [page.page_number for page in split_result.pages] == [1, 2, 3, 4, 5]
+        # Only the selected OCR pages are kept; page 2 is dropped once page 3 outranks it
+        assert [page.local_path is not None for page in split_result.pages] == [True, False, True, False, False]
+        assert split_result.local_paths == temp_files
+        assert len(list((tmp_path / "split" / "u1" / "CONSOLIDATED" / "pages").iterdir())) == 2
@@ -0,0 +1,163 @@
+"""
+Unit tests for the lossless TIFF-to-PDF passthrough:
+- CCITT G4 and single-strip JPEG frames are embedded without decoding and render identically
+- Other compressions and multi-strip frames fall back to the decode path
+- PDFMerger and DocumentSplitter handle TIFFs mixing passthrough and decoded frames
+- PDFMerger converts TIFF files from their path in frame chunks appended to the output PDF
+"""
+import io
+import pytest
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+fitz = pytest.importorskip("fitz")
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+from app.services.tiff_passthrough import build_image_pdf, get_passthrough_image
+from app.services.cpu_pool import CpuPool
+from app.services.pdf_merger import PDFMerger, tiff_to_pdf_bytes
+from app.services.document_splitter import DocumentSplitter
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files"""
+    temp_path = Path(tempfile.mkdtemp())
+    yield temp_path
+    shutil.rmtree(temp_path, ignore_errors=True)
+
+
+def _frame(mode, shift=0):
+    background = (200, 50, 50) if mode == 'RGB' else 255
+    img = Image.new(mode, (300, 200), background)
+    ImageDraw.Draw(img).rectangle([20 + shift, 20, 120 + shift, 120], fill=(0, 0, 255) if mode == 'RGB' else 0)
+    return img
+
+
+def _tiff(frames, **save_kwargs):
+    buffer = io.BytesIO()
+    frames[0].save(buffer, 'TIFF', save_all=True, append_images=frames[1:], **save_kwargs)
+    return buffer.getvalue()
+
+
+def _passthrough_images(data):
+    images = []
+    with Image.open(io.BytesIO(data)) as img:
+        for frame_idx in range(img.n_frames):
+            img.seek(frame_idx)
+            images.append(get_passthrough_image(img, data))
+    return images
+
+
+def _rendered(page):
+    pix = page.get_pixmap()
+    return Image.frombytes('RGB', (pix.width, pix.height), pix.samples)
+
+
+def _assert_pages_match_frames(pdf_doc, data):
+    with Image.open(io.BytesIO(data)) as img:
+        assert len(pdf_doc) == img.n_frames
+        for frame_idx, page in enumerate(pdf_doc):
+            img.seek(frame_idx)
+            assert page.rect.width == img.width
+            assert _rendered(page).tobytes() == img.convert('RGB').tobytes()
+
+
+class TestPassthroughImage:
+    """Test which frames are embedded as-is"""
+
+    @pytest.mark.parametrize("photometric", [0, 1])
+    def test_group4_frames_render_identically(self, photometric):
+        data = _tiff([_frame('1'), _frame('1', 50)], compression='group4', tiffinfo={262: photometric})
+
+        images = _passthrough_images(data)
+
+        assert [image.filter for image in images] == ["/CCITTFaxDecode"] * 2
+        with fitz.open(stream=build_image_pdf(images), filetype="pdf") as pdf_doc:
+            _assert_pages_match_frames(pdf_doc, data)
+
+    def test_single_strip_jpeg_frames_are_embedded(self):
+        gray = _tiff([_frame('L')], compression='jpeg')
+        rgb = _tiff([_frame('RGB')], compression='jpeg', tiffinfo={278: 200})
+
+        gray_image, = _passthrough_images(gray)
+        rgb_image, = _passthrough_images(rgb)
+
+        assert gray_image.filter == rgb_image.filter == "/DCTDecode"
+        assert rgb_image.decode_parms == "<< /ColorTransform 0 >>"
+        assert rgb_image.data.startswith(b"\xff\xd8")
+        with fitz.open(stream=build_image_pdf([gray_image]), filetype="pdf") as pdf_doc:
+            _assert_pages_match_frames(pdf_doc, gray)
+        with fitz.open(stream=build_image_pdf([rgb_image]), filetype="pdf") as pdf_doc:
+            _assert_pages_match_frames(pdf_doc, rgb)
+
+    def test_unsupported_frames_fall_back(self):
+        lzw = _tiff([_frame('L')], compression='tiff_lzw')
+        multi_strip_jpeg = _tiff([_frame('RGB')], compression='jpeg', tiffinfo={278: 64})
+
+        assert _passthrough_images(lzw) == [None]
+        assert _passthrough_images(multi_strip_jpeg) == [None]
+
+
+class TestConversions:
+    """Test the merger and splitter TIFF conversions"""
+
+    def test_merger_mixes_passthrough_and_decoded_frames(self):
+        data = _tiff([_frame('1'), _frame('1', 50)], compression='group4')
+        calls = []
+
+        def first_frame_only(img, tiff_data):
+            calls.append(img.tell())
+            return get_passthrough_image(img, tiff_data) if img.tell() == 0 else None
+
+        pdf_data, frame_count = tiff_to_pdf_bytes(data)
+        decoded_data, _ = tiff_to_pdf_bytes(data, passthrough=False)
+        with patch('app.services.pdf_merger.get_passthrough_image', side_effect=first_frame_only):
+            mixed_data, mixed_count = tiff_to_pdf_bytes(data)
+
+        assert frame_count == 2
+        assert len(pdf_data) < len(decoded_data)
+        with fitz.open(stream=pdf_data, filetype="pdf") as pdf_doc:
+            _assert_pages_match_frames(pdf_doc, data)
+        assert mixed_count == 2 and calls == [0, 1]
+        with fitz.open(stream=mixed_data, filetype="pdf") as pdf_doc:
+            _assert_pages_match_frames(pdf_doc, data)
+
+    def test_merger_converts_file_in_frame_chunks(self, temp_dir):
+        data = _tiff([_frame('1', shift) for shift in (0, 50, 100, 150, 0)], compression='group4')
+        tiff_path = temp_dir / "fax.tiff"
+        tiff_path.write_bytes(data)
+        pool = CpuPool(max_workers=0)
+
+        with patch('app.services.pdf_merger.get_cpu_pool', return_value=pool), \
+                patch.object(pool, 'run', wraps=pool.run) as run:
+            output_path = PDFMerger(temp_dir=str(temp_dir), tiff_chunk_frames=2)._convert_tiff_to_pdf(tiff_path, 0)
+
+        # Workers get the path and a frame range, never the TIFF bytes
+        assert [call.args[1:] for call in run.call_args_list] == [
+            (str(tiff_path), True, 0, 2), (str(tiff_path), True, 2, 2), (str(tiff_path), True, 4, 2)
+        ]
+        with fitz.open(output_path) as pdf_doc:
+            _assert_pages_match_frames(pdf_doc, data)
+
+    @pytest.mark.parametrize("tiff_passthrough", [True, False])
+    def test_splitter_pages(self, temp_dir, tiff_passthrough):
+        tiff_path = temp_dir / "fax.tiff"
+        tiff_path.write_bytes(_tiff([_frame('1'), _frame('1', 50), _frame('1', 100)], compression='group4'))
+
+        result = DocumentSplitter(temp_dir=str(temp_dir / "out"), tiff_passthrough=tiff_passthrough).split_document(
+            input_path=str(tiff_path),
+            unique_id="u1",
+            document_unique_identifier="FAX",
+            original_file_name="fax.tiff",
+            mime_type="image/tiff"
+        )
+
+        assert result.page_count == 3
+        assert len({page.sha256 for page in result.pages}) == 3
+        for page in result.pages:
+            with fitz.open(page.local_path) as page_doc:
+                assert page_doc[0].rect.width == 300
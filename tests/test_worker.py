@@ -0,0 +1,111 @@
+"""
+Unit tests for the standalone pipeline worker (python -m app.worker):
+- Worker DB pool sizing is applied before the engine is created
+- Background services start in the worker and stop on shutdown
+- Shutdown releases the CPU pool, pooled HTTP connections and DB connections
+"""
+import pytest
+import sys
+import asyncio
+from unittest.mock import MagicMock, patch, AsyncMock
+
+# Mock Azure modules before importing app
+sys.modules['azure'] = MagicMock()
+sys.modules['azure.storage'] = MagicMock()
+sys.modules['azure.storage.blob'] = MagicMock()
+sys.modules['azure.identity'] = MagicMock()
+sys.modules['azure.core'] = MagicMock()
+sys.modules['azure.core.exceptions'] = MagicMock()
+
+from app import worker
+
+
+class TestConfigureDbPool:
+    """Test worker DB pool sizing"""
+
+    def test_worker_pool_size_overrides_settings(self):
+        with patch('app.worker.settings') as mock_settings:
+            mock_settings.worker_db_pool_size = 20
+            mock_settings.db_pool_size = 80
+            worker.configure_db_pool()
+
+        assert mock_settings.db_pool_size == 20
+        assert mock_settings.db_max_overflow == 30
+
+    def test_worker_pool_size_is_bounded(self):
+        with patch('app.worker.settings') as mock_settings:
+            mock_settings.worker_db_pool_size = 1
+            worker.configure_db_pool()
+
+        assert mock_settings.db_pool_size == 5
+
+    def test_no_override_keeps_web_pool_size(self):
+        with patch('app.worker.settings') as mock_settings:
+            mock_settings.worker_db_pool_size = None
+            mock_settings.db_pool_size = 80
+            worker.configure_db_pool()
+
+        assert mock_settings.db_pool_size == 80
+
+
+class TestRunWorker:
+    """Test service lifecycle in the worker process"""
+
+    @pytest.mark.asyncio
+    async def test_starts_and_stops_services(self):
+        poller = MagicMock()
+        poller.start = AsyncMock()
+        poller.stop = AsyncMock()
+        poller.is_running = True
+        processor = MagicMock()
+        processor.start = AsyncMock()
+        processor.stop = AsyncMock()
+        processor.is_running = True
+
+        stop_event = asyncio.Event()
+        stop_event.set()
+
+        with patch('app.services.db.test_connection', return_value=True), \
+             patch('app.services.db.get_pool_status', return_value={'pool_size': 10}), \
+             patch('app.services.db.close_all_connections') as mock_close, \
+             patch('app.services.cpu_pool.shutdown_cpu_pool') as mock_shutdown_cpu_pool, \
+             patch('app.services.http_client.close_http_client') as mock_close_http, \
+             patch('app.services.message_poller.get_message_poller', return_value=poller), \
+             patch('app.services.clinical_ops_inbox_processor.ClinicalOpsInboxProcessor', return_value=processor), \
+             patch('app.worker.settings') as mock_settings:
+            mock_settings.message_poller_enabled = True
+            mock_settings.clinical_ops_poller_enabled = True
+            await worker.run_worker(stop_event)
+
+        poller.start.assert_awaited_once()
+        processor.start.assert_awaited_once()
+        poller.stop.assert_awaited_once()
+        processor.stop.assert_awaited_once()
+        mock_shutdown_cpu_pool.assert_called_once()
+        mock_close_http.assert_called_once()
+        mock_close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_disabled_poller_is_not_started(self):
+        processor = MagicMock()
+        processor.start = AsyncMock()
+        processor.stop = AsyncMock()
+        processor.is_running = True
+
+        stop_event = asyncio.Event()
+        stop_event.set()
+
+        with patch('app.services.db.test_connection', return_value=True), \
+             patch('app.services.db.get_pool_status', return_value={'pool_size': 10}), \
+             patch('app.services.db.close_all_connections'), \
+             patch('app.services.cpu_pool.shutdown_cpu_pool'), \
+             patch('app.services.http_client.close_http_client'), \
+             patch('app.services.message_poller.get_message_poller') as mock_get_poller, \
+             patch('app.services.clinical_ops_inbox_processor.ClinicalOpsInboxProcessor', return_value=processor), \
+             patch('app.worker.settings') as mock_settings:
+            mock_settings.message_poller_enabled = False
+            mock_settings.clinical_ops_poller_enabled = True
+            await worker.run_worker(stop_event)
+
+        mock_get_poller.assert_not_called()
+        processor.stop.assert_awaited_once()